@@ -9,8 +9,9 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import text
 
-from lib.db import get_db_pool
+from lib.db import get_async_db_pool
 from lib.logging import log_audit_event
+from lib.usage_rollups import fetch_daily_usage, fetch_usage_breakdown
 
 from .deps import (
     JST,
@@ -65,11 +66,11 @@ async def get_costs_monthly(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
-            result = conn.execute(
+        async with pool.connect() as conn:
+            result = await conn.execute(
                 text("""
                     SELECT
                         year_month,
@@ -147,7 +148,7 @@ async def get_costs_monthly(
 過去N日間の日次コストを返す。
 
 ## データソース
-- ai_usage_logs テーブルから日次集計
+- ai_usage_rollups テーブル（ai_usage_logs のJST日次集計）
 
 ## パラメータ
 - days: 集計日数（デフォルト30、最大90）
@@ -175,33 +176,19 @@ async def get_costs_daily(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
-            result = conn.execute(
-                text("""
-                    SELECT
-                        DATE(created_at) as cost_date,
-                        COALESCE(SUM(cost_jpy), 0) as cost,
-                        COUNT(*) as requests
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :start_date
-                    GROUP BY DATE(created_at)
-                    ORDER BY DATE(created_at) ASC
-                """),
-                {"org_id": organization_id, "start_date": start_date},
-            )
-            rows = result.fetchall()
+        async with pool.connect() as conn:
+            rows = await fetch_daily_usage(conn, organization_id, start_date)
 
         daily = []
         for row in rows:
             daily.append(
                 CostDailyEntry(
-                    date=row[0],
-                    cost=round(float(row[1]), 6),
-                    requests=int(row[2]),
+                    date=row.day,
+                    cost=round(row.cost_jpy, 6),
+                    requests=row.request_count,
                 )
             )
 
@@ -278,26 +265,12 @@ async def get_costs_breakdown(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
+        async with pool.connect() as conn:
             # --- モデル別 ---
-            model_result = conn.execute(
-                text("""
-                    SELECT
-                        COALESCE(model_id, 'unknown') as model,
-                        COALESCE(SUM(cost_jpy), 0) as cost,
-                        COUNT(*) as requests
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :start_date
-                    GROUP BY model_id
-                    ORDER BY cost DESC
-                """),
-                {"org_id": organization_id, "start_date": start_date},
-            )
-            model_rows = model_result.fetchall()
+            model_rows = await fetch_usage_breakdown(conn, organization_id, start_date, "model_id")
 
             # 全体コスト（割合計算用）
             total_cost = sum(float(r[1]) for r in model_rows) if model_rows else 0.0
@@ -316,21 +289,7 @@ async def get_costs_breakdown(
                 )
 
             # --- ティア別 ---
-            tier_result = conn.execute(
-                text("""
-                    SELECT
-                        COALESCE(tier, 'unknown') as tier,
-                        COALESCE(SUM(cost_jpy), 0) as cost,
-                        COUNT(*) as requests
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :start_date
-                    GROUP BY tier
-                    ORDER BY cost DESC
-                """),
-                {"org_id": organization_id, "start_date": start_date},
-            )
-            tier_rows = tier_result.fetchall()
+            tier_rows = await fetch_usage_breakdown(conn, organization_id, start_date, "tier")
 
             by_tier = []
             for row in tier_rows:
@@ -411,7 +370,7 @@ AIへの投資費用と、それによって削減できた人件費・工数を
 - ROI倍率 = 削減人件費 ÷ AI費用
 
 ## データソース
-- ai_usage_logs テーブル（ティア別リクエスト数・コスト）
+- ai_usage_rollups テーブル（ティア別リクエスト数・コスト）
     """,
 )
 async def get_ai_roi(
@@ -436,25 +395,11 @@ async def get_ai_roi(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
-            result = conn.execute(
-                text("""
-                    SELECT
-                        COALESCE(tier, 'unknown') as tier,
-                        COUNT(*) as requests,
-                        COALESCE(SUM(cost_jpy), 0) as cost
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :start_date
-                    GROUP BY tier
-                    ORDER BY cost DESC
-                """),
-                {"org_id": organization_id, "start_date": start_date},
-            )
-            rows = result.fetchall()
+        async with pool.connect() as conn:
+            rows = await fetch_usage_breakdown(conn, organization_id, start_date, "tier")
 
         by_tier = []
         total_cost = 0.0
@@ -462,10 +407,7 @@ async def get_ai_roi(
         total_time_saved_hours = 0.0
         total_labor_saved = 0.0
 
-        for row in rows:
-            tier = str(row[0])
-            requests = int(row[1])
-            cost = float(row[2])
+        for tier, cost, requests in rows:
             minutes_per_req = _ROI_MINUTES_PER_REQUEST.get(tier, _ROI_MINUTES_PER_REQUEST["unknown"])
             time_saved_hours = (requests * minutes_per_req) / 60.0
             labor_saved = time_saved_hours * _LABOR_COST_PER_HOUR_JPY
@@ -554,11 +496,11 @@ async def update_monthly_budget(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
-            conn.execute(
+        async with pool.connect() as conn:
+            await conn.execute(
                 text("""
                     INSERT INTO ai_monthly_cost_summary
                         (id, organization_id, year_month,
@@ -581,7 +523,7 @@ async def update_monthly_budget(
                     "budget_jpy": body.budget_jpy,
                 },
             )
-            conn.commit()
+            await conn.commit()
 
         log_audit_event(
             logger=logger,
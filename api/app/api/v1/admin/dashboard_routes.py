@@ -9,8 +9,9 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import text
 
-from lib.db import get_db_pool
+from lib.db import get_async_db_pool
 from lib.logging import log_audit_event
+from lib.usage_rollups import fetch_usage_totals
 
 from .deps import (
     JST,
@@ -41,7 +42,7 @@ router = APIRouter()
 全KPIを1リクエストで返すバッチエンドポイント。
 
 ## データソース
-- ai_usage_logs: 会話数、応答時間、エラー率、コスト
+- ai_usage_rollups: 会話数、応答時間、エラー率、コスト（ai_usage_logs の日次集計）
 - ai_monthly_cost_summary: 月間予算
 - bottleneck_alerts: アクティブアラート数
 
@@ -77,51 +78,26 @@ async def get_dashboard_summary(
         user_id=user.user_id,
     )
 
-    pool = get_db_pool()
+    pool = await get_async_db_pool()
 
     try:
-        with pool.connect() as conn:
-            # --- KPI: 会話数・平均応答時間・エラー率・コスト ---
-            usage_result = conn.execute(
-                text("""
-                    SELECT
-                        COUNT(*) as total_conversations,
-                        COALESCE(AVG(response_time_ms), 0) as avg_response_time_ms,
-                        CASE
-                            WHEN COUNT(*) > 0
-                            THEN COALESCE(SUM(CASE WHEN is_error = TRUE THEN 1 ELSE 0 END)::float / COUNT(*), 0)
-                            ELSE 0
-                        END as error_rate,
-                        COALESCE(SUM(cost_usd), 0) as total_cost
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :start_date
-                """),
-                {"org_id": organization_id, "start_date": start_date},
-            )
-            usage_row = usage_result.fetchone()
+        async with pool.connect() as conn:
+            # --- KPI: 会話数・平均応答時間・エラー率・コスト（日次ロールアップから集計） ---
+            usage = await fetch_usage_totals(conn, organization_id, start_date)
 
-            total_conversations = int(usage_row[0]) if usage_row else 0
-            avg_response_time_ms = float(usage_row[1]) if usage_row else 0.0
-            error_rate = float(usage_row[2]) if usage_row else 0.0
-            total_cost = float(usage_row[3]) if usage_row else 0.0
+            total_conversations = usage.request_count
+            avg_response_time_ms = usage.avg_response_time_ms
+            error_rate = usage.error_rate
 
             # --- 今日のコスト（period問わず常にtodayを返す） ---
-            today_cost_result = conn.execute(
-                text("""
-                    SELECT COALESCE(SUM(cost_usd), 0) as cost_today
-                    FROM ai_usage_logs
-                    WHERE organization_id = :org_id
-                      AND created_at >= :today
-                """),
-                {"org_id": organization_id, "today": now.date()},
-            )
-            today_cost_row = today_cost_result.fetchone()
-            cost_today = float(today_cost_row[0]) if today_cost_row else 0.0
+            if period == "today":
+                cost_today = usage.cost_usd
+            else:
+                cost_today = (await fetch_usage_totals(conn, organization_id, now.date())).cost_usd
 
             # --- 月間予算残 ---
             current_month = now.strftime("%Y-%m")
-            budget_result = conn.execute(
+            budget_result = await conn.execute(
                 text("""
                     SELECT
                         COALESCE(budget_usd, 0) as budget,
@@ -140,7 +116,7 @@ async def get_dashboard_summary(
                 monthly_budget_remaining = 0.0
 
             # --- アクティブアラート数 ---
-            alerts_count_result = conn.execute(
+            alerts_count_result = await conn.execute(
                 text("""
                     SELECT COUNT(*) as active_count
                     FROM bottleneck_alerts
@@ -153,7 +129,7 @@ async def get_dashboard_summary(
             active_alerts_count = int(alerts_count_row[0]) if alerts_count_row else 0
 
             # --- 最近のアラート（最大5件） ---
-            recent_alerts_result = conn.execute(
+            recent_alerts_result = await conn.execute(
                 text("""
                     SELECT id, bottleneck_type, risk_level, target_name, created_at, status
                     FROM bottleneck_alerts
@@ -177,7 +153,7 @@ async def get_dashboard_summary(
                 )
 
             # --- 最近のインサイト（最大5件） ---
-            recent_insights_result = conn.execute(
+            recent_insights_result = await conn.execute(
                 text("""
                     SELECT id, insight_type, title, description, created_at
                     FROM brain_strategic_insights
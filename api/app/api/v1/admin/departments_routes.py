@@ -16,6 +16,7 @@ from .deps import (
     require_editor,
     UserContext,
 )
+from app.services.department_closure import invalidate_department_closure
 from app.schemas.admin import (
     DepartmentTreeNode,
     DepartmentsTreeResponse,
@@ -379,6 +380,7 @@ async def create_department(
             )
             new_id = str(result.fetchone()[0])
             conn.commit()
+            invalidate_department_closure(organization_id)
 
         log_audit_event(
             logger=logger,
@@ -534,6 +536,7 @@ async def update_department(
             """
             conn.execute(text(query), params)
             conn.commit()
+            invalidate_department_closure(organization_id)
 
         log_audit_event(
             logger=logger,
@@ -673,6 +676,7 @@ async def delete_department(
                 },
             )
             conn.commit()
+            invalidate_department_closure(organization_id)
 
         dept_name = dept_row[1] or dept_id
 
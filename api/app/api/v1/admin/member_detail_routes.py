@@ -19,6 +19,7 @@ from .deps import (
     require_editor,
     UserContext,
 )
+from app.services.department_closure import invalidate_user_access
 from app.schemas.admin import (
     MemberDetailResponse,
     MemberDepartmentInfo,
@@ -422,6 +423,7 @@ async def update_member_departments(
                 )
 
             conn.commit()
+            invalidate_user_access(organization_id, user_id)
 
         log_audit_event(
             logger=logger,
@@ -1,13 +1,17 @@
 """
 Admin Dashboard - System Health Endpoints
 
-システムヘルスサマリー、メトリクス推移、自己診断一覧。
+システムヘルスサマリー、メトリクス推移、自己診断一覧、レイテンシ（p50/p95/p99）。
 """
 
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 
 from lib.db import get_db_pool
+from lib.latency_histogram import format_prometheus_summary, merge_histogram_snapshots
 from lib.logging import log_audit_event
 
 from .deps import (
@@ -208,3 +212,111 @@ async def get_self_diagnoses(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"status": "failed", "error_code": "INTERNAL_ERROR", "error_message": "内部エラーが発生しました"},
         )
+
+
+@router.get(
+    "/system/latency",
+    summary="Brainレイテンシ分布",
+    description=(
+        "直近N分の応答時間・段階別時間・トークン数の p50/p95/p99（Level 5+）。"
+        "format=prometheus で Prometheus テキスト形式を返す（スクレイプ用）"
+    ),
+)
+async def get_system_latency(
+    user: UserContext = Depends(require_admin),
+    minutes: int = Query(60, ge=1, le=1440, description="集計期間（分）"),
+    format: str = Query("json", pattern="^(json|prometheus)$", description="出力形式"),
+):
+    organization_id = user.organization_id or DEFAULT_ORG_ID
+    try:
+        pool = get_db_pool()
+        with pool.connect() as conn:
+            result = conn.execute(
+                text("""
+                    SELECT service, instance_id, request_count, error_count, histograms
+                    FROM brain_latency_minutes
+                    WHERE organization_id = :org_id
+                      AND minute >= NOW() - (INTERVAL '1 minute' * :minutes)
+                """),
+                {"org_id": organization_id, "minutes": minutes},
+            )
+            rows = result.fetchall()
+
+        # 分バケット（インスタンス別）をマージ: 行数×バケット数に比例
+        histograms = merge_histogram_snapshots(
+            json.loads(r[4]) if isinstance(r[4], str) else r[4] for r in rows
+        )
+        request_count = sum(int(r[2] or 0) for r in rows)
+        error_count = sum(int(r[3] or 0) for r in rows)
+        instance_count = len({(r[0], r[1]) for r in rows})
+        stages = {
+            name[len("stage."):]: histogram
+            for name, histogram in sorted(histograms.items())
+            if name.startswith("stage.")
+        }
+
+        log_audit_event(
+            logger=logger, action="get_system_latency",
+            resource_type="system", resource_id="latency",
+            user_id=user.user_id, details={"minutes": minutes, "format": format},
+        )
+
+        if format == "prometheus":
+            response_time = histograms.get("response_time_ms")
+            body = "".join([
+                format_prometheus_summary(
+                    "soulkun_brain_response_time_ms",
+                    "LLM Brain response time in milliseconds",
+                    [({}, response_time)] if response_time else [],
+                ),
+                format_prometheus_summary(
+                    "soulkun_brain_stage_time_ms",
+                    "LLM Brain stage time in milliseconds",
+                    [({"stage": stage}, histogram) for stage, histogram in stages.items()],
+                ),
+                format_prometheus_summary(
+                    "soulkun_brain_tokens",
+                    "LLM tokens per request",
+                    [
+                        ({"direction": direction}, histograms[f"{direction}_tokens"])
+                        for direction in ("input", "output")
+                        if f"{direction}_tokens" in histograms
+                    ],
+                ),
+                "# HELP soulkun_brain_window_requests Requests in the window\n",
+                "# TYPE soulkun_brain_window_requests gauge\n",
+                f"soulkun_brain_window_requests {request_count}\n",
+                "# HELP soulkun_brain_window_errors Failed requests in the window\n",
+                "# TYPE soulkun_brain_window_errors gauge\n",
+                f"soulkun_brain_window_errors {error_count}\n",
+            ])
+            return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+        from app.schemas.admin import LatencyMetricsResponse, LatencySummary
+
+        def _summary(name: str) -> LatencySummary:
+            histogram = histograms.get(name)
+            return LatencySummary(**histogram.summary()) if histogram else LatencySummary()
+
+        return LatencyMetricsResponse(
+            window_minutes=minutes,
+            instance_count=instance_count,
+            request_count=request_count,
+            error_count=error_count,
+            response_time_ms=_summary("response_time_ms"),
+            stage_timings_ms={
+                stage: LatencySummary(**histogram.summary())
+                for stage, histogram in stages.items()
+            },
+            input_tokens=_summary("input_tokens"),
+            output_tokens=_summary("output_tokens"),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Get system latency error", organization_id=organization_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"status": "failed", "error_code": "INTERNAL_ERROR", "error_message": "内部エラーが発生しました"},
+        )
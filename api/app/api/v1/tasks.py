@@ -24,8 +24,7 @@ from app.schemas.task import (
 )
 from app.services.access_control import (
     AccessControlService,
-    compute_accessible_departments_sync,
-    get_user_role_level_sync,
+    get_access_scope_sync,
 )
 from app.services.knowledge_search import UserContext
 from app.deps.auth import get_current_user
@@ -190,22 +189,20 @@ async def get_overdue_tasks(
             user_role_level = 2  # デフォルト: 一般社員
 
             if user.user_id:
-                try:
-                    user_role_level = get_user_role_level_sync(conn, user.user_id)
+                # v11.3.0: 部署クロージャ・キャッシュ経由（キャッシュ済みならDB往復なし）
+                scope = get_access_scope_sync(conn, user.user_id, organization_id)
+                if scope is not None:
+                    user_role_level = scope.role_level
                     logger.info(f"User role level: {user_role_level}", user_id=user.user_id)
 
                     # Level 5以上は全部署アクセス可能
-                    if user_role_level < 5:
-                        accessible_departments = compute_accessible_departments_sync(
-                            conn, user.user_id, organization_id
-                        )
+                    if not scope.has_full_access:
+                        accessible_departments = sorted(scope.department_ids)
                         logger.info(
-                            f"Accessible departments: {len(accessible_departments) if accessible_departments else 0}",
+                            f"Accessible departments: {len(accessible_departments)}",
                             user_id=user.user_id,
                         )
-                except Exception as e:
-                    logger.warning(f"Failed to compute accessible departments: {e}")
-                    # アクセス制御失敗時はフィルタなし（全タスク表示）
+                # アクセス制御失敗時（scope=None）はフィルタなし（全タスク表示）
 
             # 期限超過タスクを取得
             query = """
@@ -12,7 +12,7 @@ PII保護:
 from __future__ import annotations
 
 import datetime as dt
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -911,6 +911,32 @@ class SystemMetricsResponse(BaseModel):
     metrics: List[DailyMetricEntry] = Field(default_factory=list)
 
 
+class LatencySummary(BaseModel):
+    """レイテンシ分布のサマリー（ms / トークン数）"""
+
+    count: int = 0
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class LatencyMetricsResponse(BaseModel):
+    """直近N分のBrainレイテンシ（全インスタンスをマージ）"""
+
+    status: str = "success"
+    window_minutes: int
+    instance_count: int = 0
+    request_count: int = 0
+    error_count: int = 0
+    response_time_ms: LatencySummary = Field(default_factory=LatencySummary)
+    stage_timings_ms: Dict[str, LatencySummary] = Field(default_factory=dict)
+    input_tokens: LatencySummary = Field(default_factory=LatencySummary)
+    output_tokens: LatencySummary = Field(default_factory=LatencySummary)
+
+
 class SelfDiagnosisSummary(BaseModel):
     """自己診断サマリー"""
 
@@ -9,6 +9,12 @@ from app.services.access_control import (
     AccessControlService,
     get_user_role_level_sync,
     compute_accessible_departments_sync,
+    get_access_scope_sync,
+)
+from app.services.department_closure import (
+    AccessScope,
+    invalidate_department_closure,
+    invalidate_user_access,
 )
 
 __all__ = [
@@ -16,4 +22,8 @@ __all__ = [
     "AccessControlService",
     "get_user_role_level_sync",
     "compute_accessible_departments_sync",
+    "get_access_scope_sync",
+    "AccessScope",
+    "invalidate_department_closure",
+    "invalidate_user_access",
 ]
@@ -10,13 +10,22 @@ Phase 3.5: 6段階権限レベルに基づくアクセス制御
     4 = 幹部/部長（自部署＋配下全部署）
     5 = 管理部（全組織、最高機密除く）
     6 = 代表/CFO（全組織、全情報）
+
+v11.3.0: 部署クロージャ・キャッシュ（app.services.department_closure）を使う
+get_access_scope / can_access_departments / can_access_tasks を追加。
+多数の部署・タスクの判定を、DB往復なし（キャッシュ済み）〜1往復でまとめて行う。
 """
 
-from typing import List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lib.logging import get_logger
+from app.services.department_closure import (
+    AccessScope,
+    resolve_access_scope,
+    resolve_access_scope_sync,
+)
 
 logger = get_logger(__name__)
 
@@ -278,6 +287,83 @@ class AccessControlService:
             return False  # アクセス拒否（安全側に倒す）
 
 
+    # ================================================================
+    # v11.3.0: 部署クロージャ・キャッシュ経由の判定
+    # ================================================================
+
+    async def get_access_scope(
+        self,
+        user_id: str,
+        organization_id: str
+    ) -> Optional[AccessScope]:
+        """
+        ユーザーの権限レベルとアクセス可能部署を取得（キャッシュ経由）
+
+        Args:
+            user_id: ユーザーID
+            organization_id: 組織ID
+
+        Returns:
+            AccessScope、取得に失敗した場合None
+        """
+        try:
+            return await resolve_access_scope(self.db, user_id, organization_id)
+
+        except Exception as e:
+            logger.error(f"Failed to resolve access scope for user {user_id}: {type(e).__name__}")
+            return None
+
+    async def can_access_departments(
+        self,
+        user_id: str,
+        department_ids: Iterable[str],
+        organization_id: str
+    ) -> Dict[str, bool]:
+        """
+        複数の部署へのアクセス可否をまとめて判定
+
+        Args:
+            user_id: ユーザーID
+            department_ids: 部署IDのリスト
+            organization_id: 組織ID
+
+        Returns:
+            {部署ID: アクセス可能ならTrue}（取得失敗時は全てFalse）
+        """
+        scope = await self.get_access_scope(user_id, organization_id)
+        return {
+            dept_id: scope is not None and scope.can_access(dept_id)
+            for dept_id in department_ids
+        }
+
+    async def can_access_tasks(
+        self,
+        user_id: str,
+        task_department_ids: Dict[str, Optional[str]],
+        organization_id: str
+    ) -> Dict[str, bool]:
+        """
+        複数のタスクへのアクセス可否をまとめて判定
+
+        Args:
+            user_id: ユーザーID
+            task_department_ids: {タスクID: タスクの部署ID（NULLの場合あり）}
+            organization_id: 組織ID
+
+        Returns:
+            {タスクID: アクセス可能ならTrue}
+        """
+        # 部署未設定のタスクは全員アクセス可能（can_access_task と同じ）
+        if all(dept_id is None for dept_id in task_department_ids.values()):
+            return {task_id: True for task_id in task_department_ids}
+
+        scope = await self.get_access_scope(user_id, organization_id)
+        return {
+            task_id: dept_id is None or (scope is not None and scope.can_access(dept_id))
+            for task_id, dept_id in task_department_ids.items()
+        }
+
+
 # 同期版のヘルパー関数（Cloud Functions用）
 def get_user_role_level_sync(conn, user_id: str) -> int:
     """
@@ -393,3 +479,27 @@ def compute_accessible_departments_sync(
     except Exception as e:
         logger.error(f"Failed to compute accessible departments for user {user_id} (sync): {e}")
         return []  # 空のリストを返す（安全側に倒す）
+
+
+def get_access_scope_sync(
+    conn,
+    user_id: str,
+    organization_id: str
+) -> Optional[AccessScope]:
+    """
+    ユーザーの権限レベルとアクセス可能部署を取得（同期版、キャッシュ経由）
+
+    Args:
+        conn: データベース接続
+        user_id: ユーザーID
+        organization_id: 組織ID
+
+    Returns:
+        AccessScope、取得に失敗した場合None
+    """
+    try:
+        return resolve_access_scope_sync(conn, user_id, organization_id)
+
+    except Exception as e:
+        logger.error(f"Failed to resolve access scope for user {user_id} (sync): {type(e).__name__}")
+        return None
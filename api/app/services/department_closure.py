@@ -0,0 +1,451 @@
+"""
+部署クロージャ・キャッシュ
+
+v11.3.0: AccessControlService.compute_accessible_departments は
+「権限レベル → 所属部署 → 部署ごとのLTREEクエリ」と、1リクエストで
+(2 + 所属部署数) 回DBを往復していた。ナレッジ検索・タスク一覧のたびに走るため、
+組織の部署ツリーを1クエリで読み込み、配下・直下の関係を事前計算してプロセス内に保持する。
+
+【仕組み】
+- DepartmentClosure: 組織の全部署（id / parent / path / is_active）から
+  配下部署・直下部署・有効部署を事前計算したスナップショット
+- 無効化: departments の変更でトリガーが department_tree_versions.version を加算する
+  （migrations/20261016_department_tree_versions.sql）
+  バージョンの確認は DEPARTMENT_TREE_VERSION_CHECK_SECONDS に1回まで。
+  自プロセスでの部署変更は invalidate_department_closure() で即時に反映する
+  （マイグレーション未適用などでバージョンを取得できない場合は、確認のたびにツリーを再読込する）
+- DBエラー時はトランザクションをロールバックしてから送出する
+  （呼び出し側が同じ接続で後続のクエリを実行できるように）
+- AccessScope: ユーザーごとの権限レベルとアクセス可能部署。
+  ツリーのバージョンが変わるか、DEPARTMENT_ACCESS_SCOPE_TTL_SECONDS を過ぎるまで使い回す
+  （所属・ロールの変更はTTL、または invalidate_user_access() で反映）
+
+定常状態ではキャッシュ済みユーザーの判定はDBアクセスなし、
+未キャッシュのユーザーでも所属取得の1クエリで済む。
+
+権限レベルごとの範囲は AccessControlService と同じ:
+    Level 1-2: 自部署のみ / Level 3: 自部署＋直下部署
+    Level 4: 自部署＋配下全部署 / Level 5-6: 組織の全部署
+
+Created: 2026-10-16
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from lib.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# ================================================================
+# 設定
+# ================================================================
+
+# 部署ツリーのバージョン確認間隔（秒）。他インスタンスでの変更はこの秒数以内に反映される
+DEPARTMENT_TREE_VERSION_CHECK_SECONDS = float(
+    os.getenv("DEPARTMENT_TREE_VERSION_CHECK_SECONDS", "10")
+)
+# ユーザーごとのアクセス範囲の有効期限（秒）。所属・ロール変更の反映上限
+DEPARTMENT_ACCESS_SCOPE_TTL_SECONDS = float(
+    os.getenv("DEPARTMENT_ACCESS_SCOPE_TTL_SECONDS", "60")
+)
+
+# 権限レベル未設定時の既定値（一般社員）
+DEFAULT_ROLE_LEVEL = 2
+
+# バージョンを取得できなかったツリーのバージョン（キャッシュ済みのクロージャとは一致しない）
+UNVERSIONED_TREE = -1
+
+
+# ================================================================
+# クエリ
+# ================================================================
+
+DEPARTMENT_TREE_VERSION_SQL = text("""
+    SELECT version
+    FROM department_tree_versions
+    WHERE organization_id = :org_id
+""")
+
+DEPARTMENT_TREE_SQL = text("""
+    SELECT id, parent_department_id, CAST(path AS TEXT), is_active
+    FROM departments
+    WHERE organization_id = :org_id
+""")
+
+# 所属部署と権限レベルを1クエリで取得（ロール未設定の所属は level が NULL）
+USER_MEMBERSHIP_SQL = text("""
+    SELECT ud.department_id, r.level
+    FROM user_departments ud
+    LEFT JOIN roles r ON ud.role_id = r.id
+    WHERE ud.user_id = :user_id
+      AND ud.ended_at IS NULL
+""")
+
+
+# ================================================================
+# データクラス
+# ================================================================
+
+@dataclass(frozen=True)
+class DepartmentClosure:
+    """組織の部署ツリーの事前計算済みスナップショット"""
+    organization_id: str
+    version: int
+    active_ids: FrozenSet[str]
+    descendants: Dict[str, FrozenSet[str]]
+    children: Dict[str, FrozenSet[str]]
+
+    @classmethod
+    def from_rows(
+        cls,
+        organization_id: str,
+        version: int,
+        rows: Iterable[Tuple],
+    ) -> "DepartmentClosure":
+        """
+        (id, parent_department_id, path, is_active) の行から構築
+
+        配下部署は get_all_descendants と同じく「path が祖先の path 以下
+        （path <@ ancestor.path）の有効部署、ただし自分自身を除く」。
+        直下部署は get_direct_children と同じく parent_department_id が一致する有効部署。
+        """
+        active_ids: Set[str] = set()
+        path_index: Dict[str, List[str]] = {}
+        nodes: List[Tuple[str, Optional[str], str, bool]] = []
+        for dept_id, parent_id, path, is_active in rows:
+            dept_id = str(dept_id)
+            parent_id = str(parent_id) if parent_id is not None else None
+            path = str(path or "")
+            nodes.append((dept_id, parent_id, path, bool(is_active)))
+            path_index.setdefault(path, []).append(dept_id)
+            if is_active:
+                active_ids.add(dept_id)
+
+        descendants: Dict[str, Set[str]] = {}
+        children: Dict[str, Set[str]] = {}
+        for dept_id, parent_id, path, is_active in nodes:
+            if not is_active:
+                continue
+            if parent_id is not None:
+                children.setdefault(parent_id, set()).add(dept_id)
+            if not path:
+                continue
+            labels = path.split(".")
+            # 祖先のpath（自分と同じpathの別部署も <@ に含まれる）
+            for depth in range(1, len(labels) + 1):
+                for ancestor_id in path_index.get(".".join(labels[:depth]), ()):
+                    if ancestor_id != dept_id:
+                        descendants.setdefault(ancestor_id, set()).add(dept_id)
+
+        return cls(
+            organization_id=organization_id,
+            version=version,
+            active_ids=frozenset(active_ids),
+            descendants={k: frozenset(v) for k, v in descendants.items()},
+            children={k: frozenset(v) for k, v in children.items()},
+        )
+
+    def accessible_from(self, role_level: int, department_ids: Iterable[str]) -> FrozenSet[str]:
+        """権限レベルと所属部署からアクセス可能な部署集合を計算"""
+        if role_level >= 5:
+            return self.active_ids
+
+        accessible: Set[str] = set()
+        for dept_id in department_ids:
+            # 自部署は常にアクセス可能
+            accessible.add(dept_id)
+            if role_level >= 4:
+                accessible.update(self.descendants.get(dept_id, ()))
+            elif role_level >= 3:
+                accessible.update(self.children.get(dept_id, ()))
+        return frozenset(accessible)
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """ユーザーの権限レベルとアクセス可能部署"""
+    role_level: int
+    department_ids: FrozenSet[str]
+    tree_version: int = 0
+
+    @property
+    def has_full_access(self) -> bool:
+        """組織の全部署にアクセスできるか（Level 5-6）"""
+        return self.role_level >= 5
+
+    def can_access(self, department_id: str) -> bool:
+        return department_id in self.department_ids
+
+
+@dataclass
+class _ClosureEntry:
+    closure: DepartmentClosure
+    checked_at: float
+
+
+@dataclass
+class _ScopeEntry:
+    scope: AccessScope
+    expires_at: float
+
+
+def membership_to_scope(
+    closure: DepartmentClosure,
+    rows: Iterable[Tuple],
+) -> AccessScope:
+    """
+    (department_id, role_level) の所属行から AccessScope を作る
+
+    権限レベルは get_user_role_level と同じく、ロール付き所属の最大値（なければ2）。
+    """
+    department_ids: List[str] = []
+    levels: List[int] = []
+    for dept_id, level in rows:
+        if dept_id is not None:
+            department_ids.append(str(dept_id))
+        if level:
+            levels.append(int(level))
+    role_level = max(levels) if levels else DEFAULT_ROLE_LEVEL
+    return AccessScope(
+        role_level=role_level,
+        department_ids=closure.accessible_from(role_level, department_ids),
+        tree_version=closure.version,
+    )
+
+
+# ================================================================
+# キャッシュ本体
+# ================================================================
+
+class DepartmentAccessCache:
+    """
+    組織別の部署クロージャ＋ユーザー別アクセス範囲のプロセス内キャッシュ
+
+    DBアクセスは resolve_access_scope / resolve_access_scope_sync が行い、
+    このクラスは状態の保持と期限判定だけを受け持つ。
+    """
+
+    def __init__(
+        self,
+        version_check_seconds: float = DEPARTMENT_TREE_VERSION_CHECK_SECONDS,
+        scope_ttl_seconds: float = DEPARTMENT_ACCESS_SCOPE_TTL_SECONDS,
+    ):
+        self.version_check_seconds = version_check_seconds
+        self.scope_ttl_seconds = scope_ttl_seconds
+        self._closures: Dict[str, _ClosureEntry] = {}
+        self._scopes: Dict[Tuple[str, str], _ScopeEntry] = {}
+        self._lock = threading.Lock()
+        self._stats = {"closure_loads": 0, "scope_hits": 0, "scope_misses": 0}
+
+    def closure_if_fresh(self, organization_id: str, now: float) -> Optional[DepartmentClosure]:
+        """バージョン確認が不要な間だけクロージャを返す"""
+        entry = self._closures.get(organization_id)
+        if entry is None or now - entry.checked_at >= self.version_check_seconds:
+            return None
+        return entry.closure
+
+    def confirm_version(self, organization_id: str, version: int, now: float) -> Optional[DepartmentClosure]:
+        """
+        DB上のバージョンと照合し、一致すればクロージャを返す
+
+        不一致（またはクロージャ未読込）なら None を返すので、呼び出し側で再読込する。
+        """
+        if version == UNVERSIONED_TREE:
+            return None
+        with self._lock:
+            entry = self._closures.get(organization_id)
+            if entry is None or entry.closure.version != version:
+                return None
+            entry.checked_at = now
+            return entry.closure
+
+    def store_closure(self, closure: DepartmentClosure, now: float) -> None:
+        with self._lock:
+            self._closures[closure.organization_id] = _ClosureEntry(closure=closure, checked_at=now)
+            self._drop_scopes(closure.organization_id)
+            self._stats["closure_loads"] += 1
+
+    def get_scope(
+        self,
+        organization_id: str,
+        user_id: str,
+        closure: DepartmentClosure,
+        now: float,
+    ) -> Optional[AccessScope]:
+        entry = self._scopes.get((organization_id, user_id))
+        if entry is None or entry.expires_at <= now or entry.scope.tree_version != closure.version:
+            self._stats["scope_misses"] += 1
+            return None
+        self._stats["scope_hits"] += 1
+        return entry.scope
+
+    def store_scope(self, organization_id: str, user_id: str, scope: AccessScope, now: float) -> None:
+        with self._lock:
+            self._scopes[(organization_id, user_id)] = _ScopeEntry(
+                scope=scope, expires_at=now + self.scope_ttl_seconds,
+            )
+
+    def invalidate_organization(self, organization_id: str) -> None:
+        """組織のクロージャとユーザー別キャッシュを破棄"""
+        with self._lock:
+            self._closures.pop(organization_id, None)
+            self._drop_scopes(organization_id)
+
+    def invalidate_user(self, organization_id: str, user_id: str) -> None:
+        with self._lock:
+            self._scopes.pop((organization_id, user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._closures.clear()
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "organizations": len(self._closures),
+            "scopes": len(self._scopes),
+            **self._stats,
+        }
+
+    def _drop_scopes(self, organization_id: str) -> None:
+        for key in [k for k in self._scopes if k[0] == organization_id]:
+            del self._scopes[key]
+
+
+_cache = DepartmentAccessCache()
+
+
+def get_department_access_cache() -> DepartmentAccessCache:
+    """プロセス共通のキャッシュ"""
+    return _cache
+
+
+def invalidate_department_closure(organization_id: str) -> None:
+    """部署の作成・更新・削除をコミットした後に呼ぶ"""
+    _cache.invalidate_organization(str(organization_id))
+
+
+def invalidate_user_access(organization_id: str, user_id: str) -> None:
+    """ユーザーの所属・ロールを変更した後に呼ぶ"""
+    _cache.invalidate_user(str(organization_id), str(user_id))
+
+
+# ================================================================
+# DBアクセス（非同期 / 同期）
+# ================================================================
+
+def _version_from_row(row) -> int:
+    # 一度も部署が変更されていない組織は行がない
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+async def _rollback(db) -> None:
+    try:
+        await db.rollback()
+    except Exception:
+        pass
+
+
+def _rollback_sync(conn) -> None:
+    try:
+        conn.rollback()
+    except Exception:
+        pass
+
+
+async def _fetch_tree_version(db, organization_id: str) -> int:
+    try:
+        result = await db.execute(DEPARTMENT_TREE_VERSION_SQL, {"org_id": organization_id})
+        return _version_from_row(result.fetchone())
+    except Exception as e:
+        await _rollback(db)
+        logger.warning(f"Department tree version unavailable, reloading tree: {type(e).__name__}")
+        return UNVERSIONED_TREE
+
+
+def _fetch_tree_version_sync(conn, organization_id: str) -> int:
+    try:
+        row = conn.execute(DEPARTMENT_TREE_VERSION_SQL, {"org_id": organization_id}).fetchone()
+        return _version_from_row(row)
+    except Exception as e:
+        _rollback_sync(conn)
+        logger.warning(f"Department tree version unavailable, reloading tree (sync): {type(e).__name__}")
+        return UNVERSIONED_TREE
+
+
+async def resolve_access_scope(
+    db,
+    user_id: str,
+    organization_id: str,
+    cache: Optional[DepartmentAccessCache] = None,
+) -> AccessScope:
+    """
+    ユーザーのアクセス範囲を取得（AsyncSession / AsyncConnection）
+
+    Raises:
+        部署ツリー・所属のDBエラーは、ロールバックしてから送出する（呼び出し側で安全側に倒す）
+    """
+    cache = cache or _cache
+    organization_id = str(organization_id)
+    user_id = str(user_id)
+    now = time.monotonic()
+
+    try:
+        closure = cache.closure_if_fresh(organization_id, now)
+        if closure is None:
+            version = await _fetch_tree_version(db, organization_id)
+            closure = cache.confirm_version(organization_id, version, now)
+            if closure is None:
+                result = await db.execute(DEPARTMENT_TREE_SQL, {"org_id": organization_id})
+                closure = DepartmentClosure.from_rows(organization_id, version, result.fetchall())
+                cache.store_closure(closure, now)
+
+        scope = cache.get_scope(organization_id, user_id, closure, now)
+        if scope is None:
+            result = await db.execute(USER_MEMBERSHIP_SQL, {"user_id": user_id})
+            scope = membership_to_scope(closure, result.fetchall())
+            cache.store_scope(organization_id, user_id, scope, now)
+        return scope
+    except Exception:
+        await _rollback(db)
+        raise
+
+
+def resolve_access_scope_sync(
+    conn,
+    user_id: str,
+    organization_id: str,
+    cache: Optional[DepartmentAccessCache] = None,
+) -> AccessScope:
+    """ユーザーのアクセス範囲を取得（同期版。Connection）"""
+    cache = cache or _cache
+    organization_id = str(organization_id)
+    user_id = str(user_id)
+    now = time.monotonic()
+
+    try:
+        closure = cache.closure_if_fresh(organization_id, now)
+        if closure is None:
+            version = _fetch_tree_version_sync(conn, organization_id)
+            closure = cache.confirm_version(organization_id, version, now)
+            if closure is None:
+                rows = conn.execute(DEPARTMENT_TREE_SQL, {"org_id": organization_id}).fetchall()
+                closure = DepartmentClosure.from_rows(organization_id, version, rows)
+                cache.store_closure(closure, now)
+
+        scope = cache.get_scope(organization_id, user_id, closure, now)
+        if scope is None:
+            rows = conn.execute(USER_MEMBERSHIP_SQL, {"user_id": user_id}).fetchall()
+            scope = membership_to_scope(closure, rows)
+            cache.store_scope(organization_id, user_id, scope, now)
+        return scope
+    except Exception:
+        _rollback_sync(conn)
+        raise
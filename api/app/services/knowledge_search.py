@@ -25,8 +25,10 @@ from sqlalchemy.ext.asyncio import AsyncConnection
 
 from lib.config import get_settings
 from lib.logging import get_logger
-from lib.embedding import EmbeddingClient
+from lib.db import get_db_pool
+from lib.embedding import DatabaseEmbeddingStore, EmbeddingClient, get_embedding_client
 from lib.pinecone_client import PineconeClient, SearchResult
+from lib.vector_store import get_vector_store
 from app.schemas.knowledge import (
     KnowledgeSearchRequest,
     KnowledgeSearchResponse,
@@ -87,12 +89,14 @@ class KnowledgeSearchService:
         """
         Args:
             db_conn: 非同期DBコネクション
-            embedding_client: エンベディングクライアント（省略時は自動生成）
-            pinecone_client: Pineconeクライアント（省略時は自動生成）
+            embedding_client: エンベディングクライアント
+                （省略時はプロセス共通のクライアントに組織の永続キャッシュを付けて使う）
+            pinecone_client: Pineconeクライアント（省略時は VECTOR_STORE_BACKEND に応じたプロセス共通のストア）
         """
         self.db_conn = db_conn
-        self.embedding_client = embedding_client or EmbeddingClient()
-        self.pinecone_client = pinecone_client or PineconeClient()
+        self.embedding_client = embedding_client or get_embedding_client()
+        self._attach_embedding_store = embedding_client is None
+        self.pinecone_client = pinecone_client or get_vector_store()
 
     async def search(
         self,
@@ -142,7 +146,8 @@ class KnowledgeSearchService:
 
         # 1. クエリのエンベディング生成
         embed_start = time.time()
-        query_embedding = await self.embedding_client.embed_text(request.query)
+        embedding_client = self._embedding_client_for(organization_uuid)
+        query_embedding = await embedding_client.embed_text(request.query)
         embedding_time_ms = int((time.time() - embed_start) * 1000)
 
         # 2. Pineconeベクトル検索
@@ -436,6 +441,17 @@ class KnowledgeSearchService:
 
         return chunk_results
 
+    def _embedding_client_for(self, organization_uuid: str) -> EmbeddingClient:
+        """組織の永続キャッシュ（embedding_cache テーブル）を付けたクライアント"""
+        if not self._attach_embedding_store:
+            return self.embedding_client
+        try:
+            store = DatabaseEmbeddingStore(get_db_pool(), organization_uuid)
+        except Exception as e:
+            logger.warning(f"Embedding store unavailable: {type(e).__name__}")
+            return self.embedding_client
+        return self.embedding_client.with_persistent_store(store)
+
     async def _resolve_organization_uuid(self, organization_id: str) -> Optional[str]:
         """
         organization_id (テキスト識別子) から UUID を解決
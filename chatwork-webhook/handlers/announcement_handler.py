@@ -172,6 +172,9 @@ class AnnouncementHandler:
             get_secret: Secret Managerから秘密情報を取得する関数
             call_chatwork_api_with_retry: ChatWork APIリトライ付き呼び出し関数
             get_room_members: ルームメンバー取得関数
+                （タスク対象者の決定に使うため、キャッシュを読まない取得関数を渡すこと。
+                v11.3.0: utils.chatwork_utils.get_room_members は毎回APIを呼ぶ。
+                get_room_members_cached は渡さない）
             get_all_rooms: 全ルーム一覧取得関数
             create_chatwork_task: タスク作成関数（TaskHandler経由）
             send_chatwork_message: メッセージ送信関数
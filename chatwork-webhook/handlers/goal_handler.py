@@ -25,6 +25,15 @@ except ImportError:
     def log_persona_path(*args, **kwargs):
         pass
 
+try:
+    from lib.brain.context_cache import SECTION_GOALS, invalidate_context_cache
+except ImportError:
+    SECTION_GOALS = "goals"
+
+    # フォールバック用ダミー関数
+    def invalidate_context_cache(*args, **kwargs):
+        pass
+
 
 class GoalHandler:
     """
@@ -338,6 +347,7 @@ class GoalHandler:
                     "period_end": period_end,
                 })
                 conn.commit()
+                invalidate_context_cache(org_id, [SECTION_GOALS], user_id=account_id)
 
                 print(f"✅ 目標登録完了: goal_id={goal_id}, title={goal_title}, user_id={user_id}")
 
@@ -526,6 +536,7 @@ class GoalHandler:
                     )
 
                 conn.commit()
+                invalidate_context_cache(org_id, [SECTION_GOALS], user_id=account_id)
 
                 print(f"✅ 進捗記録完了: goal_id={goal_id}, value={progress_value}, cumulative={cumulative_value}")
 
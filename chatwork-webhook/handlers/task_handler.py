@@ -17,6 +17,15 @@ from typing import Optional, Dict, Any, List, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    from lib.brain.context_cache import SECTION_TASKS, invalidate_context_cache
+except ImportError:
+    SECTION_TASKS = "tasks"
+
+    # フォールバック用ダミー関数
+    def invalidate_context_cache(*args, **kwargs):
+        pass
+
 
 class TaskHandler:
     """
@@ -294,6 +303,7 @@ class TaskHandler:
                     """),
                     {"task_id": task_id, "status": status, "org_id": self.organization_id}
                 )
+            invalidate_context_cache(self.organization_id, [SECTION_TASKS])
             print(f"✅ タスクステータス更新: task_id={task_id}, status={status}")
             return True
         except Exception as e:
@@ -363,6 +373,9 @@ class TaskHandler:
                         "org_id": self.organization_id
                     }
                 )
+            invalidate_context_cache(
+                self.organization_id, [SECTION_TASKS], user_id=assigned_to_account_id,
+            )
 
             summary_preview = summary[:30] + "..." if summary and len(summary) > 30 else summary
             print(f"✅ タスクをDBに保存: task_id={task_id}, department_id={department_id}, summary={summary_preview}")
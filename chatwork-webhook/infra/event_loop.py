@@ -0,0 +1,179 @@
+"""infra/event_loop.py - Brain処理用の常駐イベントループ
+
+Phase 11-1e: リクエストごとの asyncio.new_event_loop() を廃止。
+
+Before: Webhookごとに new_event_loop() → run_until_complete() → close()
+  → LLMBrainの共有httpxクライアント、async DBエンジン、ループ依存キャッシュが
+    毎回捨てられ、OpenRouter/Cloud SQLへのTLSハンドシェイクが毎回発生
+After: 専用スレッドで1つのイベントループを常駐させ、Flaskの各スレッドから
+  run_coroutine_threadsafe() でコルーチンを投入する
+  → BrainIntegration/SoulkunBrain はこのループ上で生き続け、接続を再利用する
+
+注意:
+- ループ上のコルーチン内で同期ブロッキング処理を直接実行すると、
+  同時に処理中の他のメッセージも待たされる。DBアクセス等は asyncio.to_thread() を使うこと。
+- シャットダウン時は登録済みフックを実行してからループを停止する（atexit）。
+- gunicorn の全スレッド（--threads 8）が1つのループを共有するため、ループの
+  デフォルト executor（asyncio.to_thread の実行先）は明示的にサイズ指定する。
+  未指定だと min(32, CPU数 + 4) = 5（1 vCPU）で、to_thread 待ちが詰まる。
+
+提供する関数:
+- run_async(): コルーチンを常駐ループで実行し、結果を同期的に返す
+- add_shutdown_hook(): 終了時に実行する async 関数を登録
+- shutdown_event_loop(): 常駐ループを停止（テスト・終了処理用）
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# シャットダウンフックのタイムアウト（秒）
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+# gunicorn のスレッド数（Dockerfile: --threads 8）。executor はこれ以上にする
+GUNICORN_THREADS = 8
+
+# Flask スレッドから1メッセージの処理を待つ上限（秒）。
+# gunicorn / Cloud Run の --timeout 540 より短くし、超過時にエラー返信できる余裕を残す
+BRAIN_PROCESS_TIMEOUT_SECONDS = 480.0
+
+
+def default_executor_workers() -> int:
+    """常駐ループのデフォルト executor のスレッド数"""
+    return max(GUNICORN_THREADS, min(32, (os.cpu_count() or 1) + 4))
+
+
+class BackgroundEventLoop:
+    """専用スレッドで動作する常駐イベントループ"""
+
+    def __init__(self, name: str = "brain-event-loop", executor_workers: Optional[int] = None):
+        self._name = name
+        self._executor_workers = executor_workers or default_executor_workers()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """ループを起動（起動済みなら既存ループを返す）"""
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            # loop.close() で shutdown される
+            loop.set_default_executor(ThreadPoolExecutor(
+                max_workers=self._executor_workers,
+                thread_name_prefix=f"{self._name}-worker",
+            ))
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self._name, daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            logger.info(
+                "Background event loop started: %s (executor workers=%d)",
+                self._name, self._executor_workers,
+            )
+            return loop
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        コルーチンを常駐ループで実行し、完了まで待つ
+
+        Args:
+            coro: 実行するコルーチン
+            timeout: タイムアウト（秒）。超過時はコルーチンをキャンセルして TimeoutError
+
+        Returns:
+            コルーチンの戻り値
+        """
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run() cannot be called from the event loop thread")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)  # type: ignore[arg-type]
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[Any]]) -> None:
+        """終了時にループ上で実行する async 関数を登録"""
+        with self._lock:
+            self._shutdown_hooks.append(hook)
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """シャットダウンフックを実行してループを停止"""
+        with self._lock:
+            loop = self._loop
+            thread = self._thread
+            hooks = list(self._shutdown_hooks)
+            self._shutdown_hooks.clear()
+            self._loop = None
+            self._thread = None
+
+        if loop is None or loop.is_closed():
+            return
+
+        async def _run_hooks():
+            for hook in hooks:
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.warning("Shutdown hook failed: %s", type(e).__name__)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_run_hooks(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning("Shutdown hooks did not complete: %s", type(e).__name__)
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        if not loop.is_running():
+            loop.close()
+        logger.info("Background event loop stopped: %s", self._name)
+
+
+_background_loop = BackgroundEventLoop()
+atexit.register(_background_loop.shutdown)
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """常駐イベントループを取得"""
+    return _background_loop
+
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """コルーチンを常駐ループで実行し、結果を同期的に返す（Flaskスレッドから呼ぶ）"""
+    return _background_loop.run(coro, timeout=timeout)
+
+
+def add_shutdown_hook(hook: Callable[[], Awaitable[Any]]) -> None:
+    """終了時に常駐ループ上で実行する async 関数を登録"""
+    _background_loop.add_shutdown_hook(hook)
+
+
+def shutdown_event_loop(timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+    """常駐ループを停止"""
+    _background_loop.shutdown(timeout=timeout)
@@ -114,6 +114,12 @@ _LAZY_IMPORTS = {
     "SearchResult": ("lib.pinecone_client", "SearchResult"),
     "SearchResponse": ("lib.pinecone_client", "SearchResponse"),
 
+    # v11.3.0: ベクターストア（Pinecone / ローカルNumPy）
+    "VectorStore": ("lib.vector_store", "VectorStore"),
+    "create_vector_store": ("lib.vector_store", "create_vector_store"),
+    "get_vector_store": ("lib.vector_store", "get_vector_store"),
+    "LocalVectorStore": ("lib.local_vector_store", "LocalVectorStore"),
+
     # Phase 3: エンベディング（google-genaiに依存）
     "EmbeddingClient": ("lib.embedding", "EmbeddingClient"),
     "EmbeddingResult": ("lib.embedding", "EmbeddingResult"),
@@ -332,6 +338,11 @@ __all__ = [
     "PineconeClient",
     "SearchResult",
     "SearchResponse",
+    # v11.3.0: Vector store (lazy)
+    "VectorStore",
+    "create_vector_store",
+    "get_vector_store",
+    "LocalVectorStore",
     # Phase 3: Embedding (lazy)
     "EmbeddingClient",
     "EmbeddingResult",
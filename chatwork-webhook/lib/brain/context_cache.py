@@ -0,0 +1,395 @@
+# lib/brain/context_cache.py
+"""
+ContextBuilder用のリクエスト横断キャッシュ
+
+【目的】
+同じユーザーが短時間に連続でメッセージを送った場合に、
+ContextBuilder._fetch_all_db_data() の9クエリを毎回実行しないようにする。
+db-f1-micro ではこのDB取得が返信レイテンシの大半を占め、pool枯渇の主因でもある。
+
+【設計】
+- キー: (organization_id, room_id, user_id)
+  ただしCEO教えは (organization_id, 検索キーワード) 単位（ユーザー・ルームに依存しないため）
+- セクション単位（tasks, goals, preferences 等）でTTLを持つ
+- 書き込み経路（タスク作成、目標更新、嗜好保存、CEO教え登録等）から
+  invalidate_context_cache() を呼び、該当セクションだけを破棄する
+- 次のターンでは欠けたセクションだけを再取得する
+
+【キャッシュしないもの】
+- セッション状態（pending操作の正確性が最優先）
+- 直近の会話履歴（毎ターン変わる）
+- Phase 2E学習（メッセージ内容に依存）
+- 感情コンテキスト（メッセージ内容に依存）
+
+CEO教えはメッセージ本文から取り出したキーワードで検索するため、
+呼び出し側が正規化したキーワード（variant）をキーに含める。
+メッセージ本文そのものはキーにしない。
+ユーザー単位のエントリを押し出さないよう、組織単位のエントリは別のLRUで持つ。
+
+【整合性】
+invalidate() と並行して取得中だった古いデータが後から put() されないよう、
+組織ごとの世代番号を持つ。lookup() 時点の世代と put() 時点の世代が異なれば保存しない。
+
+Created: 2026-10-16
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from lib.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# 定数
+# =============================================================================
+
+SECTION_SUMMARY = "summary"
+SECTION_PREFERENCES = "preferences"
+SECTION_PERSONS = "persons"
+SECTION_TASKS = "tasks"
+SECTION_GOALS = "goals"
+SECTION_USER_INFO = "user_info"
+SECTION_OUTCOME_PATTERNS = "outcome_patterns"
+SECTION_CEO_TEACHINGS = "ceo_teachings"
+
+# セクション別TTL（秒）
+# タスクは別プロセス（sync-chatwork-tasks）からも更新されるため短めにする
+SECTION_TTL_SECONDS: Dict[str, float] = {
+    SECTION_SUMMARY: 300,
+    SECTION_PREFERENCES: 600,
+    SECTION_PERSONS: 600,
+    SECTION_TASKS: 120,
+    SECTION_GOALS: 300,
+    SECTION_USER_INFO: 1800,
+    SECTION_OUTCOME_PATTERNS: 600,
+    SECTION_CEO_TEACHINGS: 600,
+}
+
+# キャッシュ可能なセクション一覧
+CACHEABLE_SECTIONS: Set[str] = set(SECTION_TTL_SECONDS.keys())
+
+# 組織単位のセクション（(organization_id, variant) をキーにする）
+ORG_SCOPED_SECTIONS: Set[str] = {SECTION_CEO_TEACHINGS}
+
+# 最大エントリ数（(org, room, user) の組み合わせ数）
+CONTEXT_CACHE_MAX_ENTRIES: int = 500
+
+# 組織単位セクションの最大エントリ数（(org, section, variant) の組み合わせ数）
+ORG_SCOPED_CACHE_MAX_ENTRIES: int = 200
+
+
+# =============================================================================
+# データクラス
+# =============================================================================
+
+CacheKey = Tuple[str, str, str]
+OrgScopedKey = Tuple[str, str, str]  # (organization_id, section, variant)
+
+
+@dataclass
+class CachedSection:
+    """キャッシュされた1セクション"""
+    value: Any
+    fetched_at: float
+
+
+@dataclass
+class ContextCacheStats:
+    """キャッシュ統計"""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    stale_puts: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+            "evictions": self.evictions,
+        }
+
+
+# =============================================================================
+# ContextCache クラス
+# =============================================================================
+
+class ContextCache:
+    """
+    (organization_id, room_id, user_id) 単位のセクションキャッシュ
+
+    スレッドセーフ（ContextBuilderはasyncio.to_thread内からもアクセスする）。
+
+    【使用例】
+    cache = get_context_cache()
+    hits, generation = cache.lookup(org_id, room_id, user_id, sections)
+    ...  # 欠けたセクションだけDBから取得
+    cache.put(org_id, room_id, user_id, fetched, generation)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        max_entries: int = CONTEXT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        org_scoped_max_entries: int = ORG_SCOPED_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Args:
+            ttl_seconds: セクション別TTLの上書き
+            max_entries: 最大エントリ数（超えたらLRUで破棄）
+            clock: 時刻関数（テスト用）
+            org_scoped_max_entries: 組織単位セクションの最大エントリ数
+        """
+        self._ttl: Dict[str, float] = dict(SECTION_TTL_SECONDS)
+        if ttl_seconds:
+            self._ttl.update(ttl_seconds)
+        self._clock = clock
+        self._entries: LRUCache[CacheKey, Dict[str, CachedSection]] = LRUCache(max_entries)
+        self._org_entries: LRUCache[OrgScopedKey, CachedSection] = LRUCache(org_scoped_max_entries)
+        self._generations: Dict[str, int] = {}
+        self._stats = ContextCacheStats()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(organization_id: Any, room_id: Any, user_id: Any) -> CacheKey:
+        return (str(organization_id), str(room_id), str(user_id))
+
+    def is_cacheable(self, section: str) -> bool:
+        """キャッシュ対象のセクションか"""
+        return section in self._ttl
+
+    def generation(self, organization_id: Any) -> int:
+        """組織の現在の世代番号"""
+        with self._lock:
+            return self._generations.get(str(organization_id), 0)
+
+    def lookup(
+        self,
+        organization_id: Any,
+        room_id: Any,
+        user_id: Any,
+        sections: Iterable[str],
+        variants: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        有効なセクションを取得する
+
+        Args:
+            organization_id: 組織ID
+            room_id: ルームID
+            user_id: ユーザーID（ChatWorkアカウントID）
+            sections: 取得したいセクション名
+            variants: 組織単位セクションのvariant（CEO教えの正規化済みキーワード等）
+
+        Returns:
+            (ヒットしたセクション → 値, lookup時点の世代番号)
+        """
+        key = self._key(organization_id, room_id, user_id)
+        variants = variants or {}
+        now = self._clock()
+        hits: Dict[str, Any] = {}
+
+        with self._lock:
+            generation = self._generations.get(key[0], 0)
+            entry = self._entries.get(key)
+
+            for section in sections:
+                if section not in self._ttl:
+                    continue
+                if section in ORG_SCOPED_SECTIONS:
+                    org_key = (key[0], section, variants.get(section, ""))
+                    cached = self._org_entries.get(org_key)
+                else:
+                    cached = entry.get(section) if entry else None
+                if cached is None:
+                    self._stats.misses += 1
+                    continue
+                if now - cached.fetched_at > self._ttl[section]:
+                    if section in ORG_SCOPED_SECTIONS:
+                        self._org_entries.pop(org_key)
+                    else:
+                        del entry[section]  # type: ignore[union-attr]
+                    self._stats.misses += 1
+                    continue
+                # リストは呼び出し側で追記されてもキャッシュが汚れないようコピーする
+                value = cached.value
+                hits[section] = list(value) if isinstance(value, list) else value
+                self._stats.hits += 1
+
+        return hits, generation
+
+    def put(
+        self,
+        organization_id: Any,
+        room_id: Any,
+        user_id: Any,
+        values: Dict[str, Any],
+        generation: int,
+        variants: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        取得したセクションを保存する
+
+        lookup() 以降にinvalidateが走っていた場合は、取得データが古い可能性が
+        あるため保存しない。
+
+        Returns:
+            保存した場合True
+        """
+        key = self._key(organization_id, room_id, user_id)
+        variants = variants or {}
+        now = self._clock()
+
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                self._stats.stale_puts += 1
+                return False
+
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {}
+
+            for section, value in values.items():
+                if section not in self._ttl:
+                    continue
+                cached = CachedSection(value=value, fetched_at=now)
+                if section in ORG_SCOPED_SECTIONS:
+                    org_key = (key[0], section, variants.get(section, ""))
+                    self._stats.evictions += self._org_entries.put(org_key, cached)
+                else:
+                    entry[section] = cached
+
+            if entry:
+                self._stats.evictions += self._entries.put(key, entry)
+
+        return True
+
+    def invalidate(
+        self,
+        organization_id: Any,
+        sections: Optional[Iterable[str]] = None,
+        user_id: Optional[Any] = None,
+        room_id: Optional[Any] = None,
+    ) -> int:
+        """
+        キャッシュを破棄する
+
+        Args:
+            organization_id: 組織ID
+            sections: 破棄するセクション（Noneなら全セクション）
+            user_id: 対象ユーザー（Noneなら組織内の全ユーザー）
+            room_id: 対象ルーム（Noneなら全ルーム）
+
+        Returns:
+            破棄したセクション数
+        """
+        org = str(organization_id)
+        target_sections = set(sections) if sections is not None else None
+        user = str(user_id) if user_id is not None else None
+        room = str(room_id) if room_id is not None else None
+        removed = 0
+
+        with self._lock:
+            self._generations[org] = self._generations.get(org, 0) + 1
+            self._stats.invalidations += 1
+
+            for key, entry in self._entries.items():
+                if key[0] != org:
+                    continue
+                if room is not None and key[1] != room:
+                    continue
+                if user is not None and key[2] != user:
+                    continue
+                if target_sections is None:
+                    removed += len(entry)
+                    self._entries.pop(key)
+                    continue
+                for section in target_sections:
+                    if entry.pop(section, None) is not None:
+                        removed += 1
+                if not entry:
+                    self._entries.pop(key)
+
+            # 組織単位のセクションはユーザー・ルームの指定に関わらず破棄する
+            removed += self._org_entries.discard_where(
+                lambda k: k[0] == org and (target_sections is None or k[1] in target_sections)
+            )
+
+        return removed
+
+    def clear(self) -> None:
+        """全エントリを破棄する"""
+        with self._lock:
+            self._entries.clear()
+            self._org_entries.clear()
+            for org in list(self._generations.keys()):
+                self._generations[org] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            stats = self._stats.to_dict()
+            stats["entries"] = len(self._entries)
+            stats["org_scoped_entries"] = len(self._org_entries)
+        return stats
+
+
+# =============================================================================
+# グローバルインスタンス
+# =============================================================================
+
+_context_cache: Optional[ContextCache] = None
+
+
+def get_context_cache() -> ContextCache:
+    """
+    ContextCacheインスタンスを取得（シングルトン）
+
+    Returns:
+        ContextCache
+    """
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ContextCache()
+    return _context_cache
+
+
+def invalidate_context_cache(
+    organization_id: Any,
+    sections: Optional[Iterable[str]] = None,
+    user_id: Optional[Any] = None,
+) -> None:
+    """
+    書き込み経路から呼ぶキャッシュ破棄フック（便利関数）
+
+    書き込み処理を失敗させないよう、例外は握りつぶしてログのみ出す。
+
+    Args:
+        organization_id: 組織ID
+        sections: 破棄するセクション（Noneなら全セクション）
+        user_id: ChatWorkアカウントID（不明ならNone = 組織全体）
+    """
+    if not organization_id:
+        return
+    if sections is not None:
+        sections = list(sections)
+    try:
+        removed = get_context_cache().invalidate(
+            organization_id, sections=sections, user_id=user_id,
+        )
+        logger.debug(
+            "[ContextCache] invalidated: sections=%s, removed=%d",
+            sections if sections is not None else "all", removed,
+        )
+    except Exception as e:
+        logger.warning("[ContextCache] invalidate failed: %s", type(e).__name__)
@@ -7,8 +7,10 @@ _process_with_llm_brain（LLM Brain処理フロー）、
 _synthesize_knowledge_answer（ナレッジ回答合成）を含む。
 """
 
+import asyncio
 import logging
 import time
+import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -29,6 +31,8 @@ from lib.brain.exceptions import BrainError
 
 from lib.feature_flags import is_llm_brain_enabled
 
+from lib.brain.monitoring import get_monitor
+
 # Langfuseトレーシング
 from lib.brain.langfuse_integration import (
     observe,
@@ -520,6 +524,7 @@ class MessageProcessingMixin:
         Returns:
             BrainResponse: 処理結果
         """
+        stage_timings: Dict[str, float] = {}
         try:
             # Null安全チェック
             if self.llm_context_builder is None:
@@ -548,6 +553,7 @@ class MessageProcessingMixin:
                 "start_time": start_time,
                 "organization_id": self.org_id,
                 "context": context,
+                "stage_timings_ms": stage_timings,
             }
 
             # グラフを実行
@@ -557,6 +563,10 @@ class MessageProcessingMixin:
 
             # グラフが生成したレスポンスを返す
             response = final_state.get("response")
+            self._record_llm_brain_metrics(
+                final_state, start_time, stage_timings,
+                success=response.success if response is not None else True,
+            )
             if response is not None:
                 return response
 
@@ -571,6 +581,10 @@ class MessageProcessingMixin:
 
         except Exception as e:
             logger.exception(f"LLM Brain error: {type(e).__name__}")
+            self._record_llm_brain_metrics(
+                {}, start_time, stage_timings,
+                success=False, error_type=type(e).__name__,
+            )
 
             logger.warning("🧠 LLM Brain failed, no fallback available in this version")
             return BrainResponse(
@@ -581,6 +595,45 @@ class MessageProcessingMixin:
                 total_time_ms=self._elapsed_ms(start_time),
             )
 
+    def _record_llm_brain_metrics(
+        self,
+        final_state: Dict[str, Any],
+        start_time: float,
+        stage_timings: Dict[str, float],
+        success: bool,
+        error_type: Optional[str] = None,
+    ) -> None:
+        """
+        LLMBrainMonitor にレイテンシ・段階別時間・トークン数を記録（v11.3.0）
+
+        確定した分バケットがあれば brain_latency_minutes への保存をバックグラウンドで行う。
+        計測の失敗で応答を止めない。
+        """
+        try:
+            llm_result = final_state.get("llm_result")
+            tool_calls = getattr(llm_result, "tool_calls", None) or []
+            get_monitor().complete_request(
+                request_id=uuid.uuid4().hex[:8],
+                success=success,
+                output_type=getattr(llm_result, "output_type", None) or "error",
+                confidence=final_state.get("confidence_value", 0.0),
+                tool_name=tool_calls[0].tool_name if tool_calls else None,
+                guardian_action=final_state.get("guardian_action") or "allow",
+                api_provider=getattr(llm_result, "api_provider", None) or "openrouter",
+                input_tokens=getattr(llm_result, "input_tokens", 0) or 0,
+                output_tokens=getattr(llm_result, "output_tokens", 0) or 0,
+                error_type=error_type,
+                response_time_ms=self._elapsed_ms(start_time),
+                stage_timings_ms=stage_timings,
+                organization_id=self.org_id,
+            )
+
+            writer = getattr(self, "_latency_writer", None)
+            if writer is not None and writer.is_due():
+                self._fire_and_forget(asyncio.to_thread(writer.write))
+        except Exception as e:
+            logger.warning("Failed to record brain metrics: %s", type(e).__name__)
+
     async def _synthesize_knowledge_answer(
         self,
         search_data: Dict[str, Any],
@@ -17,8 +17,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from lib.brain.core import SoulkunBrain
 
-from lib.brain.graph.state import BrainGraphState
+from lib.brain.graph.state import BrainGraphState, record_stage_timing
 from lib.brain.models import ConversationMessage
+from lib.brain.monitoring import STAGE_TOOL
 from lib.brain.tool_executor import ToolExecutor
 
 logger = logging.getLogger(__name__)
@@ -83,6 +84,7 @@ def make_execute_tool(brain: "SoulkunBrain"):
             )
             result = outcome.result
             decision = outcome.decision  # state["decision"] 用（responses.py でログ記録に使用）
+            record_stage_timing(state, STAGE_TOOL, t0)
             logger.debug(
                 "[graph:execute_tool] DONE t=%.3fs (took %.3fs)",
                 time.time() - start_time, time.time() - t0,
@@ -25,7 +25,8 @@ if TYPE_CHECKING:
 
 from lib.brain.approval_gate import get_approval_gate, ApprovalLevel
 from lib.brain.guardian_layer import GuardianAction, GuardianResult
-from lib.brain.graph.state import BrainGraphState
+from lib.brain.graph.state import BrainGraphState, record_stage_timing
+from lib.brain.monitoring import STAGE_GUARDIAN
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,7 @@ def make_guardian_check(brain: "SoulkunBrain"):
 
             t0 = time.time()
             guardian_result = await brain.llm_guardian.check(llm_result, llm_context)
+            record_stage_timing(state, STAGE_GUARDIAN, t0)
             logger.debug(
                 "[graph:guardian_check] DONE t=%.3fs (took %.3fs)",
                 time.time() - start_time, time.time() - t0,
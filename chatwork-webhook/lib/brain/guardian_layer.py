@@ -28,19 +28,21 @@ Author: Claude Opus 4.5
 Created: 2026-01-30
 """
 
+import asyncio
 import re
 import logging
-import time
-from collections import defaultdict, deque
 from enum import Enum
 from dataclasses import dataclass, field
-from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any, Deque, Tuple
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Deque, Tuple
 from zoneinfo import ZoneInfo
 
 from lib.brain.llm_brain import LLMBrainResult, ToolCall, ConfidenceScores
 from lib.brain.context_builder import LLMContext, CEOTeaching
 
+if TYPE_CHECKING:
+    from lib.brain.operations.rate_limiter import OperationRateLimiter
+
 logger = logging.getLogger(__name__)
 
 JST = ZoneInfo("Asia/Tokyo")
@@ -207,11 +209,13 @@ class GuardianLayer:
         self,
         ceo_teachings: Optional[List[CEOTeaching]] = None,
         custom_ng_patterns: Optional[List[str]] = None,
+        rate_limiter: Optional["OperationRateLimiter"] = None,
     ):
         """
         Args:
             ceo_teachings: CEO教えのリスト
             custom_ng_patterns: カスタムNGパターンのリスト
+            rate_limiter: 操作系レートリミッター（省略時はインメモリ）
         """
         self.ceo_teachings = ceo_teachings or []
         self.ng_patterns = SECURITY_NG_PATTERNS + (custom_ng_patterns or [])
@@ -219,16 +223,26 @@ class GuardianLayer:
         # Phase 2E: 学習済みルール（LearningLoopから注入）
         self._learned_rules: List[Dict[str, str]] = []
 
-        # Step C-4: 操作系レートリミッター（インメモリ、インスタンス単位）
-        # key: account_id, value: 呼び出しタイムスタンプのdeque
-        self._op_call_timestamps: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=100))
-        # key: (account_id, date_str), value: {"read": count, "write": count}
-        self._op_daily_counts: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(
-            lambda: {"read": 0, "write": 0}
-        )
+        # Step C-4: 操作系レートリミッター
+        # v11.3.0: 上限回数分のリングバッファ＋期限切れの自動破棄。
+        # 共有バックエンド指定時はCloud Runインスタンス間で制限を共有する
+        if rate_limiter is None:
+            from lib.brain.operations.rate_limiter import create_operation_rate_limiter
+            rate_limiter = create_operation_rate_limiter()
+        self._rate_limiter = rate_limiter
 
         logger.info(f"GuardianLayer initialized with {len(self.ceo_teachings)} CEO teachings")
 
+    @property
+    def _op_call_timestamps(self) -> Dict[str, Deque[float]]:
+        """インメモリ側の呼び出し時刻（key: account_id, value: リングバッファ）"""
+        return self._rate_limiter.local.calls
+
+    @property
+    def _op_daily_counts(self) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """インメモリ側の日次カウンタ（key: (account_id, date_str), value: {"read"/"write": count}）"""
+        return self._rate_limiter.local.daily_counts
+
     def set_learned_rules(self, rules: List[Dict[str, str]]) -> None:
         """LearningLoopから学習済みルールを注入"""
         self._learned_rules = rules
@@ -303,7 +317,11 @@ class GuardianLayer:
                     return consistency_check
 
                 # 優先度8: 操作系チェック（Step C-4）
-                op_check = self._check_operation_safety(tool_call, context)
+                # v11.3.0: 共有レートリミッターはDBを叩くため、ループをブロックしないようスレッドで実行
+                if self._rate_limiter.is_shared:
+                    op_check = await asyncio.to_thread(self._check_operation_safety, tool_call, context)
+                else:
+                    op_check = self._check_operation_safety(tool_call, context)
                 if op_check.action != GuardianAction.ALLOW:
                     return op_check
 
@@ -311,6 +329,53 @@ class GuardianLayer:
         logger.info("Guardian check passed: ALLOW")
         return GuardianResult(action=GuardianAction.ALLOW)
 
+    def precheck_tool_call(
+        self,
+        tool_call: ToolCall,
+        context: LLMContext,
+    ) -> GuardianResult:
+        """
+        Tool呼び出し単体で判定できるチェックを先行実行する（v11.3.0: ストリーミング用）
+
+        ストリーミング中にTool呼び出しの引数が揃った時点で呼び、BLOCKなら
+        残りの生成を待たずに打ち切るために使う。確信度・憲法違反など応答全体が
+        必要な判定と、クォータを消費する操作系チェックは含めない。
+        最終判定は従来どおり check() で行う。
+        """
+        for result in (
+            self._check_dangerous_operation(tool_call),
+            self._check_api_limitation(tool_call),
+            self._check_ceo_teachings(tool_call, context),
+            self._check_parameters(tool_call),
+            self._check_consistency(tool_call),
+        ):
+            if result.action != GuardianAction.ALLOW:
+                return result
+        return GuardianResult(action=GuardianAction.ALLOW)
+
+    def precheck_text(self, text: str) -> GuardianResult:
+        """
+        生成途中のテキストを憲法違反・NGパターンで先行チェックする（v11.3.0: ストリーミング用）
+
+        ストリーミング中、応答テキストをクライアントへ送る前に
+        生成済みテキスト全体（思考過程を含む）に対して呼ぶ。
+        BLOCKなら以降を送らずに打ち切る。最終判定は従来どおり check() で行う。
+        """
+        constitution_check = self._check_constitution_text(text)
+        if constitution_check.action != GuardianAction.ALLOW:
+            return constitution_check
+        return self._check_security_text(text)
+
+    @property
+    def stream_holdback_chars(self) -> int:
+        """
+        ストリーミング時に送信を保留する末尾の文字数
+
+        precheck_text() が見るパターンの最大長。パターンが差分の境界をまたいでも、
+        一致する前にその一部を送ってしまわないようにする。
+        """
+        return max(len(p) for p in self.ng_patterns + CONSTITUTION_VIOLATION_PATTERNS)
+
     def _check_constitution_violation(
         self,
         llm_result: LLMBrainResult,
@@ -336,6 +401,10 @@ class GuardianLayer:
 
         # 権限判定の試みをチェック
         combined_text = llm_result.reasoning + (llm_result.text_response or "")
+        return self._check_constitution_text(combined_text)
+
+    def _check_constitution_text(self, combined_text: str) -> GuardianResult:
+        """憲法違反キーワード（権限判定の試み）がテキストに含まれていないか"""
         for pattern in CONSTITUTION_VIOLATION_PATTERNS:
             if pattern in combined_text:
                 return GuardianResult(
@@ -358,8 +427,10 @@ class GuardianLayer:
         - 機密情報が応答に含まれていないか
         """
         text_to_check = (llm_result.text_response or "") + llm_result.reasoning
+        return self._check_security_text(text_to_check)
 
-        # NGパターンチェック
+    def _check_security_text(self, text_to_check: str) -> GuardianResult:
+        """NGパターン（機密情報漏洩）がテキストに含まれていないか"""
         for pattern in self.ng_patterns:
             if re.search(pattern, text_to_check):
                 return GuardianResult(
@@ -770,45 +841,35 @@ class GuardianLayer:
 
     def _check_operation_rate_limit(self, tool_name: str, account_id: str) -> GuardianResult:
         """8-4: 連続実行チェック（>5回/分 or >3回/10秒でブロック）"""
-        from lib.brain.operations.registry import (
-            OPERATION_RATE_LIMIT_PER_MINUTE,
-            OPERATION_BURST_LIMIT_PER_10SEC,
-        )
-
-        now = time.time()
-        timestamps = self._op_call_timestamps[account_id]
+        decision = self._rate_limiter.hit(account_id)
+        if decision.allowed:
+            return GuardianResult(action=GuardianAction.ALLOW)
 
-        # バースト検出（10秒以内のコール数）
-        recent_10s = sum(1 for t in timestamps if now - t < 10)
-        if recent_10s >= OPERATION_BURST_LIMIT_PER_10SEC:
+        window = decision.window
+        if window is not None and window.window_seconds <= 10:
+            # バースト検出（10秒以内のコール数）
             logger.warning(
                 "Guardian: operation burst limit hit: %s (%d/10s)",
-                account_id, recent_10s,
+                account_id, decision.count,
             )
             return GuardianResult(
                 action=GuardianAction.BLOCK,
-                blocked_reason=f"操作の連続実行が多すぎます（10秒以内に{recent_10s}回）。少し待ってからお試しください。",
+                blocked_reason=f"操作の連続実行が多すぎます（10秒以内に{decision.count}回）。少し待ってからお試しください。",
                 priority_level=8,
                 risk_level="high",
             )
 
         # 分間レート制限
-        recent_1m = sum(1 for t in timestamps if now - t < 60)
-        if recent_1m >= OPERATION_RATE_LIMIT_PER_MINUTE:
-            logger.warning(
-                "Guardian: operation rate limit hit: %s (%d/min)",
-                account_id, recent_1m,
-            )
-            return GuardianResult(
-                action=GuardianAction.BLOCK,
-                blocked_reason=f"操作の実行回数制限を超えました（1分以内に{recent_1m}回）。少し待ってからお試しください。",
-                priority_level=8,
-                risk_level="high",
-            )
-
-        # タイムスタンプを記録
-        timestamps.append(now)
-        return GuardianResult(action=GuardianAction.ALLOW)
+        logger.warning(
+            "Guardian: operation rate limit hit: %s (%d/min)",
+            account_id, decision.count,
+        )
+        return GuardianResult(
+            action=GuardianAction.BLOCK,
+            blocked_reason=f"操作の実行回数制限を超えました（1分以内に{decision.count}回）。少し待ってからお試しください。",
+            priority_level=8,
+            risk_level="high",
+        )
 
     def _check_operation_daily_quota(self, tool_name: str, account_id: str) -> GuardianResult:
         """8-5: 日次クォータチェック（読み取り50回/日、書き込み20回/日）"""
@@ -818,10 +879,6 @@ class GuardianLayer:
         )
         from lib.brain.constants import RISK_LEVELS
 
-        today_str = date.today().isoformat()
-        key = (account_id, today_str)
-        counts = self._op_daily_counts[key]
-
         # risk_levelから読み取り/書き込みを判定
         risk = RISK_LEVELS.get(tool_name, "medium")
         if risk in ("medium", "high", "critical"):
@@ -831,10 +888,11 @@ class GuardianLayer:
             op_type = "read"
             quota = OPERATION_DAILY_QUOTA_READ
 
-        if counts[op_type] >= quota:
+        decision = self._rate_limiter.consume(account_id, op_type, quota)
+        if not decision.allowed:
             logger.warning(
                 "Guardian: daily quota exceeded: %s %s=%d/%d",
-                account_id, op_type, counts[op_type], quota,
+                account_id, op_type, decision.count, quota,
             )
             return GuardianResult(
                 action=GuardianAction.BLOCK,
@@ -843,7 +901,6 @@ class GuardianLayer:
                 risk_level="high",
             )
 
-        counts[op_type] += 1
         return GuardianResult(action=GuardianAction.ALLOW)
 
     def _generate_dangerous_confirmation(
@@ -896,14 +953,16 @@ class GuardianLayer:
 
 def create_guardian_layer(
     ceo_teachings: Optional[List[CEOTeaching]] = None,
+    rate_limiter: Optional["OperationRateLimiter"] = None,
 ) -> GuardianLayer:
     """
     GuardianLayerのファクトリ関数
 
     Args:
         ceo_teachings: CEO教えのリスト
+        rate_limiter: 操作系レートリミッター（省略時はインメモリ）
 
     Returns:
         GuardianLayerインスタンス
     """
-    return GuardianLayer(ceo_teachings=ceo_teachings)
+    return GuardianLayer(ceo_teachings=ceo_teachings, rate_limiter=rate_limiter)
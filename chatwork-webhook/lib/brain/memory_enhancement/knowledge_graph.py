@@ -11,9 +11,8 @@ Phase 2G: 記憶の強化（Memory Enhancement）- 知識グラフ
 import json
 import logging
 import re
-from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from sqlalchemy import text
@@ -204,6 +203,46 @@ class KnowledgeGraph:
             logger.error(f"Failed to find node by id: {type(e).__name__}")
             return None
 
+    def find_nodes_by_ids(
+        self,
+        conn: Connection,
+        node_ids: Iterable[str],
+    ) -> Dict[str, KnowledgeNode]:
+        """複数のノードを1クエリで取得（v11.3.0）
+
+        Args:
+            conn: DB接続
+            node_ids: ノードIDのリスト
+
+        Returns:
+            {ノードID: ノード}（見つからないIDは含まない）
+        """
+        ids = list(dict.fromkeys(node_ids))
+        if not ids:
+            return {}
+
+        query = text(f"""
+            SELECT
+                id, organization_id,
+                node_type, name, description, aliases,
+                properties, importance_score, activation_level,
+                source, evidence_count, created_at, updated_at
+            FROM {TABLE_BRAIN_KNOWLEDGE_NODES}
+            WHERE id = ANY(CAST(:node_ids AS uuid[]))
+              AND organization_id = CAST(:organization_id AS uuid)
+        """)
+
+        try:
+            result = conn.execute(query, {
+                "node_ids": ids,
+                "organization_id": self.organization_id,
+            })
+            nodes = [self._row_to_node(row) for row in result.fetchall()]
+            return {node.id: node for node in nodes}
+        except Exception as e:
+            logger.error(f"Failed to find nodes by ids: {type(e).__name__}")
+            return {}
+
     def find_node_by_name(
         self,
         conn: Connection,
@@ -557,9 +596,82 @@ class KnowledgeGraph:
             logger.error(f"Failed to find edges to node: {type(e).__name__}")
             return []
 
+    def find_edges_from_many(
+        self,
+        conn: Connection,
+        node_ids: Iterable[str],
+    ) -> Dict[str, List[KnowledgeEdge]]:
+        """複数ノードから出るエッジを1クエリで取得（v11.3.0）
+
+        BFSの1層分（フロンティア）をまとめて展開するために使う。
+
+        Args:
+            conn: DB接続
+            node_ids: ノードIDのリスト
+
+        Returns:
+            {ノードID: エッジリスト}（各リストは weight DESC, confidence DESC 順）
+        """
+        ids = list(dict.fromkeys(node_ids))
+        if not ids:
+            return {}
+
+        query = text(f"""
+            SELECT
+                id, organization_id,
+                source_node_id, target_node_id, relation_type,
+                weight, confidence, properties, is_bidirectional,
+                evidence_count, source, created_at, updated_at
+            FROM {TABLE_BRAIN_KNOWLEDGE_EDGES}
+            WHERE organization_id = CAST(:organization_id AS uuid)
+              AND (source_node_id = ANY(CAST(:node_ids AS uuid[]))
+                   OR (is_bidirectional AND target_node_id = ANY(CAST(:node_ids AS uuid[]))))
+            ORDER BY weight DESC, confidence DESC
+        """)
+
+        try:
+            result = conn.execute(query, {
+                "organization_id": self.organization_id,
+                "node_ids": ids,
+            })
+            edges = [self._row_to_edge(row) for row in result.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to find edges from nodes: {type(e).__name__}")
+            return {}
+
+        wanted = set(ids)
+        grouped: Dict[str, List[KnowledgeEdge]] = {}
+        for edge in edges:
+            if edge.source_node_id in wanted:
+                grouped.setdefault(edge.source_node_id, []).append(edge)
+            if (edge.is_bidirectional and edge.target_node_id in wanted
+                    and edge.target_node_id != edge.source_node_id):
+                grouped.setdefault(edge.target_node_id, []).append(edge)
+        return grouped
+
+    def _expand_frontier(
+        self,
+        conn: Connection,
+        frontier: List[str],
+    ) -> Dict[str, List[Tuple[str, KnowledgeEdge]]]:
+        """フロンティア全体を1回で展開する
+
+        Returns:
+            {ノードID: [(隣接ノードID, エッジ), ...]}
+        """
+        expanded: Dict[str, List[Tuple[str, KnowledgeEdge]]] = {}
+        for node_id, edges in self.find_edges_from_many(conn, frontier).items():
+            expanded[node_id] = [
+                (edge.source_node_id if edge.target_node_id == node_id else edge.target_node_id, edge)
+                for edge in edges
+            ]
+        return expanded
+
     # =========================================================================
     # グラフ探索
     # =========================================================================
+    # v11.3.0: ノードごとの find_edges_from / find_node_by_id を廃止し、
+    # BFSの1層につきエッジ取得1クエリ + ノード取得1クエリで展開する
 
     def find_related_nodes(
         self,
@@ -584,31 +696,31 @@ class KnowledgeGraph:
         results: List[Tuple[KnowledgeNode, KnowledgeEdge]] = []
         visited = {node_id}
 
-        # BFS
-        queue = deque([(node_id, 0)])
-        while queue and len(results) < limit:
-            current_id, current_depth = queue.popleft()
-            if current_depth >= depth:
-                continue
-
-            # 出るエッジを取得
-            edges = self.find_edges_from(conn, current_id)
-            for edge in edges:
-                target_id = edge.target_node_id
-                if target_id == current_id:
-                    target_id = edge.source_node_id  # 双方向の場合
-
-                if target_id in visited:
-                    continue
-
-                if relation_types and edge.relation_type not in relation_types:
-                    continue
-
-                visited.add(target_id)
-                target_node = self.find_node_by_id(conn, target_id)
+        frontier = [node_id]
+        for _ in range(depth):
+            if not frontier or len(results) >= limit:
+                break
+
+            expanded = self._expand_frontier(conn, frontier)
+            discovered: List[Tuple[str, KnowledgeEdge]] = []
+            for current_id in frontier:
+                for target_id, edge in expanded.get(current_id, []):
+                    if target_id in visited:
+                        continue
+                    if relation_types and edge.relation_type not in relation_types:
+                        continue
+                    visited.add(target_id)
+                    discovered.append((target_id, edge))
+
+            nodes = self.find_nodes_by_ids(conn, [target_id for target_id, _ in discovered])
+            frontier = []
+            for target_id, edge in discovered:
+                if len(results) >= limit:
+                    break
+                target_node = nodes.get(target_id)
                 if target_node:
                     results.append((target_node, edge))
-                    queue.append((target_id, current_depth + 1))
+                    frontier.append(target_id)
 
         return results
 
@@ -634,40 +746,52 @@ class KnowledgeGraph:
             node = self.find_node_by_id(conn, from_node_id)
             return [(node, None)] if node else None
 
-        # BFS
-        visited = {from_node_id}
-        initial_path: List[Tuple[str, Optional[KnowledgeEdge]]] = [(from_node_id, None)]
-        queue: deque[Tuple[str, List[Tuple[str, Optional[KnowledgeEdge]]]]] = deque([(from_node_id, initial_path)])
-
-        while queue:
-            current_id, path = queue.popleft()
-            if len(path) > max_depth:
-                continue
-
-            edges = self.find_edges_from(conn, current_id)
-            for edge in edges:
-                target_id = edge.target_node_id
-                if target_id == current_id:
-                    target_id = edge.source_node_id
-
-                if target_id == to_node_id:
-                    # パス発見
-                    result_path: List[Tuple[KnowledgeNode, Optional[KnowledgeEdge]]] = []
-                    for node_id, edge_in_path in path:
-                        node = self.find_node_by_id(conn, node_id)
-                        if node:
-                            result_path.append((node, edge_in_path))
-                    target_node = self.find_node_by_id(conn, target_id)
-                    if target_node:
-                        result_path.append((target_node, edge))
-                    return result_path
-
-                if target_id not in visited:
-                    visited.add(target_id)
-                    new_path = path + [(target_id, edge)]
-                    queue.append((target_id, new_path))
 
-        return None
+        # BFS（1層ずつ展開し、経路は親ポインタで保持）
+        parents: Dict[str, Tuple[Optional[str], Optional[KnowledgeEdge]]] = {
+            from_node_id: (None, None),
+        }
+        frontier = [from_node_id]
+        found = False
+
+        for _ in range(max_depth):
+            if not frontier:
+                break
+            expanded = self._expand_frontier(conn, frontier)
+            next_frontier: List[str] = []
+            for current_id in frontier:
+                for target_id, edge in expanded.get(current_id, []):
+                    if target_id in parents:
+                        continue
+                    parents[target_id] = (current_id, edge)
+                    if target_id == to_node_id:
+                        found = True
+                        break
+                    next_frontier.append(target_id)
+                if found:
+                    break
+            if found:
+                break
+            frontier = next_frontier
+
+        if not found:
+            return None
+
+        # パス上のノードを1クエリで取得
+        path_ids: List[Tuple[str, Optional[KnowledgeEdge]]] = []
+        current: Optional[str] = to_node_id
+        while current is not None:
+            parent_id, edge_in_path = parents[current]
+            path_ids.append((current, edge_in_path))
+            current = parent_id
+        path_ids.reverse()
+
+        nodes = self.find_nodes_by_ids(conn, [node_id for node_id, _ in path_ids])
+        return [
+            (nodes[node_id], edge_in_path)
+            for node_id, edge_in_path in path_ids
+            if node_id in nodes
+        ]
 
     def get_subgraph(
         self,
@@ -696,30 +820,33 @@ class KnowledgeGraph:
         visited_nodes = {center_node_id}
         visited_edges = set()
 
-        # BFS
-        queue = deque([(center_node_id, 0)])
-        while queue and len(nodes) < max_nodes:
-            current_id, current_depth = queue.popleft()
-            if current_depth >= depth:
-                continue
-
-            node_edges = self.find_edges_from(conn, current_id)
-            for edge in node_edges:
-                if edge.id in visited_edges:
-                    continue
-                visited_edges.add(edge.id)
-                edges.append(edge)
-
-                target_id = edge.target_node_id
-                if target_id == current_id:
-                    target_id = edge.source_node_id
-
-                if target_id not in visited_nodes:
-                    visited_nodes.add(target_id)
-                    target_node = self.find_node_by_id(conn, target_id)
-                    if target_node:
-                        nodes.append(target_node)
-                        queue.append((target_id, current_depth + 1))
+        frontier = [center_node_id]
+        for _ in range(depth):
+            if not frontier or len(nodes) >= max_nodes:
+                break
+
+            expanded = self._expand_frontier(conn, frontier)
+            discovered: List[str] = []
+            for current_id in frontier:
+                if len(nodes) + len(discovered) >= max_nodes:
+                    break
+                for target_id, edge in expanded.get(current_id, []):
+                    if edge.id in visited_edges:
+                        continue
+                    visited_edges.add(edge.id)
+                    edges.append(edge)
+
+                    if target_id not in visited_nodes:
+                        visited_nodes.add(target_id)
+                        discovered.append(target_id)
+
+            found = self.find_nodes_by_ids(conn, discovered)
+            frontier = []
+            for target_id in discovered:
+                target_node = found.get(target_id)
+                if target_node:
+                    nodes.append(target_node)
+                    frontier.append(target_id)
 
         return KnowledgeSubgraph(
             center_node=center_node,
@@ -28,6 +28,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
+from lib.brain.context_cache import SECTION_PREFERENCES, invalidate_context_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -446,6 +448,9 @@ class AutoMemoryFlusher:
                             },
                         )
                         conn.commit()
+                        invalidate_context_cache(
+                            self.org_id, [SECTION_PREFERENCES], user_id=user_id,
+                        )
 
                     elif item.category in ("fact", "decision", "commitment"):
                         # soulkun_knowledge テーブルに保存（Phase 4: org_idカラム対応）
@@ -19,6 +19,8 @@ import logging
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
+from lib.pii_redaction import PIIRedactor
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +38,9 @@ MASK_PATTERNS = [
     (re.compile(r'(?:給与|年収|月収|月額|時給)[：:\s]*\d+', re.IGNORECASE), "[SALARY]"),
 ]
 
+# v11.3.0: 全パターンを1本にまとめたエンジン（1パスで置換）
+_MASK_REDACTOR = PIIRedactor(MASK_PATTERNS)
+
 # カテゴリの日本語表示名
 CATEGORY_LABELS = {
     "fact": "事実",
@@ -130,16 +135,8 @@ def mask_pii(text: str) -> tuple[str, bool]:
     if not text:
         return text, False
 
-    masked = text
-    was_masked = False
-
-    for pattern, replacement in MASK_PATTERNS:
-        new_text = pattern.sub(replacement, masked)
-        if new_text != masked:
-            was_masked = True
-            masked = new_text
-
-    return masked, was_masked
+    result = _MASK_REDACTOR.redact(text)
+    return result.text, result.total > 0
 
 
 def get_category_label(category: str) -> str:
@@ -10,7 +10,7 @@
 """
 
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Tuple, Dict, Any
 from enum import Enum
@@ -30,6 +30,7 @@ from .constants import (
     DEFAULT_OUTPUT_TOKENS_ESTIMATE,
 )
 from .registry import ModelInfo
+from .spend_counters import SpendCounterCache, get_spend_counter_cache
 
 logger = logging.getLogger(__name__)
 
@@ -99,17 +100,24 @@ class CostManager:
     - 月次サマリー更新
     """
 
-    def __init__(self, pool: Engine, organization_id: str):
+    def __init__(
+        self,
+        pool: Engine,
+        organization_id: str,
+        spend_counters: Optional[SpendCounterCache] = None,
+    ):
         """
         初期化
 
         Args:
             pool: SQLAlchemyのエンジン（DB接続プール）
             organization_id: 組織ID
+            spend_counters: 日次/月次累計のキャッシュ（省略時はプロセス共通）
         """
         self._pool = pool
         self._organization_id = organization_id
         self._settings_cache: Optional[OrganizationSettings] = None
+        self._spend_counters = spend_counters or get_spend_counter_cache()
 
     # -------------------------------------------------------------------------
     # 設定取得
@@ -299,10 +307,9 @@ class CostManager:
         """
         settings = self.get_settings()
         daily_cost = self._get_daily_cost()
-        monthly_summary = self._get_monthly_summary()
 
         # USD→JPY換算して予算チェック（閾値設定はJPY単位）
-        monthly_cost_usd = monthly_summary.get("total_cost_usd", Decimal("0"))
+        monthly_cost_usd = self._get_monthly_cost_usd()
         monthly_cost = monthly_cost_usd * settings.usd_to_jpy_rate
         budget_remaining = settings.monthly_budget_jpy - monthly_cost
 
@@ -367,29 +374,17 @@ class CostManager:
     # -------------------------------------------------------------------------
 
     def _get_daily_cost_usd(self) -> Decimal:
-        """本日の累計コストをUSDで取得"""
-        today = date.today().isoformat()
-
-        query = text("""
-            SELECT COALESCE(SUM(cost_usd), 0)
-            FROM ai_usage_logs
-            WHERE organization_id = :org_id
-              AND DATE(created_at) = :today
-              AND is_error IS NOT TRUE
-        """)
+        """
+        本日（JST）の累計コストをUSDで取得
 
-        try:
-            with self._pool.connect() as conn:
-                result = conn.execute(query, {
-                    "org_id": self._organization_id,
-                    "today": today,
-                })
-                row = result.fetchone()
-                return Decimal(str(row[0])) if row else Decimal("0")
+        v11.3.0: ai_usage_logs の SUM ではなく、日次カウンタのキャッシュを参照する
+        （spend_counters.py）。DBを読むのはTTL切れ・突き合わせ時のみ。
+        """
+        return self._spend_counters.get(self._pool, self._organization_id).daily_cost_usd
 
-        except Exception as e:
-            logger.error(f"Failed to get daily cost: {type(e).__name__}")
-            return Decimal("0")
+    def _get_monthly_cost_usd(self) -> Decimal:
+        """当月（JST）の累計コストをUSDで取得（月次カウンタのキャッシュ）"""
+        return self._spend_counters.get(self._pool, self._organization_id).monthly_cost_usd
 
     def _get_daily_cost(self) -> Decimal:
         """本日の累計コストを円換算で取得（後方互換）"""
@@ -21,6 +21,7 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 from .constants import Tier
+from .spend_counters import SpendCounterCache, get_spend_counter_cache
 
 logger = logging.getLogger(__name__)
 
@@ -75,20 +76,29 @@ class UsageLogger:
     利用ログ記録
 
     - ai_usage_logsテーブルへの非同期記録
+    - ai_usage_rollups（ダッシュボード用の時間/日集計）の更新（ログとは別の文・ベストエフォート）
+    - ai_spend_counters（予算判定用の日次/月次累計）の更新（ログとは別の文・ベストエフォート）
     - 利用統計の取得
     - 重複検出
     """
 
-    def __init__(self, pool: Engine, organization_id: str):
+    def __init__(
+        self,
+        pool: Engine,
+        organization_id: str,
+        spend_counters: Optional[SpendCounterCache] = None,
+    ):
         """
         初期化
 
         Args:
             pool: SQLAlchemyのエンジン（DB接続プール）
             organization_id: 組織ID
+            spend_counters: 日次/月次累計のキャッシュ（省略時はプロセス共通）
         """
         self._pool = pool
         self._organization_id = organization_id
+        self._spend_counters = spend_counters or get_spend_counter_cache()
 
     # -------------------------------------------------------------------------
     # ログ記録
@@ -193,7 +203,7 @@ class UsageLogger:
                 :is_error,
                 :cost_usd
             )
-            RETURNING id
+            RETURNING id, created_at
         """)
 
         try:
@@ -219,9 +229,13 @@ class UsageLogger:
                     "is_error": not success,
                     "cost_usd": float(cost_usd) if cost_usd is not None else None,
                 })
+                row = result.fetchone()
                 conn.commit()
 
-                row = result.fetchone()
+                # 同一プロセスの次の予算判定に即時反映する
+                if success and cost_usd:
+                    self._spend_counters.record(self._organization_id, cost_usd)
+
                 log_id: Optional[UUID] = None
                 if row:
                     try:
@@ -230,6 +244,22 @@ class UsageLogger:
                         # Handle cases where row[0] is not a valid UUID string
                         log_id = row[0] if isinstance(row[0], UUID) else None
 
+                    # 集計テーブルはログとは別の文で更新する（失敗してもログは残す）
+                    if success:
+                        self._add_spend_counters(conn, created_at=row[1], cost_usd=cost_usd)
+                    self._upsert_rollups(
+                        conn,
+                        created_at=row[1],
+                        model_id=model_id,
+                        tier=tier,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        cost_jpy=cost_jpy,
+                        cost_usd=cost_usd,
+                        latency_ms=latency_ms,
+                        success=success,
+                    )
+
                 logger.debug(
                     f"Logged usage: model={model_id}, tier={tier.value}, "
                     f"cost=¥{cost_jpy:.2f}, success={success}"
@@ -241,6 +271,165 @@ class UsageLogger:
             logger.error(f"Failed to log usage: {type(e).__name__}")
             return None
 
+    def _add_spend_counters(
+        self,
+        conn,
+        created_at: datetime,
+        cost_usd: Optional[Decimal],
+    ) -> bool:
+        """
+        ai_spend_counters（予算判定用のJSTの日・月累計）に1件分を加算する
+
+        v11.3.0: エラーのログは数えない（呼び出し側で判定する）。
+        失敗時はロールバックして警告ログのみ残す。
+        取りこぼしは SpendCounterCache の定期再集計で補正される。
+
+        Args:
+            conn: ログをINSERTした接続（コミット済み）
+            created_at: ログの created_at（期間の基準時刻）
+            cost_usd: コスト（USD）
+
+        Returns:
+            更新できたか
+        """
+        query = text("""
+            INSERT INTO ai_spend_counters (
+                organization_id,
+                period,
+                period_start,
+                cost_usd,
+                request_count
+            )
+            SELECT
+                CAST(:org_id AS uuid),
+                p.period,
+                p.period_start,
+                :cost_usd,
+                1
+            FROM (VALUES
+                ('day', CAST(CAST(:created_at AS timestamptz) AT TIME ZONE 'Asia/Tokyo' AS date)),
+                ('month', CAST(date_trunc('month', CAST(:created_at AS timestamptz) AT TIME ZONE 'Asia/Tokyo') AS date))
+            ) AS p(period, period_start)
+            ON CONFLICT (organization_id, period, period_start) DO UPDATE SET
+                cost_usd = ai_spend_counters.cost_usd + EXCLUDED.cost_usd,
+                request_count = ai_spend_counters.request_count + EXCLUDED.request_count,
+                updated_at = NOW()
+        """)
+
+        try:
+            conn.execute(query, {
+                "org_id": self._organization_id,
+                "created_at": created_at,
+                "cost_usd": float(cost_usd) if cost_usd is not None else 0.0,
+            })
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update spend counters: {type(e).__name__}")
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return False
+
+    def _upsert_rollups(
+        self,
+        conn,
+        created_at: datetime,
+        model_id: str,
+        tier: Tier,
+        input_tokens: int,
+        output_tokens: int,
+        cost_jpy: Decimal,
+        cost_usd: Optional[Decimal],
+        latency_ms: Optional[int],
+        success: bool,
+    ) -> bool:
+        """
+        ai_usage_rollups（時間/日バケット）に1件分を加算する
+
+        v11.3.0: 管理ダッシュボードはロールアップを読むため、ログ件数に依存せず集計できる。
+        ログのINSERTとは別の文で実行し、失敗（マイグレーション未適用など）は
+        ロールバックして警告ログのみ残す。欠けた分はマイグレーションの一括集計で補正できる。
+
+        Args:
+            conn: ログをINSERTした接続（コミット済み）
+            created_at: ログの created_at（バケットの基準時刻）
+
+        Returns:
+            更新できたか
+        """
+        query = text("""
+            INSERT INTO ai_usage_rollups (
+                organization_id,
+                granularity,
+                bucket_start,
+                model_id,
+                tier,
+                request_count,
+                error_count,
+                input_tokens,
+                output_tokens,
+                cost_jpy,
+                cost_usd,
+                response_time_ms_sum,
+                response_time_count
+            )
+            SELECT
+                CAST(:org_id AS uuid),
+                b.granularity,
+                b.bucket_start,
+                :model_id,
+                :tier,
+                1,
+                :error_count,
+                :input_tokens,
+                :output_tokens,
+                :cost_jpy,
+                :cost_usd,
+                :response_time_ms_sum,
+                :response_time_count
+            FROM (VALUES
+                ('hour', date_trunc('hour', CAST(:created_at AS timestamptz))),
+                ('day', date_trunc('day', CAST(:created_at AS timestamptz) AT TIME ZONE 'Asia/Tokyo') AT TIME ZONE 'Asia/Tokyo')
+            ) AS b(granularity, bucket_start)
+            ON CONFLICT (organization_id, granularity, bucket_start, model_id, tier) DO UPDATE SET
+                request_count = ai_usage_rollups.request_count + EXCLUDED.request_count,
+                error_count = ai_usage_rollups.error_count + EXCLUDED.error_count,
+                input_tokens = ai_usage_rollups.input_tokens + EXCLUDED.input_tokens,
+                output_tokens = ai_usage_rollups.output_tokens + EXCLUDED.output_tokens,
+                cost_jpy = ai_usage_rollups.cost_jpy + EXCLUDED.cost_jpy,
+                cost_usd = ai_usage_rollups.cost_usd + EXCLUDED.cost_usd,
+                response_time_ms_sum = ai_usage_rollups.response_time_ms_sum + EXCLUDED.response_time_ms_sum,
+                response_time_count = ai_usage_rollups.response_time_count + EXCLUDED.response_time_count,
+                updated_at = NOW()
+        """)
+
+        # NULL判定・真偽判定はPython側で済ませる（型の決まらないパラメータをSQLに渡さない）
+        try:
+            conn.execute(query, {
+                "org_id": self._organization_id,
+                "created_at": created_at,
+                "model_id": model_id,
+                "tier": tier.value,
+                "error_count": 0 if success else 1,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_jpy": float(cost_jpy),
+                "cost_usd": float(cost_usd) if cost_usd is not None else 0.0,
+                "response_time_ms_sum": latency_ms if latency_ms is not None else 0,
+                "response_time_count": 0 if latency_ms is None else 1,
+            })
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update usage rollups: {type(e).__name__}")
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return False
+
     # -------------------------------------------------------------------------
     # 統計取得
     # -------------------------------------------------------------------------
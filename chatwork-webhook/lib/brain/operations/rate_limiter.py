@@ -0,0 +1,379 @@
+# lib/brain/operations/rate_limiter.py
+"""
+操作系レートリミッター（Guardian Layer 8-4 / 8-5）
+
+v11.3.0: GuardianLayer のインスタンス内リスト・日別カウンタを置き換える。
+
+Before: アカウントごとのタイムスタンプ列を毎回ジェネレータで数え直し、
+  日次カウンタは (account_id, 日付) のキーが無期限に増え続けていた
+After: 1アカウントあたり「上限回数」分だけのリングバッファで判定（O(1)）し、
+  古いウィンドウ・前日以前のカウンタは定期的に自動で破棄する
+
+【バックエンド】
+- InMemoryRateLimitBackend: インスタンス内（デフォルト、テスト用のローカル代替）
+- PostgresRateLimitBackend: brain_operation_rate_limits テーブルで
+  Cloud Run の複数インスタンス間で一貫した制限を行う（行ロックで直列化）
+  DBエラー時はインメモリ側にフォールバックする
+
+Created: 2026-10-16
+"""
+
+import logging
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text as sql_text
+
+logger = logging.getLogger(__name__)
+
+
+# 期限切れウィンドウ・カウンタを掃除する間隔（秒）
+SWEEP_INTERVAL_SECONDS = 60.0
+
+# 共有バックエンドの期限切れ行を掃除する間隔（秒）
+SHARED_CLEANUP_INTERVAL_SECONDS = 600.0
+
+
+@dataclass(frozen=True)
+class RateWindow:
+    """スライディングウィンドウの制限（window_seconds 以内に limit 回まで）"""
+    window_seconds: float
+    limit: int
+
+
+@dataclass
+class RateLimitDecision:
+    """レート判定結果（拒否時は超過したウィンドウと、その中の呼び出し回数）"""
+    allowed: bool
+    window: Optional[RateWindow] = None
+    count: int = 0
+
+
+@dataclass
+class QuotaDecision:
+    """日次クォータ判定結果（count は判定前の使用回数）"""
+    allowed: bool
+    count: int
+
+
+def evaluate_windows(
+    calls: Sequence[float],
+    now: float,
+    windows: Sequence[RateWindow],
+) -> RateLimitDecision:
+    """
+    リングバッファ（古い順の呼び出し時刻）を各ウィンドウで判定する
+
+    バッファ長は最大でも max(limit) なので、判定コストは履歴の長さに依存しない。
+    windows は指定順に評価し、最初に超過したものを返す。
+    """
+    for window in windows:
+        count = 0
+        for ts in reversed(calls):
+            if now - ts >= window.window_seconds:
+                break
+            count += 1
+            if count >= window.limit:
+                break
+        if count >= window.limit:
+            return RateLimitDecision(allowed=False, window=window, count=count)
+    return RateLimitDecision(allowed=True)
+
+
+def ring_capacity(windows: Iterable[RateWindow]) -> int:
+    """判定に必要なリングバッファ長（最大の上限回数）"""
+    return max((w.limit for w in windows), default=1)
+
+
+# =============================================================================
+# インメモリバックエンド
+# =============================================================================
+
+class InMemoryRateLimitBackend:
+    """
+    インスタンス内のレートリミッター
+
+    calls: key → 呼び出し時刻のリングバッファ（deque(maxlen=容量)）
+    daily_counts: (key, 日付) → {バケット名: 回数}
+    """
+
+    is_shared = False
+
+    def __init__(self, capacity: int, max_window_seconds: float):
+        self.capacity = capacity
+        self.max_window_seconds = max_window_seconds
+        self.calls: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.capacity))
+        self.daily_counts: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._last_sweep = time.time()
+
+    def hit(self, key: str, now: float, windows: Sequence[RateWindow]) -> RateLimitDecision:
+        """判定し、許可された場合は呼び出しを記録する"""
+        self._maybe_sweep(now)
+        calls = self.calls[key]
+        decision = evaluate_windows(calls, now, windows)
+        if decision.allowed:
+            calls.append(now)
+        return decision
+
+    def consume(self, key: str, day: str, bucket: str, quota: int) -> QuotaDecision:
+        """日次クォータを1回分消費する（上限到達時は消費しない）"""
+        counts = self.daily_counts[(key, day)]
+        current = counts[bucket]
+        if current >= quota:
+            return QuotaDecision(allowed=False, count=current)
+        counts[bucket] = current + 1
+        return QuotaDecision(allowed=True, count=current)
+
+    def _maybe_sweep(self, now: float) -> None:
+        """最長ウィンドウより古いバッファと、前日以前のカウンタを破棄"""
+        if now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+
+        stale_keys = [
+            key for key, calls in self.calls.items()
+            if not calls or now - calls[-1] >= self.max_window_seconds
+        ]
+        for key in stale_keys:
+            del self.calls[key]
+
+        today = _today()
+        stale_days = [k for k in self.daily_counts if k[1] != today]
+        for k in stale_days:
+            del self.daily_counts[k]
+
+        if stale_keys or stale_days:
+            logger.debug(
+                "Rate limiter swept: windows=%d, daily=%d",
+                len(stale_keys), len(stale_days),
+            )
+
+
+# =============================================================================
+# 共有バックエンド（PostgreSQL）
+# =============================================================================
+
+class PostgresRateLimitBackend:
+    """
+    brain_operation_rate_limits テーブルを使うクラスタ共通のレートリミッター
+
+    1キー1行で、calls（リングバッファ）または count（日次カウンタ）を保持する。
+    SELECT ... FOR UPDATE で同一キーの判定を直列化するため、
+    複数インスタンスから同時に呼ばれても上限を超えない。
+    expires_at を過ぎた行は定期的に削除する。
+    """
+
+    is_shared = True
+
+    def __init__(self, pool, organization_id: str, capacity: int, max_window_seconds: float):
+        self.pool = pool
+        self.organization_id = organization_id
+        self.capacity = capacity
+        self.max_window_seconds = max_window_seconds
+        self._last_cleanup = 0.0
+
+    def hit(self, key: str, now: float, windows: Sequence[RateWindow]) -> RateLimitDecision:
+        expires_at = datetime.fromtimestamp(now + self.max_window_seconds, tz=timezone.utc)
+        with self._org_connection() as conn:
+            self._maybe_cleanup(conn, now)
+            conn.execute(
+                sql_text("""
+                    INSERT INTO brain_operation_rate_limits
+                        (organization_id, limit_key, calls, expires_at)
+                    VALUES (CAST(:org_id AS uuid), :key, '{}', :expires_at)
+                    ON CONFLICT (organization_id, limit_key) DO NOTHING
+                """),
+                {"org_id": self.organization_id, "key": key, "expires_at": expires_at},
+            )
+            row = conn.execute(
+                sql_text("""
+                    SELECT calls FROM brain_operation_rate_limits
+                    WHERE organization_id = CAST(:org_id AS uuid) AND limit_key = :key
+                    FOR UPDATE
+                """),
+                {"org_id": self.organization_id, "key": key},
+            ).fetchone()
+            calls: List[float] = list(row[0] or []) if row else []
+
+            decision = evaluate_windows(calls, now, windows)
+            if decision.allowed:
+                calls = (calls + [now])[-self.capacity:]
+                conn.execute(
+                    sql_text("""
+                        UPDATE brain_operation_rate_limits
+                        SET calls = :calls, expires_at = :expires_at
+                        WHERE organization_id = CAST(:org_id AS uuid) AND limit_key = :key
+                    """),
+                    {
+                        "org_id": self.organization_id, "key": key,
+                        "calls": calls, "expires_at": expires_at,
+                    },
+                )
+            conn.commit()
+        return decision
+
+    def consume(self, key: str, day: str, bucket: str, quota: int) -> QuotaDecision:
+        limit_key = f"{key}:{day}:{bucket}"
+        # 翌日0時を過ぎたら不要（タイムゾーン差を見込んで1日余裕を持たせる）
+        expires_at = datetime.fromisoformat(day).replace(tzinfo=timezone.utc) + timedelta(days=2)
+        with self._org_connection() as conn:
+            row = conn.execute(
+                sql_text("""
+                    INSERT INTO brain_operation_rate_limits
+                        (organization_id, limit_key, count, expires_at)
+                    VALUES (CAST(:org_id AS uuid), :key, 1, :expires_at)
+                    ON CONFLICT (organization_id, limit_key) DO UPDATE
+                    SET count = brain_operation_rate_limits.count + 1
+                    WHERE brain_operation_rate_limits.count < :quota
+                    RETURNING count
+                """),
+                {
+                    "org_id": self.organization_id, "key": limit_key,
+                    "expires_at": expires_at, "quota": quota,
+                },
+            ).fetchone()
+            if row is not None:
+                conn.commit()
+                return QuotaDecision(allowed=True, count=int(row[0]) - 1)
+
+            current = conn.execute(
+                sql_text("""
+                    SELECT count FROM brain_operation_rate_limits
+                    WHERE organization_id = CAST(:org_id AS uuid) AND limit_key = :key
+                """),
+                {"org_id": self.organization_id, "key": limit_key},
+            ).scalar()
+            conn.commit()
+        return QuotaDecision(allowed=False, count=int(current or quota))
+
+    def _maybe_cleanup(self, conn, now: float) -> None:
+        if now - self._last_cleanup < SHARED_CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = now
+        conn.execute(
+            sql_text("""
+                DELETE FROM brain_operation_rate_limits
+                WHERE organization_id = CAST(:org_id AS uuid) AND expires_at < NOW()
+            """),
+            {"org_id": self.organization_id},
+        )
+
+    @contextmanager
+    def _org_connection(self):
+        """RLSコンテキスト（app.current_organization_id）付きのDB接続"""
+        with self.pool.connect() as conn:
+            conn.execute(
+                sql_text("SELECT set_config('app.current_organization_id', :org_id, false)"),
+                {"org_id": self.organization_id},
+            )
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                try:
+                    conn.execute(sql_text("SELECT set_config('app.current_organization_id', NULL, false)"))
+                except Exception:
+                    try:
+                        conn.invalidate()
+                    except Exception:
+                        pass
+
+
+# =============================================================================
+# レートリミッター
+# =============================================================================
+
+class OperationRateLimiter:
+    """
+    操作系のレート制限・日次クォータ
+
+    共有バックエンドが失敗した場合はインメモリ側で判定を続ける
+    （インスタンス単位の制限に縮退するが、ブロック漏れにはならない）。
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[RateWindow],
+        shared_backend: Optional[PostgresRateLimitBackend] = None,
+    ):
+        self.windows: Tuple[RateWindow, ...] = tuple(
+            sorted(windows, key=lambda w: w.window_seconds)
+        )
+        capacity = ring_capacity(self.windows)
+        max_window = max((w.window_seconds for w in self.windows), default=60.0)
+        self.local = InMemoryRateLimitBackend(capacity, max_window)
+        self.shared = shared_backend
+
+    @property
+    def is_shared(self) -> bool:
+        return self.shared is not None
+
+    def hit(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        now = time.time() if now is None else now
+        if self.shared is not None:
+            try:
+                return self.shared.hit(key, now, self.windows)
+            except Exception as e:
+                logger.warning("Shared rate limiter failed, using local: %s", type(e).__name__)
+        return self.local.hit(key, now, self.windows)
+
+    def consume(self, key: str, bucket: str, quota: int, day: Optional[str] = None) -> QuotaDecision:
+        day = day or _today()
+        if self.shared is not None:
+            try:
+                return self.shared.consume(key, day, bucket, quota)
+            except Exception as e:
+                logger.warning("Shared quota counter failed, using local: %s", type(e).__name__)
+        return self.local.consume(key, day, bucket, quota)
+
+
+def _today() -> str:
+    # 従来の日次クォータと同じく、プロセスのローカル日付で区切る
+    return date.today().isoformat()
+
+
+def create_operation_rate_limiter(
+    pool=None,
+    organization_id: Optional[str] = None,
+    backend: str = "memory",
+) -> OperationRateLimiter:
+    """
+    操作系レートリミッターを作成
+
+    Args:
+        pool: DB接続プール（backend="postgres" の場合に必須）
+        organization_id: 組織ID（RLS用）
+        backend: "memory" または "postgres"
+
+    Returns:
+        OperationRateLimiter
+    """
+    from lib.brain.operations.registry import (
+        OPERATION_RATE_LIMIT_PER_MINUTE,
+        OPERATION_BURST_LIMIT_PER_10SEC,
+    )
+
+    windows = [
+        RateWindow(window_seconds=10, limit=OPERATION_BURST_LIMIT_PER_10SEC),
+        RateWindow(window_seconds=60, limit=OPERATION_RATE_LIMIT_PER_MINUTE),
+    ]
+
+    shared = None
+    if backend == "postgres":
+        if pool is not None and organization_id:
+            shared = PostgresRateLimitBackend(
+                pool,
+                organization_id,
+                capacity=ring_capacity(windows),
+                max_window_seconds=max(w.window_seconds for w in windows),
+            )
+        else:
+            logger.warning("Postgres rate limiter requested without pool/org, using memory")
+
+    return OperationRateLimiter(windows, shared_backend=shared)
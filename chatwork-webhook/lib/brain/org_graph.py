@@ -23,8 +23,11 @@ Ultimate Brain Phase 3: 人間関係、力学、信頼関係を理解するシ
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import json
+import math
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -332,6 +335,110 @@ class RelationshipInsight:
     generated_at: datetime = field(default_factory=datetime.now)
 
 
+# =============================================================================
+# 関係キャッシュ（隣接リスト索引付き）
+# =============================================================================
+
+class _RelationshipIndex(dict):
+    """
+    関係キャッシュ（"person_a:person_b" → PersonRelationship）
+
+    v11.3.0: 経路探索・協力者検索のたびに全関係を走査しないよう、
+    人物ごとの出辺（person_a側）・入辺（person_b側）の隣接リストを
+    書き込み時にインクリメンタルに維持する。
+    関係タイプ・双方向フラグは探索時に評価するため、関係オブジェクトを
+    直接書き換えても索引の再構築は不要。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._outgoing: Dict[str, Dict[str, PersonRelationship]] = {}
+        self._incoming: Dict[str, Dict[str, PersonRelationship]] = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: str, rel: PersonRelationship) -> None:
+        if key in self:
+            self._unlink(key, dict.__getitem__(self, key))
+        dict.__setitem__(self, key, rel)
+        self._outgoing.setdefault(rel.person_a_id, {})[key] = rel
+        self._incoming.setdefault(rel.person_b_id, {})[key] = rel
+
+    def __delitem__(self, key: str) -> None:
+        rel = dict.__getitem__(self, key)
+        dict.__delitem__(self, key)
+        self._unlink(key, rel)
+
+    def _unlink(self, key: str, rel: PersonRelationship) -> None:
+        for index, person_id in ((self._outgoing, rel.person_a_id), (self._incoming, rel.person_b_id)):
+            edges = index.get(person_id)
+            if edges is not None:
+                edges.pop(key, None)
+                if not edges:
+                    del index[person_id]
+
+    def pop(self, key: str, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        rel = dict.__getitem__(self, key)
+        del self[key]
+        return rel
+
+    def popitem(self):
+        key, rel = dict.popitem(self)
+        self._unlink(key, rel)
+        return key, rel
+
+    def setdefault(self, key: str, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, rel in dict(*args, **kwargs).items():
+            self[key] = rel
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._outgoing.clear()
+        self._incoming.clear()
+
+    def outgoing(self, person_id: str) -> List[PersonRelationship]:
+        """person_id が person_a の関係"""
+        return list(self._outgoing.get(person_id, {}).values())
+
+    def incoming(self, person_id: str) -> List[PersonRelationship]:
+        """person_id が person_b の関係"""
+        return list(self._incoming.get(person_id, {}).values())
+
+    def successors(self, person_id: str) -> Dict[str, float]:
+        """
+        person_id から辿れる隣接人物と、その辺の強度（複数の関係がある場合は最大値）
+
+        辿れる辺: person_a → person_b、および双方向の関係の person_b → person_a
+        """
+        neighbors: Dict[str, float] = {}
+        for rel in self._outgoing.get(person_id, {}).values():
+            if rel.strength > neighbors.get(rel.person_b_id, -1.0):
+                neighbors[rel.person_b_id] = rel.strength
+        for rel in self._incoming.get(person_id, {}).values():
+            if rel.bidirectional and rel.strength > neighbors.get(rel.person_a_id, -1.0):
+                neighbors[rel.person_a_id] = rel.strength
+        return neighbors
+
+    def predecessors(self, person_id: str) -> Dict[str, float]:
+        """person_id へ辿り着ける隣接人物（successors の逆向き）"""
+        neighbors: Dict[str, float] = {}
+        for rel in self._incoming.get(person_id, {}).values():
+            if rel.strength > neighbors.get(rel.person_a_id, -1.0):
+                neighbors[rel.person_a_id] = rel.strength
+        for rel in self._outgoing.get(person_id, {}).values():
+            if rel.bidirectional and rel.strength > neighbors.get(rel.person_b_id, -1.0):
+                neighbors[rel.person_b_id] = rel.strength
+        return neighbors
+
+
 # =============================================================================
 # OrganizationGraph クラス
 # =============================================================================
@@ -369,7 +476,7 @@ class OrganizationGraph:
 
         # キャッシュ
         self._person_cache: Dict[str, PersonNode] = {}
-        self._relationship_cache: Dict[str, PersonRelationship] = {}
+        self._relationships = _RelationshipIndex()
         self._cache_timestamp: Optional[datetime] = None
         self._load_attempted: bool = False  # Phase 3.5: 重複ロード防止フラグ
 
@@ -383,6 +490,16 @@ class OrganizationGraph:
             f"auto_learn={enable_auto_learn}"
         )
 
+    @property
+    def _relationship_cache(self) -> _RelationshipIndex:
+        """関係キャッシュ（隣接リスト索引付き）"""
+        return self._relationships
+
+    @_relationship_cache.setter
+    def _relationship_cache(self, value: Dict[str, PersonRelationship]) -> None:
+        # 辞書を丸ごと差し替えた場合も索引を張り直す
+        self._relationships = value if isinstance(value, _RelationshipIndex) else _RelationshipIndex(value)
+
     # =========================================================================
     # 人物ノード管理
     # =========================================================================
@@ -747,15 +864,15 @@ class OrganizationGraph:
         Returns:
             関係のリスト
         """
-        relationships: List[PersonRelationship] = []
-
-        for rel in self._relationship_cache.values():
-            # 主体または対象（双方向の場合）
-            if rel.person_a_id == person_id or (rel.bidirectional and rel.person_b_id == person_id):
-                if relationship_type is None or rel.relationship_type == relationship_type:
-                    relationships.append(rel)
-
-        return relationships
+        # 主体または対象（双方向の場合）
+        candidates = self._relationships.outgoing(person_id) + [
+            rel for rel in self._relationships.incoming(person_id)
+            if rel.bidirectional and rel.person_a_id != person_id
+        ]
+        return [
+            rel for rel in candidates
+            if relationship_type is None or rel.relationship_type == relationship_type
+        ]
 
     async def get_direct_reports(self, manager_id: str) -> List[str]:
         """
@@ -767,14 +884,10 @@ class OrganizationGraph:
         Returns:
             部下のIDリスト
         """
-        direct_reports: List[str] = []
-
-        for rel in self._relationship_cache.values():
-            if (rel.relationship_type == RelationshipType.REPORTS_TO and
-                rel.person_b_id == manager_id):
-                direct_reports.append(rel.person_a_id)
-
-        return direct_reports
+        return [
+            rel.person_a_id for rel in self._relationships.incoming(manager_id)
+            if rel.relationship_type == RelationshipType.REPORTS_TO
+        ]
 
     async def get_manager(self, person_id: str) -> Optional[str]:
         """
@@ -786,9 +899,8 @@ class OrganizationGraph:
         Returns:
             マネージャーのID（いない場合は None）
         """
-        for rel in self._relationship_cache.values():
-            if (rel.relationship_type == RelationshipType.REPORTS_TO and
-                rel.person_a_id == person_id):
+        for rel in self._relationships.outgoing(person_id):
+            if rel.relationship_type == RelationshipType.REPORTS_TO:
                 return rel.person_b_id
 
         return None
@@ -803,14 +915,15 @@ class OrganizationGraph:
         Returns:
             協力者のIDリスト
         """
-        collaborators: List[str] = []
-
-        for rel in self._relationship_cache.values():
-            if rel.relationship_type == RelationshipType.COLLABORATES_WITH:
-                if rel.person_a_id == person_id:
-                    collaborators.append(rel.person_b_id)
-                elif rel.bidirectional and rel.person_b_id == person_id:
-                    collaborators.append(rel.person_a_id)
+        collaborators: List[str] = [
+            rel.person_b_id for rel in self._relationships.outgoing(person_id)
+            if rel.relationship_type == RelationshipType.COLLABORATES_WITH
+        ]
+        collaborators.extend(
+            rel.person_a_id for rel in self._relationships.incoming(person_id)
+            if rel.relationship_type == RelationshipType.COLLABORATES_WITH
+            and rel.bidirectional and rel.person_a_id != person_id
+        )
 
         return collaborators
 
@@ -1259,36 +1372,151 @@ class OrganizationGraph:
         if from_person_id == to_person_id:
             return [from_person_id]
 
-        # BFS で最短パスを見つける
-        visited: Set[str] = set()
-        queue: List[List[str]] = [[from_person_id]]
+        # v11.3.0: 隣接リスト索引上の双方向BFS（O(V+E)、探索範囲は片側BFSより小さい）
+        index = self._relationships
+        forward_parents: Dict[str, Optional[str]] = {from_person_id: None}
+        backward_parents: Dict[str, Optional[str]] = {to_person_id: None}
+        forward_frontier: List[str] = [from_person_id]
+        backward_frontier: List[str] = [to_person_id]
+
+        while forward_frontier and backward_frontier:
+            # 小さい方のフロンティアを1層分展開する
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, parents, others = forward_frontier, forward_parents, backward_parents
+                step = index.successors
+            else:
+                frontier, parents, others = backward_frontier, backward_parents, forward_parents
+                step = index.predecessors
+
+            next_frontier: List[str] = []
+            meeting: Optional[str] = None
+            for current in frontier:
+                for neighbor in step(current):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = current
+                    if neighbor in others:
+                        meeting = neighbor
+                        break
+                    next_frontier.append(neighbor)
+                if meeting is not None:
+                    break
+
+            if meeting is not None:
+                return self._join_bidirectional_path(meeting, forward_parents, backward_parents)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
 
-        while queue:
-            path = queue.pop(0)
-            current = path[-1]
+        return []
 
-            if current in visited:
-                continue
+    @staticmethod
+    def _join_bidirectional_path(
+        meeting: str,
+        forward_parents: Dict[str, Optional[str]],
+        backward_parents: Dict[str, Optional[str]],
+    ) -> List[str]:
+        """双方向BFSの合流点から開始→終了のパスを組み立てる"""
+        path: List[str] = []
+        node: Optional[str] = meeting
+        while node is not None:
+            path.append(node)
+            node = forward_parents[node]
+        path.reverse()
+
+        node = backward_parents[meeting]
+        while node is not None:
+            path.append(node)
+            node = backward_parents[node]
+        return path
+
+    async def find_strongest_path(
+        self,
+        from_person_id: str,
+        to_person_id: str,
+        min_strength: float = 0.0,
+    ) -> List[str]:
+        """
+        関係強度で重み付けした最短パス（最も「強いつながり」を辿るパス）を見つける
 
-            visited.add(current)
+        v11.3.0: 辺のコストを -log(strength) としたダイクストラ法。
+        パス上の強度の積が最大になる経路を返す。
 
-            # 隣接ノードを取得
-            neighbors: Set[str] = set()
-            for rel in self._relationship_cache.values():
-                if rel.person_a_id == current:
-                    neighbors.add(rel.person_b_id)
-                if rel.bidirectional and rel.person_b_id == current:
-                    neighbors.add(rel.person_a_id)
+        Args:
+            from_person_id: 開始人物ID
+            to_person_id: 終了人物ID
+            min_strength: これより弱い関係は辿らない
 
-            for neighbor in neighbors:
-                if neighbor == to_person_id:
-                    return path + [neighbor]
+        Returns:
+            パス（人物IDのリスト）、見つからない場合は空リスト
+        """
+        if from_person_id == to_person_id:
+            return [from_person_id]
 
-                if neighbor not in visited:
-                    queue.append(path + [neighbor])
+        index = self._relationships
+        costs: Dict[str, float] = {from_person_id: 0.0}
+        parents: Dict[str, Optional[str]] = {from_person_id: None}
+        heap: List[Tuple[float, str]] = [(0.0, from_person_id)]
+        done: Set[str] = set()
+
+        while heap:
+            cost, current = heapq.heappop(heap)
+            if current in done:
+                continue
+            if current == to_person_id:
+                path: List[str] = []
+                node: Optional[str] = current
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            done.add(current)
+
+            for neighbor, strength in index.successors(current).items():
+                if neighbor in done or strength <= 0.0 or strength < min_strength:
+                    continue
+                new_cost = cost - math.log(min(strength, RELATIONSHIP_STRENGTH_MAX))
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = current
+                    heapq.heappush(heap, (new_cost, neighbor))
 
         return []
 
+    async def get_k_hop_neighbors(
+        self,
+        person_id: str,
+        k: int = 2,
+    ) -> Dict[str, int]:
+        """
+        k ホップ以内で辿れる人物を取得
+
+        Args:
+            person_id: 起点の人物ID
+            k: 最大ホップ数
+
+        Returns:
+            {人物ID: ホップ数}（起点自身は含まない）
+        """
+        distances: Dict[str, int] = {person_id: 0}
+        queue: deque = deque([person_id])
+
+        while queue:
+            current = queue.popleft()
+            depth = distances[current]
+            if depth >= k:
+                continue
+            for neighbor in self._relationships.successors(current):
+                if neighbor not in distances:
+                    distances[neighbor] = depth + 1
+                    queue.append(neighbor)
+
+        del distances[person_id]
+        return distances
+
     async def suggest_introducer(
         self,
         person_a_id: str,
@@ -1304,18 +1532,9 @@ class OrganizationGraph:
         Returns:
             紹介者のID（いない場合は None）
         """
-        # 両方と関係がある人物を探す
-        a_connections: Set[str] = set()
-        b_connections: Set[str] = set()
-
-        for rel in self._relationship_cache.values():
-            if rel.person_a_id == person_a_id or (rel.bidirectional and rel.person_b_id == person_a_id):
-                target = rel.person_b_id if rel.person_a_id == person_a_id else rel.person_a_id
-                a_connections.add(target)
-
-            if rel.person_a_id == person_b_id or (rel.bidirectional and rel.person_b_id == person_b_id):
-                target = rel.person_b_id if rel.person_a_id == person_b_id else rel.person_a_id
-                b_connections.add(target)
+        # 両方と関係がある人物を探す（隣接リスト索引から取得）
+        a_connections = set(self._relationships.successors(person_a_id))
+        b_connections = set(self._relationships.successors(person_b_id))
 
         # 共通の接続を見つける
         common = a_connections & b_connections
@@ -1323,12 +1542,21 @@ class OrganizationGraph:
         if not common:
             return None
 
+        # キャッシュにない候補だけを並行して取得
+        persons: Dict[str, Optional[PersonNode]] = {
+            person_id: self._person_cache.get(person_id) for person_id in common
+        }
+        missing = [person_id for person_id, person in persons.items() if person is None]
+        if missing:
+            fetched = await asyncio.gather(*(self.get_person(pid) for pid in missing))
+            persons.update(zip(missing, fetched))
+
         # 最も影響力のある人物を選択
         best_introducer: Optional[str] = None
         best_influence: float = -1.0
 
-        for person_id in common:
-            person = await self.get_person(person_id)
+        for person_id in sorted(common):
+            person = persons[person_id]
             if person and person.influence_score > best_influence:
                 best_influence = person.influence_score
                 best_introducer = person_id
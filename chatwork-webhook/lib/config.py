@@ -115,6 +115,16 @@ class Settings:
         "PINECONE_INDEX_NAME", "soulkun-knowledge"
     ))
 
+    # v11.3.0: ベクターストアのバックエンド（pinecone / local）
+    # local: NumPyによるプロセス内インデックス（小規模テナント・ローカル開発・テスト用）
+    VECTOR_STORE_BACKEND: str = field(default_factory=lambda: os.getenv(
+        "VECTOR_STORE_BACKEND", "pinecone"
+    ))
+    # local バックエンドの永続化ディレクトリ（未設定ならメモリのみ）
+    LOCAL_VECTOR_STORE_DIR: Optional[str] = field(default_factory=lambda: os.getenv(
+        "LOCAL_VECTOR_STORE_DIR", None
+    ))
+
     # Phase 3.5 組織階層連携フラグ
     # TRUE: 部署ベースのアクセス制御を有効化（departments テーブル必須）
     # FALSE: 機密区分（classification）のみでアクセス制御（Phase 3 単独運用）
@@ -131,6 +131,12 @@ class DetectionParameters:
     # 非常にネガティブ判定の感情スコア閾値
     VERY_NEGATIVE_SCORE_THRESHOLD: Final[float] = -0.5
 
+    # 1回のLLMリクエストで感情分析するメッセージ数
+    SENTIMENT_BATCH_SIZE: Final[int] = 20
+
+    # 感情分析のLLM同時リクエスト数
+    SENTIMENT_MAX_CONCURRENCY: Final[int] = 4
+
 
 # ================================================================
 # 質問カテゴリ
@@ -16,6 +16,11 @@ Phase 2 進化版 A4: 感情変化検出
 - トレンドベース: 単発メッセージではなく変化を検出
 - 支援的フレーミング: 「監視」ではなく「ウェルネスチェック」
 
+v11.3.0: 感情スコアは detect() の冒頭でまとめて用意する
+- 既存スコアは1クエリで取得し、message_id 単位でキャッシュ
+- 未分析のメッセージは複数件を1回のLLM呼び出し（構造化出力）で分析
+- ユーザーごとのバッチを共有の非同期HTTPクライアントで並行実行（同時数はセマフォで制限）
+
 設計書: docs/09_phase2_a4_emotion_detection.md
 
 Author: Claude Code（経営参謀・SE・PM）
@@ -23,6 +28,7 @@ Created: 2026-01-24
 Version: 1.0
 """
 
+import asyncio
 import json
 import os
 
@@ -31,6 +37,7 @@ from decimal import Decimal
 from typing import Any, Optional
 from uuid import UUID
 
+import httpx
 import requests
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
@@ -70,6 +77,51 @@ def _ensure_aware(dt: Any) -> Any:
     return dt
 
 
+def _strip_code_fence(response: str) -> str:
+    """LLMレスポンスから ```json ... ``` の囲みを外す"""
+    response_text = response.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    if response_text.startswith("```"):
+        response_text = response_text[3:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+
+def _parse_sentiment_result(result: Any) -> Optional[dict[str, Any]]:
+    """LLMの感情分析結果（1メッセージ分）を検証・正規化する。不正なら None"""
+    # 必須フィールドの検証
+    if not isinstance(result, dict):
+        return None
+    if 'sentiment_score' not in result or 'sentiment_label' not in result:
+        return None
+
+    try:
+        # スコアの範囲を制限
+        score = max(-1.0, min(1.0, float(result['sentiment_score'])))
+        confidence = float(result.get('confidence', 0.5))
+    except (TypeError, ValueError):
+        return None
+
+    return {
+        'sentiment_score': score,
+        'sentiment_label': result.get('sentiment_label') or SentimentLabel.from_score(score).value,
+        'confidence': confidence,
+        'detected_emotions': result.get('detected_emotions', []),
+    }
+
+
+def _sentiment_from_row(row: Any) -> dict[str, Any]:
+    """emotion_scores の (sentiment_score, sentiment_label, confidence, detected_emotions, ...) 行を変換"""
+    return {
+        'sentiment_score': float(row[0]),
+        'sentiment_label': row[1],
+        'confidence': float(row[2]) if row[2] else None,
+        'detected_emotions': row[3] or [],
+    }
+
+
 # ================================================================
 # 感情分析プロンプト
 # ================================================================
@@ -98,6 +150,109 @@ SENTIMENT_ANALYSIS_PROMPT = """あなたは職場メッセージの感情分析
 メッセージ:
 """
 
+# v11.3.0: 複数メッセージを1リクエストで分析するバッチ版
+SENTIMENT_BATCH_ANALYSIS_PROMPT = """あなたは職場メッセージの感情分析専門家です。
+入力は {"id": 番号, "text": メッセージ} のJSON配列です。
+各メッセージの感情トーンを個別に分析し、JSON形式で返してください。
+
+分析ポイント:
+- 全体的な感情トーン（ポジティブ/ニュートラル/ネガティブ）
+- 検出された感情（不満、不安、疲労、焦り、喜び等）
+- 信頼度（分析の確実性）
+
+注意:
+- メッセージ同士を混同せず、1件ずつ独立に判定
+- 業務上の普通のやり取りは「neutral」と判定
+- 明確な感情表現がある場合のみ positive/negative と判定
+- 個人名や具体的な内容は出力に含めない
+
+出力形式（JSONのみ、説明不要。入力の全idについて1件ずつ）:
+{
+  "results": [
+    {
+      "id": 入力の番号,
+      "sentiment_score": -1.0から1.0の数値,
+      "sentiment_label": "very_negative" | "negative" | "neutral" | "positive" | "very_positive",
+      "detected_emotions": ["感情1", "感情2"],
+      "confidence": 0.0から1.0の数値
+    }
+  ]
+}
+"""
+
+# バッチ感情分析の構造化出力スキーマ（OpenRouter response_format）
+SENTIMENT_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "sentiment_batch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "sentiment_score": {"type": "number"},
+                            "sentiment_label": {
+                                "type": "string",
+                                "enum": [label.value for label in SentimentLabel],
+                            },
+                            "detected_emotions": {"type": "array", "items": {"type": "string"}},
+                            "confidence": {"type": "number"},
+                        },
+                        "required": [
+                            "id", "sentiment_score", "sentiment_label",
+                            "detected_emotions", "confidence",
+                        ],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# 感情分析に渡す本文の最大文字数
+SENTIMENT_MAX_TEXT_LENGTH = 500
+
+# バッチ感情分析のタイムアウト（秒）
+SENTIMENT_BATCH_TIMEOUT_SECONDS = 60.0
+
+# 感情スコアの保存（1件・一括の両方で使う）
+INSERT_EMOTION_SCORE_SQL = """
+    INSERT INTO emotion_scores (
+        organization_id,
+        message_id,
+        room_id,
+        user_id,
+        sentiment_score,
+        sentiment_label,
+        confidence,
+        detected_emotions,
+        analysis_model,
+        message_time,
+        classification
+    ) VALUES (
+        :org_id,
+        :message_id,
+        :room_id,
+        :user_id,
+        :sentiment_score,
+        :sentiment_label,
+        :confidence,
+        :detected_emotions,
+        :analysis_model,
+        :message_time,
+        'confidential'
+    )
+    ON CONFLICT (organization_id, message_id) DO NOTHING
+"""
+
 
 class EmotionDetector(BaseDetector):
     """
@@ -129,6 +284,8 @@ class EmotionDetector(BaseDetector):
         sustained_negative_high_days: int = DetectionParameters.SUSTAINED_NEGATIVE_HIGH_DAYS,
         negative_score_threshold: float = DetectionParameters.NEGATIVE_SCORE_THRESHOLD,
         very_negative_score_threshold: float = DetectionParameters.VERY_NEGATIVE_SCORE_THRESHOLD,
+        sentiment_batch_size: int = DetectionParameters.SENTIMENT_BATCH_SIZE,
+        sentiment_max_concurrency: int = DetectionParameters.SENTIMENT_MAX_CONCURRENCY,
     ) -> None:
         """
         EmotionDetectorを初期化
@@ -145,6 +302,8 @@ class EmotionDetector(BaseDetector):
             sustained_negative_high_days: High判定の継続日数（デフォルト: 5）
             negative_score_threshold: ネガティブ判定の閾値（デフォルト: -0.2）
             very_negative_score_threshold: 非常にネガティブ判定の閾値（デフォルト: -0.5）
+            sentiment_batch_size: 1回のLLMリクエストで分析するメッセージ数（デフォルト: 20）
+            sentiment_max_concurrency: LLM同時リクエスト数（デフォルト: 4）
         """
         super().__init__(
             conn=conn,
@@ -162,6 +321,11 @@ class EmotionDetector(BaseDetector):
         self._sustained_negative_high_days = sustained_negative_high_days
         self._negative_score_threshold = negative_score_threshold
         self._very_negative_score_threshold = very_negative_score_threshold
+        self._sentiment_batch_size = max(1, sentiment_batch_size)
+        self._sentiment_max_concurrency = max(1, sentiment_max_concurrency)
+
+        # 感情スコアのキャッシュ（str(message_id) → 分析結果。分析失敗は None）
+        self._sentiment_cache: dict[str, Optional[dict[str, Any]]] = {}
 
         # OpenRouter API設定
         self._openrouter_api_url = "https://openrouter.ai/api/v1/chat/completions"
@@ -192,16 +356,26 @@ class EmotionDetector(BaseDetector):
                 self.log_detection_complete(result)
                 return result
 
-            # 2. ユーザーごとに感情分析
+            # 2. メッセージを取得し、感情スコアをまとめて用意
+            #    （既存スコアは1クエリで取得、未分析分はバッチ化してユーザー単位で並行にLLM分析）
+            user_messages = await self._collect_user_messages(users)
+            await self._prepare_sentiment_scores(
+                [messages for messages in user_messages if messages]
+            )
+
+            # 3. ユーザーごとに感情分析
             all_alerts = []
             users_analyzed = 0
             users_skipped = 0
 
-            for user in users:
+            for user, messages in zip(users, user_messages):
+                if messages is None:
+                    users_skipped += 1
+                    continue
                 try:
                     # SAVEPOINT: 1ユーザーの失敗が他ユーザーのトランザクションを壊さないよう隔離
                     self._conn.execute(text("SAVEPOINT user_analysis"))
-                    alerts = await self._analyze_user_emotion(user)
+                    alerts = await self._analyze_user_emotion(user, messages)
                     if alerts:
                         all_alerts.extend(alerts)
                         users_analyzed += 1
@@ -219,14 +393,14 @@ class EmotionDetector(BaseDetector):
                     users_skipped += 1
                     continue
 
-            # 3. アラートをDBに保存
+            # 4. アラートをDBに保存
             saved_alerts = []
             for alert in all_alerts:
                 saved = await self._save_alert(alert)
                 if saved:
                     saved_alerts.append(saved)
 
-            # 4. critical/high はInsightに登録
+            # 5. critical/high はInsightに登録
             insights_created = 0
             last_insight_id = None
 
@@ -320,13 +494,15 @@ class EmotionDetector(BaseDetector):
 
     async def _analyze_user_emotion(
         self,
-        user: dict[str, Any]
+        user: dict[str, Any],
+        messages: Optional[list[dict[str, Any]]] = None,
     ) -> list[dict[str, Any]]:
         """
         ユーザーの感情を分析
 
         Args:
             user: ユーザー情報（account_id, account_name）
+            messages: 取得済みの直近メッセージ（省略時はここで取得）
 
         Returns:
             検出されたアラートのリスト
@@ -335,12 +511,13 @@ class EmotionDetector(BaseDetector):
         account_name = user['account_name']
 
         # 1. 直近のメッセージを取得
-        messages = await self._get_user_messages(account_id)
+        if messages is None:
+            messages = await self._get_user_messages(account_id)
         if len(messages) < self._min_messages:
             self._logger.debug(f"Skipping user {account_id}: insufficient messages")
             return []
 
-        # 2. 各メッセージの感情スコアを計算（または既存スコアを取得）
+        # 2. 各メッセージの感情スコアを取得（detect() で用意済みならキャッシュから）
         scores = []
         for msg in messages:
             score = await self._get_or_calculate_sentiment(msg)
@@ -462,6 +639,248 @@ class EmotionDetector(BaseDetector):
         except Exception as e:
             raise wrap_database_error(e, "get user messages")
 
+    # ================================================================
+    # 感情スコアの一括準備（v11.3.0）
+    # ================================================================
+
+    async def _collect_user_messages(
+        self,
+        users: list[dict[str, Any]]
+    ) -> list[Optional[list[dict[str, Any]]]]:
+        """
+        全ユーザーの直近メッセージを取得
+
+        Args:
+            users: ユーザーリスト
+
+        Returns:
+            users と同じ順のメッセージリスト（取得に失敗したユーザーは None）
+        """
+        user_messages: list[Optional[list[dict[str, Any]]]] = []
+        for user in users:
+            try:
+                self._conn.execute(text("SAVEPOINT user_messages"))
+                user_messages.append(await self._get_user_messages(user['account_id']))
+                self._conn.execute(text("RELEASE SAVEPOINT user_messages"))
+            except Exception as e:
+                self._logger.warning(
+                    f"Failed to get messages for user {user['account_id']}: {type(e).__name__}"
+                )
+                try:
+                    self._conn.execute(text("ROLLBACK TO SAVEPOINT user_messages"))
+                except Exception as rollback_err:
+                    self._logger.error(f"ROLLBACK TO SAVEPOINT failed: {type(rollback_err).__name__}")
+                user_messages.append(None)
+        return user_messages
+
+    async def _prepare_sentiment_scores(
+        self,
+        message_groups: list[list[dict[str, Any]]]
+    ) -> None:
+        """
+        メッセージの感情スコアをまとめて用意し、キャッシュに入れる
+
+        1. 既存スコアを1クエリで取得
+        2. 未分析のメッセージをユーザーごとにバッチ化し、共有HTTPクライアントで並行にLLM分析
+        3. 新しいスコアを一括保存
+
+        DB接続は並行利用できないため、並行にするのはLLM呼び出しだけ。
+
+        Args:
+            message_groups: ユーザーごとのメッセージリスト
+        """
+        pending_ids = [
+            str(msg['message_id'])
+            for group in message_groups for msg in group
+            if str(msg['message_id']) not in self._sentiment_cache
+        ]
+        if not pending_ids:
+            return
+
+        self._sentiment_cache.update(await self._fetch_existing_scores(pending_ids))
+
+        unscored_groups = []
+        for group in message_groups:
+            unscored = [msg for msg in group if str(msg['message_id']) not in self._sentiment_cache]
+            if unscored:
+                unscored_groups.append(unscored)
+        if not unscored_groups:
+            return
+
+        results = await self._score_message_groups(unscored_groups)
+
+        new_scores = []
+        for group in unscored_groups:
+            for msg in group:
+                sentiment = results.get(str(msg['message_id']))
+                # 分析失敗も記録し、同じ実行内で1件ずつの再分析に落ちないようにする
+                self._sentiment_cache[str(msg['message_id'])] = sentiment
+                if sentiment:
+                    new_scores.append((msg, sentiment))
+
+        await self._save_emotion_scores(new_scores)
+        self._logger.info(
+            f"Sentiment prepared: cached={len(pending_ids) - sum(len(g) for g in unscored_groups)}, "
+            f"analyzed={len(new_scores)}, failed={sum(len(g) for g in unscored_groups) - len(new_scores)}"
+        )
+
+    async def _fetch_existing_scores(
+        self,
+        message_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        既存の感情スコアをまとめて取得
+
+        Args:
+            message_ids: メッセージIDリスト
+
+        Returns:
+            str(message_id) → 感情分析結果
+        """
+        try:
+            self._conn.execute(text("SAVEPOINT fetch_emotion_scores"))
+            result = self._conn.execute(text("""
+                SELECT
+                    message_id,
+                    sentiment_score,
+                    sentiment_label,
+                    confidence,
+                    detected_emotions
+                FROM emotion_scores
+                WHERE organization_id = :org_id
+                  AND message_id = ANY(CAST(:message_ids AS bigint[]))
+            """), {
+                "org_id": str(self._org_id),
+                "message_ids": message_ids,
+            })
+            existing = {str(row[0]): _sentiment_from_row(row[1:]) for row in result}
+            self._conn.execute(text("RELEASE SAVEPOINT fetch_emotion_scores"))
+            return existing
+
+        except Exception as e:
+            safe_msg = str(e)[:200].replace('\n', ' ')
+            self._logger.warning(f"Failed to fetch existing emotion scores: {type(e).__name__}: {safe_msg}")
+            try:
+                self._conn.execute(text("ROLLBACK TO SAVEPOINT fetch_emotion_scores"))
+            except Exception as rollback_err:
+                self._logger.error(f"ROLLBACK TO SAVEPOINT failed: {type(rollback_err).__name__}")
+            return {}
+
+    async def _score_message_groups(
+        self,
+        message_groups: list[list[dict[str, Any]]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        ユーザーごとのメッセージをバッチでLLM分析（同時リクエスト数はセマフォで制限）
+
+        Args:
+            message_groups: ユーザーごとの未分析メッセージリスト
+
+        Returns:
+            str(message_id) → 感情分析結果（分析できたものだけ）
+        """
+        if not os.environ.get("OPENROUTER_API_KEY"):
+            self._logger.error("OPENROUTER_API_KEY not set")
+            return {}
+
+        size = self._sentiment_batch_size
+        batches = [
+            group[start:start + size]
+            for group in message_groups
+            for start in range(0, len(group), size)
+        ]
+        semaphore = asyncio.Semaphore(self._sentiment_max_concurrency)
+
+        async with httpx.AsyncClient(timeout=SENTIMENT_BATCH_TIMEOUT_SECONDS) as client:
+            async def run(batch: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+                async with semaphore:
+                    return await self._analyze_sentiment_batch(client, batch)
+
+            batch_results = await asyncio.gather(*(run(batch) for batch in batches))
+
+        results: dict[str, dict[str, Any]] = {}
+        for batch_result in batch_results:
+            results.update(batch_result)
+        return results
+
+    async def _analyze_sentiment_batch(
+        self,
+        client: httpx.AsyncClient,
+        messages: list[dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        複数メッセージの感情を1回のLLM呼び出しで分析
+
+        LLMには連番のidだけを渡し、メッセージIDは送らない。
+
+        Args:
+            client: 共有HTTPクライアント
+            messages: メッセージリスト
+
+        Returns:
+            str(message_id) → 感情分析結果（分析できたものだけ）
+        """
+        try:
+            items = [
+                {"id": index, "text": msg['body'][:SENTIMENT_MAX_TEXT_LENGTH]}
+                for index, msg in enumerate(messages)
+            ]
+            response = await self._call_openrouter_api_async(
+                client,
+                system_prompt=SENTIMENT_BATCH_ANALYSIS_PROMPT,
+                user_message=json.dumps(items, ensure_ascii=False),
+                max_tokens=100 + 80 * len(messages),
+                response_format=SENTIMENT_BATCH_RESPONSE_FORMAT,
+            )
+            if not response:
+                return {}
+
+            try:
+                data = json.loads(_strip_code_fence(response))
+            except json.JSONDecodeError:
+                self._logger.warning("Failed to parse batch sentiment response as JSON")
+                return {}
+
+            items_out = data.get('results') if isinstance(data, dict) else data
+            results: dict[str, dict[str, Any]] = {}
+            for item in items_out or []:
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    index = int(item.get('id'))
+                except (TypeError, ValueError):
+                    continue
+                if not 0 <= index < len(messages):
+                    continue
+                sentiment = _parse_sentiment_result(item)
+                if sentiment:
+                    results[str(messages[index]['message_id'])] = sentiment
+
+            if len(results) < len(messages):
+                self._logger.warning(
+                    f"Batch sentiment analysis incomplete: {len(results)}/{len(messages)}"
+                )
+            return results
+
+        except Exception as e:
+            self._logger.warning(f"Batch sentiment analysis failed: {type(e).__name__}")
+            return {}
+
+    def _build_score(
+        self,
+        message: dict[str, Any],
+        sentiment: dict[str, Any]
+    ) -> dict[str, Any]:
+        """感情分析結果をメッセージ単位のスコア情報にする"""
+        return {
+            'message_id': message['message_id'],
+            'sentiment_score': sentiment['sentiment_score'],
+            'sentiment_label': sentiment['sentiment_label'],
+            'confidence': sentiment.get('confidence'),
+            'detected_emotions': sentiment.get('detected_emotions', []),
+            'message_time': _ensure_aware(message['send_time']),
+        }
+
     async def _get_or_calculate_sentiment(
         self,
         message: dict[str, Any]
@@ -476,6 +895,12 @@ class EmotionDetector(BaseDetector):
             感情スコア情報
         """
         message_id = message['message_id']
+        cache_key = str(message_id)
+
+        # 0. detect() で用意済みのスコア（分析失敗も記録済みなので再分析しない）
+        if cache_key in self._sentiment_cache:
+            cached = self._sentiment_cache[cache_key]
+            return self._build_score(message, cached) if cached else None
 
         # 1. 既存のスコアを確認
         try:
@@ -496,14 +921,9 @@ class EmotionDetector(BaseDetector):
 
             row = result.fetchone()
             if row:
-                return {
-                    'message_id': message_id,
-                    'sentiment_score': float(row[0]),
-                    'sentiment_label': row[1],
-                    'confidence': float(row[2]) if row[2] else None,
-                    'detected_emotions': row[3] or [],
-                    'message_time': _ensure_aware(message['send_time']),
-                }
+                sentiment = _sentiment_from_row(row)
+                self._sentiment_cache[cache_key] = sentiment
+                return self._build_score(message, sentiment)
         except Exception as e:
             # 診断ログ: DatabaseErrorの根本原因特定（3AI合議 2026-02-15）
             safe_msg = str(e)[:200].replace('\n', ' ')
@@ -519,15 +939,9 @@ class EmotionDetector(BaseDetector):
 
             # 3. DBに保存
             await self._save_emotion_score(message, sentiment)
+            self._sentiment_cache[cache_key] = sentiment
 
-            return {
-                'message_id': message_id,
-                'sentiment_score': sentiment['sentiment_score'],
-                'sentiment_label': sentiment['sentiment_label'],
-                'confidence': sentiment.get('confidence'),
-                'detected_emotions': sentiment.get('detected_emotions', []),
-                'message_time': _ensure_aware(message['send_time']),
-            }
+            return self._build_score(message, sentiment)
 
         except Exception as e:
             self._logger.warning(f"Failed to analyze sentiment for message {message_id}: {type(e).__name__}")
@@ -545,10 +959,11 @@ class EmotionDetector(BaseDetector):
         """
         try:
             # テキストを適切な長さに制限
-            truncated_text = text_body[:500] if len(text_body) > 500 else text_body
+            truncated_text = text_body[:SENTIMENT_MAX_TEXT_LENGTH]
 
-            # OpenRouter APIを呼び出し
-            response = self._call_openrouter_api(
+            # OpenRouter APIを呼び出し（同期HTTPなのでイベントループを塞がないようスレッドで実行）
+            response = await asyncio.to_thread(
+                self._call_openrouter_api,
                 system_prompt=SENTIMENT_ANALYSIS_PROMPT,
                 user_message=truncated_text,
             )
@@ -558,30 +973,8 @@ class EmotionDetector(BaseDetector):
 
             # JSONをパース
             try:
-                # レスポンスからJSONを抽出
-                response_text = response.strip()
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-
-                result = json.loads(response_text.strip())
-
-                # 必須フィールドの検証
-                if 'sentiment_score' not in result or 'sentiment_label' not in result:
-                    return None
-
-                # スコアの範囲を制限
-                score = max(-1.0, min(1.0, float(result['sentiment_score'])))
-
-                return {
-                    'sentiment_score': score,
-                    'sentiment_label': result.get('sentiment_label', SentimentLabel.from_score(score).value),
-                    'confidence': float(result.get('confidence', 0.5)),
-                    'detected_emotions': result.get('detected_emotions', []),
-                }
+                result = json.loads(_strip_code_fence(response))
+                return _parse_sentiment_result(result)
 
             except json.JSONDecodeError:
                 self._logger.warning("Failed to parse sentiment response as JSON")
@@ -647,6 +1040,67 @@ class EmotionDetector(BaseDetector):
             self._logger.warning(f"OpenRouter API call failed: {type(e).__name__}")
             return None
 
+    async def _call_openrouter_api_async(
+        self,
+        client: httpx.AsyncClient,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 200,
+        response_format: Optional[dict[str, Any]] = None,
+        model: str = None,
+    ) -> Optional[str]:
+        """
+        OpenRouter API経由でLLMを呼び出し（非同期版）
+
+        Args:
+            client: 共有HTTPクライアント
+            system_prompt: システムプロンプト
+            user_message: ユーザーメッセージ
+            max_tokens: 最大出力トークン数
+            response_format: 構造化出力の指定
+            model: 使用するモデル
+
+        Returns:
+            LLMのレスポンステキスト
+        """
+        try:
+            api_key = os.environ.get("OPENROUTER_API_KEY")
+            if not api_key:
+                self._logger.error("OPENROUTER_API_KEY not set")
+                return None
+
+            payload: dict[str, Any] = {
+                "model": model or self._default_model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                "temperature": 0.1,
+                "max_tokens": max_tokens,
+            }
+            if response_format:
+                payload["response_format"] = response_format
+
+            response = await client.post(
+                self._openrouter_api_url,
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+            )
+
+            if response.status_code != 200:
+                self._logger.warning(f"OpenRouter API error: {response.status_code}")
+                return None
+
+            data = response.json()
+            return data.get('choices', [{}])[0].get('message', {}).get('content')
+
+        except Exception as e:
+            self._logger.warning(f"OpenRouter API call failed: {type(e).__name__}")
+            return None
+
     async def _save_emotion_score(
         self,
         message: dict[str, Any],
@@ -661,45 +1115,10 @@ class EmotionDetector(BaseDetector):
         """
         try:
             self._conn.execute(text("SAVEPOINT save_emotion_score"))
-            self._conn.execute(text("""
-                INSERT INTO emotion_scores (
-                    organization_id,
-                    message_id,
-                    room_id,
-                    user_id,
-                    sentiment_score,
-                    sentiment_label,
-                    confidence,
-                    detected_emotions,
-                    analysis_model,
-                    message_time,
-                    classification
-                ) VALUES (
-                    :org_id,
-                    :message_id,
-                    :room_id,
-                    :user_id,
-                    :sentiment_score,
-                    :sentiment_label,
-                    :confidence,
-                    :detected_emotions,
-                    :analysis_model,
-                    :message_time,
-                    'confidential'
-                )
-                ON CONFLICT (organization_id, message_id) DO NOTHING
-            """), {
-                "org_id": str(self._org_id),
-                "message_id": message['message_id'],
-                "room_id": message['room_id'],
-                "user_id": str(self._org_id),  # NOTE: user_id列はUUID型。account_id(BIGINT)は格納不可。スキーマ変更後に修正（Tier 2で対応）
-                "sentiment_score": sentiment['sentiment_score'],
-                "sentiment_label": sentiment['sentiment_label'],
-                "confidence": sentiment.get('confidence'),
-                "detected_emotions": sentiment.get('detected_emotions', []),
-                "analysis_model": self._default_model,
-                "message_time": _ensure_aware(message['send_time']),
-            })
+            self._conn.execute(
+                text(INSERT_EMOTION_SCORE_SQL),
+                self._emotion_score_params(message, sentiment),
+            )
             self._conn.execute(text("RELEASE SAVEPOINT save_emotion_score"))
 
         except Exception as e:
@@ -711,6 +1130,54 @@ class EmotionDetector(BaseDetector):
             except Exception as rollback_err:
                 self._logger.error(f"ROLLBACK TO SAVEPOINT failed: {type(rollback_err).__name__}")
 
+    async def _save_emotion_scores(
+        self,
+        scored: list[tuple[dict[str, Any], dict[str, Any]]]
+    ) -> None:
+        """
+        感情スコアをまとめてDBに保存（executemany）
+
+        Args:
+            scored: (メッセージ情報, 感情分析結果) のリスト
+        """
+        if not scored:
+            return
+        try:
+            self._conn.execute(text("SAVEPOINT save_emotion_scores"))
+            self._conn.execute(
+                text(INSERT_EMOTION_SCORE_SQL),
+                [self._emotion_score_params(message, sentiment) for message, sentiment in scored],
+            )
+            self._conn.execute(text("RELEASE SAVEPOINT save_emotion_scores"))
+
+        except Exception as e:
+            # 保存できなくても今回の分析にはキャッシュのスコアを使う（次回実行で再分析される）
+            safe_msg = str(e)[:200].replace('\n', ' ')
+            self._logger.warning(f"Failed to save emotion scores: {type(e).__name__}: {safe_msg}")
+            try:
+                self._conn.execute(text("ROLLBACK TO SAVEPOINT save_emotion_scores"))
+            except Exception as rollback_err:
+                self._logger.error(f"ROLLBACK TO SAVEPOINT failed: {type(rollback_err).__name__}")
+
+    def _emotion_score_params(
+        self,
+        message: dict[str, Any],
+        sentiment: dict[str, Any]
+    ) -> dict[str, Any]:
+        """emotion_scores INSERT のパラメータ"""
+        return {
+            "org_id": str(self._org_id),
+            "message_id": message['message_id'],
+            "room_id": message['room_id'],
+            "user_id": str(self._org_id),  # NOTE: user_id列はUUID型。account_id(BIGINT)は格納不可。スキーマ変更後に修正（Tier 2で対応）
+            "sentiment_score": sentiment['sentiment_score'],
+            "sentiment_label": sentiment['sentiment_label'],
+            "confidence": sentiment.get('confidence'),
+            "detected_emotions": sentiment.get('detected_emotions', []),
+            "analysis_model": self._default_model,
+            "message_time": _ensure_aware(message['send_time']),
+        }
+
     async def _calculate_baseline_score(self, account_id: Any) -> float:
         """
         ベースラインスコアを計算（過去N日間の平均）
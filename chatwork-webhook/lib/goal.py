@@ -483,6 +483,7 @@ class GoalService:
                 },
             )
             conn.commit()
+            _invalidate_goal_context(organization_id)
 
             # CLAUDE.md #3: confidential/restricted の操作は監査ログに記録
             classification_value = classification.value if isinstance(classification, Classification) else classification
@@ -652,6 +653,7 @@ class GoalService:
                 },
             )
             conn.commit()
+            _invalidate_goal_context(organization_id)
 
             # CLAUDE.md #3: confidential/restricted の目標は監査ログに記録
             if goal_classification in ('confidential', 'restricted') and result.rowcount > 0:
@@ -728,6 +730,7 @@ class GoalService:
                 },
             )
             conn.commit()
+            _invalidate_goal_context(organization_id)
 
             # CLAUDE.md #3: confidential/restricted の目標は監査ログに記録
             if goal_classification in ('confidential', 'restricted') and result.rowcount > 0:
@@ -875,6 +878,7 @@ class GoalService:
                     },
                 )
                 conn.commit()
+                _invalidate_goal_context(organization_id)
 
         logger.info(f"Progress recorded: goal_id={goal_id}, date={progress_date}, value={value}")
 
@@ -1124,6 +1128,16 @@ def get_goal_service(pool=None) -> GoalService:
     return GoalService(pool=pool)
 
 
+def _invalidate_goal_context(organization_id) -> None:
+    """
+    ContextBuilderの目標キャッシュを破棄
+
+    user_idはusers.id（UUID）でChatWorkアカウントIDと対応しないため、組織単位で破棄する。
+    """
+    from lib.brain.context_cache import SECTION_GOALS, invalidate_context_cache
+    invalidate_context_cache(organization_id, [SECTION_GOALS])
+
+
 # =============================================================================
 # 目標削除・整理用メソッド（v10.56.0）
 # 設計書: docs/05_phase2-5_goal_achievement.md セクション5.6, 5.7
@@ -1207,6 +1221,7 @@ def cancel_goals(
 
         result = conn.execute(text(update_query), params)
         conn.commit()
+        _invalidate_goal_context(organization_id)
 
         # 監査ログ記録（設計書5.6.4: 変更理由はaudit_logsに記録）
         # CLAUDE.md 8-3: 名前・メール・本文は記録しない → goal_titleは含めない
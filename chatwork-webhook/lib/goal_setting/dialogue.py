@@ -917,6 +917,9 @@ class GoalSettingDialogue:
             }
         )
         conn.commit()
+
+        from lib.brain.context_cache import SECTION_GOALS, invalidate_context_cache
+        invalidate_context_cache(self.org_id, [SECTION_GOALS], user_id=self.account_id)
         return goal_id
 
     def start_or_continue(self, user_message: str = None) -> Dict[str, Any]:
@@ -0,0 +1,726 @@
+"""
+ローカル（プロセス内）ベクターストア
+
+v11.3.0: PineconeClient と同じ VectorStore インターフェースを持つ NumPy 実装。
+
+用途:
+- 小規模テナント: Pineconeなしで運用（ネットワーク往復なし）
+- ローカル開発・テスト: ベクター検索を実際に動かして確認できる
+
+設計:
+- namespace（org_{organization_id}）ごとに独立したインデックス（テナント分離）
+- ベクターはコサイン類似度用に正規化した float32 行列で保持し、行列積で全件スコアリング（フラット）
+- build_ivf() で IVF（k-means による粗量子化）を作ると、近いクラスタだけを探索する
+- classification / department_id / category / document_id は転置インデックスを持ち、
+  search_with_access_control のフィルタを行マスクとして高速に評価する
+- persist() で base_dir/{namespace}/ に保存し、次回は np.load(mmap_mode="r") で
+  メモリマップとして読み込む（書き込み時にだけメモリへコピー）
+- 別プロセス（watch-google-drive 等）が保存した namespace は、meta.json の
+  差し替え（mtime / inode の変化）を検知して読み直す（未保存の変更がある場合を除く）。
+  meta.json の version は保存ごとに増える世代番号
+
+使用例:
+    from lib.local_vector_store import LocalVectorStore
+
+    store = LocalVectorStore(base_dir="/var/lib/soulkun/vectors")
+    await store.upsert_vectors(org_id, [{"id": "...", "values": [...], "metadata": {...}}])
+    await store.flush()  # ディスクへ保存
+
+    response = await store.search_with_access_control(
+        organization_id=org_id,
+        query_vector=vector,
+        accessible_classifications=["public", "internal"],
+    )
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from threading import RLock
+from typing import Any, Optional
+
+from lib.vector_store import (
+    SearchResponse,
+    SearchResult,
+    VectorStore,
+    _match_condition,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    NUMPY_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================================
+# 設定
+# ================================================================
+
+# 転置インデックスを持つメタデータフィールド（アクセス制御・削除で使うもの）
+INDEXED_FIELDS = ("classification", "department_id", "category", "document_id")
+
+# IVF探索時のクラスタ数（多いほど精度が上がり遅くなる）
+DEFAULT_IVF_NPROBE = 8
+
+# 削除済み行がこの割合を超えたら詰め直す
+COMPACTION_RATIO = 0.5
+
+_VECTORS_FILE = "vectors.npy"
+_CENTROIDS_FILE = "centroids.npy"
+_ASSIGNMENTS_FILE = "assignments.npy"
+_META_FILE = "meta.json"
+
+
+def _file_signature(path: str) -> Optional[tuple[int, int, int]]:
+    """ファイルの変更検知用の署名（inode, mtime_ns, size）。存在しなければ None
+
+    save() は rename で差し替えるため、mtime の粒度内の連続保存でも inode が変わる。
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# ================================================================
+# namespace 単位のインデックス
+# ================================================================
+
+class _NamespaceIndex:
+    """1 namespace 分のベクター・メタデータ・補助インデックス"""
+
+    def __init__(self, dimension: Optional[int] = None):
+        self.dimension = dimension
+        self.size = 0                       # 使用済み行数（削除済み行を含む）
+        self.ids: list[Optional[str]] = []  # 行 → ID（削除済みは None）
+        self.metadata: list[dict] = []
+        self.rows: dict[str, int] = {}      # ID → 行
+        self.vectors = np.zeros((0, dimension or 0), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.field_index: dict[str, dict[Any, set[int]]] = {f: {} for f in INDEXED_FIELDS}
+        # IVF（build_ivf() 実行後のみ）
+        self.centroids: Optional[Any] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.dirty = False
+        # 永続化: 保存ごとに増える世代番号と、最後に読み書きした meta.json の署名
+        self.version = 0
+        self.stamp: Optional[tuple[int, int, int]] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    # ---------------- 書き込み ----------------
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self.size + extra
+        capacity = self.vectors.shape[0]
+        if needed <= capacity and self.vectors.flags.writeable:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[:self.size] = self.assignments[:self.size]
+        self.vectors, self.alive, self.assignments = vectors, alive, assignments
+
+    def _index_metadata(self, row: int, metadata: dict) -> None:
+        for f in INDEXED_FIELDS:
+            value = metadata.get(f)
+            if value is not None and not isinstance(value, (list, dict)):
+                self.field_index[f].setdefault(value, set()).add(row)
+
+    def _unindex_metadata(self, row: int, metadata: dict) -> None:
+        for f in INDEXED_FIELDS:
+            value = metadata.get(f)
+            rows = self.field_index[f].get(value) if value is not None and not isinstance(value, (list, dict)) else None
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self.field_index[f][value]
+
+    def _assign_cluster(self, vectors: Any) -> Any:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def upsert(self, items: list[tuple[str, Any, dict]]) -> None:
+        """(id, 正規化済みベクター, metadata) を追加・上書き"""
+        self._ensure_capacity(len(items))
+        for vector_id, vector, metadata in items:
+            row = self.rows.get(vector_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.ids.append(vector_id)
+                self.metadata.append(metadata)
+                self.rows[vector_id] = row
+            else:
+                self._unindex_metadata(row, self.metadata[row])
+                self.metadata[row] = metadata
+            self.vectors[row] = vector
+            self.alive[row] = True
+            self._index_metadata(row, metadata)
+            if self.centroids is not None:
+                self.assignments[row] = self._assign_cluster(vector[None, :])[0]
+        self.dirty = True
+
+    def update_metadata(self, vector_id: str, metadata: dict) -> bool:
+        """メタデータをマージ更新（Pineconeの set_metadata と同じ挙動）"""
+        row = self.rows.get(vector_id)
+        if row is None:
+            return False
+        self._unindex_metadata(row, self.metadata[row])
+        self.metadata[row] = {**self.metadata[row], **metadata}
+        self._index_metadata(row, self.metadata[row])
+        self.dirty = True
+        return True
+
+    def delete_rows(self, rows: list[int]) -> int:
+        if not rows:
+            return 0
+        for row in rows:
+            vector_id = self.ids[row]
+            if vector_id is None:
+                continue
+            self._unindex_metadata(row, self.metadata[row])
+            del self.rows[vector_id]
+            self.ids[row] = None
+            self.metadata[row] = {}
+            self.alive[row] = False
+        self.dirty = True
+        if self.size and (self.size - self.count) / self.size > COMPACTION_RATIO:
+            self._compact()
+        return len(rows)
+
+    def _compact(self) -> None:
+        """削除済み行を詰める"""
+        keep = np.flatnonzero(self.alive[:self.size])
+        ids = [self.ids[r] for r in keep]
+        metadata = [self.metadata[r] for r in keep]
+        self.vectors = np.ascontiguousarray(self.vectors[keep])
+        self.assignments = np.ascontiguousarray(self.assignments[keep])
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.size = len(keep)
+        self.ids = ids  # type: ignore[assignment]
+        self.metadata = metadata
+        self.rows = {vid: i for i, vid in enumerate(ids)}  # type: ignore[misc]
+        self.field_index = {f: {} for f in INDEXED_FIELDS}
+        for row, meta in enumerate(metadata):
+            self._index_metadata(row, meta)
+
+    # ---------------- IVF ----------------
+
+    def build_ivf(self, nlist: int, iterations: int = 10, seed: int = 0) -> int:
+        """球面k-meansでクラスタ中心を学習し、全行を割り当てる"""
+        live = np.flatnonzero(self.alive[:self.size])
+        if len(live) == 0:
+            return 0
+        nlist = max(1, min(nlist, len(live)))
+        data = self.vectors[live]
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(live), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[labels == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm > 0:
+                        centroids[c] = centroid / norm
+
+        self.centroids = centroids
+        self._ensure_capacity(0)
+        self.assignments[:self.size] = -1
+        self.assignments[live] = self._assign_cluster(data)
+        self.dirty = True
+        return nlist
+
+    # ---------------- 検索 ----------------
+
+    def _rows_mask(self, rows: set[int]) -> Any:
+        mask = np.zeros(self.size, dtype=bool)
+        if rows:
+            mask[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+        return mask
+
+    def _field_mask(self, key: str, condition: Any) -> Any:
+        index = self.field_index.get(key)
+        if index is not None:
+            if not isinstance(condition, dict):
+                return self._rows_mask(index.get(condition, set()))
+            if set(condition) == {"$eq"}:
+                return self._rows_mask(index.get(condition["$eq"], set()))
+            if set(condition) == {"$in"}:
+                rows: set[int] = set()
+                for value in condition["$in"]:
+                    rows |= index.get(value, set())
+                return self._rows_mask(rows)
+        # 転置インデックスがないフィールドは行ごとに評価
+        return np.fromiter(
+            (_match_condition(meta.get(key), condition) for meta in self.metadata[:self.size]),
+            dtype=bool,
+            count=self.size,
+        )
+
+    def filter_mask(self, filter: Optional[dict]) -> Any:
+        """Pinecone形式フィルタ → 行マスク"""
+        mask = np.ones(self.size, dtype=bool)
+        for key, condition in (filter or {}).items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self.filter_mask(sub)
+            elif key == "$or":
+                any_mask = np.zeros(self.size, dtype=bool)
+                for sub in condition:
+                    any_mask |= self.filter_mask(sub)
+                mask &= any_mask
+            else:
+                mask &= self._field_mask(key, condition)
+        return mask
+
+    def search(
+        self,
+        query: Any,
+        top_k: int,
+        filter: Optional[dict],
+        nprobe: int,
+    ) -> list[tuple[int, float]]:
+        if self.size == 0 or top_k <= 0:
+            return []
+        mask = self.filter_mask(filter) & self.alive[:self.size]
+
+        if self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            ivf_mask = mask & np.isin(self.assignments[:self.size], probes)
+            # 探索範囲が狭すぎて top_k に満たない場合はフラット検索にフォールバック
+            if np.count_nonzero(ivf_mask) >= top_k:
+                mask = ivf_mask
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ query
+        if len(candidates) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    # ---------------- 永続化 ----------------
+
+    def save(self, directory: str) -> None:
+        """directory に保存（一時ファイル → rename で差し替え）"""
+        os.makedirs(directory, exist_ok=True)
+        live = np.flatnonzero(self.alive[:self.size])
+
+        def _atomic_save(name: str, array: Any) -> None:
+            tmp = os.path.join(directory, name + ".tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, os.path.join(directory, name))
+
+        _atomic_save(_VECTORS_FILE, np.ascontiguousarray(self.vectors[live]))
+        if self.centroids is not None:
+            _atomic_save(_CENTROIDS_FILE, self.centroids)
+            _atomic_save(_ASSIGNMENTS_FILE, np.ascontiguousarray(self.assignments[live]))
+        else:
+            for name in (_CENTROIDS_FILE, _ASSIGNMENTS_FILE):
+                path = os.path.join(directory, name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.version += 1
+        meta = {
+            "version": self.version,
+            "dimension": self.dimension,
+            "ids": [self.ids[r] for r in live],
+            "metadata": [self.metadata[r] for r in live],
+        }
+        tmp = os.path.join(directory, _META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        meta_path = os.path.join(directory, _META_FILE)
+        os.replace(tmp, meta_path)
+        self.stamp = _file_signature(meta_path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, directory: str) -> "_NamespaceIndex":
+        """directory から読み込み（ベクターはメモリマップ）"""
+        meta_path = os.path.join(directory, _META_FILE)
+        # 読み込み前に署名を取る（読み込み中に差し替わっても次回アクセスで読み直される）
+        signature = _file_signature(meta_path)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["dimension"])
+        index.version = meta.get("version", 0)
+        index.stamp = signature
+        index.vectors = np.load(os.path.join(directory, _VECTORS_FILE), mmap_mode="r")
+        index.size = len(meta["ids"])
+        index.ids = meta["ids"]
+        index.metadata = meta["metadata"]
+        index.rows = {vid: i for i, vid in enumerate(index.ids)}
+        index.alive = np.ones(index.size, dtype=bool)
+        index.assignments = np.full(index.size, -1, dtype=np.int32)
+        centroids_path = os.path.join(directory, _CENTROIDS_FILE)
+        if os.path.exists(centroids_path):
+            index.centroids = np.load(centroids_path)
+            index.assignments = np.load(os.path.join(directory, _ASSIGNMENTS_FILE))
+        for row, metadata in enumerate(index.metadata):
+            index._index_metadata(row, metadata)
+        return index
+
+
+# ================================================================
+# LocalVectorStore
+# ================================================================
+
+class LocalVectorStore(VectorStore):
+    """
+    NumPy によるプロセス内ベクターストア（PineconeClient 互換）
+
+    スコアはコサイン類似度（Pineconeの cosine インデックスと同じ尺度）。
+    スレッドセーフ（RLockで保護）。検索・更新は asyncio.to_thread で実行し、
+    イベントループをブロックしない。
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        dimension: Optional[int] = None,
+        nprobe: int = DEFAULT_IVF_NPROBE,
+    ):
+        """
+        Args:
+            base_dir: 永続化ディレクトリ（Noneならメモリのみ）
+            dimension: ベクター次元数（Noneなら最初のupsertで決定）
+            nprobe: IVF探索時に調べるクラスタ数
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "LocalVectorStore には numpy が必要です。pip install numpy を実行してください。"
+            )
+        self.base_dir = base_dir
+        self.dimension = dimension
+        self.nprobe = nprobe
+        self._indexes: dict[str, _NamespaceIndex] = {}
+        self._lock = RLock()
+
+    # ================================================================
+    # 内部処理
+    # ================================================================
+
+    def _namespace_dir(self, namespace: str) -> Optional[str]:
+        if not self.base_dir:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9_\-]", "_", namespace)
+        return os.path.join(self.base_dir, safe)
+
+    def _get_index(self, namespace: str, create: bool = False) -> Optional[_NamespaceIndex]:
+        index = self._indexes.get(namespace)
+        directory = self._namespace_dir(namespace)
+        if index is not None:
+            # 未保存の変更があるとき・ディスク上の meta.json が変わっていないときはそのまま使う
+            if not directory or index.dirty or not self._is_stale(index, directory):
+                return index
+            previous = index.version
+            index = _NamespaceIndex.load(directory)
+            logger.info(
+                f"LocalVectorStore: reloaded {namespace} "
+                f"(version {previous} -> {index.version})"
+            )
+        elif directory and os.path.exists(os.path.join(directory, _META_FILE)):
+            index = _NamespaceIndex.load(directory)
+        elif create:
+            index = _NamespaceIndex(self.dimension)
+        else:
+            return None
+        self._indexes[namespace] = index
+        return index
+
+    @staticmethod
+    def _is_stale(index: _NamespaceIndex, directory: str) -> bool:
+        """ディスク上の meta.json がこのインデックスの読み込み・保存以降に差し替わったか"""
+        signature = _file_signature(os.path.join(directory, _META_FILE))
+        return signature is not None and signature != index.stamp
+
+    def _normalize(self, values: Any, dimension: Optional[int]) -> Any:
+        vector = np.asarray(values, dtype=np.float32)
+        if vector.ndim != 1:
+            raise ValueError("ベクターは1次元である必要があります")
+        if dimension is not None and vector.shape[0] != dimension:
+            raise ValueError(
+                f"ベクターの次元数が一致しません: {vector.shape[0]} != {dimension}"
+            )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _upsert_sync(self, namespace: str, vectors: list[dict]) -> int:
+        with self._lock:
+            index = self._get_index(namespace, create=True)
+            if index.dimension is None and vectors:
+                index.dimension = len(vectors[0]["values"])
+                index.vectors = np.zeros((0, index.dimension), dtype=np.float32)
+            items = [
+                (v["id"], self._normalize(v["values"], index.dimension), dict(v.get("metadata") or {}))
+                for v in vectors
+            ]
+            index.upsert(items)
+            return len(items)
+
+    def _update_metadata_sync(self, namespace: str, updates: list[dict]) -> int:
+        updated_count = 0
+        with self._lock:
+            index = self._get_index(namespace)
+            if index is None:
+                return 0
+            for item in updates:
+                vector_id = item.get("id")
+                metadata = item.get("metadata", {})
+                if not vector_id or not metadata:
+                    continue
+                if index.update_metadata(vector_id, metadata):
+                    updated_count += 1
+        return updated_count
+
+    def _delete_ids_sync(self, namespace: str, vector_ids: list[str]) -> None:
+        with self._lock:
+            index = self._get_index(namespace)
+            if index is not None:
+                index.delete_rows([index.rows[v] for v in vector_ids if v in index.rows])
+
+    def _delete_by_filter_sync(self, namespace: str, filter: dict) -> None:
+        with self._lock:
+            index = self._get_index(namespace)
+            if index is None or index.size == 0:
+                return
+            mask = index.filter_mask(filter) & index.alive[:index.size]
+            index.delete_rows([int(r) for r in np.flatnonzero(mask)])
+
+    def _describe_sync(self, organization_id: Optional[str]) -> dict:
+        with self._lock:
+            if organization_id:
+                namespace = self.get_namespace(organization_id)
+                index = self._get_index(namespace)
+                return {
+                    "namespace": namespace,
+                    "vector_count": index.count if index else 0,
+                    "dimension": index.dimension if index else self.dimension,
+                }
+            return {
+                "total_vector_count": sum(i.count for i in self._indexes.values()),
+                "dimension": self.dimension,
+                "namespaces": {
+                    ns: {"vector_count": i.count}
+                    for ns, i in self._indexes.items()
+                },
+            }
+
+    def _search_sync(
+        self,
+        namespace: str,
+        query_vector: list[float],
+        top_k: int,
+        filters: Optional[dict],
+        include_metadata: bool,
+    ) -> SearchResponse:
+        with self._lock:
+            index = self._get_index(namespace)
+            if index is None or index.count == 0:
+                return SearchResponse(results=[], total_count=0, namespace=namespace)
+            query = self._normalize(query_vector, index.dimension)
+            hits = index.search(query, top_k, filters, self.nprobe)
+            results = [
+                SearchResult(
+                    id=index.ids[row],  # type: ignore[arg-type]
+                    score=score,
+                    metadata=dict(index.metadata[row]) if include_metadata else {},
+                )
+                for row, score in hits
+            ]
+        return SearchResponse(results=results, total_count=len(results), namespace=namespace)
+
+    # ================================================================
+    # ベクター操作
+    # ================================================================
+
+    async def upsert_vectors(
+        self,
+        organization_id: str,
+        vectors: list[dict],
+        batch_size: int = 100,
+    ) -> int:
+        """
+        ベクターをupsert（batch_size は互換性のためのみ。一括で処理する）
+
+        Args:
+            organization_id: 組織ID
+            vectors: [{"id": ..., "values": [...], "metadata": {...}}]
+
+        Returns:
+            upsertされたベクター数
+        """
+        namespace = self.get_namespace(organization_id)
+        return await asyncio.to_thread(self._upsert_sync, namespace, vectors)
+
+    async def update_metadata_batch(
+        self,
+        organization_id: str,
+        updates: list[dict],
+    ) -> int:
+        """
+        メタデータのみを更新（既存メタデータにマージ）
+
+        Returns:
+            更新されたベクター数
+        """
+        namespace = self.get_namespace(organization_id)
+        return await asyncio.to_thread(self._update_metadata_sync, namespace, updates)
+
+    async def delete_vectors(
+        self,
+        organization_id: str,
+        vector_ids: list[str],
+    ) -> int:
+        """
+        ベクターを削除
+
+        Returns:
+            削除要求されたベクター数（PineconeClient と同じ）
+        """
+        namespace = self.get_namespace(organization_id)
+        await asyncio.to_thread(self._delete_ids_sync, namespace, vector_ids)
+        return len(vector_ids)
+
+    async def delete_by_filter(
+        self,
+        organization_id: str,
+        filter: dict,
+    ) -> None:
+        """
+        フィルタに一致するベクターを削除
+
+        Args:
+            organization_id: 組織ID
+            filter: メタデータフィルタ（例: {"document_id": "doc123"}）
+        """
+        namespace = self.get_namespace(organization_id)
+        await asyncio.to_thread(self._delete_by_filter_sync, namespace, filter)
+
+    async def describe_index_stats(
+        self,
+        organization_id: Optional[str] = None
+    ) -> dict:
+        """インデックスの統計情報を取得（PineconeClient と同じ形式）"""
+        return await asyncio.to_thread(self._describe_sync, organization_id)
+
+    # ================================================================
+    # 検索
+    # ================================================================
+
+    async def search(
+        self,
+        organization_id: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_metadata: bool = True,
+    ) -> SearchResponse:
+        """
+        ベクター検索を実行（コサイン類似度の降順）
+
+        Args:
+            organization_id: 組織ID
+            query_vector: クエリベクター
+            top_k: 返す結果の数
+            filters: メタデータフィルタ（Pinecone形式）
+            include_metadata: メタデータを含めるか
+
+        Returns:
+            SearchResponse オブジェクト
+        """
+        namespace = self.get_namespace(organization_id)
+        return await asyncio.to_thread(
+            self._search_sync, namespace, query_vector, top_k, filters, include_metadata,
+        )
+
+    # ================================================================
+    # インデックス管理
+    # ================================================================
+
+    def build_ivf(
+        self,
+        organization_id: str,
+        nlist: Optional[int] = None,
+        iterations: int = 10,
+    ) -> int:
+        """
+        IVFインデックスを構築（件数が多い namespace 向け）
+
+        Args:
+            organization_id: 組織ID
+            nlist: クラスタ数（未指定時は sqrt(件数)）
+            iterations: k-meansの反復回数
+
+        Returns:
+            作成したクラスタ数（ベクターがなければ0）
+        """
+        with self._lock:
+            index = self._get_index(self.get_namespace(organization_id))
+            if index is None or index.count == 0:
+                return 0
+            nlist = nlist or max(1, int(index.count ** 0.5))
+            return index.build_ivf(nlist, iterations=iterations)
+
+    def persist(self, organization_id: Optional[str] = None) -> int:
+        """
+        変更のある namespace をディスクに保存
+
+        Args:
+            organization_id: 指定時はその組織のみ
+
+        Returns:
+            保存した namespace 数
+        """
+        if not self.base_dir:
+            return 0
+        saved = 0
+        with self._lock:
+            namespaces = (
+                [self.get_namespace(organization_id)] if organization_id
+                else list(self._indexes.keys())
+            )
+            for namespace in namespaces:
+                index = self._indexes.get(namespace)
+                if index is None or not index.dirty:
+                    continue
+                index.save(self._namespace_dir(namespace))  # type: ignore[arg-type]
+                saved += 1
+        return saved
+
+    async def flush(self) -> None:
+        """変更をディスクに保存（VectorStore インターフェース）"""
+        await asyncio.to_thread(self.persist)
+
+
+# ================================================================
+# エクスポート
+# ================================================================
+
+__all__ = [
+    'LocalVectorStore',
+    'NUMPY_AVAILABLE',
+    'INDEXED_FIELDS',
+]
@@ -115,7 +115,8 @@ class MeetingBrainInterface:
             )
 
             # 5. PII除去
-            sanitized, pii_count = self.sanitizer.sanitize(transcript_text)
+            redaction = self.sanitizer.sanitize_with_counts(transcript_text)
+            sanitized, pii_count = redaction.text, redaction.total
 
             # 6. 文字起こし結果を保存（segments/speakersもサニタイズ）
             await asyncio.to_thread(
@@ -146,8 +147,8 @@ class MeetingBrainInterface:
                 )
 
             logger.info(
-                "Meeting transcribed: id=%s, pii_removed=%d, words=%d",
-                meeting_id, pii_count, len(sanitized),
+                "Meeting transcribed: id=%s, pii_removed=%d, pii_categories=%s, words=%d",
+                meeting_id, pii_count, redaction.counts, len(sanitized),
             )
 
             # 8. 議事録自動生成（enable_minutes=True かつ LLM関数ありの場合のみ）
@@ -162,6 +163,7 @@ class MeetingBrainInterface:
                 "status": "transcribed",
                 "sanitized_transcript": sanitized[:4000],
                 "pii_removed_count": pii_count,
+                "pii_counts_by_category": redaction.counts,
                 "duration_seconds": audio_meta.get("duration", 0),
                 "speakers_detected": audio_meta.get("speakers_count", 0),
             }
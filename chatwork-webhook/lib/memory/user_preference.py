@@ -198,6 +198,10 @@ class UserPreference(BaseMemory):
             row = result.fetchone()
             self.conn.commit()
 
+            # ContextBuilderの嗜好キャッシュを破棄（user_idはUUIDのため組織単位）
+            from lib.brain.context_cache import SECTION_PREFERENCES, invalidate_context_cache
+            invalidate_context_cache(self.org_id, [SECTION_PREFERENCES])
+
             pref_id = row[0]
             new_confidence = row[1]
             sample_count = row[2]
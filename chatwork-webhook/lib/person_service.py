@@ -17,6 +17,7 @@ from typing import Optional, List, Dict, Any, Callable, Tuple
 logger = logging.getLogger(__name__)
 
 from lib.brain.hybrid_search import escape_ilike
+from lib.brain.context_cache import SECTION_PERSONS, invalidate_context_cache
 
 
 class PersonService:
@@ -52,7 +53,9 @@ class PersonService:
                 sqlalchemy.text("INSERT INTO persons (name, organization_id) VALUES (:name, :org_id) RETURNING id"),
                 {"name": name, "org_id": self.organization_id}
             )
-            return str(result.fetchone()[0])
+            person_id = str(result.fetchone()[0])
+        invalidate_context_cache(self.organization_id, [SECTION_PERSONS])
+        return person_id
 
     def save_person_attribute(
         self,
@@ -74,6 +77,7 @@ class PersonService:
                 """),
                 {"person_id": person_id, "attr_type": attribute_type, "attr_value": attribute_value, "source": source, "org_id": self.organization_id}
             )
+        invalidate_context_cache(self.organization_id, [SECTION_PERSONS])
         return True
 
     def get_person_info(self, person_name: str) -> Optional[Dict[str, Any]]:
@@ -119,6 +123,7 @@ class PersonService:
                     {"person_id": person_id, "org_id": self.organization_id}
                 )
                 trans.commit()
+                invalidate_context_cache(self.organization_id, [SECTION_PERSONS])
                 return True
             except Exception as e:
                 trans.rollback()
@@ -27,71 +27,30 @@ Pinecone ベクターDB 連携モジュール
 
 import os
 import asyncio
-from typing import Optional, Any
-from dataclasses import dataclass, field
+from typing import Optional
 import logging
 
 from pinecone import Pinecone, ServerlessSpec
 
 from lib.config import get_settings
 from lib.secrets import get_secret
+# v11.3.0: 検索結果の型と共通処理は lib.vector_store に移設（後方互換で再エクスポート）
+from lib.vector_store import SearchResult, SearchResponse, VectorStore
 
 
 logger = logging.getLogger(__name__)
 
 
-# ================================================================
-# データクラス定義
-# ================================================================
-
-@dataclass
-class SearchResult:
-    """検索結果"""
-    id: str
-    score: float
-    metadata: dict = field(default_factory=dict)
-
-    @property
-    def chunk_id(self) -> str:
-        """チャンクID（pinecone_id）"""
-        return self.id
-
-    @property
-    def document_id(self) -> Optional[str]:
-        """ドキュメントID（メタデータから取得）"""
-        return self.metadata.get('document_id')
-
-
-@dataclass
-class SearchResponse:
-    """検索レスポンス"""
-    results: list[SearchResult]
-    total_count: int
-    namespace: str
-
-    @property
-    def top_score(self) -> Optional[float]:
-        """最高スコア"""
-        if self.results:
-            return self.results[0].score
-        return None
-
-    @property
-    def average_score(self) -> Optional[float]:
-        """平均スコア"""
-        if self.results:
-            return sum(r.score for r in self.results) / len(self.results)
-        return None
-
-
 # ================================================================
 # Pinecone クライアント
 # ================================================================
 
-class PineconeClient:
+class PineconeClient(VectorStore):
     """
     Pinecone ベクターDBクライアント
 
+    v11.3.0: VectorStore インターフェースの実装（ローカル版は lib.local_vector_store）
+
     使用例:
         client = PineconeClient()
 
@@ -165,19 +124,6 @@ class PineconeClient:
             self._index = self.pc.Index(self.index_name)
         return self._index
 
-    # ================================================================
-    # Namespace
-    # ================================================================
-
-    def get_namespace(self, organization_id: str) -> str:
-        """
-        組織IDからnamespaceを生成
-
-        フォーマット: org_{organization_id}
-        例: 5f98365f-e7c5-4f48-9918-7fe9aabae5df
-        """
-        return f"org_{organization_id}"
-
     # ================================================================
     # インデックス操作
     # ================================================================
@@ -428,26 +374,6 @@ class PineconeClient:
             )
         )
 
-    async def delete_document_vectors(
-        self,
-        organization_id: str,
-        document_id: str,
-        version: Optional[int] = None,
-    ) -> None:
-        """
-        ドキュメントに関連するベクターを削除
-
-        Args:
-            organization_id: 組織ID
-            document_id: ドキュメントID
-            version: バージョン番号（指定時はそのバージョンのみ削除）
-        """
-        filter = {"document_id": document_id}
-        if version is not None:
-            filter["version"] = version
-
-        await self.delete_by_filter(organization_id, filter)
-
     # ================================================================
     # 検索
     # ================================================================
@@ -506,162 +432,6 @@ class PineconeClient:
             namespace=namespace,
         )
 
-    async def search_with_access_control(
-        self,
-        organization_id: str,
-        query_vector: list[float],
-        accessible_classifications: list[str],
-        accessible_department_ids: Optional[list[str]] = None,
-        top_k: int = 5,
-        category_filter: Optional[list[str]] = None,
-    ) -> SearchResponse:
-        """
-        アクセス制御を適用した検索
-
-        Args:
-            organization_id: 組織ID
-            query_vector: クエリベクター
-            accessible_classifications: アクセス可能な機密区分のリスト
-            accessible_department_ids: アクセス可能な部署IDのリスト（confidential用）
-            top_k: 返す結果の数
-            category_filter: カテゴリフィルタ
-
-        Returns:
-            SearchResponse オブジェクト
-        """
-        # フィルタを構築
-        # 部署アクセス制御の有無で分岐
-        # accessible_department_ids が None → 部署フィルタなし（classification のみ）
-        # accessible_department_ids が [] → confidential アクセス不可（non-confidential のみ）
-        # accessible_department_ids が ["dept_1"] → non-confidential + confidential(部署一致)
-        if accessible_department_ids is not None:
-            non_confidential = [c for c in accessible_classifications if c != "confidential"]
-            has_confidential = "confidential" in accessible_classifications
-
-            access_or: list[dict[str, Any]] = []
-            if non_confidential:
-                access_or.append({"classification": {"$in": non_confidential}})
-            if has_confidential and accessible_department_ids:
-                access_or.append({
-                    "$and": [
-                        {"classification": "confidential"},
-                        {"department_id": {"$in": accessible_department_ids}},
-                    ]
-                })
-
-            if not access_or:
-                # アクセス可能な分類なし → 空結果を返すフィルタ
-                filters: dict[str, Any] = {"classification": {"$in": []}}
-            elif len(access_or) == 1:
-                filters = access_or[0]
-            else:
-                filters = {"$or": access_or}
-        else:
-            filters: dict[str, Any] = {
-                "classification": {"$in": accessible_classifications}
-            }
-
-        # カテゴリフィルタ
-        if category_filter:
-            filters = {"$and": [filters, {"category": {"$in": category_filter}}]}
-
-        return await self.search(
-            organization_id=organization_id,
-            query_vector=query_vector,
-            top_k=top_k,
-            filters=filters,
-            include_metadata=True,
-        )
-
-    # ================================================================
-    # ユーティリティ
-    # ================================================================
-
-    def generate_pinecone_id(
-        self,
-        organization_id: str,
-        document_id: str,
-        version: int,
-        chunk_index: int,
-    ) -> str:
-        """
-        Pinecone IDを生成
-
-        フォーマット: {org_id}_{doc_id}_v{version}_chunk{index}
-        例: 5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001_v1_chunk0
-        """
-        return f"{organization_id}_{document_id}_v{version}_chunk{chunk_index}"
-
-    def parse_pinecone_id(self, pinecone_id: str) -> dict:
-        """
-        Pinecone IDをパース
-
-        フォーマット: {org_id}_{doc_id}_v{version}_chunk{index}
-        例: 5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001_v1_chunk0
-            → organization_id: "5f98365f-e7c5-4f48-9918-7fe9aabae5df"
-            → document_id: "doc_manual001"
-            → version: 1
-            → chunk_index: 0
-
-        Returns:
-            {
-                "organization_id": "5f98365f-e7c5-4f48-9918-7fe9aabae5df",
-                "document_id": "doc_manual001",
-                "version": 1,
-                "chunk_index": 0
-            }
-        """
-        # Step 1: _chunk{N} を分離
-        parts = pinecone_id.rsplit("_chunk", 1)
-        if len(parts) != 2:
-            return {"raw": pinecone_id}
-
-        try:
-            chunk_index = int(parts[1])
-        except ValueError:
-            return {"raw": pinecone_id}
-
-        remaining = parts[0]
-
-        # Step 2: _v{N} を分離
-        version_parts = remaining.rsplit("_v", 1)
-        if len(version_parts) != 2:
-            return {"raw": pinecone_id, "chunk_index": chunk_index}
-
-        try:
-            version = int(version_parts[1])
-        except ValueError:
-            return {"raw": pinecone_id, "chunk_index": chunk_index}
-
-        # Step 3: organization_id と document_id を分離
-        # document_idは "doc" で始まることを想定
-        # 例: "5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001" → 5f98365f-e7c5-4f48-9918-7fe9aabae5df + doc_manual001
-        org_doc_str = version_parts[0]
-
-        # "_doc" を探して分割（document_idは "doc" で始まる規約）
-        doc_prefix_index = org_doc_str.find("_doc")
-        if doc_prefix_index > 0:
-            organization_id = org_doc_str[:doc_prefix_index]
-            document_id = org_doc_str[doc_prefix_index + 1:]  # "_doc" の "_" をスキップ
-        else:
-            # "_doc" が見つからない場合は最初の "_" で分割（フォールバック）
-            fallback_parts = org_doc_str.split("_", 1)
-            if len(fallback_parts) != 2:
-                return {
-                    "raw": pinecone_id,
-                    "version": version,
-                    "chunk_index": chunk_index
-                }
-            organization_id = fallback_parts[0]
-            document_id = fallback_parts[1]
-
-        return {
-            "organization_id": organization_id,
-            "document_id": document_id,
-            "version": version,
-            "chunk_index": chunk_index
-        }
-
 
 # ================================================================
 # エクスポート
@@ -0,0 +1,513 @@
+"""
+ベクターストア共通インターフェース
+
+v11.3.0: Pinecone以外のバックエンド（ローカルNumPyインデックス）を差し替え可能にする。
+
+- VectorStore: バックエンド共通の基底クラス（PineconeClient / LocalVectorStore）
+- SearchResult / SearchResponse: 検索結果（pinecone_client から移設、後方互換で再エクスポート）
+- build_access_control_filter(): 機密区分・部署のアクセス制御フィルタ（Pinecone形式）
+- matches_filter(): Pinecone形式フィルタのローカル評価
+- create_vector_store(): 設定（VECTOR_STORE_BACKEND）に応じてバックエンドを生成
+- get_vector_store(): プロセス共通のインスタンス（リクエストごとに作り直さない）
+
+使用例:
+    from lib.vector_store import get_vector_store
+
+    store = get_vector_store()  # "pinecone"（デフォルト） or "local"
+    response = await store.search_with_access_control(
+        organization_id=org_id,
+        query_vector=vector,
+        accessible_classifications=["public", "internal"],
+    )
+
+設計ドキュメント:
+    docs/05_phase3_knowledge_detailed_design.md
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import logging
+import threading
+
+from lib.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# ================================================================
+# 設定
+# ================================================================
+
+VECTOR_STORE_PINECONE = "pinecone"
+VECTOR_STORE_LOCAL = "local"
+
+
+# ================================================================
+# データクラス定義
+# ================================================================
+
+@dataclass
+class SearchResult:
+    """検索結果"""
+    id: str
+    score: float
+    metadata: dict = field(default_factory=dict)
+
+    @property
+    def chunk_id(self) -> str:
+        """チャンクID（pinecone_id）"""
+        return self.id
+
+    @property
+    def document_id(self) -> Optional[str]:
+        """ドキュメントID（メタデータから取得）"""
+        return self.metadata.get('document_id')
+
+
+@dataclass
+class SearchResponse:
+    """検索レスポンス"""
+    results: list[SearchResult]
+    total_count: int
+    namespace: str
+
+    @property
+    def top_score(self) -> Optional[float]:
+        """最高スコア"""
+        if self.results:
+            return self.results[0].score
+        return None
+
+    @property
+    def average_score(self) -> Optional[float]:
+        """平均スコア"""
+        if self.results:
+            return sum(r.score for r in self.results) / len(self.results)
+        return None
+
+
+# ================================================================
+# フィルタ
+# ================================================================
+
+def build_access_control_filter(
+    accessible_classifications: list[str],
+    accessible_department_ids: Optional[list[str]] = None,
+    category_filter: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """
+    アクセス制御フィルタを構築（Pinecone形式）
+
+    部署アクセス制御の有無で分岐:
+    - accessible_department_ids が None → 部署フィルタなし（classification のみ）
+    - accessible_department_ids が [] → confidential アクセス不可（non-confidential のみ）
+    - accessible_department_ids が ["dept_1"] → non-confidential + confidential(部署一致)
+
+    Args:
+        accessible_classifications: アクセス可能な機密区分のリスト
+        accessible_department_ids: アクセス可能な部署IDのリスト（confidential用）
+        category_filter: カテゴリフィルタ
+
+    Returns:
+        メタデータフィルタ
+    """
+    if accessible_department_ids is not None:
+        non_confidential = [c for c in accessible_classifications if c != "confidential"]
+        has_confidential = "confidential" in accessible_classifications
+
+        access_or: list[dict[str, Any]] = []
+        if non_confidential:
+            access_or.append({"classification": {"$in": non_confidential}})
+        if has_confidential and accessible_department_ids:
+            access_or.append({
+                "$and": [
+                    {"classification": "confidential"},
+                    {"department_id": {"$in": accessible_department_ids}},
+                ]
+            })
+
+        if not access_or:
+            # アクセス可能な分類なし → 空結果を返すフィルタ
+            filters: dict[str, Any] = {"classification": {"$in": []}}
+        elif len(access_or) == 1:
+            filters = access_or[0]
+        else:
+            filters = {"$or": access_or}
+    else:
+        filters = {
+            "classification": {"$in": accessible_classifications}
+        }
+
+    # カテゴリフィルタ
+    if category_filter:
+        filters = {"$and": [filters, {"category": {"$in": category_filter}}]}
+
+    return filters
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    """1フィールド分の条件を評価"""
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op == "$eq":
+            ok = value == operand
+        elif op == "$ne":
+            ok = value != operand
+        elif op == "$in":
+            ok = value in operand
+        elif op == "$nin":
+            ok = value not in operand
+        elif op == "$exists":
+            ok = (value is not None) == bool(operand)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            try:
+                ok = {
+                    "$gt": value > operand,
+                    "$gte": value >= operand,
+                    "$lt": value < operand,
+                    "$lte": value <= operand,
+                }[op]
+            except TypeError:
+                return False
+        else:
+            raise ValueError(f"サポートされていないフィルタ演算子: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def matches_filter(metadata: dict, filter: Optional[dict]) -> bool:
+    """
+    Pinecone形式のメタデータフィルタをローカルで評価
+
+    対応: 暗黙の等価、$eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $exists, $and, $or
+
+    Args:
+        metadata: ベクターのメタデータ
+        filter: フィルタ（Noneなら常にTrue）
+
+    Returns:
+        条件を満たす場合True
+    """
+    if not filter:
+        return True
+
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, f) for f in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, f) for f in condition):
+                return False
+        elif not _match_condition(metadata.get(key), condition):
+            return False
+    return True
+
+
+# ================================================================
+# 基底クラス
+# ================================================================
+
+class VectorStore(ABC):
+    """
+    ベクターストアの共通インターフェース（抽象基底クラス）
+
+    organization_id ごとに namespace を分離する（テナント分離）。
+    サブクラスは search / upsert_vectors / delete_vectors / delete_by_filter /
+    update_metadata_batch / describe_index_stats を実装する。
+    """
+
+    def get_namespace(self, organization_id: str) -> str:
+        """
+        組織IDからnamespaceを生成
+
+        フォーマット: org_{organization_id}
+        """
+        return f"org_{organization_id}"
+
+    @abstractmethod
+    async def upsert_vectors(
+        self,
+        organization_id: str,
+        vectors: list[dict],
+        batch_size: int = 100,
+    ) -> int:
+        """ベクターをupsertし、upsertした件数を返す"""
+        ...
+
+    @abstractmethod
+    async def update_metadata_batch(
+        self,
+        organization_id: str,
+        updates: list[dict],
+    ) -> int:
+        """メタデータのみを更新（既存メタデータにマージ）し、更新件数を返す"""
+        ...
+
+    @abstractmethod
+    async def delete_vectors(
+        self,
+        organization_id: str,
+        vector_ids: list[str],
+    ) -> int:
+        """IDを指定してベクターを削除し、削除要求した件数を返す"""
+        ...
+
+    @abstractmethod
+    async def delete_by_filter(
+        self,
+        organization_id: str,
+        filter: dict,
+    ) -> None:
+        """メタデータフィルタに一致するベクターを削除"""
+        ...
+
+    @abstractmethod
+    async def describe_index_stats(
+        self,
+        organization_id: Optional[str] = None
+    ) -> dict:
+        """インデックスの統計情報を取得"""
+        ...
+
+    @abstractmethod
+    async def search(
+        self,
+        organization_id: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_metadata: bool = True,
+    ) -> SearchResponse:
+        """ベクター検索を実行（スコアの降順）"""
+        ...
+
+    async def flush(self) -> None:
+        """
+        未保存の変更を永続化する（Pineconeは即時反映のため何もしない）
+        """
+        return None
+
+    async def delete_document_vectors(
+        self,
+        organization_id: str,
+        document_id: str,
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        ドキュメントに関連するベクターを削除
+
+        Args:
+            organization_id: 組織ID
+            document_id: ドキュメントID
+            version: バージョン番号（指定時はそのバージョンのみ削除）
+        """
+        filter = {"document_id": document_id}
+        if version is not None:
+            filter["version"] = version
+
+        await self.delete_by_filter(organization_id, filter)
+
+    async def search_with_access_control(
+        self,
+        organization_id: str,
+        query_vector: list[float],
+        accessible_classifications: list[str],
+        accessible_department_ids: Optional[list[str]] = None,
+        top_k: int = 5,
+        category_filter: Optional[list[str]] = None,
+    ) -> SearchResponse:
+        """
+        アクセス制御を適用した検索
+
+        Args:
+            organization_id: 組織ID
+            query_vector: クエリベクター
+            accessible_classifications: アクセス可能な機密区分のリスト
+            accessible_department_ids: アクセス可能な部署IDのリスト（confidential用）
+            top_k: 返す結果の数
+            category_filter: カテゴリフィルタ
+
+        Returns:
+            SearchResponse オブジェクト
+        """
+        filters = build_access_control_filter(
+            accessible_classifications,
+            accessible_department_ids,
+            category_filter,
+        )
+
+        return await self.search(
+            organization_id=organization_id,
+            query_vector=query_vector,
+            top_k=top_k,
+            filters=filters,
+            include_metadata=True,
+        )
+
+
+    # ================================================================
+    # ユーティリティ
+    # ================================================================
+
+    def generate_pinecone_id(
+        self,
+        organization_id: str,
+        document_id: str,
+        version: int,
+        chunk_index: int,
+    ) -> str:
+        """
+        Pinecone IDを生成
+
+        フォーマット: {org_id}_{doc_id}_v{version}_chunk{index}
+        例: 5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001_v1_chunk0
+        """
+        return f"{organization_id}_{document_id}_v{version}_chunk{chunk_index}"
+
+    def parse_pinecone_id(self, pinecone_id: str) -> dict:
+        """
+        Pinecone IDをパース
+
+        フォーマット: {org_id}_{doc_id}_v{version}_chunk{index}
+        例: 5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001_v1_chunk0
+            → organization_id: "5f98365f-e7c5-4f48-9918-7fe9aabae5df"
+            → document_id: "doc_manual001"
+            → version: 1
+            → chunk_index: 0
+
+        Returns:
+            {
+                "organization_id": "5f98365f-e7c5-4f48-9918-7fe9aabae5df",
+                "document_id": "doc_manual001",
+                "version": 1,
+                "chunk_index": 0
+            }
+        """
+        # Step 1: _chunk{N} を分離
+        parts = pinecone_id.rsplit("_chunk", 1)
+        if len(parts) != 2:
+            return {"raw": pinecone_id}
+
+        try:
+            chunk_index = int(parts[1])
+        except ValueError:
+            return {"raw": pinecone_id}
+
+        remaining = parts[0]
+
+        # Step 2: _v{N} を分離
+        version_parts = remaining.rsplit("_v", 1)
+        if len(version_parts) != 2:
+            return {"raw": pinecone_id, "chunk_index": chunk_index}
+
+        try:
+            version = int(version_parts[1])
+        except ValueError:
+            return {"raw": pinecone_id, "chunk_index": chunk_index}
+
+        # Step 3: organization_id と document_id を分離
+        # document_idは "doc" で始まることを想定
+        # 例: "5f98365f-e7c5-4f48-9918-7fe9aabae5df_doc_manual001" → 5f98365f-e7c5-4f48-9918-7fe9aabae5df + doc_manual001
+        org_doc_str = version_parts[0]
+
+        # "_doc" を探して分割（document_idは "doc" で始まる規約）
+        doc_prefix_index = org_doc_str.find("_doc")
+        if doc_prefix_index > 0:
+            organization_id = org_doc_str[:doc_prefix_index]
+            document_id = org_doc_str[doc_prefix_index + 1:]  # "_doc" の "_" をスキップ
+        else:
+            # "_doc" が見つからない場合は最初の "_" で分割（フォールバック）
+            fallback_parts = org_doc_str.split("_", 1)
+            if len(fallback_parts) != 2:
+                return {
+                    "raw": pinecone_id,
+                    "version": version,
+                    "chunk_index": chunk_index
+                }
+            organization_id = fallback_parts[0]
+            document_id = fallback_parts[1]
+
+        return {
+            "organization_id": organization_id,
+            "document_id": document_id,
+            "version": version,
+            "chunk_index": chunk_index
+        }
+
+
+# ================================================================
+# ファクトリ
+# ================================================================
+
+def create_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    設定に応じたベクターストアを生成
+
+    Args:
+        backend: "pinecone" / "local"（未指定時は VECTOR_STORE_BACKEND 設定）
+
+    Returns:
+        VectorStore（PineconeClient または LocalVectorStore）
+    """
+    settings = get_settings()
+    backend = (backend or settings.VECTOR_STORE_BACKEND).lower()
+
+    if backend == VECTOR_STORE_LOCAL:
+        from lib.local_vector_store import LocalVectorStore
+        return LocalVectorStore(base_dir=settings.LOCAL_VECTOR_STORE_DIR or None)
+
+    if backend != VECTOR_STORE_PINECONE:
+        raise ValueError(f"サポートされていないベクターストア: {backend}")
+
+    from lib.pinecone_client import PineconeClient
+    return PineconeClient()
+
+
+_shared_stores: dict[str, VectorStore] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def get_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    プロセス共通のベクターストアを取得（バックエンドごとに1インスタンス）
+
+    LocalVectorStore はインデックスをメモリに保持するため、リクエストごとに
+    create_vector_store() すると毎回ディスクから読み直すことになる。
+
+    Args:
+        backend: "pinecone" / "local"（未指定時は VECTOR_STORE_BACKEND 設定）
+
+    Returns:
+        VectorStore（PineconeClient または LocalVectorStore）
+    """
+    backend = (backend or get_settings().VECTOR_STORE_BACKEND).lower()
+    with _shared_stores_lock:
+        store = _shared_stores.get(backend)
+        if store is None:
+            store = create_vector_store(backend)
+            _shared_stores[backend] = store
+        return store
+
+
+# ================================================================
+# エクスポート
+# ================================================================
+
+__all__ = [
+    'VectorStore',
+    'SearchResult',
+    'SearchResponse',
+    'build_access_control_filter',
+    'matches_filter',
+    'create_vector_store',
+    'get_vector_store',
+    'VECTOR_STORE_PINECONE',
+    'VECTOR_STORE_LOCAL',
+]
@@ -63,6 +63,11 @@ from infra.chatwork_api import (
     MEMORY_DEFAULT_ORG_ID,
     reset_runtime_caches,
 )
+from infra.event_loop import (
+    BRAIN_PROCESS_TIMEOUT_SECONDS,
+    run_async,
+    add_shutdown_hook,
+)
 from infra.message_store import (
     is_processed,
     save_room_message,
@@ -1038,12 +1043,22 @@ def _get_brain_integration():
             )
             mode = _brain_integration.get_mode().value if _brain_integration else "unknown"
             print(f"✅ BrainIntegration initialized: mode={mode}")
+            # v11.3.0: 常駐ループ停止時にLLMBrainのhttpxクライアントを解放
+            add_shutdown_hook(_close_brain_integration)
         except Exception as e:
             print(f"⚠️ BrainIntegration initialization failed: {e}")
             _brain_integration = None
     return _brain_integration
 
 
+async def _close_brain_integration():
+    """常駐イベントループ停止時のクリーンアップ（LLMBrainの共有httpxクライアントを閉じる）"""
+    brain = getattr(_brain_integration, "brain", None)
+    llm_brain = getattr(brain, "llm_brain", None)
+    if llm_brain is not None:
+        await llm_brain.close()
+
+
 # v10.33.1: _get_brain() を削除（未使用、BrainIntegration経由に移行済み）
 
 
@@ -2008,23 +2023,21 @@ def chatwork_webhook():
                     _detect_chatwork_image(body, room_id, bypass_context)
 
                 # BrainIntegration経由で処理（フォールバックなし）
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result = loop.run_until_complete(
-                        integration.process_message(
-                            message=clean_message,
-                            room_id=room_id,
-                            account_id=sender_account_id,
-                            sender_name=sender_name,
-                            fallback_func=None,  # フォールバックなし（Brain完全移行）
-                            bypass_context=bypass_context,
-                            bypass_handlers=bypass_handlers,
-                        )
-                    )
-                finally:
-                    loop.close()
+                # v11.3.0: リクエストごとのnew_event_loop()を廃止し、常駐ループで実行
+                # （LLMBrainのhttpxクライアント・async DBエンジンの接続を再利用）
+                # gunicornのタイムアウトより前に打ち切り、下のexceptでエラー返信する
+                result = run_async(
+                    integration.process_message(
+                        message=clean_message,
+                        room_id=room_id,
+                        account_id=sender_account_id,
+                        sender_name=sender_name,
+                        fallback_func=None,  # フォールバックなし（Brain完全移行）
+                        bypass_context=bypass_context,
+                        bypass_handlers=bypass_handlers,
+                    ),
+                    timeout=BRAIN_PROCESS_TIMEOUT_SECONDS,
+                )
 
                 # v10.56.6: success=False でも error=None なら確認質問として正常処理
                 # パラメータ不足で確認質問を返す場合、success=False だが送信すべき
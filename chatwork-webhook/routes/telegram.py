@@ -181,24 +181,21 @@ def telegram_webhook():
         from lib.brain.handler_wrappers.bypass_handlers import build_bypass_handlers
         bypass_handlers = build_bypass_handlers()
 
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            ceo_account_id = os.environ.get("CEO_CHATWORK_ACCOUNT_ID", "")
-            result = loop.run_until_complete(
-                integration.process_message(
-                    message=channel_msg.body,
-                    room_id=channel_msg.room_id,
-                    account_id=ceo_account_id or channel_msg.sender_id,
-                    sender_name=channel_msg.sender_name,
-                    fallback_func=None,
-                    bypass_context=telegram_bypass_context or None,
-                    bypass_handlers=bypass_handlers if telegram_bypass_context else None,
-                )
-            )
-        finally:
-            loop.close()
+        # v11.3.0: ChatWork経路と同じ常駐ループで実行（BrainIntegrationを共有するため）
+        from infra.event_loop import BRAIN_PROCESS_TIMEOUT_SECONDS, run_async
+        ceo_account_id = os.environ.get("CEO_CHATWORK_ACCOUNT_ID", "")
+        result = run_async(
+            integration.process_message(
+                message=channel_msg.body,
+                room_id=channel_msg.room_id,
+                account_id=ceo_account_id or channel_msg.sender_id,
+                sender_name=channel_msg.sender_name,
+                fallback_func=None,
+                bypass_context=telegram_bypass_context or None,
+                bypass_handlers=bypass_handlers if telegram_bypass_context else None,
+            ),
+            timeout=BRAIN_PROCESS_TIMEOUT_SECONDS,
+        )
 
         # --- 応答送信（Telegram経由、Step B-3: トピック内返信対応） ---
         topic_id = channel_msg.metadata.get("topic_id", "")
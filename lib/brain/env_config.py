@@ -59,6 +59,10 @@ ENV_ENABLE_MEETING_MINUTES = "ENABLE_MEETING_MINUTES"
 ENV_ENABLE_IMAGE_ANALYSIS = "ENABLE_IMAGE_ANALYSIS"
 ENV_ENABLE_GOOGLE_CALENDAR = "ENABLE_GOOGLE_CALENDAR"
 
+# --- Guardian Layer ---
+# 操作系レートリミッターのバックエンド（"memory" / "postgres"）
+ENV_GUARDIAN_RATE_LIMIT_BACKEND = "GUARDIAN_RATE_LIMIT_BACKEND"
+
 # --- アラート ---
 ENV_ALERT_ROOM_ID = "ALERT_ROOM_ID"
 
@@ -103,6 +107,12 @@ def is_production() -> bool:
     return os.environ.get(ENV_ENVIRONMENT, "development").lower() == "production"
 
 
+def get_guardian_rate_limit_backend() -> str:
+    """Guardian操作系レートリミッターのバックエンドを取得（不明な値は "memory"）"""
+    value = os.environ.get(ENV_GUARDIAN_RATE_LIMIT_BACKEND, "memory").lower()
+    return value if value in ("memory", "postgres") else "memory"
+
+
 def get_required_env_vars() -> dict:
     """
     デプロイ時に必須の環境変数一覧を取得（サービス起動に不可欠なもの）
@@ -11,6 +11,7 @@ Ultimate Brain Architecture - Phase 2: エピソード記憶
 import json
 import logging
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -150,6 +151,186 @@ IMPORTANT_KEYWORDS: Set[str] = {
 }
 
 
+# 起動時にDBからキャッシュへ読み込むエピソード数
+# v11.3.0: 想起は転置索引経由でマッチ件数に比例するため、50件から引き上げ
+EPISODE_CACHE_WARMUP_LIMIT: int = 1000
+
+
+# ============================================================================
+# 想起用インデックス
+# ============================================================================
+
+class _EpisodeIndex(dict):
+    """
+    エピソードキャッシュ（episode_id → Episode）
+
+    v11.3.0: recall() のたびに全エピソードを3回走査しないよう、
+    キーワード・エンティティの転置索引（posting list）、ユーザー別パーティション、
+    発生日時順のタイムライン（bisect）を書き込み時にインクリメンタルに維持する。
+    キーワード・関連エンティティ・user_id・occurred_at を書き換えた場合は
+    save_episode() で再登録すれば索引も張り直される。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._seq_counter = 0
+        self._seq: Dict[str, int] = {}
+        self._by_keyword: Dict[str, Set[str]] = {}
+        self._by_entity: Dict[str, Set[str]] = {}
+        self._by_user: Dict[Optional[str], Set[str]] = {}
+        self._keyword_counts: Dict[str, int] = {}
+        self._entity_counts: Dict[str, int] = {}
+        # 発生日時（epoch秒）昇順。_timeline_keys と _timeline_ids は同じ並び
+        self._timeline_keys: List[float] = []
+        self._timeline_ids: List[str] = []
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, episode_id: str, episode: Episode) -> None:
+        if episode_id in self:
+            self._unlink(episode_id, dict.__getitem__(self, episode_id))
+        else:
+            # 挿入順（dictの並び）を保持し、想起結果の並びを従来と揃える
+            self._seq[episode_id] = self._seq_counter
+            self._seq_counter += 1
+        dict.__setitem__(self, episode_id, episode)
+        self._link(episode_id, episode)
+
+    def __delitem__(self, episode_id: str) -> None:
+        episode = dict.__getitem__(self, episode_id)
+        dict.__delitem__(self, episode_id)
+        self._unlink(episode_id, episode)
+        del self._seq[episode_id]
+
+    def _link(self, episode_id: str, episode: Episode) -> None:
+        keywords = set(episode.keywords)
+        for keyword in keywords:
+            self._by_keyword.setdefault(keyword, set()).add(episode_id)
+        self._keyword_counts[episode_id] = len(keywords)
+
+        entity_ids = {e.entity_id for e in episode.related_entities}
+        for entity_id in entity_ids:
+            self._by_entity.setdefault(entity_id, set()).add(episode_id)
+        self._entity_counts[episode_id] = len(entity_ids)
+
+        self._by_user.setdefault(episode.user_id or None, set()).add(episode_id)
+
+        if episode.occurred_at is not None:
+            ts = episode.occurred_at.timestamp()
+            pos = bisect_right(self._timeline_keys, ts)
+            self._timeline_keys.insert(pos, ts)
+            self._timeline_ids.insert(pos, episode_id)
+
+    def _unlink(self, episode_id: str, episode: Episode) -> None:
+        for index, keys in (
+            (self._by_keyword, set(episode.keywords)),
+            (self._by_entity, {e.entity_id for e in episode.related_entities}),
+            (self._by_user, {episode.user_id or None}),
+        ):
+            for key in keys:
+                postings = index.get(key)
+                if postings is not None:
+                    postings.discard(episode_id)
+                    if not postings:
+                        del index[key]
+        self._keyword_counts.pop(episode_id, None)
+        self._entity_counts.pop(episode_id, None)
+
+        if episode.occurred_at is not None:
+            ts = episode.occurred_at.timestamp()
+            lo = bisect_left(self._timeline_keys, ts)
+            hi = bisect_right(self._timeline_keys, ts)
+            for pos in range(lo, hi):
+                if self._timeline_ids[pos] == episode_id:
+                    del self._timeline_keys[pos]
+                    del self._timeline_ids[pos]
+                    break
+
+    def pop(self, episode_id: str, *default):
+        if episode_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(episode_id)
+        episode = dict.__getitem__(self, episode_id)
+        del self[episode_id]
+        return episode
+
+    def popitem(self):
+        episode_id, episode = dict.popitem(self)
+        self._unlink(episode_id, episode)
+        del self._seq[episode_id]
+        return episode_id, episode
+
+    def setdefault(self, episode_id: str, default=None):
+        if episode_id not in self:
+            self[episode_id] = default
+        return dict.__getitem__(self, episode_id)
+
+    def update(self, *args, **kwargs) -> None:
+        for episode_id, episode in dict(*args, **kwargs).items():
+            self[episode_id] = episode
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._seq.clear()
+        self._by_keyword.clear()
+        self._by_entity.clear()
+        self._by_user.clear()
+        self._keyword_counts.clear()
+        self._entity_counts.clear()
+        self._timeline_keys.clear()
+        self._timeline_ids.clear()
+
+    # -------------------------------------------------------------------------
+    # 検索
+    # -------------------------------------------------------------------------
+
+    def visible_to(self, user_id: Optional[str]) -> Optional[Set[str]]:
+        """
+        ユーザーが想起できるエピソードID（本人分＋組織全体分）
+
+        user_id未指定時は全件対象のため None を返す。
+        """
+        if not user_id:
+            return None
+        return self._by_user.get(user_id, set()) | self._by_user.get(None, set())
+
+    def owned_by(self, user_id: str) -> Set[str]:
+        """指定ユーザー本人のエピソードID"""
+        return set(self._by_user.get(user_id, ()))
+
+    def match_keywords(self, keywords: Set[str]) -> Dict[str, Set[str]]:
+        """キーワードを含むエピソードID → 一致キーワード"""
+        matched: Dict[str, Set[str]] = {}
+        for keyword in keywords:
+            for episode_id in self._by_keyword.get(keyword, ()):
+                matched.setdefault(episode_id, set()).add(keyword)
+        return matched
+
+    def match_entities(self, entity_ids: Set[str]) -> Dict[str, int]:
+        """エンティティを含むエピソードID → 一致件数"""
+        matched: Dict[str, int] = {}
+        for entity_id in entity_ids:
+            for episode_id in self._by_entity.get(entity_id, ()):
+                matched[episode_id] = matched.get(episode_id, 0) + 1
+        return matched
+
+    def keyword_count(self, episode_id: str) -> int:
+        return self._keyword_counts.get(episode_id, 0)
+
+    def entity_count(self, episode_id: str) -> int:
+        return self._entity_counts.get(episode_id, 0)
+
+    def between(self, time_min: datetime, time_max: datetime) -> List[str]:
+        """発生日時が [time_min, time_max] に入るエピソードID"""
+        lo = bisect_left(self._timeline_keys, time_min.timestamp())
+        hi = bisect_right(self._timeline_keys, time_max.timestamp())
+        return self._timeline_ids[lo:hi]
+
+    def in_insertion_order(self, episode_ids) -> List[str]:
+        """エピソードIDをキャッシュへの登録順に並べる"""
+        return sorted(episode_ids, key=self._seq.__getitem__)
+
+
 # ============================================================================
 # メインクラス
 # ============================================================================
@@ -175,12 +356,22 @@ class EpisodicMemory:
         """
         self.pool = pool
         self.organization_id = organization_id
-        self._memory_cache: Dict[str, Episode] = {}
+        self._episodes = _EpisodeIndex()
         self._bg_tasks: set = set()  # run_in_executor futureの参照保持（GC防止）
         self._cache_loaded: bool = False  # W-3: 起動時DBキャッシュウォームアップ済みフラグ
 
         logger.debug(f"EpisodicMemory initialized for org_id={organization_id}")
 
+    @property
+    def _memory_cache(self) -> _EpisodeIndex:
+        """エピソードキャッシュ（想起用インデックス付き）"""
+        return self._episodes
+
+    @_memory_cache.setter
+    def _memory_cache(self, value: Dict[str, Episode]) -> None:
+        # 辞書を丸ごと差し替えた場合も索引を張り直す
+        self._episodes = value if isinstance(value, _EpisodeIndex) else _EpisodeIndex(value)
+
     # =========================================================================
     # エピソード保存
     # =========================================================================
@@ -476,28 +667,30 @@ class EpisodicMemory:
         message: str,
         user_id: Optional[str] = None,
     ) -> List[RecallResult]:
-        """キーワードベースで想起"""
+        """キーワードベースで想起（v11.3.0: 転置索引でマッチしたエピソードのみ評価）"""
         results = []
         message_keywords = set(self._extract_keywords(message))
+        if not message_keywords:
+            return results
 
-        for episode_id, episode in self._memory_cache.items():
+        index = self._memory_cache
+        candidates = index.match_keywords(message_keywords)
+        visible = index.visible_to(user_id)
+
+        for episode_id in index.in_insertion_order(candidates):
             # ユーザーフィルタ
-            if user_id and episode.user_id and episode.user_id != user_id:
+            if visible is not None and episode_id not in visible:
                 continue
 
-            # キーワードマッチ
-            episode_keywords = set(episode.keywords)
-            matched = message_keywords & episode_keywords
-
-            if matched:
-                relevance = len(matched) / max(len(episode_keywords), 1)
-                results.append(RecallResult(
-                    episode=episode,
-                    relevance_score=relevance,
-                    trigger=RecallTrigger.KEYWORD,
-                    matched_keywords=list(matched),
-                    reasoning=f"キーワード一致: {', '.join(matched)}",
-                ))
+            matched = candidates[episode_id]
+            relevance = len(matched) / max(index.keyword_count(episode_id), 1)
+            results.append(RecallResult(
+                episode=index[episode_id],
+                relevance_score=relevance,
+                trigger=RecallTrigger.KEYWORD,
+                matched_keywords=list(matched),
+                reasoning=f"キーワード一致: {', '.join(matched)}",
+            ))
 
         return results
 
@@ -506,29 +699,29 @@ class EpisodicMemory:
         entities: List[Dict[str, str]],
         user_id: Optional[str] = None,
     ) -> List[RecallResult]:
-        """エンティティベースで想起"""
-        results = []
+        """エンティティベースで想起（v11.3.0: 転置索引でマッチしたエピソードのみ評価）"""
+        results: List[RecallResult] = []
         entity_ids = {e.get("entity_id") for e in entities if e.get("entity_id")}
+        if not entity_ids:
+            return results
 
-        for episode_id, episode in self._memory_cache.items():
+        index = self._memory_cache
+        candidates = index.match_entities(entity_ids)
+        visible = index.visible_to(user_id)
+
+        for episode_id in index.in_insertion_order(candidates):
             # ユーザーフィルタ
-            if user_id and episode.user_id and episode.user_id != user_id:
+            if visible is not None and episode_id not in visible:
                 continue
 
-            # エンティティマッチ
-            episode_entity_ids = {
-                e.entity_id for e in episode.related_entities
-            }
-            matched = entity_ids & episode_entity_ids
-
-            if matched:
-                relevance = len(matched) / max(len(episode_entity_ids), 1)
-                results.append(RecallResult(
-                    episode=episode,
-                    relevance_score=relevance * 0.8,  # エンティティは少し重みを下げる
-                    trigger=RecallTrigger.ENTITY,
-                    reasoning=f"関連エンティティ: {len(matched)}件",
-                ))
+            matched_count = candidates[episode_id]
+            relevance = matched_count / max(index.entity_count(episode_id), 1)
+            results.append(RecallResult(
+                episode=index[episode_id],
+                relevance_score=relevance * 0.8,  # エンティティは少し重みを下げる
+                trigger=RecallTrigger.ENTITY,
+                reasoning=f"関連エンティティ: {matched_count}件",
+            ))
 
         return results
 
@@ -538,7 +731,7 @@ class EpisodicMemory:
         user_id: Optional[str] = None,
         days_range: int = 7,
     ) -> List[RecallResult]:
-        """時間的関連で想起"""
+        """時間的関連で想起（v11.3.0: タイムラインを二分探索して範囲内のみ評価）"""
         results: List[RecallResult] = []
         if not reference_time:
             return results
@@ -546,23 +739,25 @@ class EpisodicMemory:
         time_min = reference_time - timedelta(days=days_range)
         time_max = reference_time + timedelta(days=days_range)
 
-        for episode_id, episode in self._memory_cache.items():
+        index = self._memory_cache
+        visible = index.visible_to(user_id)
+
+        for episode_id in index.in_insertion_order(index.between(time_min, time_max)):
             # ユーザーフィルタ
-            if user_id and episode.user_id and episode.user_id != user_id:
+            if visible is not None and episode_id not in visible:
                 continue
 
-            # 時間範囲チェック
-            if episode.occurred_at and time_min <= episode.occurred_at <= time_max:
-                # 時間的距離に基づく関連度
-                time_diff = abs((episode.occurred_at - reference_time).days)
-                relevance = 1.0 - (time_diff / days_range) * 0.5
+            episode = index[episode_id]
+            # 時間的距離に基づく関連度
+            time_diff = abs((episode.occurred_at - reference_time).days)
+            relevance = 1.0 - (time_diff / days_range) * 0.5
 
-                results.append(RecallResult(
-                    episode=episode,
-                    relevance_score=relevance * 0.6,  # 時間関連は重みを下げる
-                    trigger=RecallTrigger.TEMPORAL,
-                    reasoning=f"時間的関連: {time_diff}日差",
-                ))
+            results.append(RecallResult(
+                episode=episode,
+                relevance_score=relevance * 0.6,  # 時間関連は重みを下げる
+                trigger=RecallTrigger.TEMPORAL,
+                reasoning=f"時間的関連: {time_diff}日差",
+            ))
 
         return results
 
@@ -653,7 +848,7 @@ class EpisodicMemory:
     # DBキャッシュウォームアップ（W-3: 起動直後のキャッシュ空問題対策）
     # =========================================================================
 
-    def _load_recent_from_db(self, limit: int = 50) -> None:
+    def _load_recent_from_db(self, limit: int = EPISODE_CACHE_WARMUP_LIMIT) -> None:
         """
         DBから最新エピソードをキャッシュに読み込む（初回呼び出し時のみ）
 
@@ -856,10 +1051,16 @@ class EpisodicMemory:
         """最近のエピソードを取得"""
         episodes = []
 
-        for episode in self._memory_cache.values():
+        # v11.3.0: ユーザー指定時は本人パーティションのみ走査
+        if user_id:
+            source = [self._memory_cache[eid] for eid in self._memory_cache.in_insertion_order(
+                self._memory_cache.owned_by(user_id)
+            )]
+        else:
+            source = list(self._memory_cache.values())
+
+        for episode in source:
             # フィルタ
-            if user_id and episode.user_id != user_id:
-                continue
             if episode_type and episode.episode_type != episode_type:
                 continue
             episodes.append(episode)
@@ -13,7 +13,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from lib.brain.core import SoulkunBrain
 
-from lib.brain.graph.state import BrainGraphState
+from lib.brain.graph.state import BrainGraphState, record_stage_timing
+from lib.brain.monitoring import STAGE_CONTEXT_BUILD
 from lib.brain.tool_converter import get_tools_for_llm
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,7 @@ def make_build_context(brain: "SoulkunBrain"):
                 sender_name=state["sender_name"],
                 phase2e_learnings_prefetched=context.phase2e_learnings,
             )
+            record_stage_timing(state, STAGE_CONTEXT_BUILD, t0)
             logger.debug(
                 "[graph:build_context] DONE t=%.3fs (took %.3fs)",
                 time.time() - start_time, time.time() - t0,
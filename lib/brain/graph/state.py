@@ -6,6 +6,7 @@ Brain処理グラフを流れるデータの型定義。
 各ノードはこのStateを受け取り、部分的な更新を返す。
 """
 
+import time
 from typing import TypedDict, Optional, Dict, Any, List
 from datetime import datetime
 
@@ -20,6 +21,8 @@ class BrainGraphState(TypedDict, total=False):
     sender_name: str
     start_time: float
     organization_id: str
+    # v11.3.0: 段階別の所要時間（monitoring.STAGE_* → ms）。各ノードが書き込む
+    stage_timings_ms: Dict[str, float]
 
     # === コンテキスト ===
     # BrainContext（最小メタ情報）
@@ -51,3 +54,10 @@ class BrainGraphState(TypedDict, total=False):
 
     # === 出力 ===
     response: Any  # BrainResponse
+
+
+def record_stage_timing(state: BrainGraphState, stage: str, started_at: float) -> None:
+    """started_at（time.time()）からの経過を stage_timings_ms に記録する"""
+    timings = state.get("stage_timings_ms")
+    if timings is not None:
+        timings[stage] = (time.time() - started_at) * 1000
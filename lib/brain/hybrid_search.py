@@ -16,7 +16,7 @@ OpenClawの「Hybrid Search」アイデアをsoul-kunの設計思想で独自実
 1. クエリを受け取る
 2. 並列実行:
    Path A: クエリ → Embedding → Pinecone（ベクトル検索）
-   Path B: クエリ → PostgreSQL ILIKE（キーワード検索）
+   Path B: クエリ → PostgreSQL pg_trgm候補取得 → 日本語バイグラムBM25で順位付け（キーワード検索）
 3. RRFでスコア統合
 4. 重複排除 + 上位N件を返す
 
@@ -26,6 +26,10 @@ Created: 2026-02-07
 
 import asyncio
 import logging
+import math
+import re
+import unicodedata
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
@@ -60,6 +64,17 @@ DEFAULT_TOP_K: int = 5
 # クエリの最大文字数
 MAX_QUERY_LENGTH: int = 500
 
+# v11.3.0: キーワード検索でDBから取得する候補数（limit の倍数）
+# pg_trgm GINインデックスで候補を絞り、アプリ側でBM25により並べ替える
+KEYWORD_CANDIDATE_MULTIPLIER: int = 5
+
+# BM25パラメータ（一般的な既定値）
+BM25_K1: float = 1.2
+BM25_B: float = 0.75
+
+# タイトル（knowledge.key / section_title）の語をBM25で何倍に数えるか
+BM25_TITLE_WEIGHT: int = 2
+
 
 # =============================================================================
 # ユーティリティ
@@ -71,6 +86,91 @@ def escape_ilike(value: str) -> str:
     return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
+# =============================================================================
+# 日本語バイグラムBM25（v11.3.0）
+# =============================================================================
+
+# 区切りとみなす文字（空白・句読点・記号）
+_TOKEN_SPLIT_PATTERN = re.compile(r"[\s\u3000、。，．・「」『』（）()\[\]【】!！?？:：;；,.\-〜~/／]+")
+
+
+def tokenize_bigrams(text: str) -> List[str]:
+    """
+    テキストを文字バイグラムに分割（日本語は分かち書き不要）
+
+    NFKC正規化・小文字化の後、空白・句読点で区切り、各区間を2文字ずつずらして切り出す。
+    1文字だけの区間はそのまま1トークンにする。
+
+    例: "経費精算" → ["経費", "費精", "精算"]
+    """
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens: List[str] = []
+    for segment in _TOKEN_SPLIT_PATTERN.split(normalized):
+        if len(segment) == 1:
+            tokens.append(segment)
+        else:
+            tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+    return tokens
+
+
+def bm25_scores(
+    query: str,
+    documents: List[Tuple[str, str]],
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+    title_weight: int = BM25_TITLE_WEIGHT,
+) -> List[float]:
+    """
+    候補文書群に対するBM25スコアを計算（日本語バイグラム）
+
+    IDF・平均文書長は渡された候補群から計算する
+    （全文書の統計を毎回集計するとコーパスサイズに比例してしまうため）。
+
+    Args:
+        query: 検索クエリ
+        documents: [(タイトル, 本文), ...]
+        k1: 語頻度の飽和パラメータ
+        b: 文書長の正規化パラメータ
+        title_weight: タイトル中の語の重み（出現回数を何倍にするか）
+
+    Returns:
+        documents と同じ順序のスコアリスト
+    """
+    query_terms = set(tokenize_bigrams(query))
+    if not documents or not query_terms:
+        return [0.0] * len(documents)
+
+    term_freqs: List[Counter] = []
+    lengths: List[int] = []
+    for title, content in documents:
+        tokens = tokenize_bigrams(title) * title_weight + tokenize_bigrams(content)
+        term_freqs.append(Counter(tokens))
+        lengths.append(len(tokens))
+
+    n_docs = len(documents)
+    avg_len = (sum(lengths) / n_docs) or 1.0
+    doc_freq = {
+        term: sum(1 for tf in term_freqs if term in tf)
+        for term in query_terms
+    }
+
+    scores = []
+    for tf, length in zip(term_freqs, lengths):
+        score = 0.0
+        norm = k1 * (1 - b + b * length / avg_len)
+        for term in query_terms:
+            freq = tf.get(term, 0)
+            if not freq:
+                continue
+            df = doc_freq[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            score += idf * freq * (k1 + 1) / (freq + norm)
+        scores.append(score)
+    return scores
+
+
 # =============================================================================
 # データクラス
 # =============================================================================
@@ -249,13 +349,24 @@ class HybridSearcher:
             pool: SQLAlchemyデータベース接続プール
             org_id: 組織ID
             pinecone_client: PineconeClient インスタンス（オプション）
-            embedding_client: EmbeddingClient インスタンス（オプション）
+            embedding_client: EmbeddingClient インスタンス（オプション。
+                未指定時はベクトル検索の初回に共通クライアントを使う）
         """
         self.pool = pool
         self.org_id = org_id
         self.pinecone_client = pinecone_client
         self.embedding_client = embedding_client
 
+    def _get_embedding_client(self):
+        """エンベディングクライアント（未指定時は共通クライアント + 組織の永続キャッシュ）"""
+        if self.embedding_client is None:
+            from lib.embedding import DatabaseEmbeddingStore, get_embedding_client
+
+            self.embedding_client = get_embedding_client().with_persistent_store(
+                DatabaseEmbeddingStore(self.pool, self.org_id),
+            )
+        return self.embedding_client
+
     async def search(
         self,
         query: str,
@@ -347,18 +458,20 @@ class HybridSearcher:
 
         クエリをEmbeddingに変換し、Pineconeで類似度検索する。
         accessible_classifications が指定された場合はアクセス制御フィルタを適用する。
-        pinecone_client または embedding_client がない場合は空リストを返す。
+        pinecone_client がない場合は空リストを返す。
+        embedding_client 未指定時はプロセス共通のクライアントに組織の永続キャッシュを付けて使う。
 
         Note（フェイルセーフ）:
             accessible_department_ids=[] の場合、confidential文書は0件になる。
             None の場合は部署フィルタなし（後方互換）。
         """
-        if not self.pinecone_client or not self.embedding_client:
+        if not self.pinecone_client:
             return []
 
         try:
             # クエリをベクトル化
-            embedding_result = await self.embedding_client.embed_query(query)
+            embedding_client = self._get_embedding_client()
+            embedding_result = await embedding_client.embed_query(query)
             query_vector = embedding_result.vector
 
             # Pinecone検索（アクセス制御フィルタの有無で分岐）
@@ -408,7 +521,7 @@ class HybridSearcher:
         PostgreSQLキーワード検索
 
         soulkun_knowledgeテーブルとdocument_chunksテーブルの両方を検索する。
-        結果はマッチ度に基づいてソートされる。
+        v11.3.0: pg_trgm GINインデックスで候補を取得し、日本語バイグラムBM25で並べ替える。
         同期DB接続をasyncio.to_threadで非ブロッキング化（HIGH-1対応）。
         """
         return await asyncio.to_thread(self._keyword_search_sync, query, limit)
@@ -418,10 +531,19 @@ class HybridSearcher:
         query: str,
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
-        """キーワード検索の同期実装（asyncio.to_threadから呼ばれる）"""
+        """
+        キーワード検索の同期実装（asyncio.to_threadから呼ばれる）
+
+        v11.3.0: ILIKE + CASE順位付けを置き換え。
+        1. 部分一致（ILIKE）または単語類似度（pg_trgm の <% 演算子）で候補を取得
+           → どちらも gin_trgm_ops インデックスで処理される
+             （migrations/20261016_keyword_search_trgm.sql）
+        2. 候補を日本語バイグラムBM25で並べ替えて上位 limit 件を返す
+        """
         results = []
         # ILIKEメタキャラクタをエスケープ（CRITICAL-2: パターンインジェクション防止）
         escaped_query = escape_ilike(query)
+        candidate_limit = limit * KEYWORD_CANDIDATE_MULTIPLIER
 
         try:
             with self.pool.connect() as conn:
@@ -439,21 +561,22 @@ class HybridSearcher:
                         AND (
                             key ILIKE '%' || CAST(:query AS TEXT) || '%' ESCAPE '\\'
                             OR value ILIKE '%' || CAST(:query AS TEXT) || '%' ESCAPE '\\'
+                            OR CAST(:raw_query AS TEXT) <% key
+                            OR CAST(:raw_query AS TEXT) <% value
                         )
                         ORDER BY
-                            CASE
-                                WHEN key ILIKE CAST(:query AS TEXT) ESCAPE '\\' THEN 1
-                                WHEN key ILIKE CAST(:query AS TEXT) || '%' ESCAPE '\\' THEN 2
-                                WHEN key ILIKE '%' || CAST(:query AS TEXT) ESCAPE '\\' THEN 3
-                                ELSE 4
-                            END,
+                            GREATEST(
+                                word_similarity(CAST(:raw_query AS TEXT), key),
+                                word_similarity(CAST(:raw_query AS TEXT), value)
+                            ) DESC,
                             id DESC
                         LIMIT :limit
                     """),
                     {
                         "org_id": self.org_id,
                         "query": escaped_query,
-                        "limit": limit,
+                        "raw_query": query,
+                        "limit": candidate_limit,
                     },
                 )
 
@@ -482,11 +605,21 @@ class HybridSearcher:
                         )
                         AND d.is_active = true
                         AND d.is_searchable = true
-                        AND dc.content ILIKE '%' || CAST(:query AS TEXT) || '%' ESCAPE '\\'
-                        ORDER BY dc.created_at DESC, dc.id DESC
+                        AND (
+                            dc.content ILIKE '%' || CAST(:query AS TEXT) || '%' ESCAPE '\\'
+                            OR CAST(:raw_query AS TEXT) <% dc.content
+                        )
+                        ORDER BY
+                            word_similarity(CAST(:raw_query AS TEXT), dc.content) DESC,
+                            dc.id DESC
                         LIMIT :limit
                     """),
-                    {"query": escaped_query, "org_id": self.org_id, "limit": limit},
+                    {
+                        "query": escaped_query,
+                        "raw_query": query,
+                        "org_id": self.org_id,
+                        "limit": candidate_limit,
+                    },
                 )
 
                 for row in chunks_results.fetchall():
@@ -504,4 +637,10 @@ class HybridSearcher:
         except Exception as e:
             logger.warning("Keyword search error: %s", e)
 
-        return results
+        # BM25で並べ替え（merge_results_rrf は順位を使う）
+        scores = bm25_scores(query, [(r["title"], r["content"]) for r in results])
+        for item, score in zip(results, scores):
+            item["score"] = score
+        results.sort(key=lambda r: r["score"], reverse=True)
+
+        return results[:limit]
@@ -577,7 +577,7 @@ class BrainMemoryEnhancement:
             edges = [e for e in edges if e.relation_type in edge_types]
 
         # Resolve target nodes
-        nodes: List[KnowledgeNode] = []
+        target_ids: List[str] = []
         seen: set = set()
         for edge in edges:
             target_id = edge.target_node_id if direction == "outgoing" else edge.source_node_id
@@ -587,10 +587,13 @@ class BrainMemoryEnhancement:
             if target_id == node_id or target_id in seen:
                 continue
             seen.add(target_id)
-            node = self._knowledge_graph.find_node_by_id(conn, target_id)
-            if node:
-                nodes.append(node)
-        return nodes
+            target_ids.append(target_id)
+
+        # v11.3.0: ノードは1クエリでまとめて取得
+        if not target_ids:
+            return []
+        found = self._knowledge_graph.find_nodes_by_ids(conn, target_ids)
+        return [found[target_id] for target_id in target_ids if target_id in found]
 
     # ========================================================================
     # 便利メソッド
@@ -15,22 +15,51 @@ Task #9: 本番ログ分析・エラー率確認
 - api_cost_per_request: 1リクエストあたりのAPIコスト
 - confidence_distribution: 確信度の分布
 - guardian_block_rate: Guardian Layerのブロック率
+- response_time p50/p95/p99: テールレイテンシ（v11.3.0）
+- stage_timings: コンテキスト構築・LLM・Guardian・Tool実行の段階別時間（v11.3.0）
+
+【集計方式】v11.3.0
+- 完了リクエストは1分単位のバケット（リングバッファ、既定60分）に足し込む
+- 各バケットは件数・合計に加え、対数バケットのヒストグラム（lib/latency_histogram.py）を持つ
+- 集計はウィンドウ内のバケットをマージするだけなので、リクエスト数によらずO(バケット数)
+- 確定した分バケットは brain_latency_minutes に保存し、管理APIがスクレイプする
+  （Brainは chatwork-webhook / mobile-api の各インスタンスで動くため、プロセス内の値だけでは全体を見られない）
 
 Author: Claude Opus 4.5
 Created: 2026-01-31
 """
 
+import json
+import os
+import socket
 import time
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 from threading import Lock
 
+from sqlalchemy import text as sql_text
+
+from lib.latency_histogram import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# 処理段階（stage_timings_ms のキー）
+# =============================================================================
+
+STAGE_CONTEXT_BUILD = "context_build"
+STAGE_LLM = "llm"
+STAGE_GUARDIAN = "guardian"
+STAGE_TOOL = "tool"
+
+# 分バケットの保持期間（分）
+METRICS_RETENTION_MINUTES = 60
+
+
 # =============================================================================
 # 閾値定義
 # =============================================================================
@@ -98,6 +127,9 @@ class RequestMetrics:
     input_tokens: int = 0
     output_tokens: int = 0
     error_type: Optional[str] = None
+    # v11.3.0: 段階別の所要時間（STAGE_* → ms）
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+    organization_id: Optional[str] = None
 
 
 @dataclass
@@ -139,6 +171,106 @@ class AggregatedMetrics:
     # エラー種別
     errors_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
 
+    # 分布（v11.3.0: パーセンタイル用）
+    response_time_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    stage_histograms: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    input_token_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    output_token_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def add(self, m: RequestMetrics, low_confidence_threshold: float) -> None:
+        """1リクエスト分を足し込む"""
+        self.total_requests += 1
+
+        if m.success:
+            self.successful_requests += 1
+        else:
+            self.failed_requests += 1
+            if m.error_type == "api_error":
+                self.api_errors += 1
+            if m.error_type:
+                self.errors_by_type[m.error_type] += 1
+
+        self.total_response_time_ms += m.response_time_ms
+        self.max_response_time_ms = max(self.max_response_time_ms, m.response_time_ms)
+        if self.min_response_time_ms == 0 or m.response_time_ms < self.min_response_time_ms:
+            self.min_response_time_ms = m.response_time_ms
+        self.response_time_histogram.record(m.response_time_ms)
+
+        for stage, elapsed_ms in m.stage_timings_ms.items():
+            self.stage_histograms.setdefault(stage, LatencyHistogram()).record(elapsed_ms)
+
+        self.total_confidence += m.confidence
+        if m.confidence < low_confidence_threshold:
+            self.low_confidence_count += 1
+
+        if m.guardian_action == "allow":
+            self.guardian_allow_count += 1
+        elif m.guardian_action == "confirm":
+            self.guardian_confirm_count += 1
+        elif m.guardian_action == "block":
+            self.guardian_block_count += 1
+
+        self.total_input_tokens += m.input_tokens
+        self.total_output_tokens += m.output_tokens
+        self.input_token_histogram.record(m.input_tokens)
+        self.output_token_histogram.record(m.output_tokens)
+
+        self.output_types[m.output_type] += 1
+
+        if m.tool_name:
+            self.tools_used[m.tool_name] += 1
+
+    def merge(self, other: "AggregatedMetrics") -> None:
+        """他の集計（分バケット）を足し込む"""
+        self.total_requests += other.total_requests
+        self.successful_requests += other.successful_requests
+        self.failed_requests += other.failed_requests
+        self.api_errors += other.api_errors
+
+        self.total_response_time_ms += other.total_response_time_ms
+        self.max_response_time_ms = max(self.max_response_time_ms, other.max_response_time_ms)
+        if other.min_response_time_ms and (
+            self.min_response_time_ms == 0 or other.min_response_time_ms < self.min_response_time_ms
+        ):
+            self.min_response_time_ms = other.min_response_time_ms
+        self.response_time_histogram.merge(other.response_time_histogram)
+        for stage, histogram in other.stage_histograms.items():
+            self.stage_histograms.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+        self.total_confidence += other.total_confidence
+        self.low_confidence_count += other.low_confidence_count
+
+        self.guardian_allow_count += other.guardian_allow_count
+        self.guardian_confirm_count += other.guardian_confirm_count
+        self.guardian_block_count += other.guardian_block_count
+
+        self.total_input_tokens += other.total_input_tokens
+        self.total_output_tokens += other.total_output_tokens
+        self.input_token_histogram.merge(other.input_token_histogram)
+        self.output_token_histogram.merge(other.output_token_histogram)
+
+        for key, n in other.output_types.items():
+            self.output_types[key] += n
+        for key, n in other.tools_used.items():
+            self.tools_used[key] += n
+        for key, n in other.errors_by_type.items():
+            self.errors_by_type[key] += n
+
+    def histogram_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        ヒストグラムのスナップショット（brain_latency_minutes.histograms に保存する形）
+
+        キー: response_time_ms / stage.{STAGE_*} / input_tokens / output_tokens
+        """
+        snapshot = {
+            "response_time_ms": self.response_time_histogram.to_dict(),
+            "input_tokens": self.input_token_histogram.to_dict(),
+            "output_tokens": self.output_token_histogram.to_dict(),
+        }
+        for stage, histogram in self.stage_histograms.items():
+            snapshot[f"stage.{stage}"] = histogram.to_dict()
+        return snapshot
+
     @property
     def error_rate(self) -> float:
         """エラー率"""
@@ -222,6 +354,13 @@ class AggregatedMetrics:
                 "avg": round(self.avg_response_time_ms, 1),
                 "max": self.max_response_time_ms,
                 "min": self.min_response_time_ms,
+                "p50": self.response_time_histogram.percentile(50),
+                "p95": self.response_time_histogram.percentile(95),
+                "p99": self.response_time_histogram.percentile(99),
+            },
+            "stage_timings_ms": {
+                stage: histogram.summary()
+                for stage, histogram in sorted(self.stage_histograms.items())
             },
             "confidence": {
                 "avg": round(self.avg_confidence, 3),
@@ -238,6 +377,10 @@ class AggregatedMetrics:
                 "input_tokens": self.total_input_tokens,
                 "output_tokens": self.total_output_tokens,
             },
+            "tokens": {
+                "input": self.input_token_histogram.summary(),
+                "output": self.output_token_histogram.summary(),
+            },
             "output_types": dict(self.output_types),
             "top_tools": dict(sorted(
                 self.tools_used.items(),
@@ -248,6 +391,19 @@ class AggregatedMetrics:
         }
 
 
+@dataclass
+class _MinuteSlot:
+    """リングバッファの1分ぶん（組織ごとの集計）"""
+    minute: int                                   # epoch分
+    by_org: Dict[str, AggregatedMetrics] = field(default_factory=dict)
+    persisted: bool = False
+
+
+def _minute_start(minute: int) -> datetime:
+    """epoch分 → その分の開始時刻（UTC, naive。既存の datetime.utcnow() に合わせる）"""
+    return datetime.utcfromtimestamp(minute * 60)
+
+
 # =============================================================================
 # LLM Brain モニター
 # =============================================================================
@@ -283,6 +439,7 @@ class LLMBrainMonitor:
         self,
         thresholds: MonitoringThresholds = DEFAULT_THRESHOLDS,
         aggregation_window_minutes: int = 5,
+        retention_minutes: int = METRICS_RETENTION_MINUTES,
     ):
         """
         モニターを初期化
@@ -290,20 +447,17 @@ class LLMBrainMonitor:
         Args:
             thresholds: モニタリング閾値
             aggregation_window_minutes: 集計ウィンドウ（分）
+            retention_minutes: 分バケットの保持期間（分）
         """
         self.thresholds = thresholds
         self.aggregation_window = timedelta(minutes=aggregation_window_minutes)
+        self.retention_minutes = max(retention_minutes, aggregation_window_minutes, 1)
 
-        # メトリクス保存
+        # メトリクス保存（v11.3.0: 1分単位のリングバッファ。メモリは保持分数で一定）
         self._requests: Dict[str, Dict[str, Any]] = {}
-        self._completed_metrics: List[RequestMetrics] = []
+        self._slots: List[Optional[_MinuteSlot]] = [None] * self.retention_minutes
         self._lock = Lock()
 
-        # 集計キャッシュ
-        self._aggregated_cache: Optional[AggregatedMetrics] = None
-        self._cache_time: Optional[datetime] = None
-        self._cache_ttl = timedelta(seconds=30)
-
         # アラート送信（オプション）
         self._alert_sender = None
 
@@ -345,6 +499,9 @@ class LLMBrainMonitor:
         input_tokens: int = 0,
         output_tokens: int = 0,
         error_type: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
+        stage_timings_ms: Optional[Dict[str, float]] = None,
+        organization_id: Optional[str] = None,
     ) -> None:
         """
         リクエスト完了を記録
@@ -360,17 +517,23 @@ class LLMBrainMonitor:
             input_tokens: 入力トークン数
             output_tokens: 出力トークン数
             error_type: エラータイプ（失敗時）
+            response_time_ms: 呼び出し側で計測した所要時間（指定時は start_request 不要）
+            stage_timings_ms: 段階別の所要時間（STAGE_* → ms）
+            organization_id: 組織ID（brain_latency_minutes への保存単位）
         """
         with self._lock:
             request_data = self._requests.pop(request_id, None)
 
             if request_data is None:
                 # 開始が記録されていない場合
-                response_time_ms = 0
                 timestamp = datetime.utcnow()
             else:
-                response_time_ms = int((time.time() - request_data["start_time"]) * 1000)
                 timestamp = request_data["timestamp"]
+            if response_time_ms is None:
+                response_time_ms = (
+                    int((time.time() - request_data["start_time"]) * 1000)
+                    if request_data is not None else 0
+                )
 
             metrics = RequestMetrics(
                 request_id=request_id,
@@ -385,101 +548,97 @@ class LLMBrainMonitor:
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 error_type=error_type,
+                stage_timings_ms=dict(stage_timings_ms or {}),
+                organization_id=organization_id,
             )
 
-            self._completed_metrics.append(metrics)
-
-            # 古いメトリクスを削除（1時間以上前）
-            cutoff = datetime.utcnow() - timedelta(hours=1)
-            self._completed_metrics = [
-                m for m in self._completed_metrics
-                if m.timestamp > cutoff
-            ]
+            # 完了した分のバケットに足し込む（古い分のバケットは上書きで消える）
+            slot = self._slot_for(int(time.time() // 60))
+            bucket = slot.by_org.get(organization_id or "")
+            if bucket is None:
+                minute_start = _minute_start(slot.minute)
+                bucket = AggregatedMetrics(
+                    period_start=minute_start,
+                    period_end=minute_start + timedelta(minutes=1),
+                )
+                slot.by_org[organization_id or ""] = bucket
+            bucket.add(metrics, self.thresholds.low_confidence_threshold)
 
         # 警告チェック
         self._check_alerts(metrics)
 
+    def _slot_for(self, minute: int) -> _MinuteSlot:
+        """epoch分のバケットを取得（同じ位置の古いバケットは作り直す）。ロック内で呼ぶ"""
+        index = minute % self.retention_minutes
+        slot = self._slots[index]
+        if slot is None or slot.minute != minute:
+            slot = _MinuteSlot(minute=minute)
+            self._slots[index] = slot
+        return slot
+
     def get_current_metrics(
         self,
         window_minutes: Optional[int] = None,
+        organization_id: Optional[str] = None,
     ) -> AggregatedMetrics:
         """
         現在のメトリクスを取得
 
+        v11.3.0: ウィンドウ内の分バケットをマージする（O(バケット数)）。
+        集計は分単位のため、ウィンドウは現在の分を含む直近N分になる。
+
         Args:
-            window_minutes: 集計ウィンドウ（分）
+            window_minutes: 集計ウィンドウ（分、保持期間まで）
+            organization_id: 指定時はその組織のみ
 
         Returns:
             集計メトリクス
         """
-        # キャッシュチェック
-        if (
-            self._aggregated_cache is not None
-            and self._cache_time is not None
-            and datetime.utcnow() - self._cache_time < self._cache_ttl
-        ):
-            return self._aggregated_cache
-
         window = timedelta(minutes=window_minutes) if window_minutes else self.aggregation_window
+        window_count = min(max(int(window.total_seconds() // 60), 1), self.retention_minutes)
         now = datetime.utcnow()
-        cutoff = now - window
-
-        with self._lock:
-            recent_metrics = [
-                m for m in self._completed_metrics
-                if m.timestamp > cutoff
-            ]
+        current_minute = int(time.time() // 60)
+        oldest_minute = current_minute - window_count + 1
 
-        # 集計
         aggregated = AggregatedMetrics(
-            period_start=cutoff,
+            period_start=_minute_start(oldest_minute),
             period_end=now,
         )
 
-        for m in recent_metrics:
-            aggregated.total_requests += 1
-
-            if m.success:
-                aggregated.successful_requests += 1
-            else:
-                aggregated.failed_requests += 1
-                if m.error_type == "api_error":
-                    aggregated.api_errors += 1
-                if m.error_type:
-                    aggregated.errors_by_type[m.error_type] += 1
-
-            aggregated.total_response_time_ms += m.response_time_ms
-            aggregated.max_response_time_ms = max(
-                aggregated.max_response_time_ms,
-                m.response_time_ms
-            )
-            if aggregated.min_response_time_ms == 0 or m.response_time_ms < aggregated.min_response_time_ms:
-                aggregated.min_response_time_ms = m.response_time_ms
-
-            aggregated.total_confidence += m.confidence
-            if m.confidence < self.thresholds.low_confidence_threshold:
-                aggregated.low_confidence_count += 1
-
-            if m.guardian_action == "allow":
-                aggregated.guardian_allow_count += 1
-            elif m.guardian_action == "confirm":
-                aggregated.guardian_confirm_count += 1
-            elif m.guardian_action == "block":
-                aggregated.guardian_block_count += 1
-
-            aggregated.total_input_tokens += m.input_tokens
-            aggregated.total_output_tokens += m.output_tokens
+        with self._lock:
+            for slot in self._slots:
+                if slot is None or not oldest_minute <= slot.minute <= current_minute:
+                    continue
+                if organization_id is not None:
+                    bucket = slot.by_org.get(organization_id)
+                    if bucket is not None:
+                        aggregated.merge(bucket)
+                else:
+                    for bucket in slot.by_org.values():
+                        aggregated.merge(bucket)
 
-            aggregated.output_types[m.output_type] += 1
+        return aggregated
 
-            if m.tool_name:
-                aggregated.tools_used[m.tool_name] += 1
+    def collect_closed_minutes(self) -> List[Tuple[str, datetime, AggregatedMetrics]]:
+        """
+        確定済み（現在の分より前）で未保存の分バケットを取り出す
 
-        # キャッシュ更新
-        self._aggregated_cache = aggregated
-        self._cache_time = now
+        組織IDなしで記録された分は保存対象外。取り出した分は保存済みとして扱う。
 
-        return aggregated
+        Returns:
+            (組織ID, 分の開始時刻, 集計) のリスト
+        """
+        current_minute = int(time.time() // 60)
+        closed: List[Tuple[str, datetime, AggregatedMetrics]] = []
+        with self._lock:
+            for slot in self._slots:
+                if slot is None or slot.persisted or slot.minute >= current_minute:
+                    continue
+                slot.persisted = True
+                for org_id, bucket in slot.by_org.items():
+                    if org_id:
+                        closed.append((org_id, _minute_start(slot.minute), bucket))
+        return closed
 
     def _check_alerts(self, metrics: RequestMetrics) -> None:
         """
@@ -613,6 +772,122 @@ def get_health_status() -> Dict[str, Any]:
     return get_monitor().get_health_status()
 
 
+# =============================================================================
+# 分バケットの保存（管理APIのスクレイプ用）
+# =============================================================================
+
+# brain_latency_minutes の保持期間（日）
+LATENCY_MINUTES_RETENTION_DAYS = 7
+
+
+def _default_instance_id() -> str:
+    """Cloud Run インスタンスの識別子（リビジョン + ホスト名）"""
+    return f"{os.getenv('K_REVISION', 'local')}:{socket.gethostname()}"
+
+
+class LatencyMinutesWriter:
+    """
+    確定した分バケットを brain_latency_minutes に保存する
+
+    同期DBアクセスのため、非同期コンテキストからは asyncio.to_thread で呼ぶ。
+    1分に1回だけ書けば十分なので、is_due() で呼び出し頻度を絞る。
+    """
+
+    CLEANUP_INTERVAL_SECONDS = 3600
+
+    def __init__(
+        self,
+        pool,
+        service: Optional[str] = None,
+        instance_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            pool: SQLAlchemy Engine
+            service: サービス名（未指定時は K_SERVICE）
+            instance_id: インスタンスID（未指定時はリビジョン + ホスト名）
+        """
+        self.pool = pool
+        self.service = service or os.getenv("K_SERVICE", "local")
+        self.instance_id = instance_id or _default_instance_id()
+        self._last_written_minute = int(time.time() // 60)
+        self._last_cleanup: Dict[str, float] = {}
+
+    def is_due(self) -> bool:
+        """前回の書き込みから分が変わっていれば True"""
+        return int(time.time() // 60) > self._last_written_minute
+
+    def write(self, monitor: Optional[LLMBrainMonitor] = None) -> int:
+        """
+        確定済みの分バケットを保存
+
+        Returns:
+            保存した行数（失敗時は0）
+        """
+        self._last_written_minute = int(time.time() // 60)
+        closed = (monitor or get_monitor()).collect_closed_minutes()
+        if not closed:
+            return 0
+
+        written = 0
+        for org_id, minute, bucket in closed:
+            try:
+                with self.pool.connect() as conn:
+                    conn.execute(
+                        sql_text("SELECT set_config('app.current_organization_id', :org_id, false)"),
+                        {"org_id": org_id},
+                    )
+                    try:
+                        conn.execute(
+                            sql_text("""
+                                INSERT INTO brain_latency_minutes
+                                    (organization_id, service, instance_id, minute,
+                                     request_count, error_count, histograms)
+                                VALUES (CAST(:org_id AS uuid), :service, :instance_id, :minute,
+                                        :request_count, :error_count, CAST(:histograms AS jsonb))
+                                ON CONFLICT (organization_id, service, instance_id, minute) DO UPDATE
+                                SET request_count = EXCLUDED.request_count,
+                                    error_count = EXCLUDED.error_count,
+                                    histograms = EXCLUDED.histograms
+                            """),
+                            {
+                                "org_id": org_id,
+                                "service": self.service,
+                                "instance_id": self.instance_id,
+                                "minute": minute.replace(tzinfo=timezone.utc),
+                                "request_count": bucket.total_requests,
+                                "error_count": bucket.failed_requests,
+                                "histograms": json.dumps(bucket.histogram_snapshot()),
+                            },
+                        )
+                        self._maybe_cleanup(conn, org_id)
+                        conn.commit()
+                        written += 1
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    finally:
+                        conn.execute(sql_text("SELECT set_config('app.current_organization_id', NULL, false)"))
+            except Exception as e:
+                logger.warning("Failed to write latency minutes: %s", type(e).__name__)
+        return written
+
+    def _maybe_cleanup(self, conn, org_id: str) -> None:
+        """保持期間を過ぎた行を削除（1時間に1回、RLSにより自組織分のみ）"""
+        now = time.time()
+        if now - self._last_cleanup.get(org_id, 0.0) < self.CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup[org_id] = now
+        conn.execute(
+            sql_text("""
+                DELETE FROM brain_latency_minutes
+                WHERE organization_id = current_setting('app.current_organization_id', true)::uuid
+                  AND minute < NOW() - (INTERVAL '1 day' * :days)
+            """),
+            {"days": LATENCY_MINUTES_RETENTION_DAYS},
+        )
+
+
 # =============================================================================
 # レスポンス時間最適化ユーティリティ
 # =============================================================================
@@ -379,8 +379,15 @@ class TruthResolver:
                 elif query_type == "room_members":
                     room_id = params.get("room_id")
                     if room_id and hasattr(chatwork_client, "get_room_members"):
+                        # v11.3.0: 権限判定に使うためキャッシュを読まない
+                        get_room_members = chatwork_client.get_room_members
+                        kwargs = (
+                            {"use_cache": False}
+                            if self._accepts_kwarg(get_room_members, "use_cache")
+                            else {}
+                        )
                         return await self._call_async_or_sync(
-                            chatwork_client.get_room_members, room_id
+                            get_room_members, room_id, **kwargs
                         )
                 elif query_type == "current_tasks":
                     if hasattr(chatwork_client, "get_my_tasks"):
@@ -524,6 +531,19 @@ class TruthResolver:
             loop = asyncio.get_event_loop()
             return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
 
+    @staticmethod
+    def _accepts_kwarg(func: Callable, name: str) -> bool:
+        """関数がキーワード引数 name を受け取れるか"""
+        import inspect
+
+        try:
+            parameters = inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            return False
+        return name in parameters or any(
+            p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+        )
+
     def register_custom_fetcher(
         self,
         source: TruthSource,
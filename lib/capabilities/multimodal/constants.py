@@ -235,6 +235,18 @@ MAX_IMAGE_DIMENSION: int = 4096
 # PDFのOCR時の解像度（DPI）
 PDF_OCR_DPI: int = 300
 
+# PDFのページ単位OCRの同時実行数（Vision API呼び出しの並列度）
+PDF_OCR_CONCURRENCY: int = 4
+
+# これ未満の文字数しか抽出できないページはOCR対象（スキャンページとみなす）
+PDF_MIN_PAGE_TEXT_LENGTH: int = 50
+
+# ページOCR結果キャッシュの最大件数（ページ画像のハッシュ単位）
+PDF_PAGE_CACHE_MAX_ENTRIES: int = 512
+
+# 要約生成に渡すテキストの最大文字数（先頭から）
+PDF_SUMMARY_INPUT_LENGTH: int = 20000
+
 # URLコンテンツの本文抽出で除外するタグ
 HTML_EXCLUDE_TAGS: FrozenSet[str] = frozenset([
     "script",
@@ -425,6 +437,34 @@ MAX_AUDIO_DURATION_MINUTES: int = 120  # 2時間
 # 音声チャンクの長さ（秒）
 AUDIO_CHUNK_DURATION_SECONDS: int = 600  # 10分
 
+# v11.3.0: 分割文字起こし
+# 固定窓で切る場合に前後のチャンクで重ねる長さ（秒）
+AUDIO_CHUNK_OVERLAP_SECONDS: float = 3.0
+
+# 窓の終端から遡って無音を探す範囲（秒）
+AUDIO_SILENCE_SEARCH_SECONDS: float = 20.0
+
+# 無音とみなす平均振幅（フルスケール比）
+AUDIO_SILENCE_THRESHOLD: float = 0.01
+
+# 分割できる形式（デコーダなしで切れる形式）のときの最大ファイルサイズ（バイト）
+MAX_SEGMENTED_AUDIO_SIZE_BYTES: int = 200 * 1024 * 1024  # 200MB
+
+# チャンク1件あたりの最大サイズ（Whisper APIの上限に余裕を持たせる）
+AUDIO_SEGMENT_MAX_BYTES: int = 24 * 1024 * 1024  # 24MB
+
+# チャンクの文字起こしの同時実行数
+AUDIO_TRANSCRIBE_CONCURRENCY: int = 4
+
+# チャンクごとの再試行回数（初回を除く。レート制限・タイムアウトのみ再試行）
+AUDIO_SEGMENT_MAX_RETRIES: int = 2
+
+# チャンク再試行の待ち時間（秒、試行ごとに倍にする）
+AUDIO_SEGMENT_RETRY_BACKOFF_SECONDS: float = 2.0
+
+# チャンク文字起こし結果キャッシュの最大件数（再開用）
+AUDIO_SEGMENT_CACHE_MAX_ENTRIES: int = 256
+
 
 # =============================================================================
 # Phase M2: 音声入力 - タイムアウト
@@ -66,6 +66,7 @@ from .constants import (
     MAX_PDF_SIZE_BYTES,
     MAX_URL_CONTENT_SIZE_BYTES,
     MAX_AUDIO_SIZE_BYTES,
+    MAX_SEGMENTED_AUDIO_SIZE_BYTES,
     MAX_AUDIO_DURATION_SECONDS,
     MAX_AUDIO_DURATION_MINUTES,
     FEATURE_FLAG_NAME,
@@ -944,6 +945,8 @@ class MultimodalCoordinator:
         """
         return {
             "max_size_bytes": MAX_AUDIO_SIZE_BYTES,
+            # v11.3.0: WAV/MP3 はチャンクに分割して文字起こしする
+            "max_segmented_size_bytes": MAX_SEGMENTED_AUDIO_SIZE_BYTES,
             "max_duration_minutes": MAX_AUDIO_DURATION_MINUTES,
             "max_duration_seconds": MAX_AUDIO_DURATION_SECONDS,
             "supported_formats": list(SUPPORTED_AUDIO_FORMATS),
@@ -9,6 +9,12 @@ Phase M1: Multimodal入力能力 - PDF処理プロセッサー
 2. スキャンPDF（画像）→ ページごとに画像化 → Vision APIでOCR
 3. 混合PDF → テキスト抽出 + 必要な部分のみOCR
 
+v11.3.0: ページ単位のパイプライン
+- pypdf の解析はワーカースレッドで実行（イベントループを塞がない）
+- OCRが必要なページだけを PDF_OCR_CONCURRENCY 件まで並行して処理
+- OCR結果はページ画像のハッシュでキャッシュ（同じページの再送ではVision APIを呼ばない）
+- ページは完了順に受け取り、要約に必要な先頭テキストが揃った時点で要約を開始
+
 ユースケース:
 - 契約書の読み取り → 重要条項の抽出
 - マニュアルの読み込み → ナレッジDBへの登録
@@ -19,8 +25,11 @@ Author: Claude Opus 4.5
 Created: 2026-01-27
 """
 
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+import asyncio
+import hashlib
 import logging
 import io
 import json
@@ -34,6 +43,10 @@ from .constants import (
     MAX_PDF_SIZE_BYTES,
     MAX_PDF_PAGES,
     PDF_OCR_DPI,
+    PDF_OCR_CONCURRENCY,
+    PDF_MIN_PAGE_TEXT_LENGTH,
+    PDF_PAGE_CACHE_MAX_ENTRIES,
+    PDF_SUMMARY_INPUT_LENGTH,
     PDF_PROCESSING_TIMEOUT_SECONDS,
     MAX_EXTRACTED_TEXT_LENGTH,
     MAX_SUMMARY_LENGTH,
@@ -59,11 +72,54 @@ from .models import (
     MultimodalOutput,
 )
 from .base import BaseMultimodalProcessor
+from lib.lru_cache import LRUCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# ページOCRキャッシュ
+# =============================================================================
+
+
+class PDFPageCache(LRUCache[str, PDFPageContent]):
+    """
+    ページOCR結果のキャッシュ（ページ画像のSHA-256 → PDFPageContent）
+
+    同じ資料の再送や、表紙・定型ページが共通する資料でVision API呼び出しを省く。
+    キーはページ画像そのもののハッシュなので、ヒットするのは
+    同一の画像を持っている場合だけ（組織をまたいでも内容は漏れない）。
+    """
+
+    def __init__(self, max_entries: int = PDF_PAGE_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+    @staticmethod
+    def key_for(image_data: bytes) -> str:
+        return hashlib.sha256(image_data).hexdigest()
+
+    def get_page(self, key: str, page_number: int) -> Optional[PDFPageContent]:
+        """キャッシュ済みの結果を page_number を付け替えて返す"""
+        page = self.get(key)
+        if page is None:
+            return None
+        return replace(
+            page,
+            page_number=page_number,
+            headings=list(page.headings),
+            tables=list(page.tables),
+        )
+
+
+_page_cache = PDFPageCache()
+
+
+def get_pdf_page_cache() -> PDFPageCache:
+    """プロセス共通のページOCRキャッシュ"""
+    return _page_cache
+
+
 # =============================================================================
 # PDFProcessor
 # =============================================================================
@@ -91,6 +147,8 @@ class PDFProcessor(BaseMultimodalProcessor):
         pool,
         organization_id: str,
         api_key: Optional[str] = None,
+        ocr_concurrency: int = PDF_OCR_CONCURRENCY,
+        page_cache: Optional[PDFPageCache] = None,
     ):
         """
         初期化
@@ -99,6 +157,8 @@ class PDFProcessor(BaseMultimodalProcessor):
             pool: データベース接続プール
             organization_id: 組織ID
             api_key: OpenRouter API Key
+            ocr_concurrency: ページOCRの同時実行数
+            page_cache: ページOCRキャッシュ（省略時はプロセス共通）
         """
         super().__init__(
             pool=pool,
@@ -106,6 +166,8 @@ class PDFProcessor(BaseMultimodalProcessor):
             api_key=api_key,
             input_type=InputType.PDF,
         )
+        self._ocr_concurrency = max(1, ocr_concurrency)
+        self._page_cache = page_cache if page_cache is not None else get_pdf_page_cache()
 
     # =========================================================================
     # 公開API
@@ -143,8 +205,8 @@ class PDFProcessor(BaseMultimodalProcessor):
             # PDFデータ取得
             pdf_data = await self._get_pdf_data(input_data)
 
-            # Step 2: PDFメタデータ抽出
-            pdf_metadata = self._extract_pdf_metadata(pdf_data)
+            # Step 2: PDFメタデータ抽出（pypdfの解析はワーカースレッドで）
+            pdf_metadata = await asyncio.to_thread(self._extract_pdf_metadata, pdf_data)
             logger.debug(
                 f"PDF metadata: {pdf_metadata.page_count} pages, "
                 f"title={pdf_metadata.title}"
@@ -158,11 +220,44 @@ class PDFProcessor(BaseMultimodalProcessor):
                 )
 
             # Step 4: PDFタイプ判定
-            pdf_type = self._detect_pdf_type(pdf_data)
+            pdf_type = await asyncio.to_thread(self._detect_pdf_type, pdf_data)
             logger.debug(f"PDF type: {pdf_type.value}")
 
-            # Step 5: テキスト抽出
-            pages = await self._extract_text(pdf_data, pdf_type, pdf_metadata.page_count)
+            # Step 5: テキスト抽出（完了したページから順に受け取る）
+            # 要約は先頭 PDF_SUMMARY_INPUT_LENGTH 文字しか使わないため、
+            # 先頭から連続するページでその文字数が揃った時点で要約を開始する
+            pages_by_index: Dict[int, PDFPageContent] = {}
+            summary_task: Optional[asyncio.Task] = None
+            prefix_parts: List[str] = []
+            prefix_length = 0
+            next_index = 0
+
+            try:
+                async for page_index, page in self._iter_pages(
+                    pdf_data, pdf_type, pdf_metadata.page_count,
+                ):
+                    pages_by_index[page_index] = page
+                    if summary_task is not None:
+                        continue
+                    while next_index in pages_by_index:
+                        text = pages_by_index[next_index].text
+                        if text:
+                            # full_text と同じく "\n\n" 区切りで数える
+                            prefix_length += len(text) + (2 if prefix_parts else 0)
+                            prefix_parts.append(text)
+                        next_index += 1
+                    if prefix_length >= PDF_SUMMARY_INPUT_LENGTH:
+                        summary_task = asyncio.create_task(self._generate_summary(
+                            "\n\n".join(prefix_parts),
+                            pdf_metadata,
+                            input_data.instruction,
+                        ))
+            except BaseException:
+                if summary_task is not None:
+                    summary_task.cancel()
+                raise
+
+            pages = [pages_by_index[i] for i in sorted(pages_by_index)]
 
             # 全テキスト結合
             full_text = "\n\n".join([p.text for p in pages if p.text])
@@ -174,12 +269,15 @@ class PDFProcessor(BaseMultimodalProcessor):
             all_tables = self._extract_all_tables(pages)
             toc = self._generate_table_of_contents(all_headings)
 
-            # Step 7: 要約生成
-            summary, key_points = await self._generate_summary(
-                full_text,
-                pdf_metadata,
-                input_data.instruction,
-            )
+            # Step 7: 要約生成（先行して開始していればその結果を待つ）
+            if summary_task is not None:
+                summary, key_points = await summary_task
+            else:
+                summary, key_points = await self._generate_summary(
+                    full_text,
+                    pdf_metadata,
+                    input_data.instruction,
+                )
 
             # Step 8: エンティティ抽出
             entities = self._extract_entities_from_text(full_text)
@@ -405,7 +503,7 @@ class PDFProcessor(BaseMultimodalProcessor):
 
                 for i, page in enumerate(reader.pages[:5]):  # 最初の5ページをサンプル
                     text = page.extract_text() or ""
-                    if len(text.strip()) > 50:  # 有意なテキストがある
+                    if len(text.strip()) > PDF_MIN_PAGE_TEXT_LENGTH:  # 有意なテキストがある
                         text_pages += 1
                     else:
                         image_pages += 1
@@ -427,27 +525,75 @@ class PDFProcessor(BaseMultimodalProcessor):
         pdf_type: PDFType,
         page_count: int,
     ) -> List[PDFPageContent]:
-        """テキストを抽出"""
-        pages = []
+        """テキストを抽出（ページ順のリスト）"""
+        pages_by_index: Dict[int, PDFPageContent] = {}
+        async for page_index, page in self._iter_pages(pdf_data, pdf_type, page_count):
+            pages_by_index[page_index] = page
+        return [pages_by_index[i] for i in sorted(pages_by_index)]
 
-        if pdf_type == PDFType.TEXT_BASED:
-            pages = self._extract_text_pypdf(pdf_data)
-        elif pdf_type == PDFType.SCANNED:
-            pages = await self._extract_text_ocr(pdf_data, page_count)
-        else:  # MIXED
-            # テキスト抽出を試み、不十分なページはOCR
-            text_pages = self._extract_text_pypdf(pdf_data)
+    async def _iter_pages(
+        self,
+        pdf_data: bytes,
+        pdf_type: PDFType,
+        page_count: int,
+    ) -> AsyncIterator[Tuple[int, PDFPageContent]]:
+        """
+        ページを完了順に返す
+
+        - テキストベース: pypdf の結果をそのまま返す
+        - スキャン: 全ページをOCR
+        - 混合: テキストが PDF_MIN_PAGE_TEXT_LENGTH 文字未満のページだけOCR
+
+        OCRは最大 ocr_concurrency 件まで並行して実行する。
+
+        Yields:
+            (0始まりのページ番号, ページ内容)
+        """
+        text_pages: List[PDFPageContent] = []
+        if pdf_type == PDFType.SCANNED:
+            ocr_indexes = list(range(min(page_count, MAX_PDF_PAGES)))
+        else:
+            text_pages = await asyncio.to_thread(self._extract_text_pypdf, pdf_data)
+            ocr_indexes = []
+            if pdf_type == PDFType.MIXED:
+                ocr_indexes = [
+                    i for i, page in enumerate(text_pages)
+                    if len(page.text.strip()) < PDF_MIN_PAGE_TEXT_LENGTH
+                ]
+            needs_ocr = set(ocr_indexes)
             for i, page in enumerate(text_pages):
-                if len(page.text.strip()) < 50:
-                    # OCRが必要
-                    try:
-                        ocr_page = await self._ocr_page(pdf_data, i)
-                        text_pages[i] = ocr_page
-                    except Exception as e:
-                        logger.warning(f"OCR failed for page {i}: {e}")
-            pages = text_pages
+                if i not in needs_ocr:
+                    yield i, page
+
+        if not ocr_indexes:
+            return
+
+        semaphore = asyncio.Semaphore(self._ocr_concurrency)
+
+        async def _ocr(page_index: int) -> Tuple[int, PDFPageContent]:
+            async with semaphore:
+                try:
+                    return page_index, await self._ocr_page(pdf_data, page_index)
+                except Exception as e:
+                    logger.warning(f"OCR failed for page {page_index}: {e}")
+                    if text_pages:
+                        # 混合PDF: テキスト抽出の結果を残す
+                        return page_index, text_pages[page_index]
+                    return page_index, PDFPageContent(
+                        page_number=page_index + 1,
+                        text="",
+                        ocr_used=True,
+                        ocr_confidence=0.0,
+                    )
 
-        return pages
+        tasks = [asyncio.ensure_future(_ocr(i)) for i in ocr_indexes]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
     def _extract_text_pypdf(self, pdf_data: bytes) -> List[PDFPageContent]:
         """PyPDF2でテキスト抽出"""
@@ -484,33 +630,23 @@ class PDFProcessor(BaseMultimodalProcessor):
         pdf_data: bytes,
         page_count: int,
     ) -> List[PDFPageContent]:
-        """OCRでテキスト抽出"""
-        pages = []
-
-        for i in range(min(page_count, MAX_PDF_PAGES)):
-            try:
-                page = await self._ocr_page(pdf_data, i)
-                pages.append(page)
-            except Exception as e:
-                logger.warning(f"OCR failed for page {i}: {e}")
-                pages.append(PDFPageContent(
-                    page_number=i + 1,
-                    text="",
-                    ocr_used=True,
-                    ocr_confidence=0.0,
-                ))
-
-        return pages
+        """OCRでテキスト抽出（全ページ、並行実行）"""
+        return await self._extract_text(pdf_data, PDFType.SCANNED, page_count)
 
     async def _ocr_page(self, pdf_data: bytes, page_index: int) -> PDFPageContent:
         """単一ページをOCR"""
         try:
-            # PDFページを画像に変換
-            image_data = self._pdf_page_to_image(pdf_data, page_index)
+            # PDFページを画像に変換（レンダリングはワーカースレッドで）
+            image_data = await asyncio.to_thread(self._pdf_page_to_image, pdf_data, page_index)
 
             if not image_data:
                 raise PDFOCRError(page_number=page_index + 1)
 
+            cache_key = PDFPageCache.key_for(image_data)
+            cached = self._page_cache.get_page(cache_key, page_number=page_index + 1)
+            if cached is not None:
+                return cached
+
             # Vision APIでOCR
             prompt = """このPDFページの画像からテキストを正確に抽出してください。
 
@@ -531,7 +667,7 @@ class PDFProcessor(BaseMultimodalProcessor):
             # 結果パース
             parsed = self._parse_ocr_result(result["content"])
 
-            return PDFPageContent(
+            page = PDFPageContent(
                 page_number=page_index + 1,
                 text=parsed.get("text", ""),
                 has_images=True,
@@ -539,6 +675,8 @@ class PDFProcessor(BaseMultimodalProcessor):
                 ocr_confidence=parsed.get("confidence", 0.7),
                 headings=parsed.get("headings", []),
             )
+            self._page_cache.put(cache_key, page)
+            return page
 
         except Exception as e:
             raise PDFOCRError(page_number=page_index + 1)
@@ -662,7 +800,7 @@ class PDFProcessor(BaseMultimodalProcessor):
             return "", []
 
         # テキストを制限
-        text_for_summary = full_text[:20000]
+        text_for_summary = full_text[:PDF_SUMMARY_INPUT_LENGTH]
 
         prompt = f"""以下のPDFドキュメントを分析し、要約と重要ポイントを抽出してください。
 
@@ -749,6 +887,7 @@ def create_pdf_processor(
     pool,
     organization_id: str,
     api_key: Optional[str] = None,
+    ocr_concurrency: int = PDF_OCR_CONCURRENCY,
 ) -> PDFProcessor:
     """
     PDFProcessorを作成するファクトリー関数
@@ -757,6 +896,7 @@ def create_pdf_processor(
         pool: データベース接続プール
         organization_id: 組織ID
         api_key: OpenRouter API Key
+        ocr_concurrency: ページOCRの同時実行数
 
     Returns:
         PDFProcessor
@@ -765,4 +905,5 @@ def create_pdf_processor(
         pool=pool,
         organization_id=organization_id,
         api_key=api_key,
+        ocr_concurrency=ocr_concurrency,
     )
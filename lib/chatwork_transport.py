@@ -0,0 +1,639 @@
+# lib/chatwork_transport.py
+"""
+ChatWork API 共通トランスポート
+
+v11.3.0: ChatworkClient._request は 429 のたびに Retry-After だけ待ち、
+Cloud Functions（sync-chatwork-tasks）は独自の call_chatwork_api_with_retry /
+get_room_members_with_cache を持っていたため、APIトークン単位の
+「300回/5分」の予算を誰も調整していなかった。
+
+【仕組み】
+- トークンバケット（APIトークンごと）
+  5分300回のペースで補充し、レスポンスの x-ratelimit-remaining / x-ratelimit-reset で
+  サーバー側の残数に合わせる（他サービスが使った分もヘッダー経由で反映される）
+- 優先レーン
+  INTERACTIVE（ライブ返信）は全枠を使えるが、BATCH（同期ジョブ等）は
+  予約枠（既定30回）を残した分しか使えず、INTERACTIVE の待機中は譲る
+- 同一GETの合流
+  同じトークン・パス・パラメータのGETが実行中なら、後続は結果を待って共有する
+  （メッセージ取得は既読化されるため対象外）
+- レスポンスキャッシュ
+  パスごとのTTL（ルーム一覧60秒、メンバー300秒など）で200レスポンスを再利用する。
+  ETag があれば期限切れ後に If-None-Match で再検証し、304 なら本文を再利用する。
+  書き込み（POST/PUT/DELETE）が成功したら、同じルームのキャッシュを破棄する
+
+HTTP 呼び出しは httpx.request、待機は time.sleep を都度参照する
+（既存テストのパッチがそのまま効くように）。
+
+Created: 2026-10-16
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from lib.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+API_BASE_URL = "https://api.chatwork.com/v2"
+
+# ChatWork API のレート制限（APIトークン単位）
+CHATWORK_RATE_LIMIT = 300
+CHATWORK_RATE_WINDOW_SECONDS = 300.0
+
+# BATCH レーンが手を付けない残り枠（ライブ返信用）
+BATCH_RESERVED_TOKENS = int(os.environ.get("CHATWORK_BATCH_RESERVED_TOKENS", "30"))
+
+# 429 で Retry-After もリセット時刻も分からない場合の待機秒数
+DEFAULT_RETRY_AFTER_SECONDS = 60
+
+# タイムアウト時の初回待機秒数（以降は倍々）
+TIMEOUT_RETRY_WAIT_SECONDS = 1.0
+
+# レスポンスキャッシュの最大エントリ数
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# GET レスポンスのキャッシュTTL（秒）。先頭から順にパスを照合する
+CACHE_TTL_RULES: Tuple[Tuple["re.Pattern[str]", float], ...] = (
+    (re.compile(r"^/rooms$"), 60.0),
+    (re.compile(r"^/rooms/\d+$"), 60.0),
+    (re.compile(r"^/rooms/\d+/members$"), 300.0),
+    (re.compile(r"^/rooms/\d+/tasks$"), 30.0),
+    (re.compile(r"^/contacts$"), 300.0),
+    (re.compile(r"^/me$"), 3600.0),
+)
+
+# 合流しないGET（取得すると既読になるなど、呼び出しごとに結果が変わるもの）
+NON_COALESCABLE_PATH = re.compile(r"/messages")
+
+_ROOM_PATH = re.compile(r"^/rooms/(\d+)")
+
+
+class Priority(IntEnum):
+    """リクエストの優先レーン（値が小さいほど優先）"""
+    INTERACTIVE = 0  # ユーザーへのライブ返信
+    BATCH = 1        # 定期同期・一括通知など
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    """ヘッダー値を整数で取得（無い・数値でない場合は None）"""
+    try:
+        value = headers.get(name)
+    except AttributeError:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("ascii", "ignore")
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _token_key(api_token: str) -> str:
+    """APIトークンを辞書キーにするためのハッシュ（トークン自体は保持しない）"""
+    return hashlib.sha256((api_token or "").encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """フルURLでもパスでも受け取り、API_BASE_URL からの相対パスにする"""
+    if endpoint.startswith(API_BASE_URL):
+        endpoint = endpoint[len(API_BASE_URL):]
+    return endpoint.split("?", 1)[0] or "/"
+
+
+def cache_ttl_for(path: str) -> Optional[float]:
+    """パスのキャッシュTTL（キャッシュ対象外なら None）"""
+    for pattern, ttl in CACHE_TTL_RULES:
+        if pattern.match(path):
+            return ttl
+    return None
+
+
+def _params_key(params: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    if not params:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+# =============================================================================
+# レートリミッター
+# =============================================================================
+
+class ChatworkRateLimiter:
+    """
+    1つのAPIトークンのトークンバケット（スレッドセーフ）
+
+    サーバーの x-ratelimit-* ヘッダーを受け取るまでは window あたり capacity 回の
+    ペースで連続補充する。ヘッダーを受け取った後は、リセット時刻まで残数を
+    サーバーの値に合わせ、リセット時刻に満タンに戻す。
+    """
+
+    def __init__(
+        self,
+        capacity: int = CHATWORK_RATE_LIMIT,
+        window_seconds: float = CHATWORK_RATE_WINDOW_SECONDS,
+        reserved_for_interactive: int = BATCH_RESERVED_TOKENS,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.capacity = capacity
+        self.refill_per_second = capacity / window_seconds
+        self.reserved_for_interactive = max(0, min(reserved_for_interactive, capacity - 1))
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._reset_at: Optional[float] = None  # サーバー側ウィンドウのリセット時刻（clock 基準）
+        self._waiting_interactive = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+    def try_acquire(self, priority: Priority = Priority.INTERACTIVE) -> float:
+        """
+        1回分を確保する
+
+        Returns:
+            0 なら確保済み。正の値なら確保できるまでの目安秒数（何も消費しない）
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            floor = 0
+            if priority >= Priority.BATCH:
+                floor = self.reserved_for_interactive
+                if self._waiting_interactive:
+                    # 待機中のライブ返信に先を譲る
+                    return self._wait_for(now, self._tokens + 1)
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                return 0.0
+            return self._wait_for(now, floor + 1)
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, sleep: Optional[Callable[[float], None]] = None) -> float:
+        """
+        確保できるまで待機して1回分を確保する
+
+        Returns:
+            待機した秒数
+        """
+        waited = 0.0
+        registered = False
+        try:
+            while True:
+                wait = self.try_acquire(priority)
+                if wait <= 0:
+                    return waited
+                if priority == Priority.INTERACTIVE and not registered:
+                    self._set_waiting(+1)
+                    registered = True
+                (sleep or time.sleep)(wait)
+                waited += wait
+        finally:
+            if registered:
+                self._set_waiting(-1)
+
+    async def acquire_async(self, priority: Priority = Priority.INTERACTIVE) -> float:
+        """acquire の非同期版（イベントループをブロックしない）"""
+        waited = 0.0
+        registered = False
+        try:
+            while True:
+                wait = self.try_acquire(priority)
+                if wait <= 0:
+                    return waited
+                if priority == Priority.INTERACTIVE and not registered:
+                    self._set_waiting(+1)
+                    registered = True
+                await asyncio.sleep(wait)
+                waited += wait
+        finally:
+            if registered:
+                self._set_waiting(-1)
+
+    def update_from_headers(self, headers: Any) -> None:
+        """レスポンスヘッダー（x-ratelimit-remaining / reset）でサーバー側の残数に合わせる"""
+        remaining = _header_int(headers, "x-ratelimit-remaining")
+        if remaining is None:
+            return
+        reset_epoch = _header_int(headers, "x-ratelimit-reset")
+
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if reset_epoch is None:
+                self._tokens = min(self._tokens, float(remaining))
+                return
+
+            reset_at = now + max(0.0, reset_epoch - self._wall_clock())
+            if self._reset_at is None or reset_at > self._reset_at + 1.0:
+                # 新しいウィンドウ: サーバーの残数をそのまま採用
+                self._tokens = float(remaining)
+            else:
+                # 同じウィンドウ: 並行リクエストの応答順によらず少ない方を採用
+                self._tokens = min(self._tokens, float(remaining))
+            self._reset_at = reset_at
+            self._updated = now
+
+    def _set_waiting(self, delta: int) -> None:
+        with self._lock:
+            self._waiting_interactive += delta
+
+    def _refill(self, now: float) -> None:
+        if self._reset_at is not None:
+            if now >= self._reset_at:
+                self._tokens = float(self.capacity)
+                self._reset_at = None
+                self._updated = now
+            return
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.capacity), self._tokens + elapsed * self.refill_per_second)
+            self._updated = now
+
+    def _wait_for(self, now: float, needed: float) -> float:
+        """残数が needed に達するまでの秒数"""
+        if self._reset_at is not None:
+            return max(self._reset_at - now, 0.01)
+        return max((needed - self._tokens) / self.refill_per_second, 0.01)
+
+
+# =============================================================================
+# レスポンスキャッシュ
+# =============================================================================
+
+@dataclass
+class CachedResponse:
+    """キャッシュした GET レスポンス"""
+    status_code: int
+    content: bytes
+    headers: Dict[str, str]
+    etag: Optional[str]
+    expires_at: float
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(self.status_code, content=self.content, headers=self.headers)
+
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class ChatworkResponseCache(LRUCache[CacheKey, CachedResponse]):
+    """
+    GET レスポンスのキャッシュ（プロセス共通）
+
+    キー: (トークンのハッシュ, パス, パラメータ)
+    期限切れでも ETag を持つエントリは再検証用に残す。
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+    def invalidate_room(self, token_key: str, room_id: Optional[str]) -> None:
+        """ルーム配下（とルーム一覧）のエントリを破棄"""
+        prefix = f"/rooms/{room_id}" if room_id else None
+        self.discard_where(
+            lambda key: key[0] == token_key and (
+                key[1] == "/rooms"
+                or (prefix is not None and (key[1] == prefix or key[1].startswith(prefix + "/")))
+            )
+        )
+
+
+# =============================================================================
+# トランスポート
+# =============================================================================
+
+@dataclass
+class _InflightCall:
+    """合流中のGET（先頭の呼び出しが結果を設定する）"""
+    done: threading.Event = field(default_factory=threading.Event)
+    response: Optional[httpx.Response] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class TransportStats:
+    """トランスポートの統計（ログ・テスト用）"""
+    sent: int = 0
+    cache_hits: int = 0
+    revalidated: int = 0
+    coalesced: int = 0
+    rate_limited: int = 0
+
+
+class ChatworkTransport:
+    """
+    ChatWork API 呼び出しの共通層
+
+    request() は最終的な httpx.Response を返す（429 やエラーステータスも含む）。
+    全試行がタイムアウトした場合は httpx.TimeoutException を送出する。
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ChatworkResponseCache] = None,
+        limiter_factory: Callable[[], ChatworkRateLimiter] = ChatworkRateLimiter,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Args:
+            cache: レスポンスキャッシュ（省略時は新規作成）
+            limiter_factory: APIトークンごとのレートリミッター生成関数
+            sleep: 待機関数（省略時は time.sleep）
+        """
+        self.cache = cache if cache is not None else ChatworkResponseCache()
+        self.stats = TransportStats()
+        self._limiter_factory = limiter_factory
+        self._limiters: Dict[str, ChatworkRateLimiter] = {}
+        self._inflight: Dict[CacheKey, _InflightCall] = {}
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 公開API
+    # -------------------------------------------------------------------------
+
+    def limiter_for(self, api_token: str) -> ChatworkRateLimiter:
+        """APIトークンのレートリミッター"""
+        key = _token_key(api_token)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiter_factory()
+                self._limiters[key] = limiter
+            return limiter
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        timeout: float = 10.0,
+        max_attempts: int = 3,
+        use_cache: bool = True,
+        on_send: Optional[Callable[[], None]] = None,
+    ) -> httpx.Response:
+        """
+        ChatWork API を呼び出す（レート制限・合流・キャッシュ付き）
+
+        Args:
+            method: HTTPメソッド
+            endpoint: パス（"/rooms/123/members"）またはフルURL
+            headers: リクエストヘッダー（X-ChatWorkToken を含む）
+            params: クエリパラメータ
+            data: リクエストボディ
+            priority: 優先レーン
+            timeout: 1回あたりのタイムアウト（秒）
+            max_attempts: 最大試行回数（429・タイムアウト時に再試行）
+            use_cache: False ならキャッシュを読まない（結果の保存は行う）
+            on_send: 実際にHTTPリクエストを送るたびに呼ぶコールバック（APIコール数の計測用）
+
+        Returns:
+            httpx.Response
+        """
+        method = method.upper()
+        path = normalize_endpoint(endpoint)
+        api_token = headers.get("X-ChatWorkToken", "")
+        token_key = _token_key(api_token)
+
+        if method != "GET":
+            response = self._send_with_retry(
+                method, path, headers, params, data, priority, timeout, max_attempts, on_send,
+            )
+            if response.status_code < 400:
+                room = _ROOM_PATH.match(path)
+                self.cache.invalidate_room(token_key, room.group(1) if room else None)
+            return response
+
+        key: CacheKey = (token_key, path, _params_key(params))
+        ttl = cache_ttl_for(path)
+        cached = self.cache.get(key) if ttl is not None else None
+        if cached is not None and use_cache and cached.expires_at > time.monotonic():
+            with self._lock:
+                self.stats.cache_hits += 1
+            return cached.to_response()
+
+        if NON_COALESCABLE_PATH.search(path):
+            return self._fetch(key, ttl, cached, method, path, headers, params, priority, timeout, max_attempts, on_send)
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = _InflightCall()
+                self._inflight[key] = inflight
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.response
+
+        try:
+            inflight.response = self._fetch(
+                key, ttl, cached, method, path, headers, params, priority, timeout, max_attempts, on_send,
+            )
+            return inflight.response
+        except BaseException as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+    def lookup_cached(self, api_token: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[httpx.Response]:
+        """有効期限内のキャッシュがあれば返す（非同期クライアント用）"""
+        path = normalize_endpoint(endpoint)
+        if cache_ttl_for(path) is None:
+            return None
+        cached = self.cache.get((_token_key(api_token), path, _params_key(params)))
+        if cached is None or cached.expires_at <= time.monotonic():
+            return None
+        with self._lock:
+            self.stats.cache_hits += 1
+        return cached.to_response()
+
+    def observe(
+        self,
+        api_token: str,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        response: Any,
+    ) -> None:
+        """
+        自前で送ったリクエストの結果を反映する（非同期クライアント用）
+
+        レートリミッターの残数更新、GET 200 のキャッシュ保存、書き込み成功時の破棄を行う。
+        """
+        path = normalize_endpoint(endpoint)
+        token_key = _token_key(api_token)
+        self.limiter_for(api_token).update_from_headers(getattr(response, "headers", None))
+        status = getattr(response, "status_code", None)
+        if not isinstance(status, int) or status >= 400:
+            return
+        if method.upper() == "GET":
+            ttl = cache_ttl_for(path)
+            if ttl is not None:
+                self._store((token_key, path, _params_key(params)), ttl, response)
+        else:
+            room = _ROOM_PATH.match(path)
+            self.cache.invalidate_room(token_key, room.group(1) if room else None)
+
+    # -------------------------------------------------------------------------
+    # 内部処理
+    # -------------------------------------------------------------------------
+
+    def _fetch(
+        self,
+        key: CacheKey,
+        ttl: Optional[float],
+        cached: Optional[CachedResponse],
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        priority: Priority,
+        timeout: float,
+        max_attempts: int,
+        on_send: Optional[Callable[[], None]],
+    ) -> httpx.Response:
+        """GET を送信し、必要なら ETag で再検証・キャッシュ保存する"""
+        etag = cached.etag if cached is not None else None
+        request_headers = dict(headers)
+        if etag:
+            request_headers["If-None-Match"] = etag
+
+        response = self._send_with_retry(
+            method, path, request_headers, params, None, priority, timeout, max_attempts, on_send,
+        )
+
+        if response.status_code == 304 and cached is not None and ttl is not None:
+            cached.expires_at = time.monotonic() + ttl
+            self.cache.put(key, cached)
+            with self._lock:
+                self.stats.revalidated += 1
+            return cached.to_response()
+
+        if ttl is not None and response.status_code == 200:
+            self._store(key, ttl, response)
+        return response
+
+    def _store(self, key: CacheKey, ttl: float, response: Any) -> None:
+        content = getattr(response, "content", None)
+        if not isinstance(content, bytes):
+            return
+        response_headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() in ("content-type", "etag")
+        }
+        self.cache.put(key, CachedResponse(
+            status_code=response.status_code,
+            content=content,
+            headers=response_headers,
+            etag=response.headers.get("etag"),
+            expires_at=time.monotonic() + ttl,
+        ))
+
+    def _send_with_retry(
+        self,
+        method: str,
+        path: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        priority: Priority,
+        timeout: float,
+        max_attempts: int,
+        on_send: Optional[Callable[[], None]],
+    ) -> httpx.Response:
+        """レート制限を守って送信し、429・タイムアウトは再試行する"""
+        limiter = self.limiter_for(headers.get("X-ChatWorkToken", ""))
+        sleep = self._sleep or time.sleep
+        url = f"{API_BASE_URL}{path}"
+        attempts = max(1, max_attempts)
+        timeout_wait = TIMEOUT_RETRY_WAIT_SECONDS
+
+        attempt = 0
+        while True:
+            last_attempt = attempt >= attempts - 1
+            attempt += 1
+            waited = limiter.acquire(priority, sleep=sleep)
+            if waited > 0:
+                logger.info("ChatWork rate budget wait: %.1fs (priority=%s)", waited, priority.name)
+
+            try:
+                if on_send is not None:
+                    on_send()
+                with self._lock:
+                    self.stats.sent += 1
+                response = httpx.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    timeout=timeout,
+                )
+            except httpx.TimeoutException:
+                if last_attempt:
+                    raise
+                sleep(timeout_wait)
+                timeout_wait *= 2
+                continue
+
+            limiter.update_from_headers(response.headers)
+
+            if response.status_code == 429:
+                with self._lock:
+                    self.stats.rate_limited += 1
+                if last_attempt:
+                    return response
+                retry_after = _header_int(response.headers, "Retry-After")
+                if retry_after is None:
+                    retry_after = DEFAULT_RETRY_AFTER_SECONDS
+                logger.warning(
+                    "ChatWork rate limited (429): %s %s, retry in %ss (%d/%d)",
+                    method, path, retry_after, attempt, attempts - 1,
+                )
+                sleep(retry_after)
+                continue
+
+            return response
+
+
+_transport: Optional[ChatworkTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_chatwork_transport() -> ChatworkTransport:
+    """プロセス共通のトランスポート（全クライアント・ジョブでレート予算とキャッシュを共有）"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = ChatworkTransport()
+        return _transport
@@ -32,13 +32,34 @@
     # クエリ用エンベディング（検索時に使用）
     query_result = client.embed_query_sync("有給申請の方法は？")
 
+★★★ v11.3.0: エンベディングキャッシュ ★★★
+- L1: プロセス内LRU（EmbeddingCache、全クライアントで共有）
+- L2: 永続ストア（DatabaseEmbeddingStore → embedding_cache テーブル、任意）
+- キーは model + task_type + テキストの SHA-256（本文そのものは保存しない）
+- embed_texts は重複除去 → キャッシュ確認 → 未取得分だけ並列バッチでAPI呼び出し
+
+    # Drive再インデックス等、同じチャンクを何度も埋め込む処理向け
+    client = EmbeddingClient(
+        persistent_store=DatabaseEmbeddingStore(pool, organization_id),
+    )
+
+    # 共有クライアントに組織のL2だけ付けて使う（リクエスト単位の検索向け）
+    client = get_embedding_client().with_persistent_store(
+        DatabaseEmbeddingStore(pool, organization_id),
+    )
+
 設計ドキュメント:
     docs/05_phase3_knowledge_detailed_design.md
 """
 
 import os
 import asyncio
+import copy
+import hashlib
 import time
+from abc import ABC, abstractmethod
+from array import array
+from threading import Lock
 from typing import Optional
 from dataclasses import dataclass
 import logging
@@ -47,6 +68,7 @@ from google import genai
 from google.genai.types import EmbedContentConfig
 
 from lib.config import get_settings
+from lib.lru_cache import LRUCache
 from lib.secrets import get_secret
 
 
@@ -78,6 +100,13 @@ TASK_TYPE_MAP = {
     "RETRIEVAL_QUERY": "RETRIEVAL_QUERY",
 }
 
+# v11.3.0: プロセス内キャッシュの最大エントリ数
+# 768次元のdouble配列で約6KB/件 → 2048件で約12MB
+EMBEDDING_CACHE_MAX_ENTRIES = 2048
+
+# v11.3.0: embed_texts で同時に投げるバッチ数の上限（API側のレート制限対策）
+EMBEDDING_MAX_CONCURRENCY = 4
+
 
 # ================================================================
 # データクラス定義
@@ -104,6 +133,204 @@ class BatchEmbeddingResult:
     total_tokens: int
     model: str
     processing_time_ms: int
+    cached_count: int = 0  # v11.3.0: キャッシュから返した件数（API呼び出しなし）
+
+
+# ================================================================
+# キャッシュ（v11.3.0）
+# ================================================================
+
+def make_embedding_cache_key(model: str, task_type: str, text: str) -> str:
+    """
+    キャッシュキーを生成（model + task_type + テキストのSHA-256）
+
+    Args:
+        model: エンベディングモデル名
+        task_type: 正規化済みタスクタイプ（RETRIEVAL_DOCUMENT 等）
+        text: テキスト
+
+    Returns:
+        16進文字列のハッシュ
+    """
+    payload = f"{model}\x00{task_type}\x00{text}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    プロセス内のエンベディングキャッシュ（LRU、スレッドセーフ）
+
+    ベクターは array('d') で保持してメモリを節約する（floatのリストの約1/4）。
+    max_entries=0 でキャッシュ無効。
+    """
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self._entries: LRUCache[str, array] = LRUCache(max_entries)
+        self._stats_lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """ヒットしたキー → ベクター（呼び出し側で変更しても良いよう新しいリスト）"""
+        found = {key: vector.tolist() for key, vector in self._entries.get_many(keys).items()}
+        with self._stats_lock:
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, vectors: dict[str, list[float]]) -> None:
+        """ベクターを保存（上限を超えたら古いものから破棄）"""
+        if self._entries.max_entries <= 0:
+            return
+        self._entries.put_many({key: array("d", vector) for key, vector in vectors.items()})
+
+    def clear(self) -> None:
+        """全エントリを破棄"""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """統計情報を取得"""
+        with self._stats_lock:
+            hits, misses = self._hits, self._misses
+        total = hits + misses
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+        }
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_cache_lock = Lock()
+
+
+def get_shared_embedding_cache() -> EmbeddingCache:
+    """
+    プロセス共通のエンベディングキャッシュを取得（シングルトン）
+
+    リクエストごとに EmbeddingClient を作る経路でもキャッシュが効くよう、
+    cache 未指定の EmbeddingClient はこれを使う。
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache()
+        return _shared_cache
+
+
+class EmbeddingStore(ABC):
+    """
+    永続エンベディングストアのインターフェース（L2キャッシュ）
+
+    実装は失敗しても例外を投げず、ヒットなし扱いにすること
+    （キャッシュ障害でエンベディング生成自体を止めない）。
+    """
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """ヒットしたキー → ベクター"""
+        ...
+
+    @abstractmethod
+    def put_many(
+        self,
+        model: str,
+        task_type: str,
+        vectors: dict[str, list[float]],
+    ) -> None:
+        """ベクターを保存"""
+        ...
+
+
+class DatabaseEmbeddingStore(EmbeddingStore):
+    """
+    embedding_cache テーブルを使う永続ストア
+
+    テナント分離のため organization_id 単位で保持する（鉄則: org_idフィルター必須）。
+    テキスト本文は保存せず、ハッシュとベクターのみを保存する。
+
+    マイグレーション: migrations/20261016_embedding_cache.sql
+    """
+
+    def __init__(self, pool, organization_id: str):
+        """
+        Args:
+            pool: SQLAlchemy同期エンジン（lib.db.get_db_pool()）
+            organization_id: 組織ID
+        """
+        self.pool = pool
+        self.organization_id = str(organization_id)
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys:
+            return {}
+        from sqlalchemy import text
+
+        try:
+            with self.pool.connect() as conn:
+                conn.execute(
+                    text("SELECT set_config('app.current_organization_id', :org_id, true)"),
+                    {"org_id": self.organization_id},
+                )
+                rows = conn.execute(
+                    text("""
+                        SELECT cache_key, vector
+                        FROM embedding_cache
+                        WHERE organization_id = :org_id
+                          AND cache_key = ANY(:keys)
+                    """),
+                    {"org_id": self.organization_id, "keys": list(keys)},
+                ).fetchall()
+            return {row[0]: list(row[1]) for row in rows if row[1]}
+        except Exception as e:
+            logger.warning("[EmbeddingStore] get failed: %s", type(e).__name__)
+            return {}
+
+    def put_many(
+        self,
+        model: str,
+        task_type: str,
+        vectors: dict[str, list[float]],
+    ) -> None:
+        if not vectors:
+            return
+        from sqlalchemy import text
+
+        params = [
+            {
+                "org_id": self.organization_id,
+                "cache_key": key,
+                "model": model,
+                "task_type": task_type,
+                "dimension": len(vector),
+                "vector": list(vector),
+            }
+            for key, vector in vectors.items()
+        ]
+        try:
+            with self.pool.connect() as conn:
+                conn.execute(
+                    text("SELECT set_config('app.current_organization_id', :org_id, true)"),
+                    {"org_id": self.organization_id},
+                )
+                conn.execute(
+                    text("""
+                        INSERT INTO embedding_cache (
+                            organization_id, cache_key, model, task_type, dimension, vector
+                        ) VALUES (
+                            :org_id, :cache_key, :model, :task_type, :dimension, :vector
+                        )
+                        ON CONFLICT (organization_id, cache_key) DO NOTHING
+                    """),
+                    params,
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning("[EmbeddingStore] put failed: %s", type(e).__name__)
 
 
 # ================================================================
@@ -140,11 +367,17 @@ class EmbeddingClient:
         self,
         api_key: Optional[str] = None,
         model: str = DEFAULT_MODEL,
+        cache: Optional[EmbeddingCache] = None,
+        persistent_store: Optional[EmbeddingStore] = None,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
     ):
         """
         Args:
             api_key: Gemini APIキー（未指定時は環境変数またはSecret Managerから取得）
             model: 使用するエンベディングモデル
+            cache: プロセス内キャッシュ（未指定時はプロセス共通のLRU）
+            persistent_store: 永続キャッシュ（L2、任意）
+            max_concurrency: embed_texts の同時バッチ数
         """
         self.settings = get_settings()
 
@@ -173,11 +406,27 @@ class EmbeddingClient:
             raise ValueError(f"サポートされていないモデル: {model}")
         self.model_info = EMBEDDING_MODELS[model]
 
+        # v11.3.0: エンベディングキャッシュ
+        self.cache = cache if cache is not None else get_shared_embedding_cache()
+        self.persistent_store = persistent_store
+        self.max_concurrency = max(1, max_concurrency)
+
     @property
     def dimension(self) -> int:
         """エンベディングの次元数"""
         return self.model_info["dimension"]
 
+    def with_persistent_store(self, persistent_store: Optional[EmbeddingStore]) -> "EmbeddingClient":
+        """
+        APIクライアントとL1キャッシュを共有し、永続ストア（L2）だけ差し替えたクライアント
+
+        DatabaseEmbeddingStore は組織単位のため、共有クライアントを
+        リクエストの組織に合わせて使うときに呼ぶ。
+        """
+        client = copy.copy(self)
+        client.persistent_store = persistent_store
+        return client
+
     # ================================================================
     # 非同期メソッド（FastAPI用）
     # ================================================================
@@ -226,19 +475,46 @@ class EmbeddingClient:
         """
         複数テキストのエンベディングを生成（非同期、バッチ処理）
 
+        v11.3.0: 重複除去 + キャッシュ確認の後、未取得分のバッチを
+        max_concurrency 件まで並列にAPIへ投げる。
+
         Args:
             texts: エンベディングを生成するテキストのリスト
             task_type: タスクタイプ
             batch_size: バッチサイズ
 
         Returns:
-            BatchEmbeddingResult オブジェクト
+            BatchEmbeddingResult オブジェクト（texts と同じ順序）
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.embed_texts_sync(texts, task_type, batch_size)
-        )
+        start_time = time.time()
+        normalized_task_type = self._normalize_task_type(task_type)
+        keys = {
+            t: make_embedding_cache_key(self.model, normalized_task_type, t)
+            for t in dict.fromkeys(texts)
+        }
+
+        cached = await asyncio.to_thread(self._get_cached, list(keys.values()))
+        missing = [t for t, k in keys.items() if k not in cached]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run_batch(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._call_embed_api, batch, normalized_task_type
+                )
+
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        batch_vectors = await asyncio.gather(*(_run_batch(b) for b in batches))
+
+        fetched: dict[str, list[float]] = {}
+        for batch, vectors in zip(batches, batch_vectors):
+            for t, vector in zip(batch, vectors):
+                fetched[keys[t]] = vector
+        if fetched:
+            await asyncio.to_thread(self._store_cached, fetched, normalized_task_type)
+
+        return self._build_batch_result(texts, keys, {**cached, **fetched}, start_time, len(cached))
 
     # ================================================================
     # 同期メソッド（Cloud Functions用）
@@ -263,19 +539,25 @@ class EmbeddingClient:
         """
         # ★★★ v10.25.0: 新SDK（google-genai）での呼び出し ★★★
         # タスクタイプを新SDKのフォーマットに変換
-        normalized_task_type = TASK_TYPE_MAP.get(task_type, "RETRIEVAL_DOCUMENT")
+        normalized_task_type = self._normalize_task_type(task_type)
 
-        result = self._client.models.embed_content(
-            model=self.model,
-            contents=text,
-            config=EmbedContentConfig(task_type=normalized_task_type),
-        )
+        # v11.3.0: キャッシュ確認（ホットなクエリはAPIを呼ばない）
+        key = make_embedding_cache_key(self.model, normalized_task_type, text)
+        embedding = self._get_cached([key]).get(key)
+
+        if embedding is None:
+            result = self._client.models.embed_content(
+                model=self.model,
+                contents=text,
+                config=EmbedContentConfig(task_type=normalized_task_type),
+            )
 
-        # 新SDKではresult.embeddingsがリストで返される
-        embedding = result.embeddings[0].values
+            # 新SDKではresult.embeddingsがリストで返される
+            embedding = list(result.embeddings[0].values)
+            self._store_cached({key: embedding}, normalized_task_type)
 
         return EmbeddingResult(
-            vector=list(embedding),
+            vector=embedding,
             model=self.model,
             token_count=self.estimate_tokens(text),
             dimension=len(embedding),
@@ -311,35 +593,91 @@ class EmbeddingClient:
             BatchEmbeddingResult オブジェクト
         """
         start_time = time.time()
-        all_results: list[EmbeddingResult] = []
-        total_tokens = 0
 
         # ★★★ v10.25.0: 新SDK（google-genai）での呼び出し ★★★
-        normalized_task_type = TASK_TYPE_MAP.get(task_type, "RETRIEVAL_DOCUMENT")
+        normalized_task_type = self._normalize_task_type(task_type)
+
+        # v11.3.0: 重複除去してからキャッシュ確認し、未取得分だけAPIに投げる
+        keys = {
+            t: make_embedding_cache_key(self.model, normalized_task_type, t)
+            for t in dict.fromkeys(texts)
+        }
+        cached = self._get_cached(list(keys.values()))
+        missing = [t for t, k in keys.items() if k not in cached]
 
         # バッチ処理
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        fetched: dict[str, list[float]] = {}
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            vectors = self._call_embed_api(batch, normalized_task_type)
+            for t, vector in zip(batch, vectors):
+                fetched[keys[t]] = vector
+        if fetched:
+            self._store_cached(fetched, normalized_task_type)
 
-            # 新SDKはリストでバッチ処理可能
-            result = self._client.models.embed_content(
-                model=self.model,
-                contents=batch,
-                config=EmbedContentConfig(task_type=normalized_task_type),
-            )
+        return self._build_batch_result(texts, keys, {**cached, **fetched}, start_time, len(cached))
+
+    # ================================================================
+    # 内部処理（v11.3.0: キャッシュ・バッチ共通）
+    # ================================================================
 
-            for j, embedding_result in enumerate(result.embeddings):
-                embedding = embedding_result.values
-                token_count = self.estimate_tokens(batch[j])
+    @staticmethod
+    def _normalize_task_type(task_type: str) -> str:
+        """タスクタイプを新SDKのフォーマットに変換"""
+        return TASK_TYPE_MAP.get(task_type, "RETRIEVAL_DOCUMENT")
 
-                all_results.append(EmbeddingResult(
-                    vector=list(embedding),
-                    model=self.model,
-                    token_count=token_count,
-                    dimension=len(embedding),
-                ))
+    def _call_embed_api(self, batch: list[str], normalized_task_type: str) -> list[list[float]]:
+        """1バッチ分のAPI呼び出し（新SDKはリストでバッチ処理可能）"""
+        result = self._client.models.embed_content(
+            model=self.model,
+            contents=batch,
+            config=EmbedContentConfig(task_type=normalized_task_type),
+        )
+        return [list(e.values) for e in result.embeddings]
+
+    def _get_cached(self, keys: list[str]) -> dict[str, list[float]]:
+        """L1 → L2 の順にキャッシュを確認（L2ヒットはL1に昇格）"""
+        found = self.cache.get_many(keys)
+        if self.persistent_store is None or len(found) == len(keys):
+            return found
+
+        missing = [k for k in keys if k not in found]
+        from_store = self.persistent_store.get_many(missing)
+        if from_store:
+            self.cache.put_many(from_store)
+            found.update(from_store)
+        return found
+
+    def _store_cached(self, vectors: dict[str, list[float]], normalized_task_type: str) -> None:
+        """新しく取得したベクターをL1/L2に保存"""
+        self.cache.put_many(vectors)
+        if self.persistent_store is not None:
+            self.persistent_store.put_many(self.model, normalized_task_type, vectors)
+
+    def _build_batch_result(
+        self,
+        texts: list[str],
+        keys: dict[str, str],
+        vectors: dict[str, list[float]],
+        start_time: float,
+        cached_count: int,
+    ) -> BatchEmbeddingResult:
+        """入力順にEmbeddingResultを並べる（重複テキストは同じベクターのコピー）"""
+        all_results: list[EmbeddingResult] = []
+        total_tokens = 0
 
-                total_tokens += token_count
+        for t in texts:
+            vector = vectors.get(keys[t])
+            if vector is None:
+                continue
+            token_count = self.estimate_tokens(t)
+            all_results.append(EmbeddingResult(
+                vector=list(vector),
+                model=self.model,
+                token_count=token_count,
+                dimension=len(vector),
+            ))
+            total_tokens += token_count
 
         processing_time_ms = int((time.time() - start_time) * 1000)
 
@@ -348,6 +686,7 @@ class EmbeddingClient:
             total_tokens=total_tokens,
             model=self.model,
             processing_time_ms=processing_time_ms,
+            cached_count=cached_count,
         )
 
     # ================================================================
@@ -467,6 +806,12 @@ __all__ = [
     # データクラス
     'EmbeddingResult',
     'BatchEmbeddingResult',
+    # キャッシュ（v11.3.0）
+    'EmbeddingCache',
+    'get_shared_embedding_cache',
+    'EmbeddingStore',
+    'DatabaseEmbeddingStore',
+    'make_embedding_cache_key',
     # 便利関数
     'embed_text',
     'embed_text_sync',
@@ -475,4 +820,6 @@ __all__ = [
     # 設定
     'EMBEDDING_MODELS',
     'DEFAULT_MODEL',
+    'EMBEDDING_CACHE_MAX_ENTRIES',
+    'EMBEDDING_MAX_CONCURRENCY',
 ]
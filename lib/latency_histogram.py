@@ -0,0 +1,207 @@
+# lib/latency_histogram.py
+"""
+レイテンシ・ヒストグラム（HDR風の対数バケット）
+
+v11.3.0: 平均・最小・最大だけでは見えないテールレイテンシ（p95/p99）を、
+固定メモリかつマージ可能な形で集計するための共通部品。
+
+【仕組み】
+- 値 v（>1）は ceil(log_G(v)) 番目のバケットに数える（G=1.05 → 相対誤差5%以内）
+- 1ms〜10分を約270バケットで覆うため、件数が増えてもメモリは一定
+- バケット同士は足し算でマージできる
+  → 分単位バケット・複数インスタンスの集計がバケット数に比例する
+- スナップショット（dict）はJSONで保存・転送できる
+
+lib.brain に依存しない（管理APIからも単体で import するため）。
+
+Created: 2026-10-16
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# バケットの成長率（隣接バケットの上限比）
+HISTOGRAM_GROWTH = 1.05
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+# 既定で出力するパーセンタイル
+DEFAULT_PERCENTILES: Tuple[float, ...] = (50.0, 95.0, 99.0)
+
+
+class LatencyHistogram:
+    """
+    対数バケットのヒストグラム
+
+    パーセンタイルは該当バケットの上限値（実測の最小・最大でクランプ）を返す。
+    テールを過小評価しないよう、HDR Histogram と同じく「高い側」に丸める。
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def bucket_index(value: float) -> int:
+        """値が入るバケット番号（0番は 0〜1）"""
+        if value <= 1.0:
+            return 0
+        return int(math.ceil(math.log(value) / _LOG_GROWTH))
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        """バケットの上限値"""
+        return HISTOGRAM_GROWTH ** index if index > 0 else 1.0
+
+    def record(self, value: float) -> None:
+        """値を1件記録"""
+        value = max(0.0, float(value))
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """他のヒストグラムを足し込む"""
+        if other.count == 0:
+            return
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        q パーセンタイル（0〜100）
+
+        Returns:
+            パーセンタイル値（記録がなければ None）
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                value = self.bucket_upper_bound(index)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """件数・平均・最小・最大・パーセンタイルの辞書"""
+        result: Dict[str, Any] = {
+            "count": self.count,
+            "avg": _round(self.mean),
+            "min": _round(self.min),
+            "max": _round(self.max),
+        }
+        for q in percentiles:
+            result[_percentile_key(q)] = _round(self.percentile(q))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON保存用のスナップショット"""
+        return {
+            "buckets": {str(index): n for index, n in self.counts.items()},
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "LatencyHistogram":
+        """to_dict() の逆変換"""
+        histogram = cls()
+        if not data:
+            return histogram
+        histogram.counts = {int(index): int(n) for index, n in (data.get("buckets") or {}).items()}
+        histogram.count = int(data.get("count") or 0)
+        histogram.total = float(data.get("sum") or 0.0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
+
+
+def merge_histogram_snapshots(
+    snapshots: Iterable[Dict[str, Dict[str, Any]]],
+) -> Dict[str, LatencyHistogram]:
+    """
+    {名前: to_dict()} のスナップショット群を名前ごとにマージ
+
+    分単位バケットを保存したDB行をまとめて読むときに使う。
+    """
+    merged: Dict[str, LatencyHistogram] = {}
+    for snapshot in snapshots:
+        for name, data in (snapshot or {}).items():
+            merged.setdefault(name, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+    return merged
+
+
+def format_prometheus_summary(
+    name: str,
+    help_text: str,
+    series: List[Tuple[Dict[str, str], LatencyHistogram]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> str:
+    """
+    Prometheus テキスト形式（summary型）に整形
+
+    Args:
+        name: メトリクス名
+        help_text: HELP行の説明
+        series: (ラベル, ヒストグラム) のリスト
+        percentiles: 出力するパーセンタイル
+
+    Returns:
+        改行区切りのテキスト（末尾改行あり）
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+    for labels, histogram in series:
+        for q in percentiles:
+            value = histogram.percentile(q)
+            quantile_labels = {**labels, "quantile": _format_number(q / 100.0)}
+            lines.append(f"{name}{_format_labels(quantile_labels)} {_format_number(value)}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram.total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def _percentile_key(q: float) -> str:
+    return f"p{q:g}".replace(".", "_")
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def _format_number(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    return repr(round(float(value), 3))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape_label_value(str(value))}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
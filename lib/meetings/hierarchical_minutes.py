@@ -0,0 +1,488 @@
+# lib/meetings/hierarchical_minutes.py
+"""
+長時間会議の階層型議事録生成（map-reduce）
+
+v11.3.0: build_chatwork_minutes_prompt() は MAX_TRANSCRIPT_CHARS を超えた部分を
+「[... 省略 ...]」で切り捨てていたため、長い会議の後半がLLMに届かなかった。
+
+【仕組み】
+- map: トランスクリプトを話者の発言単位・時間窓でチャンクに分け、
+  チャンクごとに区間メモ（議題・決定事項・タスク・数字や実例）をJSONで並行に抽出する
+- reduce: 区間メモを時系列に並べ、CHATWORK_MINUTES_SYSTEM_PROMPT で
+  会議全体の議事録（講義スタイル・■主題（00:00〜）形式）に統合する
+  区間メモ自体が MAX_TRANSCRIPT_CHARS を超える場合は、隣接する区間メモを
+  先にまとめてから統合する（階層的に縮約）
+- 区間メモはチャンク本文のハッシュ単位でキャッシュする（再実行時はLLMを呼ばない）
+
+MAX_TRANSCRIPT_CHARS 以内のトランスクリプトは、従来どおり1回の呼び出しで生成する。
+LLM呼び出し自体はBrainから注入される get_ai_response_func で行う（CLAUDE.md §1）。
+
+Created: 2026-10-16
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from lib.lru_cache import LRUCache
+from lib.meetings.minutes_generator import (
+    CHATWORK_MINUTES_SYSTEM_PROMPT,
+    MAX_TRANSCRIPT_CHARS,
+    _extract_json,
+    build_chatwork_minutes_prompt,
+)
+from lib.meetings.vtt_parser import VTTTranscript, _parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# 設定
+# =============================================================================
+
+# チャンク1件の最大文字数
+MINUTES_CHUNK_CHARS = 6000
+
+# チャンク1件の最大時間（秒）
+MINUTES_CHUNK_SECONDS = 900
+
+# 区間メモ抽出の同時実行数
+MINUTES_MAP_CONCURRENCY = 4
+
+# 区間メモキャッシュの最大件数
+MINUTES_PARTIAL_CACHE_MAX_ENTRIES = 256
+
+MINUTES_MAP_SYSTEM_PROMPT = """あなたは議事録作成の専門家です。
+長い会議を時系列に区切った「区間」の書き起こしを渡します。
+この区間で話された内容を、後で会議全体の議事録に統合できるよう漏れなく抽出してください。
+
+必ず以下のJSON形式で出力してください:
+{
+  "summary": "この区間の概要（2-3文）",
+  "topics": [
+    {"title": "主題", "start": "開始時刻（例 12:34、不明なら空）", "details": "背景・理由・議論の流れを具体的に"}
+  ],
+  "decisions": ["決定事項"],
+  "action_items": [
+    {"task": "内容", "assignee": "担当者名", "deadline": "期限（あれば）"}
+  ],
+  "facts": ["例え話・実例・ワークテーマ・数字に関する話（省略しない）"]
+}
+
+注意:
+- 日本語の音声認識エラーは文脈から推測して修正してください
+- 個人情報（電話番号、メール等）は含めないでください
+- 発言者名はそのまま使用してください"""
+
+MINUTES_MERGE_SYSTEM_PROMPT = """あなたは議事録作成の専門家です。
+会議の連続する複数区間の「区間メモ」を渡します。
+これらを1つの区間メモにまとめてください。同じ議題は統合し、決定事項・タスク・数字や実例は省略しないでください。
+
+必ず以下のJSON形式で出力してください:
+{
+  "summary": "まとめた区間の概要（2-3文）",
+  "topics": [
+    {"title": "主題", "start": "開始時刻", "details": "背景・理由・議論の流れ"}
+  ],
+  "decisions": ["決定事項"],
+  "action_items": [
+    {"task": "内容", "assignee": "担当者名", "deadline": "期限（あれば）"}
+  ],
+  "facts": ["例え話・実例・数字に関する話"]
+}"""
+
+# プロンプトを変えたらキャッシュを引かないようにする
+_MAP_PROMPT_VERSION = hashlib.sha256(MINUTES_MAP_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+# =============================================================================
+# データモデル
+# =============================================================================
+
+
+@dataclass
+class TranscriptChunk:
+    """議事録生成用のトランスクリプト断片"""
+
+    index: int
+    text: str
+    start_seconds: Optional[float] = None
+    end_seconds: Optional[float] = None
+
+    @property
+    def cache_key(self) -> str:
+        digest = hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+        return f"{digest}:{_MAP_PROMPT_VERSION}"
+
+    @property
+    def time_range(self) -> str:
+        if self.start_seconds is None or self.end_seconds is None:
+            return ""
+        return f"{format_offset(self.start_seconds)}〜{format_offset(self.end_seconds)}"
+
+
+@dataclass
+class PartialMinutes:
+    """区間メモ（map の結果）"""
+
+    index: int
+    time_range: str = ""
+    summary: str = ""
+    topics: List[Dict[str, str]] = field(default_factory=list)
+    decisions: List[str] = field(default_factory=list)
+    action_items: List[Dict[str, str]] = field(default_factory=list)
+    facts: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_data(cls, index: int, time_range: str, data: Dict[str, Any]) -> "PartialMinutes":
+        topics = []
+        for topic in data.get("topics") or []:
+            if isinstance(topic, dict):
+                topics.append(topic)
+            elif topic:
+                topics.append({"title": str(topic)})
+        return cls(
+            index=index,
+            time_range=time_range,
+            summary=str(data.get("summary") or ""),
+            topics=topics,
+            decisions=[str(d) for d in data.get("decisions") or [] if d],
+            action_items=[a for a in data.get("action_items") or [] if isinstance(a, dict)],
+            facts=[str(f) for f in data.get("facts") or [] if f],
+        )
+
+    def render(self) -> str:
+        """reduce プロンプト用のテキスト"""
+        label = f"【区間{self.index + 1}（{self.time_range}）】" if self.time_range else (
+            f"【区間{self.index + 1}】"
+        )
+        lines = [label]
+        if self.summary:
+            lines.append(f"概要: {self.summary}")
+        if self.topics:
+            lines.append("議題:")
+            for topic in self.topics:
+                start = topic.get("start") or ""
+                heading = f"{topic.get('title', '')}（{start}〜）" if start else topic.get("title", "")
+                details = topic.get("details") or ""
+                lines.append(f"- {heading}: {details}" if details else f"- {heading}")
+        if self.decisions:
+            lines.append("決定事項:")
+            lines.extend(f"- {d}" for d in self.decisions)
+        if self.action_items:
+            lines.append("タスク:")
+            for item in self.action_items:
+                deadline = item.get("deadline") or ""
+                deadline_str = f"（期限: {deadline}）" if deadline else ""
+                lines.append(f"- {item.get('assignee') or '未定'}: {item.get('task', '')}{deadline_str}")
+        if self.facts:
+            lines.append("数字・実例:")
+            lines.extend(f"- {f}" for f in self.facts)
+        return "\n".join(lines)
+
+
+def format_offset(seconds: float) -> str:
+    """会議開始からの経過時間（MM:SS / H:MM:SS）"""
+    total = int(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+# =============================================================================
+# 分割
+# =============================================================================
+
+
+def split_transcript(
+    transcript: VTTTranscript,
+    max_chars: int = MINUTES_CHUNK_CHARS,
+    max_seconds: float = MINUTES_CHUNK_SECONDS,
+) -> List[TranscriptChunk]:
+    """
+    VTTトランスクリプトを話者の発言単位・時間窓でチャンクに分ける
+
+    同じ話者の連続するセグメントを1つの発言として扱い、発言の途中では切らない
+    （1つの発言が max_chars を超える場合だけセグメント境界で切る）。
+    各発言の先頭に経過時間を付ける（■主題（00:00〜）の手がかり）。
+    """
+    turns: List[tuple] = []  # (開始秒, 終了秒, 行, 話者)
+    for seg in transcript.segments:
+        start = _parse_timestamp(seg.start_time)
+        end = _parse_timestamp(seg.end_time)
+        if turns and turns[-1][3] == seg.speaker and len(turns[-1][2]) + len(seg.text) < max_chars:
+            first, _, line, speaker = turns[-1]
+            turns[-1] = (first, end, f"{line} {seg.text}", speaker)
+            continue
+        prefix = f"{seg.speaker}: " if seg.speaker else ""
+        turns.append((start, end, f"{prefix}{seg.text}", seg.speaker))
+
+    chunks: List[TranscriptChunk] = []
+    lines: List[str] = []
+    chunk_start = 0.0
+    chunk_end = 0.0
+    size = 0
+    for start, end, line, _ in turns:
+        stamped = f"[{format_offset(start)}] {line}"
+        if lines and (size + len(stamped) > max_chars or end - chunk_start > max_seconds):
+            chunks.append(TranscriptChunk(len(chunks), "\n".join(lines), chunk_start, chunk_end))
+            lines, size = [], 0
+        if not lines:
+            chunk_start = start
+        lines.append(stamped)
+        size += len(stamped) + 1
+        chunk_end = end
+    if lines:
+        chunks.append(TranscriptChunk(len(chunks), "\n".join(lines), chunk_start, chunk_end))
+    return chunks
+
+
+def split_transcript_text(
+    text: str,
+    max_chars: int = MINUTES_CHUNK_CHARS,
+) -> List[TranscriptChunk]:
+    """
+    タイムスタンプのない書き起こしテキストをチャンクに分ける
+
+    行（発言）の境界で切り、max_chars を超える行は「。」の位置で切る。
+    """
+    pieces: List[str] = []
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            cut = line.rfind("。", 0, max_chars) + 1 or max_chars
+            pieces.append(line[:cut])
+            line = line[cut:]
+        if line.strip():
+            pieces.append(line)
+
+    chunks: List[TranscriptChunk] = []
+    lines: List[str] = []
+    size = 0
+    for piece in pieces:
+        if lines and size + len(piece) > max_chars:
+            chunks.append(TranscriptChunk(len(chunks), "\n".join(lines)))
+            lines, size = [], 0
+        lines.append(piece)
+        size += len(piece) + 1
+    if lines:
+        chunks.append(TranscriptChunk(len(chunks), "\n".join(lines)))
+    return chunks
+
+
+# =============================================================================
+# 区間メモキャッシュ
+# =============================================================================
+
+
+class PartialMinutesCache(LRUCache[str, Dict[str, Any]]):
+    """
+    区間メモのキャッシュ（チャンク本文のSHA-256 → 抽出結果のdict）
+
+    同じ録画の再処理（タスク抽出のやり直し・再投稿など）で map のLLM呼び出しを省く。
+    キーは本文そのもののハッシュなので、ヒットするのは同一の本文だけ。
+    """
+
+    def __init__(self, max_entries: int = MINUTES_PARTIAL_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+
+_partial_cache = PartialMinutesCache()
+
+
+def get_partial_minutes_cache() -> PartialMinutesCache:
+    """プロセス共通の区間メモキャッシュ"""
+    return _partial_cache
+
+
+# =============================================================================
+# 生成
+# =============================================================================
+
+
+async def call_llm(get_ai_response_func: Callable, prompt: str, system_prompt: str) -> Any:
+    """注入されたLLM関数を呼ぶ（async / sync の両方に対応）"""
+    if asyncio.iscoroutinefunction(get_ai_response_func) or asyncio.iscoroutinefunction(
+        getattr(get_ai_response_func, "__call__", None)
+    ):
+        return await get_ai_response_func(prompt, system_prompt=system_prompt)
+    return await asyncio.to_thread(get_ai_response_func, prompt, system_prompt=system_prompt)
+
+
+class HierarchicalMinutesGenerator:
+    """
+    チャンク → 区間メモ（並行）→ 統合 の順で議事録を生成する
+
+    使用例:
+        generator = HierarchicalMinutesGenerator(get_ai_response_func)
+        minutes = await generator.generate(split_transcript(vtt), title="定例会議")
+    """
+
+    def __init__(
+        self,
+        get_ai_response_func: Callable,
+        concurrency: int = MINUTES_MAP_CONCURRENCY,
+        cache: Optional[PartialMinutesCache] = None,
+        max_reduce_chars: int = MAX_TRANSCRIPT_CHARS,
+    ):
+        self.get_ai_response_func = get_ai_response_func
+        self.concurrency = max(1, concurrency)
+        self.cache = cache if cache is not None else get_partial_minutes_cache()
+        self.max_reduce_chars = max_reduce_chars
+
+    async def generate(
+        self,
+        chunks: List[TranscriptChunk],
+        title: Optional[str] = None,
+        transcript_text: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        議事録テキスト（プレーンテキスト）を生成する
+
+        全体が MAX_TRANSCRIPT_CHARS 以内なら1回の呼び出しで生成する。
+        LLMの例外はそのまま送出する（呼び出し側のフォールバックに任せる）。
+
+        Args:
+            chunks: split_transcript() / split_transcript_text() の結果
+            title: 会議タイトル
+            transcript_text: 1回で生成する場合に使う全文（省略時はチャンクを連結）
+        """
+        if not chunks:
+            return None
+
+        full_text = transcript_text if transcript_text is not None else (
+            "\n".join(chunk.text for chunk in chunks)
+        )
+        if len(chunks) == 1 or len(full_text) <= MAX_TRANSCRIPT_CHARS:
+            prompt = build_chatwork_minutes_prompt(full_text, title)
+            return await call_llm(self.get_ai_response_func, prompt, CHATWORK_MINUTES_SYSTEM_PROMPT)
+
+        partials = await self._map(chunks)
+        partials = await self._condense(partials)
+
+        logger.info(
+            "Hierarchical minutes: chunks=%d, partials=%d, chars=%d",
+            len(chunks),
+            len(partials),
+            len(full_text),
+        )
+        return await call_llm(
+            self.get_ai_response_func,
+            build_reduce_prompt(partials, title),
+            CHATWORK_MINUTES_SYSTEM_PROMPT,
+        )
+
+    async def _map(self, chunks: List[TranscriptChunk]) -> List[PartialMinutes]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def summarize(chunk: TranscriptChunk) -> PartialMinutes:
+            key = chunk.cache_key
+            data = self.cache.get(key)
+            if data is None:
+                async with semaphore:
+                    response = await call_llm(
+                        self.get_ai_response_func,
+                        build_map_prompt(chunk, len(chunks)),
+                        MINUTES_MAP_SYSTEM_PROMPT,
+                    )
+                data = _parse_partial_response(response)
+                if data is not None:
+                    self.cache.put(key, data)
+                else:
+                    # JSONで返らなかった場合は本文を概要として使う（キャッシュしない）
+                    data = {"summary": str(response or "")[:2000]}
+            return PartialMinutes.from_data(chunk.index, chunk.time_range, data)
+
+        return list(await asyncio.gather(*(summarize(chunk) for chunk in chunks)))
+
+    async def _condense(self, partials: List[PartialMinutes]) -> List[PartialMinutes]:
+        """区間メモの合計が上限を超える間、隣接する区間メモをまとめる"""
+        while len(partials) > 1 and _rendered_length(partials) > self.max_reduce_chars:
+            groups = _group_partials(partials, self.max_reduce_chars // 2)
+            if len(groups) == len(partials):
+                # これ以上まとめられない（1件が大きすぎる）
+                break
+            before = _rendered_length(partials)
+            partials = list(await asyncio.gather(
+                *(self._merge(group, index) for index, group in enumerate(groups))
+            ))
+            if _rendered_length(partials) >= before:
+                break
+        return partials
+
+    async def _merge(self, group: List[PartialMinutes], index: int) -> PartialMinutes:
+        time_range = _join_time_ranges(group)
+        if len(group) == 1:
+            merged = group[0]
+            merged.index = index
+            return merged
+        response = await call_llm(
+            self.get_ai_response_func,
+            "\n\n".join(partial.render() for partial in group),
+            MINUTES_MERGE_SYSTEM_PROMPT,
+        )
+        data = _parse_partial_response(response) or {"summary": str(response or "")[:2000]}
+        return PartialMinutes.from_data(index, time_range, data)
+
+
+def build_map_prompt(chunk: TranscriptChunk, total_chunks: int) -> str:
+    """区間メモ抽出のプロンプト"""
+    header = f"区間 {chunk.index + 1}/{total_chunks}"
+    if chunk.time_range:
+        header += f"（{chunk.time_range}）"
+    return f"{header}\n\n{chunk.text}"
+
+
+def build_reduce_prompt(partials: List[PartialMinutes], title: Optional[str] = None) -> str:
+    """区間メモを会議全体の議事録に統合するプロンプト"""
+    title_line = f"会議タイトル: {title}\n\n" if title else ""
+    body = "\n\n".join(partial.render() for partial in partials)
+    return (
+        f"{title_line}"
+        "この会議は長時間のため、時系列の区間ごとに要点を抽出済みです。\n"
+        "以下の区間メモを統合し、会議全体の議事録にしてください。"
+        "区間をまたいで続く議題は1つのセクションにまとめ、"
+        "タスクは重複を除いて「■ タスク一覧」に集約してください:\n\n"
+        f"{body}"
+    )
+
+
+def _parse_partial_response(response: Any) -> Optional[Dict[str, Any]]:
+    if not response:
+        return None
+    json_str = _extract_json(str(response))
+    if not json_str:
+        return None
+    try:
+        data = json.loads(json_str)
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse partial minutes as JSON")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _rendered_length(partials: List[PartialMinutes]) -> int:
+    return sum(len(partial.render()) + 2 for partial in partials)
+
+
+def _group_partials(partials: List[PartialMinutes], max_chars: int) -> List[List[PartialMinutes]]:
+    groups: List[List[PartialMinutes]] = []
+    size = 0
+    for partial in partials:
+        length = len(partial.render()) + 2
+        if groups and size + length <= max_chars:
+            groups[-1].append(partial)
+            size += length
+        else:
+            groups.append([partial])
+            size = length
+    return groups
+
+
+def _join_time_ranges(group: List[PartialMinutes]) -> str:
+    first = group[0].time_range.split("〜")[0] if group[0].time_range else ""
+    last = group[-1].time_range.split("〜")[-1] if group[-1].time_range else ""
+    return f"{first}〜{last}" if first and last else ""
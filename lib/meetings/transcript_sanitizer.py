@@ -6,6 +6,10 @@
 会議固有のPIIパターン（住所、カード番号、社員番号）を追加。
 長文対応のためチャンク分割処理を実装（Codex Fix #2）。
 
+v11.3.0: lib/pii_redaction.py の共通エンジンで全パターンを1パスで処理する。
+オーバーラップ付きチャンク分割（置換後の文字数比での切り出し）は廃止し、
+長文は一括処理、逐次入力は sanitize_stream() で境界のずれなく処理する。
+
 設計根拠:
 - CLAUDE.md §9-2: PIIは保存しない
 - docs/07_phase_c_meetings.md: PII Sanitization Patterns
@@ -17,12 +21,13 @@ Created: 2026-02-10
 
 import re
 import logging
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
 # memory_sanitizer.py から再利用するパターン
 from lib.brain.memory_sanitizer import MASK_PATTERNS
+from lib.pii_redaction import PIIRedactor, RedactionResult
 
 # =============================================================================
 # 会議固有のPIIパターン（docs/07_phase_c_meetings.md 準拠）
@@ -53,8 +58,11 @@ MEETING_PII_PATTERNS: List[Tuple[re.Pattern, str]] = [
     *MASK_PATTERNS,
 ]
 
+# 会議用の既定エンジン（一度だけコンパイル）
+_MEETING_REDACTOR = PIIRedactor(MEETING_PII_PATTERNS)
+
 # =============================================================================
-# チャンク分割サニタイザー
+# サニタイザー
 # =============================================================================
 
 DEFAULT_CHUNK_SIZE = 1000
@@ -70,7 +78,17 @@ class TranscriptSanitizer:
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         overlap: int = DEFAULT_OVERLAP,
     ):
+        """
+        Args:
+            patterns: (パターン, 置換文字列) のリスト（省略時は MEETING_PII_PATTERNS）
+            chunk_size: sanitize_stream() に文字列を渡したときの分割サイズ
+            overlap: 互換のため受け付ける（v11.3.0 以降は未使用）
+        """
         self.patterns = patterns or MEETING_PII_PATTERNS
+        self.redactor = (
+            _MEETING_REDACTOR if self.patterns is MEETING_PII_PATTERNS
+            else PIIRedactor(self.patterns)
+        )
         self.chunk_size = chunk_size
         self.overlap = overlap
 
@@ -78,64 +96,45 @@ class TranscriptSanitizer:
         """
         テキスト全体をサニタイズする。
 
-        短いテキストは直接処理、長いテキストはチャンク分割処理。
-
         Returns:
             (sanitized_text, pii_count): サニタイズ済みテキストとPII検出数
         """
-        if not text:
-            return ("", 0)
-
-        if len(text) <= self.chunk_size:
-            return self._apply_patterns(text)
-
-        return self._sanitize_chunked(text)
+        result = self.sanitize_with_counts(text)
+        return (result.text, result.total)
 
-    def _apply_patterns(self, text: str) -> Tuple[str, int]:
-        """全パターンを順次適用する"""
-        pii_count = 0
-        result = text
-        for pattern, replacement in self.patterns:
-            matches = pattern.findall(result)
-            if matches:
-                pii_count += len(matches)
-                result = pattern.sub(replacement, result)
-        return (result, pii_count)
-
-    def _sanitize_chunked(self, text: str) -> Tuple[str, int]:
+    def sanitize_with_counts(self, text: str) -> RedactionResult:
         """
-        チャンク分割サニタイズ。
+        テキスト全体をサニタイズし、カテゴリ別の検出数も返す。
 
-        テキストをchunk_size単位に分割し、各チャンクにパターンを適用。
-        オーバーラップ領域での重複置換を防ぐため、
-        非オーバーラップ部分のみを結果に採用する。
+        Returns:
+            RedactionResult（counts は {"PHONE": 2, "EMAIL": 1} の形式）
         """
-        total_pii = 0
-        result_parts = []
-        pos = 0
-        text_len = len(text)
-
-        while pos < text_len:
-            # チャンク範囲を決定
-            chunk_end = min(pos + self.chunk_size + self.overlap, text_len)
-            chunk = text[pos:chunk_end]
+        if not text:
+            return RedactionResult(text="")
+        return self.redactor.redact(text)
 
-            sanitized_chunk, chunk_pii = self._apply_patterns(chunk)
-            total_pii += chunk_pii
+    def sanitize_stream(
+        self,
+        source: Union[str, Iterable[str]],
+        counts: Optional[Dict[str, int]] = None,
+    ) -> Iterator[str]:
+        """
+        文字起こしを逐次サニタイズする（長時間の会議・逐次受信向け）。
 
-            if pos + self.chunk_size >= text_len:
-                # 最後のチャンク: 全体を採用
-                result_parts.append(sanitized_chunk)
-            else:
-                # 非オーバーラップ部分のみ採用
-                # サニタイズで文字数が変わるため、比率で切り出す
-                ratio = self.chunk_size / len(chunk)
-                cut_pos = int(len(sanitized_chunk) * ratio)
-                result_parts.append(sanitized_chunk[:cut_pos])
+        チャンクの切り方によらず sanitize() と同じテキストになる。
 
-            pos += self.chunk_size
+        Args:
+            source: テキスト、またはテキスト断片のイテラブル
+            counts: カテゴリ別検出数の集計先
 
-        return ("".join(result_parts), total_pii)
+        Yields:
+            サニタイズ済みテキストの断片
+        """
+        chunks = source
+        if isinstance(source, str):
+            step = max(1, self.chunk_size)
+            chunks = (source[i:i + step] for i in range(0, len(source), step))
+        return self.redactor.redact_stream(chunks, counts)
 
 
 def sanitize_transcript(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[str, int]:
@@ -144,7 +143,7 @@ def sanitize_transcript(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tupl
 
     Args:
         text: サニタイズ対象のテキスト
-        chunk_size: チャンクサイズ（デフォルト1000文字）
+        chunk_size: チャンクサイズ（sanitize_stream() 用。sanitize() は一括処理）
 
     Returns:
         (sanitized_text, pii_count)
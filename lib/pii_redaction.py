@@ -0,0 +1,194 @@
+# lib/pii_redaction.py
+"""
+PIIマスキングの共通エンジン
+
+v11.3.0: mask_pii（Brain）と TranscriptSanitizer（会議）は、
+パターンごとに findall → sub を順に実行していた（パターン数×2回の全文走査）。
+長文はオーバーラップ付きチャンクに分割し、置換後の文字数比で切り出していたため、
+境界付近の出力がずれることがあった。
+
+【仕組み】
+- (パターン, 置換文字列) のリストを、優先順の番号付きグループを持つ
+  1本の選択（alternation）正規表現にまとめて一度だけコンパイルする
+- 置換と件数カウントを re.sub の1パスで行う（カテゴリ別件数も同時に集計）
+- 同じ位置で複数パターンが一致する場合は、リストの先頭に近いパターンが優先
+- ストリーム処理は「最大マッチ長」だけ末尾を保留して確定部分を順に出力する
+  → チャンク境界で結果が変わらない（一括処理と同じ出力になる）
+
+順次置換と違い、置換済みの文字列（[PHONE] など）に後続パターンが
+再マッチして二重に数えることはない。
+
+lib.brain に依存しない（会議モジュールからも単体で import するため）。
+
+Created: 2026-10-16
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# ストリーム処理で末尾に保留する文字数（1件のPIIの最大長の上限）
+DEFAULT_MAX_MATCH_LENGTH = 256
+
+# 後読み（(?<![0-9]) など）のために確定部分から残す文字数
+_LOOKBEHIND_CONTEXT = 16
+
+# 正規表現フラグ → スコープ付きインラインフラグ
+_INLINE_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+
+@dataclass
+class RedactionResult:
+    """マスキング結果"""
+    text: str
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """検出したPIIの総数"""
+        return sum(self.counts.values())
+
+
+def category_of(replacement: str) -> str:
+    """置換文字列からカテゴリ名を得る（"[PHONE]" → "PHONE"）"""
+    return replacement.strip("[]") or replacement
+
+
+class PIIRedactor:
+    """
+    複数パターンを1本の正規表現で処理するマスキングエンジン
+
+    パターンに後方参照（\\1 など）は使えない（グループ番号がずれるため）。
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[Tuple[re.Pattern, str]],
+        max_match_length: int = DEFAULT_MAX_MATCH_LENGTH,
+    ):
+        """
+        Args:
+            patterns: (コンパイル済みパターン, 置換文字列) のリスト（先頭ほど優先）
+            max_match_length: ストリーム処理で保留する文字数
+        """
+        self.patterns = list(patterns)
+        self.max_match_length = max_match_length
+
+        alternatives: List[str] = []
+        # 外側グループ番号 → (置換文字列, カテゴリ)
+        self._rules: Dict[int, Tuple[str, str]] = {}
+        group_index = 1
+        for pattern, replacement in self.patterns:
+            flags = "".join(letter for flag, letter in _INLINE_FLAGS if pattern.flags & flag)
+            inner = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+            alternatives.append(f"({inner})")
+            self._rules[group_index] = (replacement, category_of(replacement))
+            group_index += 1 + pattern.groups
+
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def redact(self, text: str) -> RedactionResult:
+        """
+        テキスト全体を1パスでマスキングする
+
+        Returns:
+            RedactionResult（マスキング済みテキストとカテゴリ別件数）
+        """
+        counts: Dict[str, int] = {}
+        if not text or self._regex is None:
+            return RedactionResult(text=text or "", counts=counts)
+        masked = self._regex.sub(lambda m: self._replace(m, counts), text)
+        return RedactionResult(text=masked, counts=counts)
+
+    def redact_stream(
+        self,
+        chunks: Iterable[str],
+        counts: Optional[Dict[str, int]] = None,
+    ) -> Iterator[str]:
+        """
+        チャンク列を順にマスキングして出力する
+
+        末尾 max_match_length 文字と、そこにかかるマッチは次のチャンクまで保留する。
+        max_match_length 以下のPIIについては、チャンクの切り方によらず
+        redact() と同じ結果になる。
+
+        Args:
+            chunks: 入力テキストの断片
+            counts: カテゴリ別件数の集計先（呼び出し側で受け取る場合に指定）
+
+        Yields:
+            確定したマスキング済みテキスト
+        """
+        counts = counts if counts is not None else {}
+        if self._regex is None:
+            yield from chunks
+            return
+
+        context = ""
+        pending = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pending += chunk
+            if len(pending) <= self.max_match_length:
+                continue
+            output, consumed = self._redact_prefix(
+                context, pending, len(pending) - self.max_match_length, counts,
+            )
+            if output:
+                yield output
+            if consumed:
+                context = (context + pending[:consumed])[-_LOOKBEHIND_CONTEXT:]
+                pending = pending[consumed:]
+
+        if pending:
+            output, _ = self._redact_prefix(context, pending, None, counts)
+            yield output
+
+    def _redact_prefix(
+        self,
+        context: str,
+        pending: str,
+        safe_end: Optional[int],
+        counts: Dict[str, int],
+    ) -> Tuple[str, int]:
+        """
+        pending の先頭から確定できる部分をマスキングする
+
+        safe_end が None なら入力の終端として全てを確定する。
+
+        Returns:
+            (マスキング済みテキスト, 確定した pending の文字数)
+        """
+        buffer = context + pending
+        offset = len(context)
+        end = len(buffer)
+        limit = end if safe_end is None else offset + safe_end
+
+        parts: List[str] = []
+        position = offset
+        for match in self._regex.finditer(buffer, offset):
+            if match.start() >= limit:
+                break
+            if safe_end is not None and match.end() >= end:
+                # 続きのテキストでマッチが伸びる可能性がある → 開始位置から保留
+                limit = match.start()
+                break
+            parts.append(buffer[position:match.start()])
+            parts.append(self._replace(match, counts))
+            position = match.end()
+
+        consumed = max(position, limit)
+        parts.append(buffer[position:consumed])
+        return "".join(parts), consumed - offset
+
+    def _replace(self, match: "re.Match", counts: Dict[str, int]) -> str:
+        # lastindex は最後に閉じたグループ = 一致した外側グループ
+        replacement, category = self._rules[match.lastindex]
+        counts[category] = counts.get(category, 0) + 1
+        return replacement
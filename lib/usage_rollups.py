@@ -0,0 +1,192 @@
+# lib/usage_rollups.py
+"""
+AI利用量ロールアップ（ai_usage_rollups）の読み出し
+
+v11.3.0: 管理ダッシュボードのKPI・コスト集計を、ai_usage_logs の全件集計ではなく
+組織×モデル×ティアの時間/日バケットから読む。
+
+【仕組み】
+- UsageLogger.log_usage() がログのINSERT直後に別の文でバケットをUPSERTする
+  （ロールアップの失敗でログ本体を失わないよう、ベストエフォート）
+- 日バケットはJST 0時始まり、時間バケットは毎正時始まり
+- 読み出し行数は「日数×モデル数×ティア数」で頭打ちになり、ログ件数が増えても変わらない
+- 既存ログは migrations/20261016_ai_usage_rollups.sql で一括集計済み
+
+管理API（非同期エンジン）から使うため、読み出しは AsyncConnection を受け取る。
+lib.brain に依存しない（管理APIから単体で import するため）。
+
+Created: 2026-10-16
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, List, Tuple
+
+from sqlalchemy import text
+
+# ダッシュボードの日付はJST
+JST = timezone(timedelta(hours=9))
+
+# バケット粒度（時間バケットは当日内の推移など細かい集計用）
+GRANULARITY_HOUR = "hour"
+GRANULARITY_DAY = "day"
+
+# 内訳の集計軸（SQLに埋め込むためホワイトリストで限定）
+BREAKDOWN_DIMENSIONS = ("model_id", "tier")
+
+
+@dataclass
+class UsageTotals:
+    """期間内の利用量合計"""
+    request_count: int = 0
+    error_count: int = 0
+    cost_jpy: float = 0.0
+    cost_usd: float = 0.0
+    response_time_ms_sum: float = 0.0
+    response_time_count: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        if self.request_count == 0:
+            return 0.0
+        return self.error_count / self.request_count
+
+    @property
+    def avg_response_time_ms(self) -> float:
+        if self.response_time_count == 0:
+            return 0.0
+        return self.response_time_ms_sum / self.response_time_count
+
+
+@dataclass
+class DailyUsage:
+    """1日分の利用量"""
+    day: date
+    cost_jpy: float
+    request_count: int
+
+
+def jst_day_start(day: date) -> datetime:
+    """JST日付の0時（日バケットの bucket_start）"""
+    return datetime.combine(day, time.min, tzinfo=JST)
+
+
+async def fetch_usage_totals(
+    conn: Any,
+    organization_id: str,
+    start_day: date,
+) -> UsageTotals:
+    """
+    開始日（JST、この日を含む）以降の利用量合計
+
+    Args:
+        conn: AsyncConnection
+        organization_id: 組織ID
+        start_day: 開始日
+    """
+    result = await conn.execute(
+        text("""
+            SELECT
+                COALESCE(SUM(request_count), 0),
+                COALESCE(SUM(error_count), 0),
+                COALESCE(SUM(cost_jpy), 0),
+                COALESCE(SUM(cost_usd), 0),
+                COALESCE(SUM(response_time_ms_sum), 0),
+                COALESCE(SUM(response_time_count), 0)
+            FROM ai_usage_rollups
+            WHERE organization_id = :org_id
+              AND granularity = :granularity
+              AND bucket_start >= :start
+        """),
+        {
+            "org_id": organization_id,
+            "granularity": GRANULARITY_DAY,
+            "start": jst_day_start(start_day),
+        },
+    )
+    row = result.fetchone()
+    if not row:
+        return UsageTotals()
+    return UsageTotals(
+        request_count=int(row[0]),
+        error_count=int(row[1]),
+        cost_jpy=float(row[2]),
+        cost_usd=float(row[3]),
+        response_time_ms_sum=float(row[4]),
+        response_time_count=int(row[5]),
+    )
+
+
+async def fetch_daily_usage(
+    conn: Any,
+    organization_id: str,
+    start_day: date,
+) -> List[DailyUsage]:
+    """開始日（JST）以降の日別コスト・リクエスト数（古い順）"""
+    result = await conn.execute(
+        text("""
+            SELECT
+                bucket_start,
+                COALESCE(SUM(cost_jpy), 0) as cost,
+                COALESCE(SUM(request_count), 0) as requests
+            FROM ai_usage_rollups
+            WHERE organization_id = :org_id
+              AND granularity = :granularity
+              AND bucket_start >= :start
+            GROUP BY bucket_start
+            ORDER BY bucket_start ASC
+        """),
+        {
+            "org_id": organization_id,
+            "granularity": GRANULARITY_DAY,
+            "start": jst_day_start(start_day),
+        },
+    )
+    return [
+        DailyUsage(
+            day=row[0].astimezone(JST).date(),
+            cost_jpy=float(row[1]),
+            request_count=int(row[2]),
+        )
+        for row in result.fetchall()
+    ]
+
+
+async def fetch_usage_breakdown(
+    conn: Any,
+    organization_id: str,
+    start_day: date,
+    dimension: str,
+) -> List[Tuple[str, float, int]]:
+    """
+    開始日（JST）以降のモデル別・ティア別コスト
+
+    Args:
+        dimension: "model_id" または "tier"
+
+    Returns:
+        (キー, コスト円, リクエスト数) のリスト（コストの高い順）
+    """
+    if dimension not in BREAKDOWN_DIMENSIONS:
+        raise ValueError(f"Unsupported breakdown dimension: {dimension}")
+
+    result = await conn.execute(
+        text(f"""
+            SELECT
+                COALESCE({dimension}, 'unknown') as key,
+                COALESCE(SUM(cost_jpy), 0) as cost,
+                COALESCE(SUM(request_count), 0) as requests
+            FROM ai_usage_rollups
+            WHERE organization_id = :org_id
+              AND granularity = :granularity
+              AND bucket_start >= :start
+            GROUP BY {dimension}
+            ORDER BY cost DESC
+        """),
+        {
+            "org_id": organization_id,
+            "granularity": GRANULARITY_DAY,
+            "start": jst_day_start(start_day),
+        },
+    )
+    return [(str(row[0]), float(row[1]), int(row[2])) for row in result.fetchall()]
@@ -0,0 +1,54 @@
+-- migrations/20261016_ai_spend_counters.sql
+-- AI利用額の日次/月次カウンタ（v11.3.0）
+--
+-- CostManager.check_cost() は全てのAI呼び出しの直前に ai_usage_logs を
+-- DATE(created_at) = 今日 で SUM していた（DATE() のためインデックスが効かない）。
+-- 組織×期間（JSTの日・月）の累計額を持ち、予算判定はここ（のプロセス内キャッシュ）を読む。
+--   period = 'day'  : period_start = JSTの日付
+--   period = 'month': period_start = JSTの月初日
+-- UsageLogger.log_usage() がログのINSERT直後に別の文で加算する（エラーのログは数えない）。
+-- spend_counters.py が定期的に ai_usage_logs から再集計して上書きする（reconciled_at）。
+--
+-- ロールバック: 20261016_ai_spend_counters_rollback.sql
+
+CREATE TABLE IF NOT EXISTS ai_spend_counters (
+    organization_id UUID NOT NULL,
+    period          VARCHAR(8) NOT NULL CHECK (period IN ('day', 'month')),
+    period_start    DATE NOT NULL,
+    cost_usd        NUMERIC(16,6) NOT NULL DEFAULT 0,
+    request_count   BIGINT NOT NULL DEFAULT 0,
+    reconciled_at   TIMESTAMPTZ,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organization_id, period, period_start)
+);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE ai_spend_counters ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY ai_spend_counters_org_isolation ON ai_spend_counters
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::uuid)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::uuid);
+
+COMMENT ON TABLE ai_spend_counters IS 'AI利用額の組織別 日次/月次累計（予算判定用）';
+
+-- 当日・当月分を既存ログから集計（それ以前の期間は予算判定で参照しない）
+INSERT INTO ai_spend_counters (
+    organization_id, period, period_start, cost_usd, request_count, reconciled_at
+)
+SELECT
+    l.organization_id,
+    p.period,
+    p.period_start,
+    COALESCE(SUM(l.cost_usd), 0),
+    COUNT(*),
+    NOW()
+FROM ai_usage_logs l
+CROSS JOIN LATERAL (VALUES
+    ('day', CAST(l.created_at AT TIME ZONE 'Asia/Tokyo' AS date)),
+    ('month', CAST(date_trunc('month', l.created_at AT TIME ZONE 'Asia/Tokyo') AS date))
+) AS p(period, period_start)
+WHERE l.created_at >= date_trunc('month', NOW() AT TIME ZONE 'Asia/Tokyo') AT TIME ZONE 'Asia/Tokyo'
+  AND l.is_error IS NOT TRUE
+GROUP BY l.organization_id, p.period, p.period_start
+ON CONFLICT (organization_id, period, period_start) DO NOTHING;
@@ -0,0 +1,4 @@
+-- migrations/20261016_ai_spend_counters_rollback.sql
+-- ai_spend_counters テーブルのロールバック
+
+DROP TABLE IF EXISTS ai_spend_counters CASCADE;
@@ -0,0 +1,74 @@
+-- migrations/20261016_ai_usage_rollups.sql
+-- AI利用量ロールアップ（v11.3.0）
+--
+-- 管理ダッシュボード（/admin/dashboard/summary, /admin/costs/*）は ai_usage_logs を
+-- 毎回30日分 COUNT/AVG/SUM していたため、ログ件数に比例して遅くなっていた。
+-- 組織×モデル×ティアの時間/日バケットに集計済みの値を持ち、管理APIはここを読む。
+--   granularity = 'hour': 毎正時始まり
+--   granularity = 'day' : JST 0時始まり（ダッシュボードの日付はJST）
+-- UsageLogger.log_usage() がログのINSERT直後に別の文でUPSERTする（失敗時もログ本体は残す）。
+-- 既存ログは本マイグレーションで一括集計する（再実行時はテーブルを空にしてから流し直す）。
+--
+-- ロールバック: 20261016_ai_usage_rollups_rollback.sql
+
+CREATE TABLE IF NOT EXISTS ai_usage_rollups (
+    organization_id      UUID NOT NULL,
+    granularity          VARCHAR(8) NOT NULL CHECK (granularity IN ('hour', 'day')),
+    bucket_start         TIMESTAMPTZ NOT NULL,
+    model_id             VARCHAR(100) NOT NULL,
+    tier                 VARCHAR(20) NOT NULL,
+    request_count        BIGINT NOT NULL DEFAULT 0,
+    error_count          BIGINT NOT NULL DEFAULT 0,
+    input_tokens         BIGINT NOT NULL DEFAULT 0,
+    output_tokens        BIGINT NOT NULL DEFAULT 0,
+    cost_jpy             NUMERIC(16,4) NOT NULL DEFAULT 0,
+    cost_usd             NUMERIC(16,6) NOT NULL DEFAULT 0,
+    -- 平均応答時間 = response_time_ms_sum / response_time_count（NULLのログは数えない）
+    response_time_ms_sum BIGINT NOT NULL DEFAULT 0,
+    response_time_count  BIGINT NOT NULL DEFAULT 0,
+    updated_at           TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organization_id, granularity, bucket_start, model_id, tier)
+);
+
+-- 期間指定の読み出し用
+CREATE INDEX IF NOT EXISTS idx_ai_usage_rollups_org_bucket
+    ON ai_usage_rollups(organization_id, granularity, bucket_start DESC);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE ai_usage_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY ai_usage_rollups_org_isolation ON ai_usage_rollups
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::uuid)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::uuid);
+
+COMMENT ON TABLE ai_usage_rollups IS 'ai_usage_logs の組織×モデル×ティア別 時間/日集計';
+
+-- 既存ログの一括集計
+INSERT INTO ai_usage_rollups (
+    organization_id, granularity, bucket_start, model_id, tier,
+    request_count, error_count, input_tokens, output_tokens,
+    cost_jpy, cost_usd, response_time_ms_sum, response_time_count
+)
+SELECT
+    l.organization_id,
+    b.granularity,
+    b.bucket_start,
+    l.model_id,
+    l.tier,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE l.is_error = TRUE),
+    COALESCE(SUM(l.input_tokens), 0),
+    COALESCE(SUM(l.output_tokens), 0),
+    COALESCE(SUM(l.cost_jpy), 0),
+    COALESCE(SUM(l.cost_usd), 0),
+    COALESCE(SUM(l.response_time_ms), 0),
+    COUNT(l.response_time_ms)
+FROM ai_usage_logs l
+CROSS JOIN LATERAL (VALUES
+    ('hour', date_trunc('hour', l.created_at)),
+    ('day', date_trunc('day', l.created_at AT TIME ZONE 'Asia/Tokyo') AT TIME ZONE 'Asia/Tokyo')
+) AS b(granularity, bucket_start)
+WHERE l.created_at IS NOT NULL
+GROUP BY l.organization_id, b.granularity, b.bucket_start, l.model_id, l.tier
+ON CONFLICT (organization_id, granularity, bucket_start, model_id, tier) DO NOTHING;
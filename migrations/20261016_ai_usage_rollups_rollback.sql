@@ -0,0 +1,4 @@
+-- migrations/20261016_ai_usage_rollups_rollback.sql
+-- ai_usage_rollups テーブルのロールバック
+
+DROP TABLE IF EXISTS ai_usage_rollups CASCADE;
@@ -0,0 +1,37 @@
+-- migrations/20261016_brain_latency_minutes.sql
+-- LLM Brain レイテンシの分バケット（v11.3.0）
+--
+-- Brain は chatwork-webhook / mobile-api の各 Cloud Run インスタンスで動くため、
+-- 各インスタンスの LLMBrainMonitor が確定した1分ぶんの集計をこのテーブルに保存し、
+-- 管理API（GET /admin/system/latency）がマージしてパーセンタイルを返す。
+--   histograms: {"response_time_ms" | "stage.{段階}" | "input_tokens" | "output_tokens":
+--                lib/latency_histogram.LatencyHistogram.to_dict()}
+-- 7日を過ぎた行はアプリ側が定期的に削除する。
+--
+-- ロールバック: 20261016_brain_latency_minutes_rollback.sql
+
+CREATE TABLE IF NOT EXISTS brain_latency_minutes (
+    organization_id  UUID NOT NULL,
+    service          TEXT NOT NULL,
+    instance_id      TEXT NOT NULL,
+    minute           TIMESTAMPTZ NOT NULL,
+    request_count    INTEGER NOT NULL DEFAULT 0,
+    error_count      INTEGER NOT NULL DEFAULT 0,
+    histograms       JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at       TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organization_id, service, instance_id, minute)
+);
+
+-- 直近N分の読み出し・期限切れ行の削除用
+CREATE INDEX IF NOT EXISTS idx_brain_latency_minutes_org_minute
+    ON brain_latency_minutes(organization_id, minute DESC);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE brain_latency_minutes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY brain_latency_minutes_org_isolation ON brain_latency_minutes
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::uuid)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::uuid);
+
+COMMENT ON TABLE brain_latency_minutes IS 'LLM Brainレイテンシの分単位ヒストグラム（インスタンス別）';
@@ -0,0 +1,4 @@
+-- migrations/20261016_brain_latency_minutes_rollback.sql
+-- brain_latency_minutes テーブルのロールバック
+
+DROP TABLE IF EXISTS brain_latency_minutes CASCADE;
@@ -0,0 +1,33 @@
+-- migrations/20261016_brain_operation_rate_limits.sql
+-- Guardian Layer 操作系レートリミッターの共有ストア（v11.3.0）
+--
+-- GUARDIAN_RATE_LIMIT_BACKEND=postgres のとき、Cloud Run の全インスタンスが
+-- このテーブルで連続実行チェック（8-4）と日次クォータ（8-5）を共有する。
+--   calls: 直近の呼び出し時刻（epoch秒）のリングバッファ（長さ = 最大上限回数）
+--   count: 日次クォータの使用回数（limit_key = "{account_id}:{日付}:{read|write}"）
+-- expires_at を過ぎた行はアプリ側が定期的に削除する。
+--
+-- ロールバック: 20261016_brain_operation_rate_limits_rollback.sql
+
+CREATE TABLE IF NOT EXISTS brain_operation_rate_limits (
+    organization_id  UUID NOT NULL,
+    limit_key        TEXT NOT NULL,
+    calls            DOUBLE PRECISION[] NOT NULL DEFAULT '{}',
+    count            INTEGER NOT NULL DEFAULT 0,
+    expires_at       TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (organization_id, limit_key)
+);
+
+-- 期限切れ行の削除用
+CREATE INDEX IF NOT EXISTS idx_brain_operation_rate_limits_expires
+    ON brain_operation_rate_limits(organization_id, expires_at);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE brain_operation_rate_limits ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY brain_operation_rate_limits_org_isolation ON brain_operation_rate_limits
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::uuid)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::uuid);
+
+COMMENT ON TABLE brain_operation_rate_limits IS 'Guardian操作系レートリミッターの共有カウンタ';
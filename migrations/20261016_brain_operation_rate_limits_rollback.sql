@@ -0,0 +1,4 @@
+-- migrations/20261016_brain_operation_rate_limits_rollback.sql
+-- brain_operation_rate_limits テーブルのロールバック
+
+DROP TABLE IF EXISTS brain_operation_rate_limits CASCADE;
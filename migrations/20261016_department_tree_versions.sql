@@ -0,0 +1,53 @@
+-- migrations/20261016_department_tree_versions.sql
+-- 部署ツリーのバージョン（v11.3.0）
+--
+-- API（app.services.department_closure）は組織の部署ツリーを1クエリで読み込み、
+-- 配下・直下部署を事前計算してプロセス内にキャッシュする。
+-- departments の INSERT / UPDATE / DELETE でトリガーが version を加算し、
+-- 各インスタンスは version の変化を見てキャッシュを読み直す。
+-- 行がない組織は version = 0 として扱う（初回変更時に作成される）。
+--
+-- 中身は組織IDとカウンタのみのため RLS は設定しない
+-- （テナントコンテキスト設定前のアクセス判定で読むため）。
+--
+-- ロールバック: 20261016_department_tree_versions_rollback.sql
+
+CREATE TABLE IF NOT EXISTS department_tree_versions (
+    organization_id UUID PRIMARY KEY,
+    version         BIGINT NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE department_tree_versions IS '組織ごとの部署ツリー変更カウンタ（部署クロージャ・キャッシュの無効化用）';
+
+CREATE OR REPLACE FUNCTION bump_department_tree_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    INSERT INTO department_tree_versions (organization_id, version, updated_at)
+    VALUES (COALESCE(NEW.organization_id, OLD.organization_id), 1, NOW())
+    ON CONFLICT (organization_id) DO UPDATE
+        SET version = department_tree_versions.version + 1,
+            updated_at = NOW();
+
+    -- 組織をまたぐ移動（通常は発生しない）は移動元も無効化する
+    IF TG_OP = 'UPDATE' AND OLD.organization_id IS DISTINCT FROM NEW.organization_id THEN
+        INSERT INTO department_tree_versions (organization_id, version, updated_at)
+        VALUES (OLD.organization_id, 1, NOW())
+        ON CONFLICT (organization_id) DO UPDATE
+            SET version = department_tree_versions.version + 1,
+                updated_at = NOW();
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_departments_bump_tree_version ON departments;
+
+CREATE TRIGGER trg_departments_bump_tree_version
+    AFTER INSERT OR UPDATE OR DELETE ON departments
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_department_tree_version();
@@ -0,0 +1,6 @@
+-- migrations/20261016_department_tree_versions_rollback.sql
+-- department_tree_versions テーブル・トリガーのロールバック
+
+DROP TRIGGER IF EXISTS trg_departments_bump_tree_version ON departments;
+DROP FUNCTION IF EXISTS bump_department_tree_version();
+DROP TABLE IF EXISTS department_tree_versions CASCADE;
@@ -0,0 +1,34 @@
+-- migrations/20261016_embedding_cache.sql
+-- エンベディングの永続キャッシュ（lib/embedding.py DatabaseEmbeddingStore）
+-- Drive再インデックスで変更のないチャンクや、繰り返される検索クエリの
+-- エンベディングAPI呼び出しを省くために使用。
+--
+-- キー: model + task_type + テキストの SHA-256（テキスト本文は保存しない）
+-- テナント分離のため organization_id 単位で保持する。
+--
+-- ロールバック: 20261016_embedding_cache_rollback.sql
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    organization_id  VARCHAR(255) NOT NULL,
+    cache_key        CHAR(64) NOT NULL,          -- SHA-256(model + task_type + text)
+    model            VARCHAR(100) NOT NULL,
+    task_type        VARCHAR(50) NOT NULL,       -- RETRIEVAL_DOCUMENT / RETRIEVAL_QUERY
+    dimension        INTEGER NOT NULL,
+    vector           REAL[] NOT NULL,
+    created_at       TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (organization_id, cache_key)
+);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE embedding_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY embedding_cache_org_policy ON embedding_cache
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::text)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::text);
+
+-- インデックス: モデル変更時の一括削除・古いエントリの掃除用
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_model_created
+    ON embedding_cache(model, created_at);
+
+COMMENT ON TABLE embedding_cache IS 'エンベディングの永続キャッシュ（ハッシュ → ベクター）';
@@ -0,0 +1,4 @@
+-- migrations/20261016_embedding_cache_rollback.sql
+-- embedding_cache テーブルのロールバック
+
+DROP TABLE IF EXISTS embedding_cache CASCADE;
@@ -0,0 +1,29 @@
+-- migrations/20261016_keyword_search_trgm.sql
+-- HybridSearcher キーワード検索用の pg_trgm GIN インデックス
+--
+-- 目的:
+--   lib/brain/hybrid_search.py の _keyword_search_sync は
+--   ILIKE '%query%' と word_similarity（<% 演算子）で候補を取得する。
+--   インデックスなしでは毎回シーケンシャルスキャンになり、
+--   Driveの取り込み量に比例して遅くなるため、トライグラムGINインデックスを追加する。
+--   候補の最終順位はアプリ側で日本語バイグラムBM25により決める。
+--
+-- 注意:
+--   - 日本語をトライグラム化するにはDBのロケールがUTF-8系（en_US.UTF-8 等）である必要がある
+--   - 3文字未満のクエリはトライグラムを作れないため、インデックスは部分的にしか効かない
+--   - 大きなテーブルでは作成に時間がかかる。本番では業務時間外に実行すること
+--
+-- ロールバック: 20261016_keyword_search_trgm_rollback.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- soulkun_knowledge（会社知識）: key / value の部分一致・類似度検索
+CREATE INDEX IF NOT EXISTS idx_soulkun_knowledge_key_trgm
+    ON soulkun_knowledge USING gin (key gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_soulkun_knowledge_value_trgm
+    ON soulkun_knowledge USING gin (value gin_trgm_ops);
+
+-- document_chunks（ドキュメントチャンク）: content の部分一致・類似度検索
+CREATE INDEX IF NOT EXISTS idx_document_chunks_content_trgm
+    ON document_chunks USING gin (content gin_trgm_ops);
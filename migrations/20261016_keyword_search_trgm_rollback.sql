@@ -0,0 +1,7 @@
+-- migrations/20261016_keyword_search_trgm_rollback.sql
+-- キーワード検索用 pg_trgm インデックスのロールバック
+-- （pg_trgm 拡張自体は他で使われている可能性があるため削除しない）
+
+DROP INDEX IF EXISTS idx_soulkun_knowledge_key_trgm;
+DROP INDEX IF EXISTS idx_soulkun_knowledge_value_trgm;
+DROP INDEX IF EXISTS idx_document_chunks_content_trgm;
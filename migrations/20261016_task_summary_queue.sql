@@ -0,0 +1,49 @@
+-- migrations/20261016_task_summary_queue.sql
+-- タスク要約の遅延・バッチ生成（sync-chatwork-tasks v11.3.0）
+--
+-- task_summary_queue: 同期処理が要約生成待ちのタスクを積むキュー
+--   /process-summary-queue のワーカーが複数本文をまとめてLLMで要約する
+-- task_summary_cache: 本文のSHA-256 → 要約 のキャッシュ
+--   定型タスクや同一本文の再同期でLLMを呼ばないために使用
+--
+-- chatwork_tasks と同様に organization_id は TEXT 型。
+--
+-- ロールバック: 20261016_task_summary_queue_rollback.sql
+
+CREATE TABLE IF NOT EXISTS task_summary_queue (
+    organization_id  TEXT NOT NULL,
+    task_id          BIGINT NOT NULL,
+    body_hash        CHAR(64) NOT NULL,          -- エンキュー時点の本文のSHA-256
+    attempts         INTEGER NOT NULL DEFAULT 0,  -- 上限（SUMMARY_QUEUE_MAX_ATTEMPTS）に達したらワーカーが削除
+    enqueued_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organization_id, task_id)
+);
+
+-- ワーカーの取り出し順（古い順）
+CREATE INDEX IF NOT EXISTS idx_task_summary_queue_enqueued
+    ON task_summary_queue(organization_id, enqueued_at);
+
+CREATE TABLE IF NOT EXISTS task_summary_cache (
+    organization_id  TEXT NOT NULL,
+    body_hash        CHAR(64) NOT NULL,          -- 本文のSHA-256（本文は保存しない）
+    summary          TEXT NOT NULL,
+    created_at       TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (organization_id, body_hash)
+);
+
+-- Row Level Security: 自組織のデータのみ参照・更新可能
+ALTER TABLE task_summary_queue ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_summary_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY task_summary_queue_org_policy ON task_summary_queue
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::text)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::text);
+
+CREATE POLICY task_summary_cache_org_policy ON task_summary_cache
+    FOR ALL
+    USING (organization_id = current_setting('app.current_organization_id', true)::text)
+    WITH CHECK (organization_id = current_setting('app.current_organization_id', true)::text);
+
+COMMENT ON TABLE task_summary_queue IS 'タスク要約の生成待ちキュー（sync-chatwork-tasks）';
+COMMENT ON TABLE task_summary_cache IS 'タスク要約のキャッシュ（本文ハッシュ → 要約）';
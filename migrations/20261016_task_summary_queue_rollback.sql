@@ -0,0 +1,5 @@
+-- migrations/20261016_task_summary_queue_rollback.sql
+-- task_summary_queue / task_summary_cache テーブルのロールバック
+
+DROP TABLE IF EXISTS task_summary_queue CASCADE;
+DROP TABLE IF EXISTS task_summary_cache CASCADE;
@@ -0,0 +1,242 @@
+"""
+ソウルくん Mobile API — 組織別 Brain インスタンスプール
+
+REST / WebSocket / 音声の各エンドポイントで共有する常駐 BrainIntegration。
+
+Before: メッセージごとに BrainIntegration を生成
+  → lib/brain/core/initialization.py の全初期化（記憶・学習ループ・組織グラフ・
+    Guardian・LLMBrain・ContextBuilder・LangGraph構築）が毎回走り、
+    読み込んだキャッシュ（OrganizationGraph.load_from_db() 等）も毎回捨てていた
+After: 組織ごとに1インスタンスを遅延生成して使い回す
+  - LRU: 上限を超えたら最も使われていない組織から退避
+  - ヘルスチェック: DBプールの差し替え・最大寿命・アイドル期限・連続失敗・
+    脳の初期化失敗（integration.brain が None）で作り直す
+  - 連続失敗: BrainIntegration.process_message は例外を握りつぶして
+    success=False を返すため、例外だけでなく success=False も失敗として数える
+  - 並行利用: 生成は組織単位のロックで1回だけ。退避時は利用中リースの終了を待って解放
+
+BrainIntegration.process_message は chatwork-webhook でも1インスタンスを
+複数メッセージで共有しており、同一インスタンスの並行呼び出しに対応している。
+
+Created: 2026-10-16
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# 設定
+# =============================================================================
+
+# 常駐させる組織数の上限（Cloud Runのメモリに合わせて調整）
+BRAIN_POOL_MAX_ORGS = int(os.getenv("BRAIN_POOL_MAX_ORGS", "8"))
+# 使われないまま経過したら作り直す（秒）
+BRAIN_POOL_IDLE_TTL_SECONDS = float(os.getenv("BRAIN_POOL_IDLE_TTL_SECONDS", "1800"))
+# 生成からの最大寿命（CEO教え・組織図などの変更を取り込むため定期的に作り直す）
+BRAIN_POOL_MAX_AGE_SECONDS = float(os.getenv("BRAIN_POOL_MAX_AGE_SECONDS", "21600"))
+# 連続でこの回数失敗したインスタンスは破棄する
+BRAIN_POOL_MAX_CONSECUTIVE_FAILURES = 3
+
+
+@dataclass
+class _PoolEntry:
+    """プール内の1組織分の Brain"""
+    integration: Any
+    db_pool: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    retired: bool = False
+
+
+@dataclass
+class _Lease:
+    """1回分のリース（失敗扱いにするかを記録する）"""
+    entry: _PoolEntry
+    failed: bool = False
+
+
+class BrainPool:
+    """
+    組織ID → BrainIntegration の LRU プール
+
+    【使用例】
+    result = await brain_pool.process_message(org_id, db_pool, message=..., ...)
+
+    # process_message 以外を呼ぶ場合
+    async with brain_pool.lease(org_id, db_pool) as integration:
+        ...
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str, Any], Any],
+        max_size: int = BRAIN_POOL_MAX_ORGS,
+        idle_ttl_seconds: float = BRAIN_POOL_IDLE_TTL_SECONDS,
+        max_age_seconds: float = BRAIN_POOL_MAX_AGE_SECONDS,
+        max_consecutive_failures: int = BRAIN_POOL_MAX_CONSECUTIVE_FAILURES,
+    ):
+        """
+        Args:
+            factory: (org_id, db_pool) → BrainIntegration を返す同期関数
+            max_size: 常駐させる組織数の上限
+            idle_ttl_seconds: アイドル期限（秒）
+            max_age_seconds: 最大寿命（秒）
+            max_consecutive_failures: 破棄するまでの連続失敗回数
+        """
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_consecutive_failures = max_consecutive_failures
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._create_locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @asynccontextmanager
+    async def lease(self, org_id: str, db_pool: Any) -> AsyncIterator[Any]:
+        """組織の BrainIntegration を借りる（なければ生成）"""
+        async with self._lease(org_id, db_pool) as lease:
+            yield lease.entry.integration
+
+    async def process_message(self, org_id: str, db_pool: Any, **kwargs: Any) -> Any:
+        """
+        組織の Brain でメッセージを処理する
+
+        success=False の結果も失敗として数える（連続失敗でインスタンスを破棄）。
+
+        Args:
+            org_id: 組織ID
+            db_pool: DBプール
+            **kwargs: BrainIntegration.process_message に渡す引数
+
+        Returns:
+            IntegrationResult
+        """
+        async with self._lease(org_id, db_pool) as lease:
+            result = await lease.entry.integration.process_message(**kwargs)
+            lease.failed = not getattr(result, "success", True)
+        return result
+
+    @asynccontextmanager
+    async def _lease(self, org_id: str, db_pool: Any) -> AsyncIterator[_Lease]:
+        entry = await self._acquire(org_id, db_pool)
+        lease = _Lease(entry=entry)
+        entry.in_flight += 1
+        try:
+            yield lease
+        except Exception:
+            self._record_failure(org_id, entry)
+            raise
+        else:
+            if lease.failed:
+                self._record_failure(org_id, entry)
+            else:
+                entry.consecutive_failures = 0
+        finally:
+            entry.in_flight -= 1
+            entry.last_used_at = time.monotonic()
+            if entry.retired and entry.in_flight == 0:
+                await _close_integration(entry.integration)
+
+    def _record_failure(self, org_id: str, entry: _PoolEntry) -> None:
+        entry.consecutive_failures += 1
+        if entry.consecutive_failures >= self.max_consecutive_failures:
+            logger.warning(
+                "Brain pool: retiring org after %d consecutive failures",
+                entry.consecutive_failures,
+            )
+            self._remove(org_id, entry)
+
+    async def _acquire(self, org_id: str, db_pool: Any) -> _PoolEntry:
+        entry = self._entries.get(org_id)
+        if entry is not None and self._is_healthy(entry, db_pool):
+            self._entries.move_to_end(org_id)
+            self._stats["hits"] += 1
+            return entry
+
+        lock = self._create_locks.setdefault(org_id, asyncio.Lock())
+        async with lock:
+            # ロック待ちの間に他のリクエストが生成済みならそれを使う
+            entry = self._entries.get(org_id)
+            if entry is not None and self._is_healthy(entry, db_pool):
+                self._entries.move_to_end(org_id)
+                self._stats["hits"] += 1
+                return entry
+            if entry is not None:
+                self._remove(org_id, entry)
+                await self._close_if_idle(entry)
+
+            self._stats["misses"] += 1
+            started = time.monotonic()
+            # 初期化は同期DBアクセスを含むため、イベントループを塞がないようスレッドで実行
+            integration = await asyncio.to_thread(self._factory, org_id, db_pool)
+            entry = _PoolEntry(integration=integration, db_pool=db_pool)
+            self._entries[org_id] = entry
+            logger.info(
+                "Brain pool: created brain in %.2fs (size=%d)",
+                time.monotonic() - started, len(self._entries),
+            )
+
+        await self._evict_overflow()
+        return entry
+
+    def _is_healthy(self, entry: _PoolEntry, db_pool: Any) -> bool:
+        now = time.monotonic()
+        idle_expired = entry.in_flight == 0 and now - entry.last_used_at >= self.idle_ttl_seconds
+        return (
+            entry.db_pool is db_pool
+            # 脳の初期化に失敗したインスタンスはフォールバック応答しか返さない
+            and getattr(entry.integration, "brain", None) is not None
+            and now - entry.created_at < self.max_age_seconds
+            and not idle_expired
+        )
+
+    async def _evict_overflow(self) -> None:
+        while len(self._entries) > self.max_size:
+            org_id, entry = next(iter(self._entries.items()))
+            self._remove(org_id, entry)
+            self._stats["evictions"] += 1
+            await self._close_if_idle(entry)
+
+    def _remove(self, org_id: str, entry: _PoolEntry) -> None:
+        if self._entries.get(org_id) is entry:
+            del self._entries[org_id]
+        entry.retired = True
+
+    async def _close_if_idle(self, entry: _PoolEntry) -> None:
+        # 利用中ならリース終了時に閉じる
+        if entry.in_flight == 0:
+            await _close_integration(entry.integration)
+
+    async def close_all(self) -> None:
+        """全インスタンスを解放（シャットダウン時）"""
+        entries = list(self._entries.items())
+        for org_id, entry in entries:
+            self._remove(org_id, entry)
+            await self._close_if_idle(entry)
+
+    def stats(self) -> Dict[str, int]:
+        """プール統計（組織IDは含めない）"""
+        return {"size": len(self._entries), **self._stats}
+
+
+async def _close_integration(integration: Any) -> None:
+    """LLMBrainの共有httpxクライアントを閉じる"""
+    brain = getattr(integration, "brain", None)
+    llm_brain = getattr(brain, "llm_brain", None)
+    if llm_brain is None:
+        return
+    try:
+        await llm_brain.close()
+    except Exception as e:
+        logger.warning("Brain pool: close failed: %s", type(e).__name__)
@@ -39,6 +39,8 @@ from pydantic import BaseModel, Field
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "chatwork-webhook"))
 
+from brain_pool import BrainPool  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -220,6 +222,30 @@ def _get_capabilities():
     return _cached_capabilities
 
 
+def _create_brain_integration(org_id: str, pool):
+    """BrainIntegrationを生成（brain_poolのファクトリ、スレッドで実行される）"""
+    from lib.brain.integration import BrainIntegration
+    from lib.brain.llm import get_ai_response_raw
+
+    return BrainIntegration(
+        pool=pool,
+        org_id=org_id,
+        handlers=_get_handlers(),
+        capabilities=_get_capabilities(),
+        get_ai_response_func=get_ai_response_raw,
+    )
+
+
+# v11.3.0: 組織別の常駐Brain（REST / WebSocket / 音声で共有）
+brain_pool = BrainPool(factory=_create_brain_integration)
+
+
+@app.on_event("shutdown")
+async def close_brain_pool():
+    """終了時に常駐BrainのLLMクライアントを解放"""
+    await brain_pool.close_all()
+
+
 def _run_db_query(org_id: str, query: str, params: list) -> list:
     """同期DBクエリ実行（asyncio.to_thread経由で呼ぶ）"""
     pool = _get_pool()
@@ -329,22 +355,8 @@ async def refresh_token(user: Dict = Depends(get_current_user)):
 async def chat(req: ChatRequest, user: Dict = Depends(get_current_user)):
     """メッセージ送信 — Brain経由で処理（鉄則1: bypass禁止）"""
     try:
-        pool = _get_pool()
-        handlers = _get_handlers()
-        capabilities = _get_capabilities()
-
-        from lib.brain.integration import BrainIntegration
-        from lib.brain.llm import get_ai_response_raw
-
-        integration = BrainIntegration(
-            pool=pool,
-            org_id=user["org_id"],
-            handlers=handlers,
-            capabilities=capabilities,
-            get_ai_response_func=get_ai_response_raw,
-        )
-
-        result = await integration.process_message(
+        result = await brain_pool.process_message(
+            user["org_id"], _get_pool(),
             message=req.message,
             room_id=f"mobile-{user['sub']}",
             account_id=user["sub"],
@@ -469,6 +481,11 @@ async def websocket_chat(websocket: WebSocket):
     1. サーバーがaccept
     2. クライアントが token を最初のメッセージで送信
     3. 認証後セッション開始
+
+    応答はストリーミングで返す（v11.3.0）:
+    - {"type": "delta", "text": ...}  応答テキストの差分（暫定）
+    - {"type": "thinking", "status": "tool_selected", "tool": ...}  Tool確定
+    - {"type": "response", ...}  最終応答（差分表示をこれで置き換える）
     """
     await websocket.accept()
 
@@ -505,27 +522,29 @@ async def websocket_chat(websocket: WebSocket):
                 await websocket.send_json({"type": "thinking", "status": "processing"})
 
                 try:
-                    pool = _get_pool()
-                    handlers = _get_handlers()
-                    capabilities = _get_capabilities()
-
-                    from lib.brain.integration import BrainIntegration
-                    from lib.brain.llm import get_ai_response_raw
-
-                    integration = BrainIntegration(
-                        pool=pool,
-                        org_id=user["org_id"],
-                        handlers=handlers,
-                        capabilities=capabilities,
-                        get_ai_response_func=get_ai_response_raw,
-                    )
-
-                    result = await integration.process_message(
-                        message=message,
-                        room_id=f"ws-{user_id}",
-                        account_id=user_id,
-                        sender_name=user.get("display_name", "Mobile User"),
-                    )
+                    from lib.brain.llm_streaming import stream_to
+
+                    # v11.3.0: LLMの応答テキストを生成されたそばから "delta" で送る。
+                    # 差分はGuardianの憲法違反・NGパターン検査を通過した部分だけが届く。
+                    # 最終応答（Tool実行結果・確認メッセージ等）は従来どおり "response" で確定する
+                    async def _on_stream(event):
+                        if event.type == "text_delta":
+                            await websocket.send_json({"type": "delta", "text": event.text})
+                        elif event.type == "tool_call":
+                            await websocket.send_json({
+                                "type": "thinking",
+                                "status": "tool_selected",
+                                "tool": event.tool_call.tool_name,
+                            })
+
+                    with stream_to(_on_stream):
+                        result = await brain_pool.process_message(
+                            user["org_id"], _get_pool(),
+                            message=message,
+                            room_id=f"ws-{user_id}",
+                            account_id=user_id,
+                            sender_name=user.get("display_name", "Mobile User"),
+                        )
 
                     response_text = (
                         result.to_chatwork_message()
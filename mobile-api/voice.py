@@ -266,23 +266,10 @@ async def voice_chat(
 
     # Step 2: Brain処理（JWT の org_id / user_id を使用）
     try:
-        from main import _get_pool, _get_handlers, _get_capabilities
-        from lib.brain.integration import BrainIntegration
-        from lib.brain.llm import get_ai_response_raw
-
-        pool = _get_pool()
-        handlers = _get_handlers()
-        capabilities = _get_capabilities()
-
-        integration = BrainIntegration(
-            pool=pool,
-            org_id=user["org_id"],
-            handlers=handlers,
-            capabilities=capabilities,
-            get_ai_response_func=get_ai_response_raw,
-        )
+        from main import _get_pool, brain_pool
 
-        result = await integration.process_message(
+        result = await brain_pool.process_message(
+            user["org_id"], _get_pool(),
             message=user_text,
             room_id=f"voice-{user['sub']}",
             account_id=user["sub"],
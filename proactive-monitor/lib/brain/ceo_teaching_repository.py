@@ -32,10 +32,30 @@ from .models import (
     TeachingUsageContext,
 )
 from lib.brain.hybrid_search import escape_ilike
+from lib.brain.context_cache import SECTION_CEO_TEACHINGS, invalidate_context_cache
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# 検索キーワード
+# =============================================================================
+
+# 教え検索に使う最大キーワード数
+MAX_SEARCH_KEYWORDS = 5
+
+
+def split_search_keywords(query_text: str) -> List[str]:
+    """
+    検索クエリを空白で分割し、検索に使うキーワード（先頭から最大5件）を返す
+
+    search_teachings / search_teachings_with_conn と、
+    その結果をキャッシュするContextCacheのキーで共通に使う。
+    """
+    keywords = [k.strip() for k in query_text.split() if k.strip()]
+    return keywords[:MAX_SEARCH_KEYWORDS]
+
+
 # =============================================================================
 # UUID検証ヘルパー
 # =============================================================================
@@ -197,6 +217,7 @@ class CEOTeachingRepository:
         teaching.organization_id = self._organization_id
         teaching.created_at = row[1]
         teaching.updated_at = row[2]
+        invalidate_context_cache(self._organization_id, [SECTION_CEO_TEACHINGS])
 
         logger.info(
             f"CEO teaching created: id={teaching.id}, "
@@ -364,7 +385,7 @@ class CEOTeachingRepository:
             return []
 
         # キーワードを分割
-        keywords = [k.strip() for k in query_text.split() if k.strip()]
+        keywords = split_search_keywords(query_text)
 
         if not keywords:
             return []
@@ -376,7 +397,7 @@ class CEOTeachingRepository:
             "limit": limit,
         }
 
-        for i, kw in enumerate(keywords[:5]):  # 最大5キーワード
+        for i, kw in enumerate(keywords):
             param_name = f"kw_{i}"
             conditions.append(f"""
                 (statement ILIKE :{param_name} ESCAPE '\\'
@@ -430,7 +451,7 @@ class CEOTeachingRepository:
             return []
 
         # キーワードを分割
-        keywords = [k.strip() for k in query_text.split() if k.strip()]
+        keywords = split_search_keywords(query_text)
 
         if not keywords:
             return []
@@ -442,7 +463,7 @@ class CEOTeachingRepository:
             "limit": limit,
         }
 
-        for i, kw in enumerate(keywords[:5]):  # 最大5キーワード
+        for i, kw in enumerate(keywords):
             param_name = f"kw_{i}"
             conditions.append(f"""
                 (statement ILIKE :{param_name} ESCAPE '\\'
@@ -646,6 +667,7 @@ class CEOTeachingRepository:
         if row is None:
             return None
 
+        invalidate_context_cache(self._organization_id, [SECTION_CEO_TEACHINGS])
         logger.info(f"CEO teaching updated: id={teaching_id}, fields={list(filtered_updates.keys())}")
 
         return self.get_teaching_by_id(teaching_id)
@@ -696,6 +718,8 @@ class CEOTeachingRepository:
             row = result.fetchone()
             conn.commit()
 
+        if row is not None:
+            invalidate_context_cache(self._organization_id, [SECTION_CEO_TEACHINGS])
         return row is not None
 
     def increment_usage(
@@ -798,6 +822,7 @@ class CEOTeachingRepository:
             conn.commit()
 
         if row:
+            invalidate_context_cache(self._organization_id, [SECTION_CEO_TEACHINGS])
             logger.info(f"CEO teaching deactivated: id={teaching_id}")
 
         return row is not None
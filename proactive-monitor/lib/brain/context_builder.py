@@ -31,7 +31,7 @@ import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 from zoneinfo import ZoneInfo
 
 # SoT: lib/brain/models.py から統一版をimport
@@ -285,6 +285,7 @@ class ContextBuilder:
         outcome_learning=None,
         emotion_reader=None,
         org_graph=None,
+        context_cache=None,
     ):
         """
         Args:
@@ -296,6 +297,7 @@ class ContextBuilder:
             outcome_learning: Phase 2F OutcomeLearningインスタンス
             emotion_reader: EmotionReaderインスタンス（Task 7: 感情分析）
             org_graph: OrganizationGraphインスタンス（Phase 3.5: 組織関係RAG）
+            context_cache: ContextCacheインスタンス（Noneの場合はキャッシュしない）
         """
         self.pool = pool
         self.memory_access = memory_access
@@ -305,6 +307,7 @@ class ContextBuilder:
         self.outcome_learning = outcome_learning
         self.emotion_reader = emotion_reader
         self.org_graph = org_graph
+        self.context_cache = context_cache
 
     async def build(
         self,
@@ -360,7 +363,7 @@ class ContextBuilder:
         results = await asyncio.gather(
             _safe(self._get_recent_messages(user_id, room_id, organization_id), "messages", default=[]),
             _safe(self._get_emotion_context(message, organization_id, user_id), "emotion", default=""),
-            _safe(self._fetch_all_db_data(
+            _safe(self._fetch_db_data_cached(
                 user_id, room_id, organization_id, message,
                 sender_name, phase2e_learnings_prefetched,
             ), "db_data", default={}, timeout=20.0),  # v10.79: 15→20 (DB_POOL_TIMEOUT=15の結果をキャッチするため、3AI合議)
@@ -462,6 +465,105 @@ class ContextBuilder:
 
         return tuple(processed)
 
+    async def _fetch_db_data_cached(
+        self,
+        user_id: str,
+        room_id: str,
+        organization_id: str,
+        message: str,
+        sender_name: Optional[str] = None,
+        phase2e_learnings_prefetched: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        ContextCacheを参照し、欠けているセクションだけDBから取得する
+
+        context_cacheが未設定の場合は _fetch_all_db_data() をそのまま呼ぶ。
+        キャッシュ対象外のセクション（Phase 2E学習）は毎回取得する。
+        全セクションがキャッシュヒットした場合はDB接続自体を行わない。
+        """
+        cache = self.context_cache
+        if cache is None:
+            return await self._fetch_all_db_data(
+                user_id, room_id, organization_id, message,
+                sender_name, phase2e_learnings_prefetched,
+            )
+
+        from lib.brain.ceo_teaching_repository import split_search_keywords
+        from lib.brain.context_cache import SECTION_CEO_TEACHINGS
+
+        sections = self._db_sections_for(organization_id)
+        # CEO教えは検索に使うキーワードだけで結果が決まる（順序・重複は結果に影響しない）
+        variants = {
+            SECTION_CEO_TEACHINGS: " ".join(sorted(set(split_search_keywords(message)))),
+        }
+        cached, generation = cache.lookup(
+            organization_id, room_id, user_id, sections, variants,
+        )
+        needed = sections - set(cached.keys())
+        if phase2e_learnings_prefetched is None and self.phase2e_learning:
+            needed.add("phase2e")
+
+        if not needed:
+            logger.debug("[ContextCache] all sections hit, skipping DB")
+            data = dict(cached)
+            data["phase2e"] = phase2e_learnings_prefetched or ""
+            return data
+
+        fetched = await self._fetch_all_db_data(
+            user_id, room_id, organization_id, message,
+            sender_name, phase2e_learnings_prefetched,
+            sections=needed,
+        )
+        logger.debug(
+            "[ContextCache] hit=%d, fetched=%d",
+            len(cached), len(fetched.get("_fetched", ())),
+        )
+
+        # 取得に成功したセクションのみ保存（失敗時のデフォルト値はキャッシュしない）
+        succeeded = fetched.pop("_fetched", set())
+        cache.put(
+            organization_id, room_id, user_id,
+            {k: v for k, v in fetched.items() if k in succeeded},
+            generation,
+            variants,
+        )
+
+        data = dict(fetched)
+        data.update(cached)
+        return data
+
+    def _db_sections_for(self, organization_id: str) -> Set[str]:
+        """
+        _fetch_all_db_data() が実際にクエリを発行するキャッシュ対象セクション
+
+        依存コンポーネントが無い・org_idがUUIDでない等で常にデフォルト値になる
+        セクションは含めない（毎回「未取得」扱いでDB接続するのを防ぐ）。
+        """
+        from lib.brain.context_cache import (
+            SECTION_SUMMARY, SECTION_PREFERENCES, SECTION_PERSONS, SECTION_TASKS,
+            SECTION_GOALS, SECTION_USER_INFO, SECTION_OUTCOME_PATTERNS,
+            SECTION_CEO_TEACHINGS,
+        )
+
+        org_is_uuid = False
+        try:
+            import uuid
+            uuid.UUID(organization_id)
+            org_is_uuid = True
+        except (ValueError, AttributeError):
+            pass
+
+        sections = {SECTION_USER_INFO}
+        if self.memory_access:
+            sections |= {SECTION_PERSONS, SECTION_TASKS}
+            if org_is_uuid:
+                sections |= {SECTION_SUMMARY, SECTION_PREFERENCES, SECTION_GOALS}
+        if self.outcome_learning:
+            sections.add(SECTION_OUTCOME_PATTERNS)
+        if self.ceo_teaching_repository:
+            sections.add(SECTION_CEO_TEACHINGS)
+        return sections
+
     async def _fetch_all_db_data(
         self,
         user_id: str,
@@ -470,6 +572,7 @@ class ContextBuilder:
         message: str,
         sender_name: Optional[str] = None,
         phase2e_learnings_prefetched: Optional[str] = None,
+        sections: Optional[Set[str]] = None,
     ) -> Dict[str, Any]:
         """
         根本原因修正: 全DBクエリを1コネクション・1スレッドで実行
@@ -485,9 +588,14 @@ class ContextBuilder:
         - memory_access（9並列pool.connect()）は全て15秒タイムアウト
         - 3者合議（Claude+Codex+Gemini）でpool枯渇が原因と一致
 
+        Args:
+            sections: 取得するセクション名（Noneなら全セクション）。
+                ContextCacheでヒットしなかったセクションだけを指定する。
+
         Returns:
             Dict with keys: summary, preferences, persons, tasks, goals,
-            user_info, phase2e, outcome_patterns
+            user_info, phase2e, outcome_patterns, ceo_teachings,
+            _fetched（クエリに成功したセクション名のset）
         """
         from sqlalchemy import text as sa_text
         import time as _time
@@ -509,6 +617,9 @@ class ContextBuilder:
 
         t_before_thread = None  # asyncio.to_thread待ち計測用
 
+        def _want(name: str) -> bool:
+            return sections is None or name in sections
+
         def _sync_all_queries():
             """1コネクションで全DBクエリを直列実行（スレッド内で実行）"""
             t0 = _time.monotonic()
@@ -525,7 +636,9 @@ class ContextBuilder:
                 "phase2e": prefetched or "",
                 "outcome_patterns": "",
                 "ceo_teachings": [],
+                "_fetched": set(),
             }
+            fetched: Set[str] = data["_fetched"]
 
             try:
                 # [DIAG] pool状態可視化（Codex+Gemini共通指摘: pool枯渇の検出）
@@ -556,7 +669,7 @@ class ContextBuilder:
                     t_q = _time.monotonic()  # クエリ個別タイミング
 
                     # --- 1. 会話要約 (conversation_summaries) ---
-                    if org_is_uuid and memory:
+                    if org_is_uuid and memory and _want("summary"):
                         try:
                             row = conn.execute(sa_text("""
                                 SELECT cs.id, cs.summary_text, cs.key_topics,
@@ -570,6 +683,7 @@ class ContextBuilder:
                             """), {"user_id": user_id, "org_id": org_id}).fetchone()
                             if row and row[1]:
                                 data["summary"] = str(row[1])
+                            fetched.add("summary")
                         except Exception as e:
                             logger.debug("[DIAG] summary query failed: %s", type(e).__name__)
                             try:
@@ -579,7 +693,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_1_summary: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 2. ユーザー嗜好 (user_preferences) ---
-                    if org_is_uuid and memory:
+                    if org_is_uuid and memory and _want("preferences"):
                         try:
                             rows = conn.execute(sa_text("""
                                 SELECT up.preference_type, up.preference_key,
@@ -604,6 +718,7 @@ class ContextBuilder:
                                     else:
                                         prefs.other_preferences[key] = value
                                 data["preferences"] = prefs
+                            fetched.add("preferences")
                         except Exception as e:
                             logger.debug("[DIAG] preferences query failed: %s", type(e).__name__)
                             try:
@@ -613,7 +728,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_2_prefs: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 3. 人物情報 (persons + person_attributes) ---
-                    if memory:
+                    if memory and _want("persons"):
                         try:
                             from collections import OrderedDict
                             rows = conn.execute(sa_text("""
@@ -643,6 +758,7 @@ class ContextBuilder:
                                 )
                                 for pid, info in person_map.items()
                             ]
+                            fetched.add("persons")
                         except Exception as e:
                             logger.debug("[DIAG] persons query failed: %s", type(e).__name__)
                             try:
@@ -652,7 +768,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_3_persons: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 4. タスク情報 (chatwork_tasks) ---
-                    if memory:
+                    if memory and _want("tasks"):
                         try:
                             import time as time_mod
                             now_ts = int(time_mod.time())
@@ -713,6 +829,7 @@ class ContextBuilder:
                                 )
                                 for r in rows
                             ]
+                            fetched.add("tasks")
                         except Exception as e:
                             logger.debug("[DIAG] tasks query failed: %s", type(e).__name__)
                             try:
@@ -722,7 +839,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_4_tasks: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 5. 目標情報 (goals) ---
-                    if org_is_uuid and memory:
+                    if org_is_uuid and memory and _want("goals"):
                         try:
                             rows = conn.execute(sa_text("""
                                 SELECT g.id, g.title, g.description,
@@ -753,6 +870,7 @@ class ContextBuilder:
                                 )
                                 for r in rows
                             ]
+                            fetched.add("goals")
                         except Exception as e:
                             logger.debug("[DIAG] goals query failed: %s", type(e).__name__)
                             try:
@@ -762,31 +880,33 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_5_goals: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 6. ユーザー基本情報 (users) ---
-                    try:
-                        row = conn.execute(sa_text("""
-                            SELECT u.name, r.name AS role_name
-                            FROM users u
-                            LEFT JOIN user_departments ud ON ud.user_id = u.id
-                            LEFT JOIN roles r ON ud.role_id = r.id
-                            WHERE u.chatwork_account_id = :account_id
-                            AND u.organization_id = :org_id
-                            LIMIT 1
-                        """), {"account_id": user_id, "org_id": org_id}).fetchone()
-                        if row:
-                            data["user_info"] = {
-                                "name": row[0] or sender_name or "ユーザー",
-                                "role": row[1] or "",
-                            }
-                    except Exception as e:
-                        logger.debug("[DIAG] user_info query failed: %s", type(e).__name__)
+                    if _want("user_info"):
                         try:
-                            conn.rollback()
-                        except Exception:
-                            pass
+                            row = conn.execute(sa_text("""
+                                SELECT u.name, r.name AS role_name
+                                FROM users u
+                                LEFT JOIN user_departments ud ON ud.user_id = u.id
+                                LEFT JOIN roles r ON ud.role_id = r.id
+                                WHERE u.chatwork_account_id = :account_id
+                                AND u.organization_id = :org_id
+                                LIMIT 1
+                            """), {"account_id": user_id, "org_id": org_id}).fetchone()
+                            if row:
+                                data["user_info"] = {
+                                    "name": row[0] or sender_name or "ユーザー",
+                                    "role": row[1] or "",
+                                }
+                            fetched.add("user_info")
+                        except Exception as e:
+                            logger.debug("[DIAG] user_info query failed: %s", type(e).__name__)
+                            try:
+                                conn.rollback()
+                            except Exception:
+                                pass
                     logger.debug("[DIAG] query_6_userinfo: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 7. Phase 2E 学習済み知識 ---
-                    if prefetched is None and phase2e_learning:
+                    if prefetched is None and phase2e_learning and _want("phase2e"):
                         try:
                             applicable = phase2e_learning.find_applicable(
                                 conn, message, None, user_id, room_id
@@ -807,7 +927,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_7_phase2e: %.3fs", _time.monotonic() - t_q); t_q = _time.monotonic()
 
                     # --- 8. Phase 2F 行動パターン ---
-                    if outcome_learning:
+                    if outcome_learning and _want("outcome_patterns"):
                         try:
                             patterns = outcome_learning.find_applicable_patterns(
                                 conn=conn, target_account_id=user_id,
@@ -823,6 +943,7 @@ class ContextBuilder:
                                     "【行動パターン（Phase 2F）】\n"
                                     + "\n".join(lines)
                                 )
+                            fetched.add("outcome_patterns")
                         except Exception as e:
                             logger.debug("[DIAG] outcome query failed: %s", type(e).__name__)
                             try:
@@ -832,7 +953,7 @@ class ContextBuilder:
                     logger.debug("[DIAG] query_8_outcome: %.3fs", _time.monotonic() - t_q)
 
                     # --- 9. CEO教え ---
-                    if self.ceo_teaching_repository:
+                    if self.ceo_teaching_repository and _want("ceo_teachings"):
                         try:
                             teachings = self.ceo_teaching_repository.search_teachings_with_conn(
                                 conn=conn,
@@ -848,6 +969,7 @@ class ContextBuilder:
                                 )
                                 for t in teachings
                             ]
+                            fetched.add("ceo_teachings")
                         except Exception as e:
                             logger.debug("[DIAG] ceo_teachings query failed: %s", type(e).__name__)
                             try:
@@ -44,12 +44,16 @@ from lib.feature_flags import is_llm_brain_enabled
 # v10.50.0: LLM Brain（LLM常駐型脳 - 25章）
 from lib.brain.llm_brain import LLMBrain
 from lib.brain.guardian_layer import GuardianLayer
+from lib.brain.operations.rate_limiter import create_operation_rate_limiter
+from lib.brain.env_config import get_guardian_rate_limit_backend
 from lib.brain.state_manager import LLMStateManager
 from lib.brain.context_builder import ContextBuilder
+from lib.brain.context_cache import get_context_cache
 from lib.brain.deep_understanding.emotion_reader import create_emotion_reader
 
 # v10.46.0: 観測機能（Observability Layer）
 from lib.brain.observability import create_observability
+from lib.brain.monitoring import LatencyMinutesWriter
 
 # タスクD: エピソード記憶（過去の出来事を想起）
 from lib.brain.episodic_memory import create_episodic_memory
@@ -92,7 +96,8 @@ class InitializationMixin:
             ai_client=get_ai_response_func,
         )
 
-        # Phase 1-B: ハイブリッド検索（Pinecone/Embeddingは後から設定可能）
+        # Phase 1-B: ハイブリッド検索（Pineconeは後から設定可能。Embeddingは未指定時に
+        # プロセス共通のクライアント + 組織の永続キャッシュを使う）
         hybrid_searcher = HybridSearcher(
             pool=pool,
             org_id=org_id,
@@ -264,6 +269,9 @@ class InitializationMixin:
         # v10.74.0: fire-and-forgetタスク追跡（タスク消滅防止）
         self._background_tasks: set = set()
 
+        # v11.3.0: レイテンシ分バケットの保存（管理APIのスクレイプ用）
+        self._latency_writer = LatencyMinutesWriter(pool) if pool is not None else None
+
         logger.debug(f"SoulkunBrain initialized: "
                     f"chain_of_thought={self.use_chain_of_thought}, "
                     f"self_critique={self.use_self_critique}, "
@@ -356,6 +364,11 @@ class InitializationMixin:
             self.llm_brain = LLMBrain()
             self.llm_guardian = GuardianLayer(
                 ceo_teachings=[],  # CEO教えは実行時に取得
+                rate_limiter=create_operation_rate_limiter(
+                    pool=self.pool,
+                    organization_id=self.org_id,
+                    backend=get_guardian_rate_limit_backend(),
+                ),
             )
             self.llm_state_manager = LLMStateManager(
                 brain_state_manager=self.state_manager,
@@ -370,6 +383,7 @@ class InitializationMixin:
                 outcome_learning=self.outcome_learning,
                 emotion_reader=self.emotion_reader,
                 org_graph=self.org_graph,
+                context_cache=get_context_cache(),
             )
             logger.info(
                 "🧠 [DIAG] LLMBrain init: SUCCESS model=%s, provider=%s",
@@ -15,7 +15,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from lib.brain.core import SoulkunBrain
 
-from lib.brain.graph.state import BrainGraphState
+from lib.brain.graph.state import BrainGraphState, record_stage_timing
+from lib.brain.guardian_layer import GuardianAction
+from lib.brain.llm_streaming import StopStreaming, StreamTextGuard, get_stream_callback
+from lib.brain.monitoring import STAGE_LLM
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,37 @@ async def _log_llm_usage(pool, org_id: str, model_id: str,
         logger.warning("[graph:llm_inference] ai_usage_logs記録失敗: %s", e)
 
 
+def _make_guardian_precheck(brain: "SoulkunBrain", llm_context):
+    """ストリーミング中のTool呼び出しをGuardianで先行チェックするコールバックを生成"""
+
+    async def _precheck(tool_call) -> None:
+        guardian = getattr(brain, "llm_guardian", None)
+        if guardian is None:
+            return
+        result = guardian.precheck_tool_call(tool_call, llm_context)
+        if result.action == GuardianAction.BLOCK:
+            logger.info("[graph:llm_inference] Guardian precheck blocked tool=%s, stopping stream", tool_call.tool_name)
+            raise StopStreaming()
+
+    return _precheck
+
+
+def _make_guardian_text_guard(brain: "SoulkunBrain"):
+    """ストリーミング中の応答テキストを送信前にGuardianで検査するガードを生成"""
+    guardian = getattr(brain, "llm_guardian", None)
+    if guardian is None:
+        return None
+
+    def _check(text: str) -> bool:
+        result = guardian.precheck_text(text)
+        if result.action == GuardianAction.BLOCK:
+            logger.info("[graph:llm_inference] Guardian text precheck blocked (priority=%d), stopping stream", result.priority_level)
+            return False
+        return True
+
+    return StreamTextGuard(check=_check, holdback_chars=guardian.stream_holdback_chars)
+
+
 def make_llm_inference(brain: "SoulkunBrain"):
     """SoulkunBrainを参照するllm_inferenceノードを生成"""
 
@@ -57,11 +91,20 @@ def make_llm_inference(brain: "SoulkunBrain"):
 
         try:
             t0 = time.time()
+            process_kwargs = {}
+            if get_stream_callback() is not None:
+                # v11.3.0: ストリーミング時はTool呼び出しが確定した時点でGuardianの
+                # 単体チェックを先行し、BLOCKなら残りの生成を打ち切る。
+                # 応答テキストも憲法違反・NGパターンの検査を通過した部分だけを流す
+                process_kwargs["on_tool_call"] = _make_guardian_precheck(brain, state["llm_context"])
+                process_kwargs["text_guard"] = _make_guardian_text_guard(brain)
             llm_result = await brain.llm_brain.process(
                 context=state["llm_context"],
                 message=state["message"],
                 tools=state["tools"],
+                **process_kwargs,
             )
+            record_stage_timing(state, STAGE_LLM, t0)
             logger.debug(
                 "[graph:llm_inference] DONE t=%.3fs (took %.3fs)",
                 time.time() - start_time, time.time() - t0,
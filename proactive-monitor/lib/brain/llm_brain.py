@@ -59,13 +59,25 @@ import re
 import json
 import logging
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
 from enum import Enum
 
 import httpx
 
 from lib.brain.context_builder import LLMContext
 from lib.brain.langfuse_integration import observe, update_current_observation
+from lib.brain.llm_streaming import (
+    AnthropicStreamAssembler,
+    GuardedTextBuffer,
+    OpenAIStreamAssembler,
+    ResponseTextFilter,
+    StopStreaming,
+    StreamCallback,
+    StreamEvent,
+    StreamTextGuard,
+    get_stream_callback,
+    parse_sse_data,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -495,17 +507,25 @@ class LLMBrain:
         message: str,
         tools: List[Dict[str, Any]],
         system_prompt: Optional[str] = None,
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[None]]] = None,
+        text_guard: Optional[StreamTextGuard] = None,
     ) -> LLMBrainResult:
         """
         ユーザーメッセージを処理する
 
         LLMにメッセージを送信し、Tool呼び出しまたはテキスト応答を取得する。
+        v11.3.0: llm_streaming.stream_to() でコールバックが登録されている場合は
+        ストリーミングAPIで呼び出し、応答テキストの差分を逐次通知する。
 
         Args:
             context: Context Builderで構築したコンテキスト
             message: ユーザーのメッセージ
             tools: 使用可能なTool定義のリスト（Anthropic形式）
             system_prompt: System Prompt（Noneの場合はデフォルトを使用）
+            on_tool_call: ストリーミング時、Tool呼び出しの引数が揃った時点で呼ばれる。
+                StopStreaming を送出すると残りの生成を打ち切る
+            text_guard: ストリーミング時、応答テキストを送信前に検査する。
+                違反を検出したら以降を送らずに残りの生成を打ち切る
 
         Returns:
             LLMBrainResult: 処理結果（Tool呼び出しまたは直接応答）
@@ -526,20 +546,7 @@ class LLMBrain:
 
         # 3. LLM呼び出し
         try:
-            if self.api_provider == APIProvider.OPENROUTER:
-                response = await self._call_openrouter(
-                    system=full_system_prompt,
-                    messages=messages,
-                    tools=tools,
-                )
-                result = self._parse_openrouter_response(response)
-            else:
-                response = await self._call_anthropic(
-                    system=full_system_prompt,
-                    messages=messages,
-                    tools=tools,
-                )
-                result = self._parse_anthropic_response(response)
+            result = await self._call_llm(full_system_prompt, messages, tools, on_tool_call, text_guard)
 
         except RuntimeError as e:
             if "Event loop is closed" in str(e):
@@ -553,20 +560,7 @@ class LLMBrain:
                     limits=httpx.Limits(max_connections=5, max_keepalive_connections=3),
                 )
                 try:
-                    if self.api_provider == APIProvider.OPENROUTER:
-                        response = await self._call_openrouter(
-                            system=full_system_prompt,
-                            messages=messages,
-                            tools=tools,
-                        )
-                        result = self._parse_openrouter_response(response)
-                    else:
-                        response = await self._call_anthropic(
-                            system=full_system_prompt,
-                            messages=messages,
-                            tools=tools,
-                        )
-                        result = self._parse_anthropic_response(response)
+                    result = await self._call_llm(full_system_prompt, messages, tools, on_tool_call, text_guard)
                 except Exception as retry_e:
                     logger.error(f"API retry error: {type(retry_e).__name__}", exc_info=True)
                     return self._create_error_result(type(retry_e).__name__)
@@ -855,6 +849,37 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
 
         return openai_tools
 
+    # =========================================================================
+    # LLM呼び出しの振り分け（通常 / ストリーミング）
+    # =========================================================================
+
+    async def _call_llm(
+        self,
+        system: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[None]]] = None,
+        text_guard: Optional[StreamTextGuard] = None,
+    ) -> LLMBrainResult:
+        """API提供元とストリーミング有無に応じて呼び出し、LLMBrainResultに変換"""
+        callback = get_stream_callback()
+        if self.api_provider == APIProvider.OPENROUTER:
+            if callback is not None:
+                response = await self._stream_openrouter(
+                    system, messages, tools, callback, on_tool_call, text_guard,
+                )
+            else:
+                response = await self._call_openrouter(system=system, messages=messages, tools=tools)
+            return self._parse_openrouter_response(response)
+
+        if callback is not None:
+            response = await self._stream_anthropic(
+                system, messages, tools, callback, on_tool_call, text_guard,
+            )
+        else:
+            response = await self._call_anthropic(system=system, messages=messages, tools=tools)
+        return self._parse_anthropic_response(response)
+
     # =========================================================================
     # OpenRouter API呼び出し
     # =========================================================================
@@ -890,33 +915,13 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
             f"tools={len(tools)}"
         )
 
-        # systemメッセージを先頭に追加
-        full_messages = [{"role": "system", "content": system}] + messages
-
-        # ToolをOpenAI形式に変換
-        openai_tools = self._convert_tools_to_openai_format(tools) if tools else None
-
-        # リクエストボディ構築
-        request_body: Dict[str, Any] = {
-            "model": self.model,
-            "messages": full_messages,
-            "max_tokens": self.max_tokens,
-            "temperature": 0.7,
-        }
-
-        if openai_tools:
-            request_body["tools"] = openai_tools
-            request_body["tool_choice"] = "auto"
+        request_body = self._build_openrouter_request(system, messages, tools)
+        full_messages = request_body["messages"]
 
         # API呼び出し（v10.74.0: 共有httpxクライアントで接続再利用）
         response = await self._http_client.post(
             self.api_url,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": HTTP_REFERER,
-                "X-Title": APP_TITLE,
-            },
+            headers=self._openrouter_headers(),
             json=request_body,
         )
 
@@ -945,6 +950,86 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
 
         return result
 
+    def _build_openrouter_request(
+        self,
+        system: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """OpenRouterのリクエストボディを構築（OpenAI形式）"""
+        # systemメッセージを先頭に追加
+        full_messages = [{"role": "system", "content": system}] + messages
+
+        # ToolをOpenAI形式に変換
+        openai_tools = self._convert_tools_to_openai_format(tools) if tools else None
+
+        # リクエストボディ構築
+        request_body: Dict[str, Any] = {
+            "model": self.model,
+            "messages": full_messages,
+            "max_tokens": self.max_tokens,
+            "temperature": 0.7,
+        }
+
+        if openai_tools:
+            request_body["tools"] = openai_tools
+            request_body["tool_choice"] = "auto"
+
+        return request_body
+
+    def _openrouter_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": HTTP_REFERER,
+            "X-Title": APP_TITLE,
+        }
+
+    @observe(as_type="generation", name="openrouter_stream", capture_input=False, capture_output=False)
+    async def _stream_openrouter(
+        self,
+        system: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        callback: StreamCallback,
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[None]]] = None,
+        text_guard: Optional[StreamTextGuard] = None,
+    ) -> Dict[str, Any]:
+        """
+        OpenRouter APIをストリーミングで呼び出す（v11.3.0）
+
+        Returns:
+            _call_openrouter() と同じ形式に組み立てたレスポンス
+        """
+        request_body = self._build_openrouter_request(system, messages, tools)
+        request_body["stream"] = True
+        request_body["stream_options"] = {"include_usage": True}
+
+        assembler = OpenAIStreamAssembler()
+        await self._consume_stream(
+            provider="OpenRouter",
+            headers=self._openrouter_headers(),
+            request_body=request_body,
+            assembler=assembler,
+            to_tool_call=_openai_tool_call,
+            callback=callback,
+            on_tool_call=on_tool_call,
+            text_guard=text_guard,
+        )
+
+        usage = assembler.usage
+        update_current_observation(
+            model=self.model,
+            input={"message_count": len(request_body["messages"])},
+            output={"output_type": "openrouter_stream"},
+            usage={
+                "input": usage.get("prompt_tokens", 0),
+                "output": usage.get("completion_tokens", 0),
+            },
+            metadata={"api_provider": "openrouter", "stream": True},
+        )
+        return assembler.to_response()
+
     # =========================================================================
     # Anthropic API呼び出し
     # =========================================================================
@@ -977,26 +1062,12 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
             f"tools={len(tools)}"
         )
 
-        # リクエストボディ構築
-        request_body: Dict[str, Any] = {
-            "model": self.model,
-            "max_tokens": self.max_tokens,
-            "system": system,
-            "messages": messages,
-        }
-
-        if tools:
-            request_body["tools"] = tools
-            request_body["tool_choice"] = {"type": "auto"}
+        request_body = self._build_anthropic_request(system, messages, tools)
 
         # API呼び出し（v10.74.0: 共有httpxクライアントで接続再利用）
         response = await self._http_client.post(
             self.api_url,
-            headers={
-                "x-api-key": self.api_key or "",
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01",
-            },
+            headers=self._anthropic_headers(),
             json=request_body,
         )
 
@@ -1025,6 +1096,169 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
 
         return anthropic_result
 
+    def _build_anthropic_request(
+        self,
+        system: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Anthropic Messages APIのリクエストボディを構築"""
+        request_body: Dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": system,
+            "messages": messages,
+        }
+
+        if tools:
+            request_body["tools"] = tools
+            request_body["tool_choice"] = {"type": "auto"}
+
+        return request_body
+
+    def _anthropic_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key or "",
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01",
+        }
+
+    @observe(as_type="generation", name="anthropic_stream", capture_input=False, capture_output=False)
+    async def _stream_anthropic(
+        self,
+        system: str,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        callback: StreamCallback,
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[None]]] = None,
+        text_guard: Optional[StreamTextGuard] = None,
+    ) -> Dict[str, Any]:
+        """
+        Anthropic APIをストリーミングで呼び出す（v11.3.0）
+
+        Returns:
+            _call_anthropic() と同じ形式に組み立てたレスポンス
+        """
+        request_body = self._build_anthropic_request(system, messages, tools)
+        request_body["stream"] = True
+
+        assembler = AnthropicStreamAssembler()
+        await self._consume_stream(
+            provider="Anthropic",
+            headers=self._anthropic_headers(),
+            request_body=request_body,
+            assembler=assembler,
+            to_tool_call=_anthropic_tool_call,
+            callback=callback,
+            on_tool_call=on_tool_call,
+            text_guard=text_guard,
+        )
+
+        usage = assembler.usage
+        update_current_observation(
+            model=self.model,
+            input={"message_count": len(messages)},
+            output={"output_type": "anthropic_stream"},
+            usage={
+                "input": usage.get("input_tokens", 0),
+                "output": usage.get("output_tokens", 0),
+            },
+            metadata={"api_provider": "anthropic", "stream": True},
+        )
+        return assembler.to_response()
+
+    # =========================================================================
+    # ストリーミング共通処理
+    # =========================================================================
+
+    async def _consume_stream(
+        self,
+        provider: str,
+        headers: Dict[str, str],
+        request_body: Dict[str, Any],
+        assembler: Any,
+        to_tool_call: Callable[[Dict[str, Any]], ToolCall],
+        callback: StreamCallback,
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[None]]] = None,
+        text_guard: Optional[StreamTextGuard] = None,
+    ) -> None:
+        """
+        SSEを読みながらアセンブラに渡し、応答テキスト差分・Tool確定を通知する
+
+        通知先（WebSocket等）の送信失敗では生成を止めず、以降の通知だけを止める。
+        on_tool_call / callback が StopStreaming を送出した場合はストリームを閉じて終了する。
+        text_guard があれば、応答テキストは検査を通過した部分だけを送る。
+        違反を検出した場合は保留中のテキストを捨て、同様にストリームを閉じて終了する
+        （最終的な判定・差し替えは従来どおり GuardianLayer.check() が行う）。
+        """
+        text_filter = ResponseTextFilter()
+        text_buffer = GuardedTextBuffer(text_guard)
+        notify = callback
+
+        async def _emit(event: StreamEvent) -> None:
+            nonlocal notify
+            if notify is None:
+                return
+            try:
+                await notify(event)
+            except StopStreaming:
+                raise
+            except Exception as e:
+                logger.warning("Stream callback failed, disabling: %s", type(e).__name__)
+                notify = None
+
+        async def _emit_tool_calls(raw_calls: List[Dict[str, Any]]) -> None:
+            for raw in raw_calls:
+                tool_call = to_tool_call(raw)
+                await _emit(StreamEvent(type="tool_call", tool_call=tool_call))
+                if on_tool_call is not None:
+                    await on_tool_call(tool_call)
+
+        try:
+            async with self._http_client.stream(
+                "POST", self.api_url, headers=headers, json=request_body,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    logger.error(f"{provider} API error: status={response.status_code}")
+                    raise Exception(f"{provider} API error: {response.status_code}")
+
+                lines = response.aiter_lines()
+                try:
+                    async for line in lines:
+                        data = parse_sse_data(line)
+                        if data is None:
+                            continue
+                        if data == "[DONE]":
+                            break
+                        try:
+                            payload = json.loads(data)
+                        except json.JSONDecodeError:
+                            continue
+                        if payload.get("error") or payload.get("type") == "error":
+                            logger.error(f"{provider} stream error event")
+                            raise Exception(f"{provider} stream error")
+
+                        completed = assembler.feed(payload)
+                        delta = text_buffer.feed(
+                            assembler.last_text_delta,
+                            text_filter.feed(assembler.last_text_delta),
+                        )
+                        if delta:
+                            await _emit(StreamEvent(type="text_delta", text=delta))
+                        await _emit_tool_calls(completed)
+                finally:
+                    # 途中で抜けた場合も行イテレータを閉じる
+                    await lines.aclose()
+
+                await _emit_tool_calls(assembler.finish())
+                # 生成済みテキスト全体が検査済みなので、保留していた末尾を送る
+                tail = text_buffer.flush()
+                if tail:
+                    await _emit(StreamEvent(type="text_delta", text=tail))
+        except StopStreaming:
+            logger.info(f"{provider} stream stopped early")
+
     # =========================================================================
     # レスポンス解析
     # =========================================================================
@@ -1389,6 +1623,33 @@ Toolを呼び出す前に、以下の形式で思考過程を出力してくだ
         )
 
 
+# =============================================================================
+# ストリーミング用ヘルパー
+# =============================================================================
+
+def _openai_tool_call(raw: Dict[str, Any]) -> ToolCall:
+    """ストリームで確定したOpenAI形式のtool_callをToolCallに変換"""
+    function = raw.get("function", {})
+    try:
+        parameters = json.loads(function.get("arguments") or "{}")
+    except json.JSONDecodeError:
+        parameters = {}
+    return ToolCall(
+        tool_name=function.get("name", ""),
+        parameters=parameters,
+        tool_use_id=raw.get("id", ""),
+    )
+
+
+def _anthropic_tool_call(raw: Dict[str, Any]) -> ToolCall:
+    """ストリームで確定したAnthropicのtool_useブロックをToolCallに変換"""
+    return ToolCall(
+        tool_name=raw.get("name", ""),
+        parameters=raw.get("input", {}),
+        tool_use_id=raw.get("id", ""),
+    )
+
+
 # =============================================================================
 # ファクトリ関数
 # =============================================================================
@@ -0,0 +1,355 @@
+# lib/brain/llm_streaming.py
+"""
+LLM Brain ストリーミング応答
+
+v11.3.0: OpenRouter（OpenAI互換）/ Anthropic のストリーミングAPIを解析し、
+応答テキストの差分とTool呼び出しの確定をイベントとして通知する。
+
+【仕組み】
+- 呼び出し側（mobile-api の WebSocket 等）が stream_to(callback) で
+  コールバックを登録すると、その処理中の LLMBrain.process() がストリーミングで呼び出す
+  （ContextVarなので、同じBrainインスタンスを共有する並行リクエスト同士は混ざらない）
+- アセンブラはSSEチャンクを非ストリーミング時と同じ形のレスポンスへ組み立てるため、
+  既存の _parse_openrouter_response / _parse_anthropic_response をそのまま使える
+- 【思考過程】はユーザーに見せないため、【応答】以降のテキストだけを差分として流す
+- Tool呼び出しは引数が揃った時点で "tool_call" イベントを出す。
+  コールバックが StopStreaming を送出すると、残りの生成を待たずに打ち切る
+- 応答テキストは StreamTextGuard（GuardianLayer の憲法違反・NGパターン検査）を
+  通過した部分だけを流す。パターンが差分の境界をまたいでも一部を先に送らないよう、
+  末尾はパターン長ぶん保留し、違反を検出したら保留分を捨てて打ち切る
+
+【イベント】
+- StreamEvent(type="text_delta", text=...)  応答テキストの差分（暫定。最終応答で置き換える）
+- StreamEvent(type="tool_call", tool_call=...)  Tool呼び出しの確定
+
+Created: 2026-10-16
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 応答セクションのマーカー（llm_brain._extract_reasoning_and_response と同じ）
+RESPONSE_MARKER = "【応答】"
+
+
+@dataclass
+class StreamEvent:
+    """ストリーミング中に通知するイベント"""
+    type: str                      # "text_delta" / "tool_call"
+    text: str = ""
+    tool_call: Any = None          # ToolCall（type="tool_call" のとき）
+
+
+StreamCallback = Callable[[StreamEvent], Awaitable[None]]
+
+
+class StopStreaming(Exception):
+    """コールバックから送出すると、ストリームを打ち切ってそこまでの結果で確定する"""
+
+
+# =============================================================================
+# コールバック登録（ContextVar）
+# =============================================================================
+
+_stream_callback: ContextVar[Optional[StreamCallback]] = ContextVar(
+    "llm_stream_callback", default=None
+)
+
+
+@contextmanager
+def stream_to(callback: StreamCallback) -> Iterator[None]:
+    """このコンテキスト内の LLMBrain.process() をストリーミングで実行する"""
+    token = _stream_callback.set(callback)
+    try:
+        yield
+    finally:
+        _stream_callback.reset(token)
+
+
+def get_stream_callback() -> Optional[StreamCallback]:
+    """登録中のストリーミングコールバック（なければ None）"""
+    return _stream_callback.get()
+
+
+# =============================================================================
+# SSE
+# =============================================================================
+
+def parse_sse_data(line: str) -> Optional[str]:
+    """SSEの1行から data ペイロードを取り出す（コメント・event行・空行は None）"""
+    if not line or line.startswith(":"):
+        return None
+    if line.startswith("data:"):
+        return line[5:].strip()
+    return None
+
+
+# =============================================================================
+# 応答テキストのフィルタ
+# =============================================================================
+
+class ResponseTextFilter:
+    """
+    【応答】マーカー以降のテキストだけを差分として返す
+
+    マーカーがチャンク境界で分割されても検出できるよう、
+    マーカー検出前はマーカー長-1文字分だけ末尾を保持しておく。
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_response = False
+        self._leading = True
+
+    def feed(self, delta: str) -> str:
+        if not delta:
+            return ""
+        if self._in_response:
+            return self._strip_leading(delta)
+
+        self._buffer += delta
+        pos = self._buffer.find(RESPONSE_MARKER)
+        if pos < 0:
+            # 末尾にマーカーの途中が来ている可能性があるので残す
+            self._buffer = self._buffer[-(len(RESPONSE_MARKER) - 1):]
+            return ""
+
+        self._in_response = True
+        rest = self._buffer[pos + len(RESPONSE_MARKER):]
+        self._buffer = ""
+        return self._strip_leading(rest)
+
+    def _strip_leading(self, text: str) -> str:
+        # 最終応答は strip() されるため、先頭の空白・改行は流さない
+        if self._leading:
+            text = text.lstrip()
+            if text:
+                self._leading = False
+        return text
+
+
+# =============================================================================
+# 応答テキストの送信前検査
+# =============================================================================
+
+@dataclass
+class StreamTextGuard:
+    """
+    送信前の応答テキスト検査
+
+    check には【思考過程】を含む生成済みテキスト全体を渡し、False なら違反とみなす。
+    holdback_chars は検査対象パターンの最大長（この文字数は次の検査まで送らない）。
+    """
+    check: Callable[[str], bool]
+    holdback_chars: int
+
+
+class GuardedTextBuffer:
+    """
+    StreamTextGuard を通過した応答テキストだけを返すバッファ
+
+    ガードなしの場合は受け取った差分をそのまま返す。
+    違反を検出すると保留分を捨てて StopStreaming を送出する。
+    """
+
+    def __init__(self, guard: Optional[StreamTextGuard] = None):
+        self._guard = guard
+        self._generated = ""
+        self._pending = ""
+
+    def feed(self, generated_delta: str, response_delta: str) -> str:
+        """
+        生成テキスト（思考過程を含む）と応答テキストの差分を取り込み、送信してよい部分を返す
+        """
+        self._pending += response_delta
+        if self._guard is None:
+            return self.flush()
+        if not generated_delta:
+            return ""
+
+        self._generated += generated_delta
+        if not self._guard.check(self._generated):
+            self._pending = ""
+            raise StopStreaming()
+
+        cut = len(self._pending) - self._guard.holdback_chars
+        if cut <= 0:
+            return ""
+        ready, self._pending = self._pending[:cut], self._pending[cut:]
+        return ready
+
+    def flush(self) -> str:
+        """保留中のテキストを返す（生成済みテキスト全体が検査済みのときだけ呼ぶ）"""
+        ready, self._pending = self._pending, ""
+        return ready
+
+
+# =============================================================================
+# OpenAI互換（OpenRouter）
+# =============================================================================
+
+class OpenAIStreamAssembler:
+    """
+    chat.completions のストリーミングチャンクを非ストリーミング形式に組み立てる
+
+    tool_calls は index ごとに id / name / arguments の断片が届く。
+    次の index が始まった時点、または finish_reason 到着時に確定とみなす。
+    """
+
+    def __init__(self):
+        self.content = ""
+        self.last_text_delta = ""
+        self.finish_reason: Optional[str] = None
+        self.usage: Dict[str, Any] = {}
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        self._completed: set = set()
+
+    def feed(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        チャンクを取り込み、今回確定したTool呼び出し（OpenAI形式）を返す
+
+        テキスト差分は戻り値ではなく last_text_delta に入る。
+        """
+        self.last_text_delta = ""
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+
+        completed: List[Dict[str, Any]] = []
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            text = delta.get("content")
+            if text:
+                self.content += text
+                self.last_text_delta += text
+
+            for tc in delta.get("tool_calls") or []:
+                index = tc.get("index", 0)
+                # 新しい index が始まったら、それより前の呼び出しは確定
+                completed.extend(self._complete_before(index))
+                entry = self._tool_calls.setdefault(
+                    index,
+                    {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                )
+                if tc.get("id"):
+                    entry["id"] = tc["id"]
+                function = tc.get("function") or {}
+                if function.get("name"):
+                    entry["function"]["name"] += function["name"]
+                if function.get("arguments"):
+                    entry["function"]["arguments"] += function["arguments"]
+
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+                completed.extend(self._complete_before(None))
+        return completed
+
+    def _complete_before(self, index: Optional[int]) -> List[Dict[str, Any]]:
+        done = []
+        for i in sorted(self._tool_calls):
+            if (index is None or i < index) and i not in self._completed:
+                self._completed.add(i)
+                done.append(self._tool_calls[i])
+        return done
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """ストリーム終了時に未確定のTool呼び出しを確定させる"""
+        return self._complete_before(None)
+
+    def to_response(self) -> Dict[str, Any]:
+        """確定済みのTool呼び出しだけを含む非ストリーミング形式のレスポンス"""
+        tool_calls = [self._tool_calls[i] for i in sorted(self._completed)]
+        message: Dict[str, Any] = {"role": "assistant", "content": self.content or None}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return {
+            "choices": [{"message": message, "finish_reason": self.finish_reason}],
+            "usage": self.usage,
+        }
+
+
+# =============================================================================
+# Anthropic
+# =============================================================================
+
+class AnthropicStreamAssembler:
+    """
+    Messages API のストリーミングイベントを非ストリーミング形式に組み立てる
+
+    tool_use ブロックは content_block_stop で引数JSONが揃い、確定とみなす。
+    """
+
+    def __init__(self):
+        self.last_text_delta = ""
+        self._blocks: Dict[int, Dict[str, Any]] = {}
+        self._partial_json: Dict[int, str] = {}
+        self._completed_tools: List[int] = []
+        self.usage: Dict[str, Any] = {}
+        self.stop_reason: Optional[str] = None
+
+    def feed(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """イベントを取り込み、今回確定した tool_use ブロックを返す"""
+        self.last_text_delta = ""
+        event_type = event.get("type", "")
+
+        if event_type == "message_start":
+            self.usage.update((event.get("message") or {}).get("usage") or {})
+
+        elif event_type == "content_block_start":
+            index = event.get("index", 0)
+            block = dict(event.get("content_block") or {})
+            if block.get("type") == "text":
+                block.setdefault("text", "")
+            elif block.get("type") == "tool_use":
+                block["input"] = {}
+                self._partial_json[index] = ""
+            self._blocks[index] = block
+
+        elif event_type == "content_block_delta":
+            index = event.get("index", 0)
+            delta = event.get("delta") or {}
+            block = self._blocks.get(index)
+            if block is None:
+                return []
+            if delta.get("type") == "text_delta":
+                text = delta.get("text", "")
+                block["text"] = block.get("text", "") + text
+                self.last_text_delta += text
+            elif delta.get("type") == "input_json_delta":
+                self._partial_json[index] = self._partial_json.get(index, "") + delta.get("partial_json", "")
+
+        elif event_type == "content_block_stop":
+            index = event.get("index", 0)
+            block = self._blocks.get(index)
+            if block is not None and block.get("type") == "tool_use":
+                raw = self._partial_json.pop(index, "")
+                try:
+                    block["input"] = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    logger.warning("Failed to parse streamed tool input")
+                    block["input"] = {}
+                self._completed_tools.append(index)
+                return [block]
+
+        elif event_type == "message_delta":
+            self.usage.update(event.get("usage") or {})
+            self.stop_reason = (event.get("delta") or {}).get("stop_reason") or self.stop_reason
+
+        return []
+
+    def finish(self) -> List[Dict[str, Any]]:
+        # content_block_stop が届かなかった tool_use は引数が不完全なため確定させない
+        return []
+
+    def to_response(self) -> Dict[str, Any]:
+        """確定済みの tool_use とテキストブロックを含む非ストリーミング形式のレスポンス"""
+        content = [
+            self._blocks[i] for i in sorted(self._blocks)
+            if self._blocks[i].get("type") == "text" or i in self._completed_tools
+        ]
+        return {"content": content, "usage": self.usage, "stop_reason": self.stop_reason}
@@ -0,0 +1,279 @@
+"""
+日次/月次の利用額カウンタ
+
+v11.3.0: CostManager.check_cost() は全てのAI呼び出しの直前に
+ai_usage_logs を `DATE(created_at) = :today` で SUM していた。
+DATE() でインデックス (organization_id, created_at) が使えず、
+ログが増えるほど呼び出しごとの待ち時間が伸びていた。
+
+【仕組み】
+- ai_spend_counters: 組織×期間（JSTの日・月）の累計額（USD）
+  UsageLogger.log_usage() がログのINSERT直後に別の文で加算する（失敗はログのみ、再集計で補正）
+- SpendCounterCache: プロセス内に組織ごとの日次/月次累計を保持する
+  - SPEND_COUNTER_TTL_SECONDS 以内は DB を読まない（他インスタンスの利用分はTTLで反映）
+  - 自プロセスの利用分は record() で即時に加算する
+  - SPEND_RECONCILE_INTERVAL_SECONDS ごとに ai_usage_logs から範囲条件で再集計し、
+    カウンタを上書きする（取りこぼし・手動修正の補正）
+  - 日付・月が変わったら読み直す
+
+check_cost() の予算判定は、ほとんどの呼び出しでメモリ参照だけになる。
+
+Created: 2026-10-16
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+JST = timezone(timedelta(hours=9))
+
+# =============================================================================
+# 設定
+# =============================================================================
+
+# DBのカウンタを読み直す間隔（秒）
+SPEND_COUNTER_TTL_SECONDS = float(os.getenv("SPEND_COUNTER_TTL_SECONDS", "30"))
+# ai_usage_logs との突き合わせ間隔（秒）
+SPEND_RECONCILE_INTERVAL_SECONDS = float(os.getenv("SPEND_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+
+
+# =============================================================================
+# クエリ
+# =============================================================================
+
+SELECT_SPEND_COUNTERS_SQL = text("""
+    SELECT period, cost_usd
+    FROM ai_spend_counters
+    WHERE organization_id = CAST(:org_id AS uuid)
+      AND ((period = 'day' AND period_start = :day_start)
+        OR (period = 'month' AND period_start = :month_start))
+""")
+
+# ai_usage_logs から範囲条件（インデックス利用可）で再集計し、カウンタを上書きする
+RECONCILE_SPEND_COUNTERS_SQL = text("""
+    WITH totals AS (
+        SELECT
+            COALESCE(SUM(cost_usd) FILTER (WHERE created_at >= :day_from), 0) AS day_cost,
+            COUNT(*) FILTER (WHERE created_at >= :day_from) AS day_count,
+            COALESCE(SUM(cost_usd), 0) AS month_cost,
+            COUNT(*) AS month_count
+        FROM ai_usage_logs
+        WHERE organization_id = CAST(:org_id AS uuid)
+          AND created_at >= :month_from
+          AND created_at < :until
+          AND is_error IS NOT TRUE
+    )
+    INSERT INTO ai_spend_counters (
+        organization_id, period, period_start, cost_usd, request_count, reconciled_at
+    )
+    SELECT CAST(:org_id AS uuid), p.period, p.period_start, p.cost_usd, p.request_count, NOW()
+    FROM totals
+    CROSS JOIN LATERAL (VALUES
+        ('day', CAST(:day_start AS date), totals.day_cost, totals.day_count),
+        ('month', CAST(:month_start AS date), totals.month_cost, totals.month_count)
+    ) AS p(period, period_start, cost_usd, request_count)
+    ON CONFLICT (organization_id, period, period_start) DO UPDATE SET
+        cost_usd = EXCLUDED.cost_usd,
+        request_count = EXCLUDED.request_count,
+        reconciled_at = NOW(),
+        updated_at = NOW()
+    RETURNING period, cost_usd
+""")
+
+
+# =============================================================================
+# データモデル
+# =============================================================================
+
+@dataclass
+class SpendSnapshot:
+    """組織の日次/月次累計（USD）"""
+    day_start: date
+    month_start: date
+    daily_cost_usd: Decimal
+    monthly_cost_usd: Decimal
+    loaded_at: float
+    reconciled_at: float
+
+
+def jst_periods(now: Optional[datetime] = None) -> Tuple[date, date]:
+    """JSTの当日・当月の開始日"""
+    today = (now or datetime.now(JST)).astimezone(JST).date()
+    return today, today.replace(day=1)
+
+
+def _next_month(month_start: date) -> date:
+    return (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _to_jst_datetime(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=JST)
+
+
+# =============================================================================
+# キャッシュ
+# =============================================================================
+
+class SpendCounterCache:
+    """
+    組織ID → SpendSnapshot のプロセス内キャッシュ
+
+    CostManager / UsageLogger はインスタンスが別でも同じキャッシュを共有する。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SPEND_COUNTER_TTL_SECONDS,
+        reconcile_interval_seconds: float = SPEND_RECONCILE_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._clock = clock
+        self._snapshots: Dict[str, SpendSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        pool: Engine,
+        organization_id: str,
+        now: Optional[datetime] = None,
+    ) -> SpendSnapshot:
+        """
+        日次/月次累計を取得（必要な場合だけDBを読む）
+
+        DBエラー時は手元の値（なければ0）を返す。
+        """
+        day_start, month_start = jst_periods(now)
+        tick = self._clock()
+        snapshot = self._snapshots.get(organization_id)
+
+        if (
+            snapshot is not None
+            and snapshot.day_start == day_start
+            and snapshot.month_start == month_start
+            and tick - snapshot.loaded_at < self.ttl_seconds
+        ):
+            return snapshot
+
+        reconcile = (
+            snapshot is None
+            or snapshot.month_start != month_start
+            or tick - snapshot.reconciled_at >= self.reconcile_interval_seconds
+        )
+        try:
+            if reconcile:
+                costs = self._reconcile(pool, organization_id, day_start, month_start)
+            else:
+                costs = self._load(pool, organization_id, day_start, month_start)
+        except Exception as e:
+            logger.error(f"Failed to load spend counters: {type(e).__name__}")
+            if snapshot is not None and snapshot.day_start == day_start:
+                return snapshot
+            return SpendSnapshot(
+                day_start=day_start,
+                month_start=month_start,
+                daily_cost_usd=Decimal("0"),
+                monthly_cost_usd=Decimal("0"),
+                loaded_at=tick,
+                reconciled_at=tick,
+            )
+
+        snapshot = SpendSnapshot(
+            day_start=day_start,
+            month_start=month_start,
+            daily_cost_usd=costs.get(PERIOD_DAY, Decimal("0")),
+            monthly_cost_usd=costs.get(PERIOD_MONTH, Decimal("0")),
+            loaded_at=tick,
+            reconciled_at=tick if reconcile else snapshot.reconciled_at,
+        )
+        with self._lock:
+            self._snapshots[organization_id] = snapshot
+        return snapshot
+
+    def record(
+        self,
+        organization_id: str,
+        cost_usd: Decimal,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        自プロセスの利用額を即時に加算する
+
+        DBのカウンタは log_usage() の文で加算済みのため、次の読み直しで置き換わる。
+        """
+        if not cost_usd:
+            return
+        cost_usd = Decimal(str(cost_usd))
+        day_start, month_start = jst_periods(now)
+        with self._lock:
+            snapshot = self._snapshots.get(organization_id)
+            if snapshot is None or snapshot.month_start != month_start:
+                return
+            if snapshot.day_start == day_start:
+                snapshot.daily_cost_usd += cost_usd
+            snapshot.monthly_cost_usd += cost_usd
+
+    def invalidate(self, organization_id: Optional[str] = None) -> None:
+        with self._lock:
+            if organization_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(organization_id, None)
+
+    def _load(
+        self,
+        pool: Engine,
+        organization_id: str,
+        day_start: date,
+        month_start: date,
+    ) -> Dict[str, Decimal]:
+        with pool.connect() as conn:
+            result = conn.execute(SELECT_SPEND_COUNTERS_SQL, {
+                "org_id": organization_id,
+                "day_start": day_start,
+                "month_start": month_start,
+            })
+            return {row[0]: Decimal(str(row[1] or 0)) for row in result.fetchall()}
+
+    def _reconcile(
+        self,
+        pool: Engine,
+        organization_id: str,
+        day_start: date,
+        month_start: date,
+    ) -> Dict[str, Decimal]:
+        # 集計と上書きの間に別プロセスが加算した分は、次回の突き合わせで補正される
+        with pool.connect() as conn:
+            result = conn.execute(RECONCILE_SPEND_COUNTERS_SQL, {
+                "org_id": organization_id,
+                "day_start": day_start,
+                "month_start": month_start,
+                "day_from": _to_jst_datetime(day_start),
+                "month_from": _to_jst_datetime(month_start),
+                "until": _to_jst_datetime(_next_month(month_start)),
+            })
+            costs = {row[0]: Decimal(str(row[1] or 0)) for row in result.fetchall()}
+            conn.commit()
+        return costs
+
+
+_spend_counters = SpendCounterCache()
+
+
+def get_spend_counter_cache() -> SpendCounterCache:
+    """プロセス共通のカウンタキャッシュ"""
+    return _spend_counters
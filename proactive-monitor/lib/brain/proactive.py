@@ -15,6 +15,12 @@ Phase 2: 能動的モニタリング（Proactive Monitoring）
 
 【実行タイミング】
 Cloud Schedulerから毎時実行（本番環境）
+
+【一括評価】v11.3.0
+check_and_act() はトリガー種別ごとに組織単位の集合クエリを1回だけ実行し、
+発火したユーザーだけを返す。クールダウンも組織単位でまとめて読み込み、
+アクションは PROACTIVE_ACTION_CONCURRENCY 件まで並行して実行する。
+（従来は ユーザー数 × トリガー数 のクエリを発行していた）
 """
 
 import asyncio
@@ -22,7 +28,7 @@ from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List, Dict, Any, Callable, Awaitable
+from typing import Optional, List, Dict, Any, Callable, Awaitable, Set, Tuple
 from uuid import UUID
 from lib.brain.constants import JST
 import logging
@@ -81,6 +87,12 @@ TASK_OVERLOAD_COUNT = 5          # タスク山積みとみなす件数
 EMOTION_DECLINE_DAYS = 3         # ネガティブ継続日数
 QUESTION_UNANSWERED_HOURS = 24   # 質問放置時間
 LONG_ABSENCE_DAYS = 14           # 長期不在とみなす日数
+EMOTION_DECLINE_MIN_SAMPLES = 3  # 感情変化の判定に必要な最低件数
+EMOTION_DECLINE_THRESHOLD = -0.3  # ネガティブ傾向とみなす平均スコア
+TASK_COMPLETED_STREAK_COUNT = 3  # 称賛する24時間の完了件数
+
+# 一括評価後のアクション（脳でのメッセージ生成・送信）の同時実行数
+PROACTIVE_ACTION_CONCURRENCY = 5
 
 # メッセージクールダウン（同じトリガーで再度メッセージを送るまでの時間）
 MESSAGE_COOLDOWN_HOURS = {
@@ -230,6 +242,41 @@ class CheckResult:
     checked_at: datetime = field(default_factory=lambda: datetime.now(JST))
 
 
+@dataclass
+class OrgTriggerSnapshot:
+    """組織単位で一括評価したトリガーとクールダウン"""
+    organization_id: str
+    triggers: Dict[str, List[Trigger]] = field(default_factory=dict)  # user_id → 発火トリガー
+    cooldowns: Set[Tuple[str, str]] = field(default_factory=set)  # (user_id, trigger_type)
+
+    def triggers_for(self, user_id: str) -> List[Trigger]:
+        return self.triggers.get(user_id, [])
+
+    def in_cooldown(self, user_id: str, trigger_type: TriggerType) -> bool:
+        return (user_id, trigger_type.value) in self.cooldowns
+
+
+# ============================================================
+# 一括評価クエリ
+# ============================================================
+
+# 組織内のクールダウン中 (user_id, trigger_type) をまとめて取得する
+# 種別ごとのクールダウン時間は :since_<trigger_type> で渡す
+_COOLDOWN_CONDITIONS = "\n                   OR ".join(
+    f"(trigger_type = '{trigger_type.value}' "
+    f"AND sent_at >= :since_{trigger_type.value} AT TIME ZONE 'Asia/Tokyo')"
+    for trigger_type in MESSAGE_COOLDOWN_HOURS
+)
+
+BULK_COOLDOWN_SQL = text(f"""
+    SELECT DISTINCT user_id, trigger_type
+    FROM brain_proactive_actions
+    WHERE organization_id = :org_id
+      AND sent_at >= :since_min AT TIME ZONE 'Asia/Tokyo'
+      AND ({_COOLDOWN_CONDITIONS})
+""")
+
+
 # ============================================================
 # メインクラス
 # ============================================================
@@ -283,6 +330,17 @@ class ProactiveMonitor:
             TriggerType.LONG_ABSENCE: self._check_long_absence,
         }
 
+        # v11.3.0: 組織単位の一括チェッカー（check_and_act で使用）
+        # 質問放置は未実装のため対象外
+        self._bulk_trigger_checkers: Dict[TriggerType, Callable] = {
+            TriggerType.GOAL_ABANDONED: self._bulk_check_goal_abandoned,
+            TriggerType.TASK_OVERLOAD: self._bulk_check_task_overload,
+            TriggerType.EMOTION_DECLINE: self._bulk_check_emotion_decline,
+            TriggerType.GOAL_ACHIEVED: self._bulk_check_goal_achieved,
+            TriggerType.TASK_COMPLETED_STREAK: self._bulk_check_task_completed_streak,
+            TriggerType.LONG_ABSENCE: self._bulk_check_long_absence,
+        }
+
     @asynccontextmanager
     async def _connect_with_org_context(self, organization_id: str):
         """
@@ -417,30 +475,46 @@ class ProactiveMonitor:
             users = await self._get_active_users(organization_id)
             logger.info(f"[Proactive] Checking {len(users)} users")
 
+            # v11.3.0: トリガーは組織単位で一括評価する
+            users_by_org: Dict[str, List[UserContext]] = {}
             for user_ctx in users:
-                try:
-                    result = await self._check_single_user(user_ctx)
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"[Proactive] Error checking user {user_ctx.user_id}: {type(e).__name__}")
-                    results.append(CheckResult(
-                        user_id=user_ctx.user_id,
-                        triggers_found=[],
-                        actions_taken=[ProactiveAction(
-                            message=ProactiveMessage(
-                                trigger=Trigger(
-                                    trigger_type=TriggerType.GOAL_ABANDONED,
-                                    user_id=user_ctx.user_id,
-                                    organization_id=user_ctx.organization_id,
-                                    priority=ActionPriority.LOW,
+                users_by_org.setdefault(user_ctx.organization_id, []).append(user_ctx)
+
+            snapshots: Dict[str, OrgTriggerSnapshot] = {}
+            for org_id, org_users in users_by_org.items():
+                snapshots[org_id] = await self._evaluate_org_triggers(org_id, org_users)
+
+            # 発火したユーザーのアクションだけが並行実行の対象になる
+            semaphore = asyncio.Semaphore(PROACTIVE_ACTION_CONCURRENCY)
+
+            async def _check(user_ctx: UserContext) -> CheckResult:
+                async with semaphore:
+                    try:
+                        return await self._check_single_user(
+                            user_ctx, snapshots.get(user_ctx.organization_id),
+                        )
+                    except Exception as e:
+                        logger.error(f"[Proactive] Error checking user {user_ctx.user_id}: {type(e).__name__}")
+                        return CheckResult(
+                            user_id=user_ctx.user_id,
+                            triggers_found=[],
+                            actions_taken=[ProactiveAction(
+                                message=ProactiveMessage(
+                                    trigger=Trigger(
+                                        trigger_type=TriggerType.GOAL_ABANDONED,
+                                        user_id=user_ctx.user_id,
+                                        organization_id=user_ctx.organization_id,
+                                        priority=ActionPriority.LOW,
+                                    ),
+                                    message_type=ProactiveMessageType.CHECK_IN,
+                                    message="",
                                 ),
-                                message_type=ProactiveMessageType.CHECK_IN,
-                                message="",
-                            ),
-                            success=False,
-                            error_message=type(e).__name__,
-                        )],
-                    ))
+                                success=False,
+                                error_message=type(e).__name__,
+                            )],
+                        )
+
+            results = list(await asyncio.gather(*(_check(user_ctx) for user_ctx in users)))
 
             # 統計ログ
             total_triggers = sum(len(r.triggers_found) for r in results)
@@ -473,35 +547,66 @@ class ProactiveMonitor:
 
         return await self._check_single_user(user_ctx)
 
-    async def _check_single_user(self, user_ctx: UserContext) -> CheckResult:
-        """単一ユーザーのチェックと対応"""
+    async def _check_single_user(
+        self,
+        user_ctx: UserContext,
+        snapshot: Optional[OrgTriggerSnapshot] = None,
+    ) -> CheckResult:
+        """
+        単一ユーザーのチェックと対応
+
+        Args:
+            user_ctx: ユーザーコンテキスト
+            snapshot: 組織単位の一括評価結果（省略時はトリガーごとにDBを確認）
+        """
         result = CheckResult(user_id=user_ctx.user_id)
 
+        if snapshot is not None:
+            for trigger in snapshot.triggers_for(user_ctx.user_id):
+                try:
+                    await self._process_trigger(
+                        result, trigger, user_ctx,
+                        snapshot.in_cooldown(user_ctx.user_id, trigger.trigger_type),
+                    )
+                except Exception as e:
+                    logger.warning(f"[Proactive] Error handling {trigger.trigger_type.value}: {type(e).__name__}")
+            return result
+
         # 全トリガーをチェック
         for trigger_type, checker in self._trigger_checkers.items():
             try:
                 trigger = await checker(user_ctx)
                 if trigger:
-                    # クールダウンチェック
-                    if await self._is_in_cooldown(user_ctx, trigger_type):
-                        result.skipped_triggers.append({
-                            "trigger_type": trigger_type.value,
-                            "reason": "cooldown",
-                        })
-                        continue
-
-                    result.triggers_found.append(trigger)
-
-                    # アクション実行
-                    if self._should_act(trigger, user_ctx):
-                        action = await self._take_action(trigger, user_ctx)
-                        result.actions_taken.append(action)
+                    in_cooldown = await self._is_in_cooldown(user_ctx, trigger_type)
+                    await self._process_trigger(result, trigger, user_ctx, in_cooldown)
 
             except Exception as e:
                 logger.warning(f"[Proactive] Error checking {trigger_type.value}: {type(e).__name__}")
 
         return result
 
+    async def _process_trigger(
+        self,
+        result: CheckResult,
+        trigger: Trigger,
+        user_ctx: UserContext,
+        in_cooldown: bool,
+    ) -> None:
+        """発火したトリガーを結果に記録し、必要ならアクションを実行"""
+        if in_cooldown:
+            result.skipped_triggers.append({
+                "trigger_type": trigger.trigger_type.value,
+                "reason": "cooldown",
+            })
+            return
+
+        result.triggers_found.append(trigger)
+
+        # アクション実行
+        if self._should_act(trigger, user_ctx):
+            action = await self._take_action(trigger, user_ctx)
+            result.actions_taken.append(action)
+
     # --------------------------------------------------------
     # トリガーチェッカー
     # --------------------------------------------------------
@@ -653,9 +758,9 @@ class ProactiveMonitor:
 
             rows = await asyncio.to_thread(_sync)
 
-            if len(rows) >= 3:  # 最低3件のデータが必要
+            if len(rows) >= EMOTION_DECLINE_MIN_SAMPLES:  # 最低3件のデータが必要
                 avg_score = sum(r.sentiment_score for r in rows) / len(rows)
-                if avg_score < -0.3:  # ネガティブ傾向
+                if avg_score < EMOTION_DECLINE_THRESHOLD:  # ネガティブ傾向
                     return Trigger(
                         trigger_type=TriggerType.EMOTION_DECLINE,
                         user_id=user_ctx.user_id,
@@ -772,7 +877,7 @@ class ProactiveMonitor:
 
             row = await asyncio.to_thread(_sync)
 
-            if row and row.count >= 3:  # 3件以上完了で称賛
+            if row and row.count >= TASK_COMPLETED_STREAK_COUNT:  # 3件以上完了で称賛
                 return Trigger(
                     trigger_type=TriggerType.TASK_COMPLETED_STREAK,
                     user_id=user_ctx.user_id,
@@ -808,6 +913,379 @@ class ProactiveMonitor:
 
         return None
 
+    # --------------------------------------------------------
+    # 一括トリガーチェッカー（v11.3.0: 組織単位の集合クエリ）
+    # --------------------------------------------------------
+
+    async def _evaluate_org_triggers(
+        self,
+        organization_id: str,
+        users: List[UserContext],
+    ) -> OrgTriggerSnapshot:
+        """
+        組織内の全ユーザーについてトリガーを一括評価する
+
+        トリガー種別ごとに1クエリで発火ユーザーを取得し、
+        発火があればクールダウンをまとめて読み込む。
+        """
+        snapshot = OrgTriggerSnapshot(organization_id=organization_id)
+        if not users:
+            return snapshot
+
+        checkers = list(self._bulk_trigger_checkers.items())
+        outcomes = await asyncio.gather(
+            *(checker(organization_id, users) for _, checker in checkers),
+            return_exceptions=True,
+        )
+
+        found: Dict[str, Dict[TriggerType, Trigger]] = {}
+        for (trigger_type, _), outcome in zip(checkers, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"[Proactive] Bulk {trigger_type.value} check failed: {type(outcome).__name__}")
+                continue
+            for trigger in outcome:
+                found.setdefault(trigger.user_id, {})[trigger_type] = trigger
+
+        # ユーザーごとのトリガー順は個別チェック（_trigger_checkers）と同じにする
+        order = list(self._trigger_checkers)
+        snapshot.triggers = {
+            user_id: [by_type[t] for t in order if t in by_type]
+            for user_id, by_type in found.items()
+        }
+
+        if snapshot.triggers:
+            snapshot.cooldowns = await self._load_cooldowns(organization_id)
+
+        logger.info(
+            f"[Proactive] Org {(organization_id or '')[:8]}...: "
+            f"{len(snapshot.triggers)}/{len(users)} users triggered"
+        )
+        return snapshot
+
+    def _users_by_account_id(self, users: List[UserContext]) -> Dict[int, List[UserContext]]:
+        """chatwork_tasks.assigned_to_account_id（BIGINT）→ ユーザー"""
+        mapping: Dict[int, List[UserContext]] = {}
+        for user_ctx in users:
+            account_id_int = self._get_chatwork_account_id_int(user_ctx.chatwork_account_id)
+            if account_id_int is not None:
+                mapping.setdefault(account_id_int, []).append(user_ctx)
+        return mapping
+
+    async def _bulk_check_goal_abandoned(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """目標放置の一括チェック（ユーザーごとに最も古い放置目標）"""
+        if not self._pool or not self._is_valid_uuid(organization_id):
+            return []
+
+        user_ids = {user_ctx.user_id for user_ctx in users}
+
+        try:
+            query = text("""
+                SELECT DISTINCT ON (user_id) user_id, id, title, updated_at
+                FROM goals
+                WHERE organization_id = CAST(:org_id AS uuid)
+                  AND status = 'active'
+                  AND (deadline IS NULL OR deadline >= CURRENT_DATE)
+                  AND (period_end IS NULL OR period_end >= CURRENT_DATE)
+                  AND updated_at < :threshold AT TIME ZONE 'Asia/Tokyo'
+                ORDER BY user_id, updated_at ASC
+            """)
+
+            threshold = datetime.now(JST) - timedelta(days=GOAL_ABANDONED_DAYS)
+
+            def _sync():
+                with self._pool.connect() as conn:
+                    result = conn.execute(query, {
+                        "org_id": organization_id,
+                        "threshold": threshold,
+                    })
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+
+            now = datetime.now(JST)
+            return [
+                Trigger(
+                    trigger_type=TriggerType.GOAL_ABANDONED,
+                    user_id=str(row.user_id),
+                    organization_id=organization_id,
+                    priority=TRIGGER_PRIORITY[TriggerType.GOAL_ABANDONED],
+                    details={
+                        "goal_id": str(row.id),
+                        "goal_name": row.title[:50] if row.title else "",
+                        "days_since_update": (now - row.updated_at).days,
+                    },
+                )
+                for row in rows
+                if str(row.user_id) in user_ids
+            ]
+
+        except Exception as e:
+            logger.warning(f"[Proactive] Bulk goal abandoned check failed: {type(e).__name__}")
+
+        return []
+
+    async def _bulk_check_task_overload(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """タスク山積みの一括チェック（担当者ごとの未完了件数）"""
+        if not self._pool:
+            return []
+
+        users_by_account = self._users_by_account_id(users)
+        if not users_by_account:
+            return []
+
+        try:
+            chatwork_org_id = self._get_chatwork_tasks_org_id(organization_id)
+
+            query = text("""
+                SELECT assigned_to_account_id AS account_id,
+                       COUNT(*) as total_count,
+                       COUNT(CASE WHEN limit_time IS NOT NULL AND limit_time < EXTRACT(EPOCH FROM CURRENT_TIMESTAMP)::bigint THEN 1 END) as overdue_count
+                FROM chatwork_tasks
+                WHERE organization_id = :org_id
+                  AND status = 'open'
+                  AND assigned_to_account_id IS NOT NULL
+                GROUP BY assigned_to_account_id
+                HAVING COUNT(*) >= :min_count
+            """)
+
+            def _sync():
+                with self._pool.connect() as conn:
+                    result = conn.execute(query, {
+                        "org_id": chatwork_org_id,
+                        "min_count": TASK_OVERLOAD_COUNT,
+                    })
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+
+            return [
+                Trigger(
+                    trigger_type=TriggerType.TASK_OVERLOAD,
+                    user_id=user_ctx.user_id,
+                    organization_id=organization_id,
+                    priority=TRIGGER_PRIORITY[TriggerType.TASK_OVERLOAD],
+                    details={
+                        "count": row.total_count,
+                        "overdue_count": row.overdue_count or 0,
+                    },
+                )
+                for row in rows
+                for user_ctx in users_by_account.get(row.account_id, [])
+            ]
+
+        except Exception as e:
+            logger.warning(f"[Proactive] Bulk task overload check failed: {type(e).__name__}")
+
+        return []
+
+    async def _bulk_check_emotion_decline(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """感情変化の一括チェック（直近N日の平均スコアをDB側で集計）"""
+        if not self._pool or not self._is_valid_uuid(organization_id):
+            return []
+
+        user_ids = {user_ctx.user_id for user_ctx in users}
+
+        try:
+            query = text("""
+                SELECT user_id,
+                       AVG(sentiment_score) AS avg_score,
+                       COUNT(*) AS sample_count
+                FROM emotion_scores
+                WHERE organization_id = CAST(:org_id AS uuid)
+                  AND message_time >= :threshold AT TIME ZONE 'Asia/Tokyo'
+                GROUP BY user_id
+                HAVING COUNT(*) >= :min_samples
+                   AND AVG(sentiment_score) < :max_avg_score
+            """)
+
+            threshold = datetime.now(JST) - timedelta(days=EMOTION_DECLINE_DAYS)
+
+            def _sync():
+                with self._pool.connect() as conn:
+                    result = conn.execute(query, {
+                        "org_id": organization_id,
+                        "threshold": threshold,
+                        "min_samples": EMOTION_DECLINE_MIN_SAMPLES,
+                        "max_avg_score": EMOTION_DECLINE_THRESHOLD,
+                    })
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+
+            return [
+                Trigger(
+                    trigger_type=TriggerType.EMOTION_DECLINE,
+                    user_id=str(row.user_id),
+                    organization_id=organization_id,
+                    priority=TRIGGER_PRIORITY[TriggerType.EMOTION_DECLINE],
+                    details={
+                        "avg_sentiment_score": round(float(row.avg_score), 2),
+                        "sample_count": row.sample_count,
+                    },
+                )
+                for row in rows
+                if str(row.user_id) in user_ids
+            ]
+
+        except Exception as e:
+            logger.warning(f"[Proactive] Bulk emotion decline check failed: {type(e).__name__}")
+
+        return []
+
+    async def _bulk_check_goal_achieved(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """目標達成の一括チェック（ユーザーごとに直近24時間で最新の達成目標）"""
+        if not self._pool or not self._is_valid_uuid(organization_id):
+            return []
+
+        user_ids = {user_ctx.user_id for user_ctx in users}
+
+        try:
+            query = text("""
+                SELECT DISTINCT ON (user_id) user_id, id, title, updated_at
+                FROM goals
+                WHERE organization_id = CAST(:org_id AS uuid)
+                  AND status = 'completed'
+                  AND updated_at >= :threshold AT TIME ZONE 'Asia/Tokyo'
+                ORDER BY user_id, updated_at DESC
+            """)
+
+            threshold = datetime.now(JST) - timedelta(hours=24)
+
+            def _sync():
+                with self._pool.connect() as conn:
+                    result = conn.execute(query, {
+                        "org_id": organization_id,
+                        "threshold": threshold,
+                    })
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+
+            return [
+                Trigger(
+                    trigger_type=TriggerType.GOAL_ACHIEVED,
+                    user_id=str(row.user_id),
+                    organization_id=organization_id,
+                    priority=TRIGGER_PRIORITY[TriggerType.GOAL_ACHIEVED],
+                    details={
+                        "goal_id": str(row.id),
+                        "goal_name": row.title[:50] if row.title else "",
+                    },
+                )
+                for row in rows
+                if str(row.user_id) in user_ids
+            ]
+
+        except Exception as e:
+            logger.warning(f"[Proactive] Bulk goal achieved check failed: {type(e).__name__}")
+
+        return []
+
+    async def _bulk_check_task_completed_streak(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """タスク連続完了の一括チェック（担当者ごとの24時間の完了件数）"""
+        if not self._pool:
+            return []
+
+        users_by_account = self._users_by_account_id(users)
+        if not users_by_account:
+            return []
+
+        try:
+            chatwork_org_id = self._get_chatwork_tasks_org_id(organization_id)
+
+            query = text("""
+                SELECT assigned_to_account_id AS account_id, COUNT(*) as count
+                FROM chatwork_tasks
+                WHERE organization_id = :org_id
+                  AND status = 'done'
+                  AND assigned_to_account_id IS NOT NULL
+                  AND updated_at >= :threshold AT TIME ZONE 'Asia/Tokyo'
+                GROUP BY assigned_to_account_id
+                HAVING COUNT(*) >= :min_count
+            """)
+
+            threshold = datetime.now(JST) - timedelta(hours=24)
+
+            def _sync():
+                with self._pool.connect() as conn:
+                    result = conn.execute(query, {
+                        "org_id": chatwork_org_id,
+                        "threshold": threshold,
+                        "min_count": TASK_COMPLETED_STREAK_COUNT,
+                    })
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+
+            return [
+                Trigger(
+                    trigger_type=TriggerType.TASK_COMPLETED_STREAK,
+                    user_id=user_ctx.user_id,
+                    organization_id=organization_id,
+                    priority=TRIGGER_PRIORITY[TriggerType.TASK_COMPLETED_STREAK],
+                    details={
+                        "count": row.count,
+                    },
+                )
+                for row in rows
+                for user_ctx in users_by_account.get(row.account_id, [])
+            ]
+
+        except Exception as e:
+            logger.warning(f"[Proactive] Bulk task completed streak check failed: {type(e).__name__}")
+
+        return []
+
+    async def _bulk_check_long_absence(
+        self, organization_id: str, users: List[UserContext],
+    ) -> List[Trigger]:
+        """長期不在の一括チェック（取得済みの last_activity_at で判定、DB不要）"""
+        triggers = []
+        for user_ctx in users:
+            trigger = await self._check_long_absence(user_ctx)
+            if trigger:
+                triggers.append(trigger)
+        return triggers
+
+    async def _load_cooldowns(self, organization_id: str) -> Set[Tuple[str, str]]:
+        """
+        組織内でクールダウン中の (user_id, trigger_type) をまとめて取得
+
+        失敗時は個別チェックと同じく「クールダウンなし」として扱う。
+        """
+        if not self._pool:
+            return set()
+
+        try:
+            now = datetime.now(JST)
+            params: Dict[str, Any] = {"org_id": organization_id}
+            for trigger_type, hours in MESSAGE_COOLDOWN_HOURS.items():
+                params[f"since_{trigger_type.value}"] = now - timedelta(hours=hours)
+            params["since_min"] = now - timedelta(hours=max(MESSAGE_COOLDOWN_HOURS.values()))
+
+            # brain_*テーブルアクセス: RLSコンテキスト設定（sync版でスレッド安全）
+            def _sync():
+                with self._connect_with_org_context_sync(organization_id) as conn:
+                    result = conn.execute(BULK_COOLDOWN_SQL, params)
+                    return result.fetchall()
+
+            rows = await asyncio.to_thread(_sync)
+            return {(str(row.user_id), row.trigger_type) for row in rows}
+
+        except Exception as e:
+            logger.debug(f"[Proactive] Bulk cooldown check failed (continuing): {type(e).__name__}")
+            return set()
+
     # --------------------------------------------------------
     # アクション実行
     # --------------------------------------------------------
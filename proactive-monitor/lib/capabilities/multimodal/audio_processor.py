@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 from uuid import uuid4
+import asyncio
 import logging
 import os
 import io
@@ -33,6 +34,10 @@ from .constants import (
     MAX_AUDIO_DURATION_SECONDS,
     MAX_AUDIO_DURATION_MINUTES,
     AUDIO_CHUNK_DURATION_SECONDS,
+    MAX_SEGMENTED_AUDIO_SIZE_BYTES,
+    AUDIO_TRANSCRIBE_CONCURRENCY,
+    AUDIO_SEGMENT_MAX_RETRIES,
+    AUDIO_SEGMENT_RETRY_BACKOFF_SECONDS,
     WHISPER_API_TIMEOUT_SECONDS,
     AUDIO_PROCESSING_TIMEOUT_SECONDS,
     DEFAULT_WHISPER_MODEL,
@@ -69,6 +74,14 @@ from .models import (
     AudioAnalysisResult,
 )
 from .base import BaseMultimodalProcessor
+from .audio_segmenter import (
+    AudioSegment,
+    SegmentTranscriptCache,
+    can_split,
+    get_segment_transcript_cache,
+    split_audio,
+    stitch_transcripts,
+)
 
 
 # =============================================================================
@@ -239,6 +252,8 @@ class AudioProcessor(BaseMultimodalProcessor):
         organization_id: str,
         api_key: Optional[str] = None,
         openai_api_key: Optional[str] = None,
+        transcribe_concurrency: int = AUDIO_TRANSCRIBE_CONCURRENCY,
+        segment_cache: Optional[SegmentTranscriptCache] = None,
     ):
         """
         初期化
@@ -248,6 +263,8 @@ class AudioProcessor(BaseMultimodalProcessor):
             organization_id: 組織ID
             api_key: OpenRouter API Key（要約生成用）
             openai_api_key: OpenAI API Key（Whisper用）
+            transcribe_concurrency: 長時間音声のチャンクを同時に文字起こしする数
+            segment_cache: チャンク文字起こし結果のキャッシュ（省略時はプロセス共通）
         """
         super().__init__(
             pool=pool,
@@ -257,6 +274,10 @@ class AudioProcessor(BaseMultimodalProcessor):
         )
         self._openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
         self._whisper_client = WhisperAPIClient(api_key=self._openai_api_key)
+        self._transcribe_concurrency = max(1, transcribe_concurrency)
+        self._segment_cache = (
+            segment_cache if segment_cache is not None else get_segment_transcript_cache()
+        )
 
     # =========================================================================
     # メイン処理
@@ -301,6 +322,7 @@ class AudioProcessor(BaseMultimodalProcessor):
                 audio_data=audio_data,
                 filename=self._get_filename(input_data),
                 language=input_data.language,
+                audio_format=audio_metadata.format,
             )
 
             # セグメント解析
@@ -456,12 +478,16 @@ class AudioProcessor(BaseMultimodalProcessor):
                 )
 
         # ファイルサイズチェック
+        # v11.3.0: 分割できる形式（WAV/MP3）はチャンクに分けて送るため上限を緩める
         if input_data.audio_data:
             size = len(input_data.audio_data)
-            if size > MAX_AUDIO_SIZE_BYTES:
+            max_size = MAX_AUDIO_SIZE_BYTES
+            if can_split(self._detect_audio_format(input_data.audio_data)):
+                max_size = MAX_SEGMENTED_AUDIO_SIZE_BYTES
+            if size > max_size:
                 raise FileTooLargeError(
                     actual_size_bytes=size,
-                    max_size_bytes=MAX_AUDIO_SIZE_BYTES,
+                    max_size_bytes=max_size,
                     input_type=InputType.AUDIO,
                 )
 
@@ -614,15 +640,124 @@ class AudioProcessor(BaseMultimodalProcessor):
         audio_data: bytes,
         filename: str,
         language: Optional[str] = None,
+        audio_format: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Whisper APIで文字起こし"""
-        return await self._whisper_client.transcribe(
-            audio_data=audio_data,
-            filename=filename,
-            language=language or DEFAULT_WHISPER_LANGUAGE,
-            response_format="verbose_json",
+        """
+        Whisper APIで文字起こし
+
+        v11.3.0: WAV/MP3 で AUDIO_CHUNK_DURATION_SECONDS を超える音声は
+        チャンクに分割して並行に文字起こしし、1件の結果に結合する。
+        分割できない形式・短い音声は従来どおり1リクエストで送る。
+        """
+        language = language or DEFAULT_WHISPER_LANGUAGE
+        audio_format = audio_format or self._detect_audio_format(audio_data)
+
+        segments = None
+        if can_split(audio_format):
+            segments = await asyncio.to_thread(split_audio, audio_data, audio_format)
+
+        if not segments or len(segments) == 1:
+            if len(audio_data) > MAX_AUDIO_SIZE_BYTES:
+                # 分割できなかった大きなファイルは API に送っても失敗する
+                raise FileTooLargeError(
+                    actual_size_bytes=len(audio_data),
+                    max_size_bytes=MAX_AUDIO_SIZE_BYTES,
+                    input_type=InputType.AUDIO,
+                )
+            return await self._whisper_client.transcribe(
+                audio_data=audio_data,
+                filename=filename,
+                language=language,
+                response_format="verbose_json",
+            )
+
+        results = await self._transcribe_segments(segments, language)
+        logger.info(
+            f"Chunked transcription completed: segments={len(segments)}, "
+            f"duration={segments[-1].end_seconds:.0f}s"
+        )
+        return stitch_transcripts(segments, results)
+
+    async def _transcribe_segments(
+        self,
+        segments: List[AudioSegment],
+        language: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        チャンクを並行に文字起こしする
+
+        成功したチャンクはその場でキャッシュに保存する。
+        失敗したチャンクが残った場合は AudioTranscriptionError を送出し、
+        同じ音声を再処理したときは失敗したチャンクだけを送り直す。
+        """
+        semaphore = asyncio.Semaphore(self._transcribe_concurrency)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(segments)
+        pending: List[Tuple[AudioSegment, str]] = []
+        for segment in segments:
+            key = SegmentTranscriptCache.key_for(
+                segment.data, language, self._whisper_client._model,
+            )
+            cached = self._segment_cache.get(key)
+            if cached is not None:
+                results[segment.index] = cached
+            else:
+                pending.append((segment, key))
+
+        async def run(segment: AudioSegment, key: str) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self._transcribe_segment(segment, language)
+            self._segment_cache.put(key, result)
+            return result
+
+        outcomes = await asyncio.gather(
+            *(run(segment, key) for segment, key in pending),
+            return_exceptions=True,
         )
 
+        failed = 0
+        for (segment, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                failed += 1
+                logger.warning(
+                    f"Segment transcription failed: index={segment.index}, "
+                    f"error={type(outcome).__name__}"
+                )
+            else:
+                results[segment.index] = outcome
+
+        if failed:
+            raise AudioTranscriptionError(
+                reason=f"{failed}/{len(segments)}チャンクの文字起こしに失敗"
+            )
+        return results
+
+    async def _transcribe_segment(
+        self,
+        segment: AudioSegment,
+        language: str,
+    ) -> Dict[str, Any]:
+        """
+        チャンク1件を文字起こし
+
+        レート制限・タイムアウトだけを待ってから再試行する。
+        それ以外（4xx等）は再送しても結果が変わらないため、そのまま送出する。
+        """
+        for attempt in range(AUDIO_SEGMENT_MAX_RETRIES + 1):
+            try:
+                return await self._whisper_client.transcribe(
+                    audio_data=segment.data,
+                    filename=segment.filename,
+                    language=language,
+                    response_format="verbose_json",
+                )
+            except (WhisperAPIRateLimitError, WhisperAPITimeoutError) as e:
+                if attempt >= AUDIO_SEGMENT_MAX_RETRIES:
+                    raise
+                delay = e.details.get("retry_after") or (
+                    AUDIO_SEGMENT_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+                )
+                await asyncio.sleep(delay)
+
     def _parse_segments(
         self,
         transcript_result: Dict[str, Any],
@@ -897,6 +1032,7 @@ def create_audio_processor(
     organization_id: str,
     api_key: Optional[str] = None,
     openai_api_key: Optional[str] = None,
+    transcribe_concurrency: int = AUDIO_TRANSCRIBE_CONCURRENCY,
 ) -> AudioProcessor:
     """
     AudioProcessorを作成
@@ -906,6 +1042,7 @@ def create_audio_processor(
         organization_id: 組織ID
         api_key: OpenRouter API Key（要約生成用）
         openai_api_key: OpenAI API Key（Whisper用）
+        transcribe_concurrency: 長時間音声のチャンクを同時に文字起こしする数
 
     Returns:
         AudioProcessor: 音声プロセッサー
@@ -915,4 +1052,5 @@ def create_audio_processor(
         organization_id=organization_id,
         api_key=api_key,
         openai_api_key=openai_api_key,
+        transcribe_concurrency=transcribe_concurrency,
     )
@@ -0,0 +1,434 @@
+# lib/capabilities/multimodal/audio_segmenter.py
+"""
+Phase M2: 音声入力能力 - 長時間音声の分割と結合
+
+v11.3.0: AudioProcessor は音声ファイル全体を1リクエストで Whisper API に送っていた。
+Whisper API の上限（25MB）を超える録音は処理できず、
+2時間の会議でも1本の直列リクエストを待つ必要があった。
+
+【仕組み】
+- WAV: PCMフレームを読み、窓の終端付近で最も静かな位置（無音）で切る
+  無音が見つからなければ固定窓で切り、前後のチャンクを重ねる
+- MP3: フレームヘッダを解析し、フレーム境界で固定窓（重ねあり）に切る
+- どちらもデコーダ（ffmpeg等）を使わない。それ以外の形式は分割しない
+- チャンクごとの文字起こし結果は、タイムスタンプを元音声の時刻に戻して結合する
+  重ねた区間は中点より前を前のチャンク、後ろを次のチャンクから採用する（重複しない）
+- SegmentTranscriptCache: チャンクのハッシュ → 文字起こし結果
+  一部のチャンクが失敗しても、成功済みのチャンクは再実行時に送り直さない
+
+Created: 2026-10-16
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import array
+import hashlib
+import io
+import logging
+import math
+import sys
+import wave
+
+from .constants import (
+    AUDIO_CHUNK_DURATION_SECONDS,
+    AUDIO_CHUNK_OVERLAP_SECONDS,
+    AUDIO_SILENCE_SEARCH_SECONDS,
+    AUDIO_SILENCE_THRESHOLD,
+    AUDIO_SEGMENT_MAX_BYTES,
+    AUDIO_SEGMENT_CACHE_MAX_ENTRIES,
+)
+from lib.lru_cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# 分割に対応する形式（フォーマット名 → 分割方式）
+SEGMENTABLE_AUDIO_FORMATS: Dict[str, str] = {
+    "wav": "wav",
+    "mp3": "mp3",
+    "mpeg": "mp3",
+    "mpga": "mp3",
+}
+
+# 無音判定のブロック長（秒）
+_SILENCE_BLOCK_SECONDS = 0.1
+
+# 無音判定で1ブロックから読むサンプル数の上限（間引き）
+_SILENCE_SAMPLES_PER_BLOCK = 200
+
+# WAVヘッダの大きさ（チャンクのサイズ計算用）
+_WAV_HEADER_BYTES = 44
+
+# MP3（Layer III）のビットレート表（kbps）
+_MP3_BITRATES = {
+    "1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# MP3のサンプルレート表（バージョンビット → Hz）
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG1
+    2: (22050, 24000, 16000),  # MPEG2
+    0: (11025, 12000, 8000),   # MPEG2.5
+}
+
+
+# =============================================================================
+# データモデル
+# =============================================================================
+
+
+@dataclass
+class AudioSegment:
+    """
+    分割した音声チャンク
+
+    keep_from / keep_until は、このチャンクの文字起こしから採用する区間（元音声の秒）。
+    重ねた区間の中点で前後のチャンクに振り分ける。
+    """
+    index: int
+    start_seconds: float
+    end_seconds: float
+    keep_from: float
+    keep_until: float
+    data: bytes
+    format: str
+
+    @property
+    def filename(self) -> str:
+        return f"segment_{self.index:03d}.{self.format}"
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+
+def can_split(audio_format: Optional[str]) -> bool:
+    """デコーダなしで分割できる形式か"""
+    return (audio_format or "").lower() in SEGMENTABLE_AUDIO_FORMATS
+
+
+# =============================================================================
+# 分割
+# =============================================================================
+
+
+def split_audio(
+    audio_data: bytes,
+    audio_format: Optional[str],
+    window_seconds: float = AUDIO_CHUNK_DURATION_SECONDS,
+    overlap_seconds: float = AUDIO_CHUNK_OVERLAP_SECONDS,
+    max_segment_bytes: int = AUDIO_SEGMENT_MAX_BYTES,
+) -> Optional[List[AudioSegment]]:
+    """
+    音声をチャンクに分割する
+
+    Args:
+        audio_data: 音声バイナリ
+        audio_format: フォーマット名（wav / mp3 など）
+        window_seconds: チャンクの最大長（秒）
+        overlap_seconds: 固定窓で切る場合に重ねる長さ（秒）
+        max_segment_bytes: チャンク1件の最大サイズ（窓はこれに収まるよう短くする）
+
+    Returns:
+        チャンクのリスト。分割に対応しない形式・解析できないデータは None
+    """
+    method = SEGMENTABLE_AUDIO_FORMATS.get((audio_format or "").lower())
+    try:
+        if method == "wav":
+            return _split_wav(audio_data, window_seconds, overlap_seconds, max_segment_bytes)
+        if method == "mp3":
+            return _split_mp3(audio_data, window_seconds, overlap_seconds, max_segment_bytes)
+    except (wave.Error, EOFError, ValueError) as e:
+        logger.warning(f"Audio split failed, falling back to single request: {type(e).__name__}")
+    return None
+
+
+def _split_wav(
+    audio_data: bytes,
+    window_seconds: float,
+    overlap_seconds: float,
+    max_segment_bytes: int,
+) -> Optional[List[AudioSegment]]:
+    with wave.open(io.BytesIO(audio_data), "rb") as reader:
+        params = reader.getparams()
+        frames = reader.readframes(params.nframes)
+
+    rate = params.framerate
+    frame_bytes = params.nchannels * params.sampwidth
+    total = len(frames) // frame_bytes
+    if not rate or not total:
+        return None
+
+    window = min(
+        int(window_seconds * rate),
+        (max_segment_bytes - _WAV_HEADER_BYTES) // frame_bytes,
+    )
+    overlap = min(int(overlap_seconds * rate), window // 4)
+    search = int(AUDIO_SILENCE_SEARCH_SECONDS * rate)
+
+    # (開始フレーム, 終了フレーム, 採用開始フレーム, 採用終了フレーム)
+    bounds: List[Tuple[int, int, float, float]] = []
+    start = 0
+    keep_from = 0.0
+    while start < total:
+        end = start + window
+        if end >= total:
+            bounds.append((start, total, keep_from, math.inf))
+            break
+        cut = _quietest_frame(frames, params, max(start + window // 2, end - search), end)
+        if cut is not None:
+            bounds.append((start, cut, keep_from, float(cut)))
+            start, keep_from = cut, float(cut)
+        else:
+            boundary = end - overlap / 2
+            bounds.append((start, end, keep_from, boundary))
+            start, keep_from = end - overlap, boundary
+
+    segments = []
+    for index, (first, last, keep_first, keep_last) in enumerate(bounds):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(params.nchannels)
+            writer.setsampwidth(params.sampwidth)
+            writer.setframerate(rate)
+            writer.writeframes(frames[first * frame_bytes:last * frame_bytes])
+        segments.append(AudioSegment(
+            index=index,
+            start_seconds=first / rate,
+            end_seconds=last / rate,
+            keep_from=keep_first / rate,
+            keep_until=keep_last / rate,
+            data=buffer.getvalue(),
+            format="wav",
+        ))
+    return segments
+
+
+def _quietest_frame(
+    frames: bytes,
+    params: Any,
+    search_from: int,
+    search_to: int,
+) -> Optional[int]:
+    """
+    範囲内で最も静かなブロックの中央フレームを返す
+
+    平均振幅が AUDIO_SILENCE_THRESHOLD 以下のブロックがなければ None。
+    """
+    typecodes = {1: "B", 2: "h", 4: "i"}
+    typecode = typecodes.get(params.sampwidth)
+    if typecode is None or search_to <= search_from:
+        return None
+
+    frame_bytes = params.nchannels * params.sampwidth
+    block = max(1, int(params.framerate * _SILENCE_BLOCK_SECONDS))
+    full_scale = float(2 ** (8 * params.sampwidth - 1))
+    # 8bit PCM は符号なし（128が無音）
+    center = 128 if params.sampwidth == 1 else 0
+
+    best: Optional[Tuple[float, int]] = None
+    for block_start in range(search_from, search_to - block + 1, block):
+        samples = array.array(
+            typecode,
+            frames[block_start * frame_bytes:(block_start + block) * frame_bytes],
+        )
+        if sys.byteorder == "big" and params.sampwidth > 1:
+            samples.byteswap()
+        step = max(1, len(samples) // _SILENCE_SAMPLES_PER_BLOCK)
+        picked = samples[::step]
+        level = sum(abs(s - center) for s in picked) / (len(picked) * full_scale)
+        # 同じ静かさなら後ろのブロックを選ぶ（チャンクを長く保つ）
+        if best is None or level <= best[0]:
+            best = (level, block_start + block // 2)
+
+    if best is None or best[0] > AUDIO_SILENCE_THRESHOLD:
+        return None
+    return best[1]
+
+
+def _split_mp3(
+    audio_data: bytes,
+    window_seconds: float,
+    overlap_seconds: float,
+    max_segment_bytes: int,
+) -> Optional[List[AudioSegment]]:
+    frames, sample_rate, samples_per_frame = _mp3_frames(audio_data)
+    if not frames:
+        return None
+
+    frame_seconds = samples_per_frame / sample_rate
+    total = len(frames)
+    window = max(1, int(window_seconds / frame_seconds))
+    overlap = min(int(overlap_seconds / frame_seconds), window // 4)
+
+    segments = []
+    start = 0
+    keep_from = 0.0
+    while start < total:
+        end = min(start + window, total)
+        # VBRでもチャンクがサイズ上限に収まるよう、フレームを詰めながら確認する
+        data_start = frames[start][0]
+        while end - start > 1 and frames[end - 1][0] + frames[end - 1][1] - data_start > max_segment_bytes:
+            end = start + max(1, (end - start) * 9 // 10)
+        last = frames[end - 1]
+        if end >= total:
+            keep_until = math.inf
+            next_start = total
+        else:
+            step_overlap = min(overlap, (end - start) // 4)
+            keep_until = (end - step_overlap / 2) * frame_seconds
+            next_start = end - step_overlap
+        segments.append(AudioSegment(
+            index=len(segments),
+            start_seconds=start * frame_seconds,
+            end_seconds=end * frame_seconds,
+            keep_from=keep_from,
+            keep_until=keep_until,
+            data=audio_data[data_start:last[0] + last[1]],
+            format="mp3",
+        ))
+        start, keep_from = next_start, keep_until
+    return segments
+
+
+def _mp3_frames(audio_data: bytes) -> Tuple[List[Tuple[int, int]], int, int]:
+    """
+    MP3（Layer III）のフレーム一覧を得る
+
+    Returns:
+        ([(オフセット, フレーム長), ...], サンプルレート, 1フレームのサンプル数)
+        解析できなければフレーム一覧は空
+    """
+    position = 0
+    if audio_data[:3] == b"ID3" and len(audio_data) >= 10:
+        size = 0
+        for byte in audio_data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        position = 10 + size + (10 if audio_data[5] & 0x10 else 0)
+
+    limit = len(audio_data)
+    if limit >= 128 and audio_data[-128:-125] == b"TAG":
+        limit -= 128
+
+    frames: List[Tuple[int, int]] = []
+    sample_rate = 0
+    samples_per_frame = 0
+    while position + 4 <= limit:
+        header = _parse_mp3_header(audio_data[position:position + 4])
+        if header is None or position + header[0] > limit:
+            # 同期が外れた場合は次の同期ワードを探す
+            position = audio_data.find(b"\xff", position + 1, limit)
+            if position < 0:
+                break
+            continue
+        length, rate, samples = header
+        if not sample_rate:
+            sample_rate, samples_per_frame = rate, samples
+        elif (rate, samples) != (sample_rate, samples_per_frame):
+            position += 1
+            continue
+        frames.append((position, length))
+        position += length
+
+    return frames, sample_rate, samples_per_frame
+
+
+def _parse_mp3_header(header: bytes) -> Optional[Tuple[int, int, int]]:
+    """フレームヘッダ4バイトを解析する → (フレーム長, サンプルレート, サンプル数)"""
+    if header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    # Layer III 以外・予約値・フリーフォーマットは扱わない
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES["1" if mpeg1 else "2"][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    coefficient = 144 if mpeg1 else 72
+    length = coefficient * bitrate // sample_rate + padding
+    return length, sample_rate, 1152 if mpeg1 else 576
+
+
+# =============================================================================
+# 結合
+# =============================================================================
+
+
+def stitch_transcripts(
+    segments: Sequence[AudioSegment],
+    results: Sequence[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    チャンクごとの文字起こし結果（verbose_json）を1件に結合する
+
+    タイムスタンプは元音声の時刻に直し、各チャンクの採用区間
+    （keep_from 〜 keep_until）に中点が入るセグメントだけを残す。
+    話者の推定は結合後のセグメント列に対して行う（チャンク境界をまたいでも連続する）。
+    """
+    merged: List[Dict[str, Any]] = []
+    language = None
+    for segment, result in zip(segments, results):
+        language = language or result.get("language")
+        raw_segments = result.get("segments") or []
+        if not raw_segments:
+            text = (result.get("text") or "").strip()
+            if text:
+                merged.append({
+                    "start": segment.start_seconds,
+                    "end": segment.end_seconds,
+                    "text": text,
+                })
+            continue
+        for raw in raw_segments:
+            start = segment.start_seconds + float(raw.get("start", 0.0))
+            end = segment.start_seconds + float(raw.get("end", 0.0))
+            if not segment.keep_from <= (start + end) / 2 < segment.keep_until:
+                continue
+            merged.append({**raw, "start": start, "end": end})
+
+    for i, raw in enumerate(merged):
+        raw["id"] = i
+
+    return {
+        "text": "".join(raw.get("text", "") for raw in merged).strip(),
+        "language": language,
+        "duration": segments[-1].end_seconds if segments else 0.0,
+        "segments": merged,
+    }
+
+
+# =============================================================================
+# チャンク結果キャッシュ（再開用）
+# =============================================================================
+
+
+class SegmentTranscriptCache(LRUCache[str, Dict[str, Any]]):
+    """
+    チャンクの文字起こし結果のキャッシュ（チャンクのSHA-256+言語+モデル → 結果）
+
+    一部のチャンクが失敗して処理全体をやり直す場合も、
+    成功済みのチャンクは Whisper API に送り直さない。
+    """
+
+    def __init__(self, max_entries: int = AUDIO_SEGMENT_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+
+    @staticmethod
+    def key_for(segment_data: bytes, language: str, model: str) -> str:
+        digest = hashlib.sha256(segment_data).hexdigest()
+        return f"{digest}:{language}:{model}"
+
+
+_segment_cache = SegmentTranscriptCache()
+
+
+def get_segment_transcript_cache() -> SegmentTranscriptCache:
+    """プロセス共通のチャンク文字起こしキャッシュ"""
+    return _segment_cache
@@ -21,6 +21,11 @@ Phase 4対応:
     - テナント別APIトークン対応
     - レート制限の自動ハンドリング
     - リトライ機能
+
+v11.3.0: 通信は lib/chatwork_transport.py の共通トランスポート経由
+    - APIトークン単位のレート予算（x-ratelimit-* ヘッダー連動）をプロセス内で共有
+    - priority=Priority.BATCH のクライアントはライブ返信用の予約枠を使わない
+    - 同一GETの合流、ルーム一覧・メンバー等のTTL/ETagキャッシュ
 """
 
 from typing import Optional, List, Dict, Any, Union, cast
@@ -29,6 +34,12 @@ import time
 
 import httpx
 
+from lib.chatwork_transport import (
+    ChatworkTransport,
+    DEFAULT_RETRY_AFTER_SECONDS,
+    Priority,
+    get_chatwork_transport,
+)
 from lib.config import get_settings
 from lib.secrets import get_secret_cached
 
@@ -125,10 +136,23 @@ class ChatworkClient(ChatworkClientBase):
         tenant_id: Optional[str] = None,
         timeout: float = 10.0,
         max_retries: int = 3,
+        priority: Priority = Priority.INTERACTIVE,
+        transport: Optional[ChatworkTransport] = None,
     ):
+        """
+        Args:
+            api_token: APIトークン（省略時はSecret Managerから取得）
+            tenant_id: テナントID（Phase 4: テナント別トークン用）
+            timeout: 1回あたりのタイムアウト（秒）
+            max_retries: 最大試行回数
+            priority: 優先レーン（定期ジョブ等は Priority.BATCH）
+            transport: 共通トランスポート（省略時はプロセス共通のもの）
+        """
         super().__init__(api_token, tenant_id)
         self._timeout = timeout
         self._max_retries = max_retries
+        self._priority = priority
+        self._transport = transport or get_chatwork_transport()
 
     def _request(
         self,
@@ -136,54 +160,46 @@ class ChatworkClient(ChatworkClientBase):
         endpoint: str,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
+        use_cache: bool = True,
     ) -> Any:
         """
         HTTP リクエストを送信（リトライ付き）
-        """
-        url = f"{self.API_BASE_URL}{endpoint}"
-        headers = self._get_headers()
-
-        for attempt in range(self._max_retries):
-            try:
-                response = httpx.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    data=data,
-                    timeout=self._timeout,
-                )
-
-                # レート制限
-                if response.status_code == 429:
-                    retry_after = int(
-                        response.headers.get("Retry-After", "60")
-                    )
-                    if attempt < self._max_retries - 1:
-                        time.sleep(retry_after)
-                        continue
-                    raise ChatworkRateLimitError(
-                        f"Rate limited. Retry after {retry_after}s"
-                    )
 
-                # 成功
-                if response.status_code in (200, 204):
-                    if response.status_code == 204:
-                        return None
-                    return response.json()
-
-                # その他のエラー
-                raise ChatworkAPIError(
-                    f"API error: {response.status_code} - {response.text}"
-                )
+        レート予算の確保・429/タイムアウトの再試行・キャッシュは共通トランスポートが行う。
+        use_cache=False ならキャッシュを読まずにAPIへ問い合わせる（結果の保存は行う）。
+        """
+        try:
+            response = self._transport.request(
+                method,
+                endpoint,
+                headers=self._get_headers(),
+                params=params,
+                data=data,
+                priority=self._priority,
+                timeout=self._timeout,
+                max_attempts=self._max_retries,
+                use_cache=use_cache,
+            )
+        except httpx.TimeoutException:
+            raise ChatworkTimeoutError("Request timed out")
+
+        # レート制限（再試行しても解消しなかった）
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", str(DEFAULT_RETRY_AFTER_SECONDS))
+            raise ChatworkRateLimitError(
+                f"Rate limited. Retry after {retry_after}s"
+            )
 
-            except httpx.TimeoutException:
-                if attempt < self._max_retries - 1:
-                    time.sleep(1)
-                    continue
-                raise ChatworkTimeoutError("Request timed out")
+        # 成功
+        if response.status_code in (200, 204):
+            if response.status_code == 204:
+                return None
+            return response.json()
 
-        raise ChatworkAPIError("Max retries exceeded")
+        # その他のエラー
+        raise ChatworkAPIError(
+            f"API error: {response.status_code} - {response.text}"
+        )
 
     # =========================================================================
     # メッセージ API
@@ -279,17 +295,21 @@ class ChatworkClient(ChatworkClientBase):
         all_rooms = self.get_rooms()
         return [r for r in all_rooms if r.type == "direct"]
 
-    def get_room_members(self, room_id: int) -> List[Dict[str, Any]]:
+    def get_room_members(self, room_id: int, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         ルームのメンバー一覧を取得
 
         Args:
             room_id: ルームID
+            use_cache: False ならキャッシュを使わず最新のメンバーを取得
+                （権限判定など、退室直後の反映が必要な場合）
 
         Returns:
             メンバーのリスト
         """
-        result: List[Dict[str, Any]] = self._request("GET", f"/rooms/{room_id}/members")
+        result: List[Dict[str, Any]] = self._request(
+            "GET", f"/rooms/{room_id}/members", use_cache=use_cache
+        )
         return result
 
     # =========================================================================
@@ -380,6 +400,9 @@ class ChatworkAsyncClient(ChatworkClientBase):
     Chatwork API 非同期クライアント
 
     FastAPI で使用。
+
+    v11.3.0: レート予算・キャッシュは同期クライアントと共通トランスポートで共有する
+    （同一GETの合流はスレッド単位のため、非同期クライアントでは行わない）。
     """
 
     def __init__(
@@ -388,10 +411,14 @@ class ChatworkAsyncClient(ChatworkClientBase):
         tenant_id: Optional[str] = None,
         timeout: float = 10.0,
         max_retries: int = 3,
+        priority: Priority = Priority.INTERACTIVE,
+        transport: Optional[ChatworkTransport] = None,
     ):
         super().__init__(api_token, tenant_id)
         self._timeout = timeout
         self._max_retries = max_retries
+        self._priority = priority
+        self._transport = transport or get_chatwork_transport()
         self._client: Optional[httpx.AsyncClient] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
@@ -412,16 +439,26 @@ class ChatworkAsyncClient(ChatworkClientBase):
         endpoint: str,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
+        use_cache: bool = True,
     ) -> Any:
-        """HTTP リクエストを送信（非同期・リトライ付き）"""
+        """HTTP リクエストを送信（非同期・リトライ付き。use_cache=False ならキャッシュを読まない）"""
         import asyncio
 
         url = f"{self.API_BASE_URL}{endpoint}"
         headers = self._get_headers()
+        api_token = headers["X-ChatWorkToken"]
+
+        if use_cache and method.upper() == "GET":
+            cached = self._transport.lookup_cached(api_token, endpoint, params)
+            if cached is not None:
+                return cached.json()
+
         client = await self._get_client()
+        limiter = self._transport.limiter_for(api_token)
 
         for attempt in range(self._max_retries):
             try:
+                await limiter.acquire_async(self._priority)
                 response = await client.request(
                     method=method,
                     url=url,
@@ -429,6 +466,7 @@ class ChatworkAsyncClient(ChatworkClientBase):
                     params=params,
                     data=data,
                 )
+                self._transport.observe(api_token, method, endpoint, params, response)
 
                 if response.status_code == 429:
                     retry_after = int(
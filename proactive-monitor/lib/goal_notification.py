@@ -12,6 +12,12 @@ Phase 2.5: 目標達成支援 - 通知サービス
 - 08:00 個人フィードバック (goal_morning_feedback)
 - 08:00 チームサマリー (goal_team_summary)
 
+★★★ v11.3.0: 一括通知エンジン ★★★
+- scheduled_* は対象者の目標・進捗・通知ログ状態を集合クエリでまとめて取得
+- notification_logs の確保（pending）と最終ステータス更新はそれぞれ1クエリで一括実行
+- 送信はレート制限付きの並列ディスパッチャー経由（ChatWork 300回/5分を超えない）
+- send_*_to_user は単発送信用にそのまま残している
+
 使用例:
     from lib.goal_notification import (
         send_daily_check_to_user,
@@ -26,11 +32,16 @@ Phase 2.5: 目標達成支援 - 通知サービス
 
 import os
 import re
+import json
+import time
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional, List, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple, Callable, Deque, Iterable, Set
+from dataclasses import dataclass, field
 from enum import Enum
 import pytz
 
@@ -1105,19 +1116,605 @@ def send_team_summary_to_leader(
     return (status, error_message)
 
 
+# =====================================================
+# v11.3.0: 一括通知エンジン（スケジュール関数用）
+# =====================================================
+#
+# Before: ユーザー一覧 → ユーザーごとに目標・進捗クエリ → send_*_to_user を逐次実行
+#   （1人あたり INSERT + commit + 送信 + UPDATE + commit、数百人でDB往復が数千回）
+# After:
+#   1. 目標・進捗・通知ログ状態を対象者全員分まとめて取得（集合クエリ数本）
+#   2. notification_logs を1回の INSERT ... ON CONFLICT で一括確保（pending）
+#   3. メッセージをメモリ上で生成し、レート制限付きの並列ディスパッチャーで送信
+#   4. 最終ステータスを1回の UPDATE で一括記録
+#
+# CLAUDE.md鉄則#10: 送信中はトランザクションを保持しない（確保後に commit 済み）
+# =====================================================
+
+# 同時送信数
+GOAL_NOTIFICATION_SEND_CONCURRENCY = int(os.environ.get("GOAL_NOTIFICATION_SEND_CONCURRENCY", "8"))
+
+# ChatWork API の上限は 300回/5分（トークン単位）
+# 他の処理（タスクリマインド等）の分を残して 250回/5分、瞬間的にも 10回/秒までに抑える
+GOAL_NOTIFICATION_RATE_WINDOWS: Tuple[Tuple[float, int], ...] = (
+    (1.0, 10),
+    (300.0, 250),
+)
+
+# pending 確保（send_*_to_user の INSERT ... ON CONFLICT と同じ条件）
+# 新規 / failed / 10分以上古い pending のみ RETURNING される
+_CLAIM_NOTIFICATION_LOGS_SQL = """
+    INSERT INTO notification_logs (
+        organization_id, notification_type, target_type, target_id,
+        notification_date, status, channel, channel_target, metadata
+    )
+    SELECT :org_id, :notification_type, 'user', t.target_id, :today,
+           'pending', 'chatwork', t.room_id, CAST(t.metadata AS JSONB)
+    FROM UNNEST(
+        CAST(:target_ids AS TEXT[]),
+        CAST(:room_ids AS TEXT[]),
+        CAST(:metadata AS TEXT[])
+    ) AS t(target_id, room_id, metadata)
+    ON CONFLICT (organization_id, target_type, target_id, notification_date, notification_type)
+    DO UPDATE SET
+        status = 'pending',
+        error_message = NULL,
+        updated_at = NOW()
+    WHERE notification_logs.status = 'failed'
+       OR (notification_logs.status = 'pending' AND notification_logs.updated_at < NOW() - INTERVAL '10 minutes')
+    RETURNING target_id
+"""
+
+_FINALIZE_NOTIFICATION_LOGS_SQL = """
+    UPDATE notification_logs AS nl
+    SET status = t.status,
+        error_message = t.error_message,
+        retry_count = nl.retry_count + 1,
+        updated_at = NOW()
+    FROM UNNEST(
+        CAST(:target_ids AS TEXT[]),
+        CAST(:statuses AS TEXT[]),
+        CAST(:error_messages AS TEXT[])
+    ) AS t(target_id, status, error_message)
+    WHERE nl.organization_id = CAST(:org_id AS TEXT)
+      AND nl.target_type = 'user'
+      AND nl.target_id = t.target_id
+      AND nl.notification_date = :today
+      AND nl.notification_type = :notification_type
+"""
+
+
+class SlidingWindowRateLimiter:
+    """
+    複数のスライディングウィンドウで送信回数を制限する（スレッドセーフ）
+
+    acquire() は全ウィンドウに空きができるまでブロックする。
+    """
+
+    def __init__(
+        self,
+        windows: Iterable[Tuple[float, int]] = GOAL_NOTIFICATION_RATE_WINDOWS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            windows: (ウィンドウ秒数, 上限回数) のリスト
+            clock: 現在時刻（単調増加）を返す関数
+            sleep: 待機関数
+        """
+        self.windows = [(float(seconds), int(limit)) for seconds, limit in windows]
+        self._clock = clock
+        self._sleep = sleep
+        self._max_window = max((seconds for seconds, _ in self.windows), default=0.0)
+        self._capacity = max((limit for _, limit in self.windows), default=1)
+        self._calls: Deque[float] = deque(maxlen=self._capacity)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        送信枠を1つ確保する
+
+        Returns:
+            待機した秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._wait_seconds(now)
+                if wait <= 0:
+                    self._calls.append(now)
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def _wait_seconds(self, now: float) -> float:
+        """全ウィンドウに空きができるまでの秒数（0以下なら即時送信可）"""
+        wait = 0.0
+        calls = self._calls
+        for seconds, limit in self.windows:
+            if len(calls) < limit:
+                continue
+            # ウィンドウ内の limit 件目（新しい方から数えて）が抜けるまで待つ
+            oldest_in_window = calls[len(calls) - limit]
+            wait = max(wait, oldest_in_window + seconds - now)
+        return wait
+
+
+_rate_limiter: Optional[SlidingWindowRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_goal_notification_rate_limiter() -> SlidingWindowRateLimiter:
+    """プロセス共通のレートリミッター（同一プロセス内の各スケジュールで枠を共有）"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = SlidingWindowRateLimiter()
+        return _rate_limiter
+
+
+@dataclass
+class GoalNotification:
+    """一括送信する1通分の通知"""
+    recipient_id: str
+    recipient_name: str
+    chatwork_room_id: str
+    render: Callable[[], str]
+    metadata: Optional[Dict[str, Any]] = None     # notification_logs.metadata に保存
+    context: Dict[str, Any] = field(default_factory=dict)  # 保存しない付随データ
+    status: str = 'pending'
+    error_message: Optional[str] = None
+
+
+class NotificationDispatcher:
+    """
+    レート制限付きの並列送信
+
+    send_message_func はワーカースレッドから呼ばれる。
+    例外を送出した通知は failed、それ以外は success として扱う（send_*_to_user と同じ）。
+    """
+
+    def __init__(
+        self,
+        send_message_func,
+        max_workers: int = GOAL_NOTIFICATION_SEND_CONCURRENCY,
+        rate_limiter: Optional[SlidingWindowRateLimiter] = None,
+    ):
+        self.send_message_func = send_message_func
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or get_goal_notification_rate_limiter()
+
+    def dispatch(self, notifications: List[GoalNotification], label: str = "") -> None:
+        """各通知の status / error_message を送信結果で更新する"""
+        if not notifications:
+            return
+        workers = min(self.max_workers, len(notifications))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="goal-notify") as executor:
+            list(executor.map(lambda n: self._send(n, label), notifications))
+
+    def _send(self, notification: GoalNotification, label: str) -> None:
+        try:
+            message = notification.render()
+            self.rate_limiter.acquire()
+            self.send_message_func(notification.chatwork_room_id, message)
+            notification.status = 'success'
+        except Exception as e:
+            notification.status = 'failed'
+            notification.error_message = sanitize_error(e)
+            logger.error(f"{label}送信エラー: user={notification.recipient_id}, error={notification.error_message}")
+
+
+def _claim_notification_logs(
+    conn,
+    org_id: str,
+    notification_type: str,
+    today: date,
+    notifications: List[GoalNotification],
+) -> Set[str]:
+    """
+    notification_logs を一括で pending 確保する
+
+    Returns:
+        送信してよい（新規 or failed / 古い pending を再試行する）recipient_id の集合
+    """
+    import sqlalchemy
+
+    if not notifications:
+        return set()
+
+    result = conn.execute(sqlalchemy.text(_CLAIM_NOTIFICATION_LOGS_SQL), {
+        'org_id': org_id,
+        'notification_type': notification_type,
+        'today': today,
+        'target_ids': [n.recipient_id for n in notifications],
+        'room_ids': [str(n.chatwork_room_id) for n in notifications],
+        'metadata': [
+            json.dumps(n.metadata, ensure_ascii=False) if n.metadata is not None else None
+            for n in notifications
+        ],
+    })
+    claimed = {str(row[0]) for row in result.fetchall()}
+    conn.commit()  # DBロック解放
+    return claimed
+
+
+def _finalize_notification_logs(
+    conn,
+    org_id: str,
+    notification_type: str,
+    today: date,
+    notifications: List[GoalNotification],
+) -> None:
+    """送信結果を notification_logs に一括記録する（commit は呼び出し側）"""
+    import sqlalchemy
+
+    if not notifications:
+        return
+
+    conn.execute(sqlalchemy.text(_FINALIZE_NOTIFICATION_LOGS_SQL), {
+        'org_id': org_id,
+        'notification_type': notification_type,
+        'today': today,
+        'target_ids': [n.recipient_id for n in notifications],
+        'statuses': [n.status for n in notifications],
+        'error_messages': [n.error_message for n in notifications],
+    })
+
+
+def send_goal_notifications(
+    conn,
+    org_id: str,
+    notification_type: str,
+    notifications: List[GoalNotification],
+    send_message_func,
+    dry_run: bool = False,
+    dispatcher: Optional[NotificationDispatcher] = None,
+    label: str = "",
+) -> Tuple[Dict[str, int], List[GoalNotification]]:
+    """
+    通知をまとめて確保・送信・記録する
+
+    同じ受信者への通知が複数ある場合は先頭の1通のみ送る
+    （notification_logs は受信者×日付×種別で一意のため。send_*_to_user を順に呼んだ場合と同じ）。
+
+    Args:
+        conn: データベース接続
+        org_id: 組織ID (UUID)
+        notification_type: GoalNotificationType の値
+        notifications: 送信候補（テストガード・業務ロジックで絞り込み済み）
+        send_message_func: メッセージ送信関数
+        dry_run: ドライランモード（DBに記録せず全件 skipped）
+        dispatcher: 送信に使うディスパッチャー（省略時は共通レートリミッターで生成）
+        label: ログ用の通知名
+
+    Returns:
+        (送信結果のサマリー, 実際に送信を試みた通知のリスト)
+    """
+    results = {'success': 0, 'skipped': 0, 'failed': 0}
+    if not notifications:
+        return results, []
+
+    if dry_run:
+        for n in notifications:
+            logger.info(f"[DRY_RUN] {label}: {n.recipient_name}さん")
+        results['skipped'] = len(notifications)
+        return results, []
+
+    unique: Dict[str, GoalNotification] = {}
+    for n in notifications:
+        if n.recipient_id in unique:
+            logger.info(f"既に送信済みまたは処理中: user={n.recipient_id} / {notification_type}")
+            results['skipped'] += 1
+            continue
+        unique[n.recipient_id] = n
+
+    today = datetime.now(JST).date()  # CLAUDE.md: サーバーはUTCなのでJSTで日付取得
+
+    # Phase 1: 一括確保（RETURNINGに含まれない = 送信済み or 処理中）
+    claimed_ids = _claim_notification_logs(conn, org_id, notification_type, today, list(unique.values()))
+    claimed = [n for n in unique.values() if n.recipient_id in claimed_ids]
+    results['skipped'] += len(unique) - len(claimed)
+
+    # Phase 2: メッセージ生成 + 並列送信（DB接続を保持しない）
+    dispatcher = dispatcher or NotificationDispatcher(send_message_func)
+    dispatcher.dispatch(claimed, label=label)
+
+    # Phase 3: 最終ステータスを一括更新
+    _finalize_notification_logs(conn, org_id, notification_type, today, claimed)
+    conn.commit()
+
+    for n in claimed:
+        results[n.status] = results.get(n.status, 0) + 1
+    return results, claimed
+
+
+def _merge_results(results: Dict[str, int], partial: Dict[str, int]) -> None:
+    for key, count in partial.items():
+        results[key] = results.get(key, 0) + count
+
+
+def _goal_from_row(row, with_deadline: bool = True) -> Dict[str, Any]:
+    """(id, title, goal_type, target_value, current_value, unit[, deadline]) → 目標dict"""
+    goal = {
+        'id': str(row[0]),
+        'title': row[1],
+        'goal_type': row[2],
+        'target_value': float(row[3]) if row[3] else None,
+        'current_value': float(row[4]) if row[4] else 0,
+        'unit': row[5],
+    }
+    if with_deadline:
+        goal['deadline'] = row[6]
+    return goal
+
+
+def _fetch_active_goals_by_user(conn, org_id: str, user_ids: List[str]) -> Dict[str, List[Dict]]:
+    """対象ユーザー全員のアクティブな目標（期限切れ除外）を1クエリで取得"""
+    import sqlalchemy
+
+    goals_by_user: Dict[str, List[Dict]] = {}
+    if not user_ids:
+        return goals_by_user
+
+    result = conn.execute(sqlalchemy.text("""
+        SELECT user_id, id, title, goal_type, target_value, current_value, unit, deadline
+        FROM goals
+        WHERE user_id = ANY(CAST(:user_ids AS UUID[]))
+          AND organization_id = CAST(:org_id AS UUID)
+          AND status = 'active'
+          AND (deadline IS NULL OR deadline >= CURRENT_DATE)
+          AND (period_end IS NULL OR period_end >= CURRENT_DATE)
+        ORDER BY user_id, created_at
+    """), {'user_ids': user_ids, 'org_id': org_id})
+
+    for row in result.fetchall():
+        goals_by_user.setdefault(str(row[0]), []).append(_goal_from_row(row[1:]))
+    return goals_by_user
+
+
+def _fetch_progress_by_user(conn, org_id: str, user_ids: List[str], progress_date: date) -> Dict[str, Dict[str, Dict]]:
+    """対象ユーザー全員の指定日の進捗を1クエリで取得（user_id → goal_id → 進捗）"""
+    import sqlalchemy
+
+    progress_by_user: Dict[str, Dict[str, Dict]] = {}
+    if not user_ids:
+        return progress_by_user
+
+    # テナント分離: goals, goal_progressの両方でorg_idフィルタ
+    result = conn.execute(sqlalchemy.text("""
+        SELECT g.user_id, gp.goal_id, gp.value, gp.cumulative_value, gp.daily_note, gp.daily_choice
+        FROM goal_progress gp
+        JOIN goals g ON gp.goal_id = g.id AND gp.organization_id = g.organization_id
+        WHERE g.user_id = ANY(CAST(:user_ids AS UUID[]))
+          AND g.organization_id = CAST(:org_id AS UUID)
+          AND gp.organization_id = CAST(:org_id AS UUID)
+          AND gp.progress_date = :progress_date
+    """), {'user_ids': user_ids, 'org_id': org_id, 'progress_date': progress_date})
+
+    for p in result.fetchall():
+        progress_by_user.setdefault(str(p[0]), {})[str(p[1])] = {
+            'value': float(p[2]) if p[2] else 0,
+            'cumulative_value': float(p[3]) if p[3] else 0,
+            'daily_note': p[4],
+            'daily_choice': p[5],
+        }
+    return progress_by_user
+
+
+def _fetch_answered_user_ids(conn, org_id: str, user_ids: List[str], progress_date: date) -> Set[str]:
+    """指定日に進捗を回答済みのユーザーIDを1クエリで取得"""
+    import sqlalchemy
+
+    if not user_ids:
+        return set()
+
+    result = conn.execute(sqlalchemy.text("""
+        SELECT DISTINCT g.user_id
+        FROM goal_progress gp
+        JOIN goals g ON gp.goal_id = g.id AND gp.organization_id = g.organization_id
+        WHERE g.user_id = ANY(CAST(:user_ids AS UUID[]))
+          AND g.organization_id = CAST(:org_id AS UUID)
+          AND gp.organization_id = CAST(:org_id AS UUID)
+          AND gp.progress_date = :progress_date
+    """), {'user_ids': user_ids, 'org_id': org_id, 'progress_date': progress_date})
+    return {str(row[0]) for row in result.fetchall()}
+
+
+def _fetch_ignored_reminder_days(conn, org_id: str, user_ids: List[str]) -> Dict[str, int]:
+    """
+    直近7日間でリマインドを送ったが回答がなかった日数をユーザーごとに1クエリで取得
+
+    send_daily_reminder_to_user の連続無視チェックと同じ条件。
+    エラー時は空（= 全員送信を許可）。
+    """
+    import sqlalchemy
+
+    if not user_ids:
+        return {}
+
+    try:
+        result = conn.execute(sqlalchemy.text("""
+            SELECT nl.target_id, COUNT(*) AS ignored_days
+            FROM notification_logs nl
+            WHERE nl.organization_id = CAST(:org_id AS TEXT)
+              AND nl.target_id = ANY(CAST(:user_ids AS TEXT[]))
+              AND nl.notification_type = :notification_type
+              AND nl.status = 'success'
+              AND nl.notification_date >= CURRENT_DATE - INTERVAL '7 days'
+              AND nl.notification_date < CURRENT_DATE
+              AND NOT EXISTS (
+                  SELECT 1 FROM goal_progress gp
+                  JOIN goals g ON gp.goal_id = g.id AND gp.organization_id = g.organization_id
+                  WHERE g.user_id = CAST(nl.target_id AS UUID)
+                    AND g.organization_id = CAST(:org_id AS UUID)
+                    AND gp.organization_id = CAST(:org_id AS UUID)
+                    AND gp.progress_date = nl.notification_date
+              )
+            GROUP BY nl.target_id
+        """), {
+            'org_id': org_id,
+            'user_ids': user_ids,
+            'notification_type': GoalNotificationType.DAILY_REMINDER.value,
+        })
+        return {str(row[0]): int(row[1]) for row in result.fetchall() if row[1] is not None}
+    except Exception as e:
+        logger.warning(f"連続無視チェックエラー（送信を許可）: {type(e).__name__}")
+        return {}
+
+
+def _fetch_department_members(conn, org_id: str, department_ids: List[str]) -> Dict[str, List[Dict]]:
+    """対象部署全てのメンバーと目標を1クエリで取得（department_id → メンバーリスト）"""
+    import sqlalchemy
+
+    members_by_department: Dict[str, Dict[str, Dict]] = {}
+    if not department_ids:
+        return {}
+
+    # テナント分離: 全テーブルでorg_idフィルタ
+    result = conn.execute(sqlalchemy.text("""
+        SELECT
+            ud.department_id,
+            u.id AS user_id,
+            u.name AS user_name,
+            g.id AS goal_id,
+            g.title,
+            g.goal_type,
+            g.target_value,
+            g.current_value,
+            g.unit
+        FROM users u
+        JOIN user_departments ud ON ud.user_id = u.id
+        JOIN goals g ON g.user_id = u.id AND g.organization_id = CAST(:org_id AS UUID)
+        WHERE u.organization_id = CAST(:org_id AS TEXT)
+          AND ud.department_id = ANY(CAST(:department_ids AS UUID[]))
+          AND g.organization_id = CAST(:org_id AS UUID)
+          AND g.status = 'active'
+        ORDER BY ud.department_id, u.name, g.created_at
+    """), {'department_ids': department_ids, 'org_id': org_id})
+
+    for m in result.fetchall():
+        members = members_by_department.setdefault(str(m[0]), {})
+        member_id = str(m[1])
+        if member_id not in members:
+            members[member_id] = {
+                'user_id': member_id,
+                'user_name': m[2],
+                'goals': [],
+            }
+        members[member_id]['goals'].append(_goal_from_row(m[3:], with_deadline=False))
+
+    return {dept_id: list(members.values()) for dept_id, members in members_by_department.items()}
+
+
+def _record_team_summary_audit_logs(conn, org_id: str, sent: List[GoalNotification], today: date) -> None:
+    """
+    チームサマリー送信成功分の監査ログを記録する（CLAUDE.md鉄則#3）
+
+    チームサマリーは他ユーザーの目標データを閲覧する機密操作。
+    """
+    import sqlalchemy
+
+    rows = []
+    for n in sent:
+        team_members = n.context.get('team_members') or []
+        if n.status != 'success' or not team_members:
+            continue
+        department_id = n.metadata['department_id']
+        viewed_user_ids = [m.get('user_id') for m in team_members if m.get('user_id')]
+        rows.append({
+            'org_id': org_id,
+            'user_id': n.recipient_id,
+            'resource_id': f"team_summary_{department_id}_{today}",
+            'details': json.dumps({
+                "action": "view_team_goals",
+                "department_id": department_id,
+                "department_name": n.metadata['department_name'],
+                "viewed_user_count": len(team_members),
+                "viewed_user_ids": viewed_user_ids[:10],
+            }, ensure_ascii=False),
+        })
+
+    if not rows:
+        return
+
+    try:
+        conn.execute(sqlalchemy.text("""
+            INSERT INTO audit_logs (
+                organization_id, user_id, action, resource_type,
+                resource_id, classification, details, created_at
+            ) VALUES (
+                :org_id, :user_id, 'read', 'goal_progress',
+                :resource_id, 'confidential',
+                :details::jsonb, CURRENT_TIMESTAMP
+            )
+        """), rows)
+    except Exception as audit_error:
+        logger.warning(f"監査ログ記録エラー（non-blocking）: {type(audit_error).__name__}")
+
+    conn.commit()
+
+
 # =====================================================
 # スケジュール関数（Cloud Scheduler から呼び出し）
 # =====================================================
 
-def scheduled_daily_check(conn, org_id: str, send_message_func, dry_run: bool = False) -> Dict[str, int]:
+def _fetch_goal_users(conn, org_id: str) -> List[Tuple[str, str, str]]:
+    """アクティブな目標を持つユーザーを取得（テナント分離: users, goalsの両方でorg_idフィルタ）"""
+    import sqlalchemy
+
+    result = conn.execute(sqlalchemy.text("""
+        SELECT DISTINCT
+            u.id AS user_id,
+            u.name AS user_name,
+            u.chatwork_room_id
+        FROM users u
+        JOIN goals g ON g.user_id = u.id AND g.organization_id = CAST(:org_id AS UUID)
+        WHERE u.organization_id = CAST(:org_id AS TEXT)
+          AND g.organization_id = CAST(:org_id AS UUID)
+          AND g.status = 'active'
+          AND (g.deadline IS NULL OR g.deadline >= CURRENT_DATE)
+          AND (g.period_end IS NULL OR g.period_end >= CURRENT_DATE)
+          AND u.chatwork_room_id IS NOT NULL
+    """), {'org_id': org_id})
+    return [(str(u[0]), u[1], u[2]) for u in result.fetchall()]
+
+
+def _filter_test_guard(
+    users: List[Tuple[str, str, str]],
+    results: Dict[str, int],
+    label: str = "",
+) -> List[Tuple[str, str, str]]:
+    """★★★ テストガード: 許可されていないルームへの送信をブロック ★★★"""
+    allowed = []
+    for user_id, user_name, chatwork_room_id in users:
+        if not is_goal_test_send_allowed(chatwork_room_id):
+            logger.info(f"🚫 [TEST_GUARD] {label}送信をブロック: {user_name}さん (room_id={chatwork_room_id})")
+            results['blocked'] = results.get('blocked', 0) + 1
+            continue
+        allowed.append((user_id, user_name, chatwork_room_id))
+    return allowed
+
+
+def scheduled_daily_check(
+    conn,
+    org_id: str,
+    send_message_func,
+    dry_run: bool = False,
+    dispatcher: Optional[NotificationDispatcher] = None,
+) -> Dict[str, int]:
     """
     17:00 進捗確認の一括送信
 
+    v11.3.0: 対象者全員の目標を1クエリで取得し、一括通知エンジンで送信
+
     Args:
         conn: データベース接続
         org_id: 組織ID (UUID)
         send_message_func: メッセージ送信関数
         dry_run: ドライランモード
+        dispatcher: 送信に使うディスパッチャー（省略時は共通レートリミッター）
 
     Returns:
         送信結果のサマリー
@@ -1154,158 +1751,129 @@ def scheduled_daily_check(conn, org_id: str, send_message_func, dry_run: bool =
     except Exception as e:
         logger.warning(f"期限切れゴール自動キャンセルエラー: {type(e).__name__}: {e}")
 
-    # アクティブな目標を持つユーザーを取得（テナント分離: users, goalsの両方でorg_idフィルタ）
-    result = conn.execute(sqlalchemy.text("""
-        SELECT DISTINCT
-            u.id AS user_id,
-            u.name AS user_name,
-            u.chatwork_room_id
-        FROM users u
-        JOIN goals g ON g.user_id = u.id AND g.organization_id = CAST(:org_id AS UUID)
-        WHERE u.organization_id = CAST(:org_id AS TEXT)
-          AND g.organization_id = CAST(:org_id AS UUID)
-          AND g.status = 'active'
-          AND (g.deadline IS NULL OR g.deadline >= CURRENT_DATE)
-          AND (g.period_end IS NULL OR g.period_end >= CURRENT_DATE)
-          AND u.chatwork_room_id IS NOT NULL
-    """), {'org_id': org_id})
-
-    users = result.fetchall()
+    users = _fetch_goal_users(conn, org_id)
     logger.info(f"対象ユーザー: {len(users)}名")
 
-    for user in users:
-        user_id = str(user[0])
-        user_name = user[1]
-        chatwork_room_id = user[2]
-
-        # ★★★ テストガード: 許可されていないルームへの送信をブロック ★★★
-        if not is_goal_test_send_allowed(chatwork_room_id):
-            logger.info(f"🚫 [TEST_GUARD] 送信をブロック: {user_name}さん (room_id={chatwork_room_id})")
-            results['blocked'] = results.get('blocked', 0) + 1
-            continue
-
-        # ユーザーのアクティブな目標を取得（期限切れ除外）
-        goals_result = conn.execute(sqlalchemy.text("""
-            SELECT id, title, goal_type, target_value, current_value, unit, deadline
-            FROM goals
-            WHERE user_id = CAST(:user_id AS UUID)
-              AND organization_id = CAST(:org_id AS UUID)
-              AND status = 'active'
-              AND (deadline IS NULL OR deadline >= CURRENT_DATE)
-              AND (period_end IS NULL OR period_end >= CURRENT_DATE)
-            ORDER BY created_at
-        """), {'user_id': user_id, 'org_id': org_id})
-
-        goals = []
-        for g in goals_result.fetchall():
-            goals.append({
-                'id': str(g[0]),
-                'title': g[1],
-                'goal_type': g[2],
-                'target_value': float(g[3]) if g[3] else None,
-                'current_value': float(g[4]) if g[4] else 0,
-                'unit': g[5],
-                'deadline': g[6],
-            })
+    users = _filter_test_guard(users, results)
+    goals_by_user = _fetch_active_goals_by_user(conn, org_id, [u[0] for u in users])
 
+    notifications = []
+    for user_id, user_name, chatwork_room_id in users:
+        goals = goals_by_user.get(user_id)
         if not goals:
             logger.info(f"目標なし: {user_name}さん")
             continue
-
-        # 送信
-        status, error = send_daily_check_to_user(
-            conn=conn,
-            user_id=user_id,
-            org_id=org_id,
-            user_name=user_name,
+        notifications.append(GoalNotification(
+            recipient_id=user_id,
+            recipient_name=user_name,
             chatwork_room_id=chatwork_room_id,
-            goals=goals,
-            send_message_func=send_message_func,
-            dry_run=dry_run,
-        )
+            render=lambda name=user_name, goals=goals: build_daily_check_message(name, goals),
+        ))
 
-        results[status] = results.get(status, 0) + 1
+    sent, _ = send_goal_notifications(
+        conn, org_id, GoalNotificationType.DAILY_CHECK.value, notifications,
+        send_message_func, dry_run=dry_run, dispatcher=dispatcher, label="17時進捗確認",
+    )
+    _merge_results(results, sent)
 
     logger.info(f"=== 17時進捗確認 完了: success={results['success']}, skipped={results['skipped']}, failed={results['failed']}, blocked={results.get('blocked', 0)} ===")
     return results
 
 
-def scheduled_daily_reminder(conn, org_id: str, send_message_func, dry_run: bool = False) -> Dict[str, int]:
+def scheduled_daily_reminder(
+    conn,
+    org_id: str,
+    send_message_func,
+    dry_run: bool = False,
+    dispatcher: Optional[NotificationDispatcher] = None,
+) -> Dict[str, int]:
     """
     18:00 未回答リマインドの一括送信
 
+    v11.3.0: 回答済み判定・連続無視日数を対象者全員分まとめて取得し、一括通知エンジンで送信
+
     Args:
         conn: データベース接続
         org_id: 組織ID (UUID)
         send_message_func: メッセージ送信関数
         dry_run: ドライランモード
+        dispatcher: 送信に使うディスパッチャー（省略時は共通レートリミッター）
 
     Returns:
         送信結果のサマリー
     """
-    import sqlalchemy
-
     logger.info(f"=== 18時未回答リマインド 開始 (org={org_id}) ===")
     log_goal_test_mode_status()  # テストモード状態をログ出力
 
     results = {'success': 0, 'skipped': 0, 'failed': 0, 'blocked': 0}
+    today = datetime.now(JST).date()  # CLAUDE.md: サーバーはUTCなのでJSTで日付取得
 
-    # アクティブな目標を持つユーザーを取得（テナント分離: users, goalsの両方でorg_idフィルタ）
-    result = conn.execute(sqlalchemy.text("""
-        SELECT DISTINCT
-            u.id AS user_id,
-            u.name AS user_name,
-            u.chatwork_room_id
-        FROM users u
-        JOIN goals g ON g.user_id = u.id AND g.organization_id = CAST(:org_id AS UUID)
-        WHERE u.organization_id = CAST(:org_id AS TEXT)
-          AND g.organization_id = CAST(:org_id AS UUID)
-          AND g.status = 'active'
-          AND (g.deadline IS NULL OR g.deadline >= CURRENT_DATE)
-          AND (g.period_end IS NULL OR g.period_end >= CURRENT_DATE)
-          AND u.chatwork_room_id IS NOT NULL
-    """), {'org_id': org_id})
-
-    users = result.fetchall()
+    users = _fetch_goal_users(conn, org_id)
     logger.info(f"対象ユーザー: {len(users)}名")
 
-    for user in users:
-        user_id = str(user[0])
-        user_name = user[1]
-        chatwork_room_id = user[2]
+    users = _filter_test_guard(users, results)
 
-        # ★★★ テストガード: 許可されていないルームへの送信をブロック ★★★
-        if not is_goal_test_send_allowed(chatwork_room_id):
-            logger.info(f"🚫 [TEST_GUARD] 送信をブロック: {user_name}さん (room_id={chatwork_room_id})")
-            results['blocked'] = results.get('blocked', 0) + 1
-            continue
+    if dry_run:
+        # send_daily_reminder_to_user と同じく、業務判定の前に全員 skipped
+        candidates = users
+    else:
+        user_ids = [u[0] for u in users]
+        answered = _fetch_answered_user_ids(conn, org_id, user_ids, today)
+        ignored_days = _fetch_ignored_reminder_days(conn, org_id, user_ids)
+
+        candidates = []
+        for user in users:
+            user_id = user[0]
+            if user_id in answered:
+                logger.info(f"既に回答済み: user={user_id}")
+                results['skipped'] += 1
+                continue
+            # 3日以上無視されている場合、月曜日のみ送信（週1回に減頻）
+            days = ignored_days.get(user_id, 0)
+            if days >= 3 and today.weekday() != 0:
+                logger.info(f"連続{days}日無視のため今日はスキップ（月曜のみ送信）: user={user_id}")
+                results['skipped'] += 1
+                continue
+            candidates.append(user)
 
-        # 送信
-        status, error = send_daily_reminder_to_user(
-            conn=conn,
-            user_id=user_id,
-            org_id=org_id,
-            user_name=user_name,
+    notifications = [
+        GoalNotification(
+            recipient_id=user_id,
+            recipient_name=user_name,
             chatwork_room_id=chatwork_room_id,
-            send_message_func=send_message_func,
-            dry_run=dry_run,
+            render=lambda name=user_name: build_daily_reminder_message(name),
         )
+        for user_id, user_name, chatwork_room_id in candidates
+    ]
 
-        results[status] = results.get(status, 0) + 1
+    sent, _ = send_goal_notifications(
+        conn, org_id, GoalNotificationType.DAILY_REMINDER.value, notifications,
+        send_message_func, dry_run=dry_run, dispatcher=dispatcher, label="18時未回答リマインド",
+    )
+    _merge_results(results, sent)
 
     logger.info(f"=== 18時未回答リマインド 完了: success={results['success']}, skipped={results['skipped']}, failed={results['failed']}, blocked={results.get('blocked', 0)} ===")
     return results
 
 
-def scheduled_morning_feedback(conn, org_id: str, send_message_func, dry_run: bool = False) -> Dict[str, int]:
+def scheduled_morning_feedback(
+    conn,
+    org_id: str,
+    send_message_func,
+    dry_run: bool = False,
+    dispatcher: Optional[NotificationDispatcher] = None,
+) -> Dict[str, int]:
     """
     08:00 朝フィードバックの一括送信（個人フィードバック + チームサマリー）
 
+    v11.3.0: 目標・昨日の進捗・部署メンバーをそれぞれ1クエリで取得し、一括通知エンジンで送信
+
     Args:
         conn: データベース接続
         org_id: 組織ID (UUID)
         send_message_func: メッセージ送信関数
         dry_run: ドライランモード
+        dispatcher: 送信に使うディスパッチャー（省略時は共通レートリミッター）
 
     Returns:
         送信結果のサマリー
@@ -1340,79 +1908,31 @@ def scheduled_morning_feedback(conn, org_id: str, send_message_func, dry_run: bo
           AND u.chatwork_room_id IS NOT NULL
     """), {'org_id': org_id, 'yesterday': yesterday})
 
-    users = result.fetchall()
+    users = [(str(u[0]), u[1], u[2]) for u in result.fetchall()]
     logger.info(f"個人フィードバック対象: {len(users)}名")
 
-    for user in users:
-        user_id = str(user[0])
-        user_name = user[1]
-        chatwork_room_id = user[2]
-
-        # ★★★ テストガード: 許可されていないルームへの送信をブロック ★★★
-        if not is_goal_test_send_allowed(chatwork_room_id):
-            logger.info(f"🚫 [TEST_GUARD] 送信をブロック: {user_name}さん (room_id={chatwork_room_id})")
-            results['blocked'] = results.get('blocked', 0) + 1
-            continue
-
-        # ユーザーの目標を取得（期限切れ除外）
-        goals_result = conn.execute(sqlalchemy.text("""
-            SELECT id, title, goal_type, target_value, current_value, unit, deadline
-            FROM goals
-            WHERE user_id = CAST(:user_id AS UUID)
-              AND organization_id = CAST(:org_id AS UUID)
-              AND status = 'active'
-              AND (deadline IS NULL OR deadline >= CURRENT_DATE)
-              AND (period_end IS NULL OR period_end >= CURRENT_DATE)
-            ORDER BY created_at
-        """), {'user_id': user_id, 'org_id': org_id})
-
-        goals = []
-        for g in goals_result.fetchall():
-            goals.append({
-                'id': str(g[0]),
-                'title': g[1],
-                'goal_type': g[2],
-                'target_value': float(g[3]) if g[3] else None,
-                'current_value': float(g[4]) if g[4] else 0,
-                'unit': g[5],
-                'deadline': g[6],
-            })
-
-        # 昨日の進捗データを取得
-        # テナント分離: goals, goal_progressの両方でorg_idフィルタ
-        progress_result = conn.execute(sqlalchemy.text("""
-            SELECT gp.goal_id, gp.value, gp.cumulative_value, gp.daily_note, gp.daily_choice
-            FROM goal_progress gp
-            JOIN goals g ON gp.goal_id = g.id AND gp.organization_id = g.organization_id
-            WHERE g.user_id = CAST(:user_id AS UUID)
-              AND g.organization_id = CAST(:org_id AS UUID)
-              AND gp.organization_id = CAST(:org_id AS UUID)
-              AND gp.progress_date = :yesterday
-        """), {'user_id': user_id, 'org_id': org_id, 'yesterday': yesterday})
-
-        progress_data = {}
-        for p in progress_result.fetchall():
-            progress_data[str(p[0])] = {
-                'value': float(p[1]) if p[1] else 0,
-                'cumulative_value': float(p[2]) if p[2] else 0,
-                'daily_note': p[3],
-                'daily_choice': p[4],
-            }
+    users = _filter_test_guard(users, results)
+    user_ids = [u[0] for u in users]
+    goals_by_user = _fetch_active_goals_by_user(conn, org_id, user_ids)
+    progress_by_user = _fetch_progress_by_user(conn, org_id, user_ids, yesterday)
 
-        # 送信
-        status, error = send_morning_feedback_to_user(
-            conn=conn,
-            user_id=user_id,
-            org_id=org_id,
-            user_name=user_name,
+    notifications = [
+        GoalNotification(
+            recipient_id=user_id,
+            recipient_name=user_name,
             chatwork_room_id=chatwork_room_id,
-            goals=goals,
-            progress_data=progress_data,
-            send_message_func=send_message_func,
-            dry_run=dry_run,
+            render=lambda name=user_name, goals=goals_by_user.get(user_id, []),
+                          progress=progress_by_user.get(user_id, {}):
+                build_morning_feedback_message(name, goals, progress),
         )
+        for user_id, user_name, chatwork_room_id in users
+    ]
 
-        results[status] = results.get(status, 0) + 1
+    sent, _ = send_goal_notifications(
+        conn, org_id, GoalNotificationType.MORNING_FEEDBACK.value, notifications,
+        send_message_func, dry_run=dry_run, dispatcher=dispatcher, label="8時フィードバック",
+    )
+    _merge_results(results, sent)
 
     # =====================================================
     # 2. チームサマリー（チームリーダー・部長向け）
@@ -1433,7 +1953,6 @@ def scheduled_morning_feedback(conn, org_id: str, send_message_func, dry_run: bo
         JOIN departments d ON ud.department_id = d.id AND d.organization_id = CAST(:org_id AS TEXT)
         JOIN roles r ON ud.role_id = r.id
         WHERE u.organization_id = CAST(:org_id AS TEXT)
-          
           AND d.organization_id = CAST(:org_id AS TEXT)
           AND r.name IN ('チームリーダー', '部長', '経営', '代表')
           AND u.chatwork_room_id IS NOT NULL
@@ -1442,81 +1961,47 @@ def scheduled_morning_feedback(conn, org_id: str, send_message_func, dry_run: bo
     leaders = result.fetchall()
     logger.info(f"チームサマリー対象リーダー: {len(leaders)}名")
 
+    allowed_leaders = []
     for leader in leaders:
-        leader_id = str(leader[0])
-        leader_name = leader[1]
-        chatwork_room_id = leader[2]
-        department_id = str(leader[3])
-        department_name = leader[4]
-
         # ★★★ テストガード: 許可されていないルームへの送信をブロック ★★★
-        if not is_goal_test_send_allowed(chatwork_room_id):
-            logger.info(f"🚫 [TEST_GUARD] チームサマリー送信をブロック: {leader_name}さん (room_id={chatwork_room_id})")
+        if not is_goal_test_send_allowed(leader[2]):
+            logger.info(f"🚫 [TEST_GUARD] チームサマリー送信をブロック: {leader[1]}さん (room_id={leader[2]})")
             results['blocked'] = results.get('blocked', 0) + 1
             continue
+        allowed_leaders.append(leader)
 
-        # 部署メンバーの進捗を取得（テナント分離: 全テーブルでorg_idフィルタ）
-        members_result = conn.execute(sqlalchemy.text("""
-            SELECT
-                u.id AS user_id,
-                u.name AS user_name,
-                g.id AS goal_id,
-                g.title,
-                g.goal_type,
-                g.target_value,
-                g.current_value,
-                g.unit
-            FROM users u
-            JOIN user_departments ud ON ud.user_id = u.id
-            JOIN goals g ON g.user_id = u.id AND g.organization_id = CAST(:org_id AS UUID)
-            WHERE u.organization_id = CAST(:org_id AS TEXT)
-              
-              AND ud.department_id = CAST(:department_id AS UUID)
-              AND g.organization_id = CAST(:org_id AS UUID)
-              AND g.status = 'active'
-            ORDER BY u.name, g.created_at
-        """), {'department_id': department_id, 'org_id': org_id})
-
-        # メンバーデータを整形
-        team_members = {}
-        for m in members_result.fetchall():
-            member_id = str(m[0])
-            if member_id not in team_members:
-                team_members[member_id] = {
-                    'user_id': member_id,
-                    'user_name': m[1],
-                    'goals': [],
-                }
-            team_members[member_id]['goals'].append({
-                'id': str(m[2]),
-                'title': m[3],
-                'goal_type': m[4],
-                'target_value': float(m[5]) if m[5] else None,
-                'current_value': float(m[6]) if m[6] else 0,
-                'unit': m[7],
-            })
+    members_by_department = _fetch_department_members(
+        conn, org_id, sorted({str(leader[3]) for leader in allowed_leaders}),
+    )
 
-        team_members_list = list(team_members.values())
+    summaries = []
+    for leader in allowed_leaders:
+        leader_id = str(leader[0])
+        leader_name = leader[1]
+        department_id = str(leader[3])
+        department_name = leader[4]
 
+        team_members_list = members_by_department.get(department_id, [])
         if not team_members_list:
             logger.info(f"チームメンバーなし: {leader_name}さん（{department_name}）")
             continue
 
-        # 送信
-        status, error = send_team_summary_to_leader(
-            conn=conn,
+        summaries.append(GoalNotification(
             recipient_id=leader_id,
-            org_id=org_id,
-            leader_name=leader_name,
-            department_id=department_id,
-            department_name=department_name,
-            chatwork_room_id=chatwork_room_id,
-            team_members=team_members_list,
-            send_message_func=send_message_func,
-            dry_run=dry_run,
-        )
-
-        results[status] = results.get(status, 0) + 1
+            recipient_name=leader_name,
+            chatwork_room_id=leader[2],
+            render=lambda name=leader_name, dept=department_name, members=team_members_list:
+                build_team_summary_message(name, dept, members, yesterday),
+            metadata={"department_id": department_id, "department_name": department_name},
+            context={'team_members': team_members_list},
+        ))
+
+    sent, attempted = send_goal_notifications(
+        conn, org_id, GoalNotificationType.TEAM_SUMMARY.value, summaries,
+        send_message_func, dry_run=dry_run, dispatcher=dispatcher, label="チームサマリー",
+    )
+    _merge_results(results, sent)
+    _record_team_summary_audit_logs(conn, org_id, attempted, today)
 
     logger.info(f"=== 8時朝フィードバック 完了: success={results['success']}, skipped={results['skipped']}, failed={results['failed']}, blocked={results.get('blocked', 0)} ===")
     return results
@@ -0,0 +1,108 @@
+"""
+スレッドセーフなLRUキャッシュ
+
+v11.3.0: プロセス内キャッシュ（PDFページOCR・音声チャンク・区間メモ・
+ChatWorkレスポンス・エンベディング・コンテキスト）の共通部品。
+
+- get / put のたびにエントリを最新側へ移動する
+- max_entries を超えたら最も古いエントリから破棄する
+- 全操作をロックで保護する（len() を含む）
+
+使用例:
+    from lib.lru_cache import LRUCache
+
+    cache: LRUCache[str, dict] = LRUCache(max_entries=256)
+    cache.put("key", {"text": "..."})
+    value = cache.get("key")
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """最大件数付きのLRUキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """値を取得（なければ None）"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """ヒットしたキー → 値"""
+        found: Dict[K, V] = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+        return found
+
+    def put(self, key: K, value: V) -> int:
+        """
+        値を保存
+
+        Returns:
+            上限超過で破棄したエントリ数
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            return self._evict()
+
+    def put_many(self, items: Mapping[K, V]) -> int:
+        """複数の値を保存（破棄したエントリ数を返す）"""
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            return self._evict()
+
+    def pop(self, key: K) -> Optional[V]:
+        """エントリを取り除いて返す（なければ None）"""
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> int:
+        """キーが条件に一致するエントリを破棄し、破棄した件数を返す"""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def items(self) -> List[Tuple[K, V]]:
+        """エントリのスナップショット（古い順。LRU順序は変えない）"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self) -> int:
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+
+__all__ = ["LRUCache"]
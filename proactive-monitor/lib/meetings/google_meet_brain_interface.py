@@ -35,9 +35,11 @@ from lib.meetings.google_meet_drive_client import (
     MAX_DOWNLOAD_BYTES,
 )
 from lib.meetings.minutes_generator import (
-    build_chatwork_minutes_prompt,
     format_chatwork_minutes,
-    CHATWORK_MINUTES_SYSTEM_PROMPT,
+)
+from lib.meetings.hierarchical_minutes import (
+    HierarchicalMinutesGenerator,
+    split_transcript_text,
 )
 from lib.meetings.task_extractor import (
     extract_and_create_tasks,
@@ -176,7 +178,7 @@ class GoogleMeetBrainInterface:
                 )
 
             # Step 4: PII除去
-            sanitized_text = self.sanitizer.sanitize(transcript_text)
+            sanitized_text, _ = self.sanitizer.sanitize(transcript_text)
 
             # Step 5: DB保存（MeetingDB の正しいAPI順序）
             source_recording_id = recording.file_id
@@ -423,26 +425,20 @@ class GoogleMeetBrainInterface:
             フォーマット済み議事録テキスト。失敗時はNone。
         """
         try:
-            # C-1修正: meeting_dateはbuild_chatwork_minutes_promptの引数に存在しない
-            prompt = build_chatwork_minutes_prompt(transcript_text, meeting_title)
-
-            # C-2修正: async/sync callable を判別して適切に呼ぶ（Zoomと同パターン）
-            if asyncio.iscoroutinefunction(get_ai_response_func):
-                raw_minutes = await get_ai_response_func(
-                    prompt,
-                    system_prompt=CHATWORK_MINUTES_SYSTEM_PROMPT,
-                )
-            else:
-                raw_minutes = await asyncio.to_thread(
-                    get_ai_response_func,
-                    prompt,
-                    system_prompt=CHATWORK_MINUTES_SYSTEM_PROMPT,
-                )
+            # v11.3.0: 長い録画は区間ごとに要点を抽出してから統合する（Zoomと同パターン）
+            # async/sync callable の判別は HierarchicalMinutesGenerator 側で行う
+            generator = HierarchicalMinutesGenerator(get_ai_response_func)
+            raw_minutes = await generator.generate(
+                split_transcript_text(transcript_text),
+                meeting_title,
+                transcript_text=transcript_text,
+            )
 
             if not raw_minutes:
                 return None
 
-            formatted = format_chatwork_minutes(raw_minutes, meeting_title, meeting_date)
+            # meeting_dateはformat_chatwork_minutesの引数に存在しない
+            formatted = format_chatwork_minutes(raw_minutes, meeting_title)
 
             # DB更新: status="completed", brain_approved=True
             await asyncio.to_thread(
@@ -27,9 +27,12 @@ from lib.meetings.transcript_sanitizer import TranscriptSanitizer
 from lib.meetings.zoom_api_client import ZoomAPIClient, create_zoom_client_from_secrets
 from lib.meetings.vtt_parser import parse_vtt, VTTTranscript
 from lib.meetings.minutes_generator import (
-    build_chatwork_minutes_prompt,
     format_chatwork_minutes,
-    CHATWORK_MINUTES_SYSTEM_PROMPT,
+)
+from lib.meetings.hierarchical_minutes import (
+    HierarchicalMinutesGenerator,
+    split_transcript,
+    split_transcript_text,
 )
 from lib.meetings.docs_brain_integration import (
     create_meeting_docs_publisher,
@@ -269,6 +272,7 @@ class ZoomBrainInterface:
                     sanitized_text,
                     resolved_title,
                     get_ai_response_func,
+                    vtt_transcript=vtt_transcript,
                 )
 
             # Step 8: 録画URL取得
@@ -578,26 +582,29 @@ class ZoomBrainInterface:
         sanitized_text: str,
         title: str,
         get_ai_response_func: Callable,
+        vtt_transcript: Optional[VTTTranscript] = None,
     ) -> Optional[str]:
         """Generate lecture-style minutes using LLM (Vision 12.2.4 format).
 
         Returns plain text with ■主題（00:00〜）sections,
         not JSON-structured MeetingMinutes.
+
+        v11.3.0: Long recordings are split by speaker turns / time windows
+        and summarised map-reduce style (see hierarchical_minutes).
         """
         try:
-            prompt = build_chatwork_minutes_prompt(sanitized_text, title)
-
-            if asyncio.iscoroutinefunction(get_ai_response_func):
-                response = await get_ai_response_func(
-                    prompt,
-                    system_prompt=CHATWORK_MINUTES_SYSTEM_PROMPT,
-                )
+            if vtt_transcript is not None and vtt_transcript.segments:
+                chunks = split_transcript(vtt_transcript)
+                # チャンク本文もLLMに渡す前にPII除去する
+                for chunk in chunks:
+                    chunk.text, _ = self.sanitizer.sanitize(chunk.text)
             else:
-                response = await asyncio.to_thread(
-                    get_ai_response_func,
-                    prompt,
-                    system_prompt=CHATWORK_MINUTES_SYSTEM_PROMPT,
-                )
+                chunks = split_transcript_text(sanitized_text)
+
+            generator = HierarchicalMinutesGenerator(get_ai_response_func)
+            response = await generator.generate(
+                chunks, title, transcript_text=sanitized_text,
+            )
 
             if response:
                 return response
@@ -10,6 +10,9 @@ from sqlalchemy import bindparam  # v6.8.3: expanding IN対応
 import json
 from functools import lru_cache
 import traceback
+import threading  # v11.3.0: ルーム並列同期用
+from concurrent.futures import ThreadPoolExecutor  # v11.3.0: ルーム並列同期用
+from contextlib import contextmanager  # v11.3.0: 要約キューのDB接続管理用
 import hmac  # v6.8.9: Webhook署名検証用
 import hashlib  # v6.8.9: Webhook署名検証用
 import base64  # v6.8.9: Webhook署名検証用
@@ -23,6 +26,8 @@ from google import genai  # v10.8.1: Gemini APIでタスク要約
 from lib.db import get_db_pool as _lib_get_db_pool, get_db_connection as _lib_get_db_connection
 from lib.secrets import get_secret_cached as _lib_get_secret
 from lib.config import get_settings
+from lib.chatwork_transport import Priority, get_chatwork_transport  # v11.3.0: 共通ChatWorkトランスポート
+from lib.lru_cache import LRUCache  # v11.3.0: 要約のプロセス内キャッシュ
 
 # =====================================================
 # v10.14.1: lib/共通ライブラリからインポート
@@ -1021,24 +1026,16 @@ def generate_task_summary_with_anthropic(clean_body: str, max_length: int = 40)
 TASK_SUMMARY_MAX_LENGTH = 40
 
 
-def generate_task_summary(task_body: str) -> str:
+def resolve_task_summary_locally(task_body: str):
     """
-    タスクの本文をAIで要約する
-
-    ★★★ v10.14.0: 件名優先抽出 + バリデーション追加 ★★★
-    ★★★ v10.9.0: Gemini 3 Flash + 40文字 + 途切れ防止 ★★★
-
-    優先順位:
-    1. 【...】形式の件名（最優先）
-    2. Gemini 3 Flash（メイン）
-    3. Anthropic Claude Haiku（フォールバック）
-    4. ルールベース切り詰め（最終手段）
+    LLMを呼ばずに確定できる要約を返す（確定できなければNone）
 
-    Args:
-        task_body: タスクの本文
+    ★★★ v11.3.0: generate_task_summary から分離 ★★★
+    同期処理ではこの結果だけを即時に使い、残りは要約キューに回す。
 
-    Returns:
-        要約（40文字以内、完結した文）
+    1. 本文が空 → 「（タスク内容なし）」
+    2. 【...】形式の件名（v10.14.0）
+    3. 挨拶を除いた本文が最大文字数以内で有効（v10.14.0）
     """
     max_length = TASK_SUMMARY_MAX_LENGTH
 
@@ -1049,18 +1046,12 @@ def generate_task_summary(task_body: str) -> str:
     if not clean_body:
         return "（タスク内容なし）"
 
-    # =====================================================
-    # v10.14.0: 件名を優先抽出
-    # =====================================================
     # 【...】形式の件名があれば優先使用
     subject = extract_task_subject(task_body)  # 元の本文から抽出（タグ除去前）
     if subject and len(subject) <= max_length:
         print(f"📝 件名を抽出: {subject}")
         return subject
 
-    # =====================================================
-    # v10.14.0: 短いテキストでも挨拶チェック
-    # =====================================================
     # 本文が短くても、挨拶が残っている可能性があるのでチェック
     if len(clean_body) <= max_length:
         # 有効なコンテンツがあればそのまま返す
@@ -1069,6 +1060,37 @@ def generate_task_summary(task_body: str) -> str:
         # 挨拶のみの場合はAIで要約を試みる
         print(f"⚠️ 短いテキストだが挨拶のみの可能性、AI要約を実行")
 
+    return None
+
+
+def generate_task_summary(task_body: str) -> str:
+    """
+    タスクの本文をAIで要約する
+
+    ★★★ v10.14.0: 件名優先抽出 + バリデーション追加 ★★★
+    ★★★ v10.9.0: Gemini 3 Flash + 40文字 + 途切れ防止 ★★★
+
+    優先順位:
+    1. 【...】形式の件名（最優先）
+    2. Gemini 3 Flash（メイン）
+    3. Anthropic Claude Haiku（フォールバック）
+    4. ルールベース切り詰め（最終手段）
+
+    Args:
+        task_body: タスクの本文
+
+    Returns:
+        要約（40文字以内、完結した文）
+    """
+    max_length = TASK_SUMMARY_MAX_LENGTH
+
+    # v11.3.0: LLMを使わずに確定できる要約（空本文・件名・短文）
+    local_summary = resolve_task_summary_locally(task_body)
+    if local_summary:
+        return local_summary
+
+    clean_body = clean_task_body_for_summary(task_body)
+
     # 1. Gemini で要約を試みる（メイン）
     summary = generate_task_summary_with_gemini(clean_body, max_length)
     if summary and validate_summary(summary, task_body):
@@ -1123,6 +1145,460 @@ def _truncate_text_safely(text: str, max_length: int) -> str:
     return truncated[:max_length - 3] + "..."
 
 
+# =====================================================
+# v11.3.0: タスク要約の遅延・バッチ生成パイプライン
+# =====================================================
+# Before: 同期ループ内でタスクごとに generate_task_summary() を呼び、
+#   バックフィル/再生成は time.sleep() を挟んで1件ずつLLMを呼んでいた
+#   → 多数のタスクが同時に変更されると同期が数分かかり、LLMコストも件数に比例
+# After:
+#   1. 同期はLLM不要な要約（件名・短文）だけを即時に確定し、残りは
+#      task_summary_queue に task_id を積むだけ
+#   2. /process-summary-queue のワーカーが複数本文を1リクエストで要約
+#      （SUMMARY_BATCH_SIZE件/プロンプト、SUMMARY_MAX_CONCURRENCY並列）
+#   3. 本文のSHA-256で要約をキャッシュ（プロセス内LRU + task_summary_cache）
+#      → 定型タスクや同一本文の再同期ではLLMを呼ばない
+# =====================================================
+
+# 1回のLLMリクエストで要約する本文数
+SUMMARY_BATCH_SIZE = int(os.environ.get("SUMMARY_BATCH_SIZE", "20"))
+
+# LLMリクエストの同時実行数
+SUMMARY_MAX_CONCURRENCY = int(os.environ.get("SUMMARY_MAX_CONCURRENCY", "4"))
+
+# ワーカー1回で処理するキュー件数
+SUMMARY_QUEUE_DRAIN_LIMIT = 200
+
+# キュー項目の最大試行回数（超えたものはキューから外す。要約が未設定・低品質のままなら次の同期で再エンキューされる）
+SUMMARY_QUEUE_MAX_ATTEMPTS = 3
+
+# プロセス内キャッシュの最大件数
+SUMMARY_CACHE_MAX_ENTRIES = 4096
+
+# プロセス内の要約キャッシュ（本文ハッシュ → 要約）
+_summary_cache: LRUCache[str, str] = LRUCache(SUMMARY_CACHE_MAX_ENTRIES)
+
+
+def task_body_hash(body) -> str:
+    """要約キャッシュ・キュー用の本文ハッシュ（SHA-256）"""
+    return hashlib.sha256((body or "").encode("utf-8")).hexdigest()
+
+
+def clear_summary_cache() -> None:
+    """プロセス内の要約キャッシュをクリア"""
+    _summary_cache.clear()
+
+
+def _normalize_batch_summary(summary, max_length: int):
+    """バッチ応答の1件を整形（不正・短すぎる場合はNone）"""
+    if not isinstance(summary, str):
+        return None
+    summary = summary.strip().strip('"\'「」')
+    if '\n' in summary:
+        summary = summary.split('\n')[0].strip()
+    if len(summary) < 10:
+        return None
+    if len(summary) > max_length:
+        summary = _ensure_complete_summary(summary, max_length)
+    return summary
+
+
+def generate_task_summaries_batch_with_gemini(clean_bodies, max_length: int = 40, retry_count: int = 0):
+    """
+    複数のタスク本文を1回のGeminiリクエストで要約する
+
+    ★★★ v11.3.0: 新規追加 ★★★
+
+    Args:
+        clean_bodies: タグ除去済みのタスク本文のリスト
+        max_length: 最大文字数（デフォルト40）
+        retry_count: リトライ回数（内部使用）
+
+    Returns:
+        入力と同じ順序の要約リスト（失敗した項目はNone）
+    """
+    if not clean_bodies:
+        return []
+
+    failed = [None] * len(clean_bodies)
+    api_key = get_google_ai_api_key()
+    if not api_key:
+        print("⚠️ GOOGLE_AI_API_KEY が設定されていません")
+        return failed
+
+    MAX_RATE_RETRIES = 3
+    if retry_count >= MAX_RATE_RETRIES:
+        print(f"⚠️ Gemini リトライ上限到達 ({MAX_RATE_RETRIES}回)")
+        return failed
+
+    items = "\n\n".join(
+        f"[{i}]\n{body[:500]}" for i, body in enumerate(clean_bodies)
+    )
+    prompt = f"""あなたはタスク管理アシスタントです。
+以下の{len(clean_bodies)}件のタスク本文それぞれについて、「何をすべきか」を{max_length}文字以内の日本語で要約してください。
+
+【絶対に守るルール】
+1. 各要約は{max_length}文字以内で必ず文を完結させる
+2. 途中で途切れる表現は絶対にNG（例: 「～を確認し…」はダメ）
+3. 「確認」「依頼」「対応」「作成」「報告」「共有」など動作で終わる
+4. 挨拶や定型文（お疲れ様です、よろしくお願いします等）は完全に無視する
+5. 【...】形式の件名があればそれを優先使用
+6. 出力は要約文字列のJSON配列のみ。要素数は{len(clean_bodies)}件、[0]から順に並べる
+
+タスク本文:
+{items}
+
+JSON配列:"""
+
+    try:
+        client = genai.Client(api_key=api_key)
+        response = client.models.generate_content(
+            model="gemini-3-flash-preview",
+            contents=prompt,
+            config={
+                "max_output_tokens": 80 * len(clean_bodies),
+                "temperature": 0.1,
+                "response_mime_type": "application/json",
+            }
+        )
+        summaries = json.loads(response.text)
+        if not isinstance(summaries, list) or len(summaries) != len(clean_bodies):
+            print(f"⚠️ バッチ要約の件数不一致: expected={len(clean_bodies)}")
+            return failed
+        return [_normalize_batch_summary(s, max_length) for s in summaries]
+
+    except Exception as e:
+        error_str = str(e)
+        if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+            wait_time = 5 * (2 ** retry_count)
+            print(f"⚠️ Gemini レート制限、{wait_time}秒待機後リトライ ({retry_count + 1}/{MAX_RATE_RETRIES})")
+            time.sleep(wait_time)
+            return generate_task_summaries_batch_with_gemini(clean_bodies, max_length, retry_count + 1)
+
+        print(f"⚠️ Geminiバッチ要約生成に失敗: {type(e).__name__}")
+        return failed
+
+
+def _summarize_batch(bodies):
+    """
+    1バッチ分の本文を要約（バッチ応答が無効な項目は個別の generate_task_summary にフォールバック）
+    """
+    clean_bodies = [clean_task_body_for_summary(body) for body in bodies]
+    batch = generate_task_summaries_batch_with_gemini(clean_bodies, TASK_SUMMARY_MAX_LENGTH)
+
+    summaries = []
+    for body, summary in zip(bodies, batch):
+        if not (summary and validate_summary(summary, body)):
+            summary = generate_task_summary(body)
+        summaries.append(summary)
+    return summaries
+
+
+def summarize_task_bodies(bodies, known_summaries=None):
+    """
+    複数のタスク本文を要約する（ローカル確定 → キャッシュ → バッチLLM）
+
+    同一本文は1回だけ要約し、生成結果はプロセス内キャッシュに保存する。
+
+    Args:
+        bodies: タスク本文のリスト
+        known_summaries: 永続キャッシュから取得済みの {本文ハッシュ: 要約}
+
+    Returns:
+        入力と同じ順序の要約リスト
+    """
+    known_summaries = known_summaries or {}
+    results = [None] * len(bodies)
+    pending = {}  # 本文ハッシュ → (本文, [インデックス])
+
+    for i, body in enumerate(bodies):
+        local_summary = resolve_task_summary_locally(body)
+        if local_summary:
+            results[i] = local_summary
+            continue
+
+        body_hash = task_body_hash(body)
+        cached = known_summaries.get(body_hash) or _summary_cache.get(body_hash)
+        if cached:
+            results[i] = cached
+            continue
+
+        pending.setdefault(body_hash, (body, []))[1].append(i)
+
+    if not pending:
+        return results
+
+    hashes = list(pending.keys())
+    batches = [hashes[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(hashes), SUMMARY_BATCH_SIZE)]
+    print(f"🧠 バッチ要約: {len(hashes)}件 / {len(batches)}リクエスト")
+
+    def _run(batch_hashes):
+        return batch_hashes, _summarize_batch([pending[h][0] for h in batch_hashes])
+
+    workers = max(1, min(SUMMARY_MAX_CONCURRENCY, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task-summary") as executor:
+        for batch_hashes, summaries in executor.map(_run, batches):
+            for body_hash, summary in zip(batch_hashes, summaries):
+                _summary_cache.put(body_hash, summary)
+                for i in pending[body_hash][1]:
+                    results[i] = summary
+
+    return results
+
+
+def _load_cached_summaries(cursor, body_hashes):
+    """永続キャッシュから要約を取得（{本文ハッシュ: 要約}）"""
+    if not body_hashes:
+        return {}
+    try:
+        cursor.execute("""
+            SELECT body_hash, summary FROM task_summary_cache
+            WHERE organization_id = %s
+              AND body_hash = ANY(%s)
+        """, (_ORGANIZATION_ID, list(body_hashes)))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    except Exception as e:
+        print(f"⚠️ 要約キャッシュ取得エラー（LLMで生成）: {type(e).__name__}")
+        return {}
+
+
+def _store_cached_summaries(cursor, summaries_by_hash) -> None:
+    """永続キャッシュに要約を保存"""
+    if not summaries_by_hash:
+        return
+    hashes = list(summaries_by_hash.keys())
+    cursor.execute("""
+        INSERT INTO task_summary_cache (organization_id, body_hash, summary)
+        SELECT %s, h, s FROM unnest(%s::text[], %s::text[]) AS v(h, s)
+        ON CONFLICT (organization_id, body_hash) DO NOTHING
+    """, (_ORGANIZATION_ID, hashes, [summaries_by_hash[h] for h in hashes]))
+
+
+def _bulk_update_summaries(cursor, task_ids, summaries, body_hashes) -> None:
+    """
+    chatwork_tasks.summary を1クエリで更新
+
+    要約の元になった本文（body_hashes）と現在の本文が一致する行だけを更新する。
+    LLMの要約中に同期で本文が変わった場合、古い本文の要約で上書きしない。
+    """
+    if not task_ids:
+        return
+    cursor.execute("""
+        UPDATE chatwork_tasks t
+        SET summary = v.summary
+        FROM unnest(%s::bigint[], %s::text[], %s::text[]) AS v(task_id, summary, body_hash)
+        WHERE t.task_id = v.task_id
+          AND t.organization_id = %s
+          AND encode(sha256(convert_to(COALESCE(t.body, ''), 'UTF8')), 'hex') = v.body_hash
+    """, (list(task_ids), list(summaries), list(body_hashes), _ORGANIZATION_ID))
+
+
+def _store_summaries(cursor, task_ids, body_hashes, summaries, known) -> None:
+    """要約を chatwork_tasks（本文が変わっていない行のみ）と永続キャッシュに反映する"""
+    _bulk_update_summaries(cursor, task_ids, summaries, body_hashes)
+    new_entries = {
+        h: summary for h, summary in zip(body_hashes, summaries)
+        if h not in known and summary
+    }
+    try:
+        _store_cached_summaries(cursor, new_entries)
+    except Exception as e:
+        print(f"⚠️ 要約キャッシュ保存エラー（処理は継続）: {type(e).__name__}")
+
+
+def _summarize_and_store(cursor, task_ids, bodies):
+    """
+    本文を要約して chatwork_tasks と永続キャッシュに反映する
+
+    Returns:
+        要約のリスト（task_idsと同じ順序）
+    """
+    hashes = [task_body_hash(body) for body in bodies]
+    known = _load_cached_summaries(cursor, set(hashes))
+    summaries = summarize_task_bodies(bodies, known_summaries=known)
+    _store_summaries(cursor, task_ids, hashes, summaries, known)
+    return summaries
+
+
+def enqueue_task_summaries(cursor, tasks) -> int:
+    """
+    要約生成キューにタスクを積む（同期処理から呼ばれる）
+
+    同じタスクが既にキューにある場合は本文ハッシュを更新し、
+    本文が変わっていれば試行回数をリセットする。
+
+    Args:
+        cursor: DBカーソル
+        tasks: (task_id, body) のリスト
+
+    Returns:
+        キューに積んだ件数
+    """
+    if not tasks:
+        return 0
+    task_ids = [task_id for task_id, _ in tasks]
+    hashes = [task_body_hash(body) for _, body in tasks]
+    cursor.execute("""
+        INSERT INTO task_summary_queue (organization_id, task_id, body_hash)
+        SELECT %s, v.task_id, v.body_hash
+        FROM unnest(%s::bigint[], %s::text[]) AS v(task_id, body_hash)
+        ON CONFLICT (organization_id, task_id) DO UPDATE
+        SET body_hash = EXCLUDED.body_hash,
+            enqueued_at = CURRENT_TIMESTAMP,
+            attempts = CASE
+                WHEN task_summary_queue.body_hash = EXCLUDED.body_hash
+                THEN task_summary_queue.attempts
+                ELSE 0
+            END
+    """, (_ORGANIZATION_ID, task_ids, hashes))
+    return len(tasks)
+
+
+def discard_task_summaries(cursor, task_ids) -> None:
+    """
+    要約生成キューからタスクを外す（同期処理から呼ばれる）
+
+    本文が変わり、新しい要約をローカルで確定できた場合に使う。
+    古い本文で積まれた項目をワーカーが処理しないようにする。
+    """
+    if not task_ids:
+        return
+    cursor.execute("""
+        DELETE FROM task_summary_queue
+        WHERE organization_id = %s
+          AND task_id = ANY(%s)
+    """, (_ORGANIZATION_ID, list(task_ids)))
+
+
+@contextmanager
+def _db_cursor(connect):
+    """接続とカーソルを開き、終了時に閉じる（コミットは呼び出し側で行う）"""
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        yield conn, cursor
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _claim_summary_queue(conn, cursor, limit: int):
+    """
+    要約生成キューから処理対象を取り出す（試行回数を加算してコミットする）
+
+    - 試行回数の上限に達した項目は削除する
+    - 削除済みタスク、エンキュー後に本文が変わった（古いハッシュの）項目は削除する
+
+    Returns:
+        (tasks, known, counts)
+        tasks: (task_id, body, body_hash) のリスト
+        known: 永続キャッシュから取得済みの {本文ハッシュ: 要約}
+        counts: {"exhausted": int, "stale": int}
+    """
+    cursor.execute("""
+        DELETE FROM task_summary_queue
+        WHERE organization_id = %s
+          AND attempts >= %s
+    """, (_ORGANIZATION_ID, SUMMARY_QUEUE_MAX_ATTEMPTS))
+    exhausted = max(cursor.rowcount or 0, 0)
+
+    cursor.execute("""
+        SELECT q.task_id, q.body_hash, t.body, t.task_id IS NOT NULL AS task_exists
+        FROM task_summary_queue q
+        LEFT JOIN chatwork_tasks t
+          ON t.task_id = q.task_id
+         AND t.organization_id = q.organization_id
+        WHERE q.organization_id = %s
+          AND q.attempts < %s
+        ORDER BY q.enqueued_at ASC
+        LIMIT %s
+    """, (_ORGANIZATION_ID, SUMMARY_QUEUE_MAX_ATTEMPTS, limit))
+    rows = cursor.fetchall()
+
+    tasks = []
+    dropped = []  # (task_id, queued_hash)
+    for task_id, queued_hash, body, exists in rows:
+        if exists and task_body_hash(body) == queued_hash:
+            tasks.append((task_id, body, queued_hash))
+        else:
+            dropped.append((task_id, queued_hash))
+
+    if dropped:
+        # 取り出し後に再エンキュー（ハッシュ更新）されたものは残す
+        cursor.execute("""
+            DELETE FROM task_summary_queue q
+            USING unnest(%s::bigint[], %s::text[]) AS d(task_id, body_hash)
+            WHERE q.organization_id = %s
+              AND q.task_id = d.task_id
+              AND q.body_hash = d.body_hash
+        """, ([d[0] for d in dropped], [d[1] for d in dropped], _ORGANIZATION_ID))
+
+    known = {}
+    if tasks:
+        # 途中で失敗しても無限に再試行しないよう、先に試行回数を加算してコミット
+        cursor.execute("""
+            UPDATE task_summary_queue
+            SET attempts = attempts + 1
+            WHERE organization_id = %s
+              AND task_id = ANY(%s)
+        """, (_ORGANIZATION_ID, [task_id for task_id, _, _ in tasks]))
+        known = _load_cached_summaries(cursor, {h for _, _, h in tasks})
+    conn.commit()
+
+    return tasks, known, {"exhausted": exhausted, "stale": len(dropped)}
+
+
+def process_task_summary_queue(limit: int = SUMMARY_QUEUE_DRAIN_LIMIT, connect=None) -> dict:
+    """
+    要約生成キューを処理する（ワーカー）
+
+    LLMの要約中はDB接続を保持しない。
+    取り出し（コミットして接続を返却）→ 要約 → 別の接続で書き込み、の順に処理する。
+    書き込みは要約の元になった本文が変わっていない行・キュー項目だけに反映する。
+
+    Args:
+        limit: 処理する最大件数
+        connect: DB接続を返す関数（デフォルト get_db_connection）
+
+    Returns:
+        処理結果の辞書 {"total": int, "success": int, "failed": int, "stale": int, "exhausted": int}
+    """
+    connect = connect or get_db_connection
+
+    with _db_cursor(connect) as (conn, cursor):
+        tasks, known, counts = _claim_summary_queue(conn, cursor, limit)
+
+    result = {"total": len(tasks), "success": 0, "failed": 0, **counts}
+    if not tasks:
+        print(f"📊 要約キュー処理完了: {result}")
+        return result
+
+    task_ids = [task_id for task_id, _, _ in tasks]
+    hashes = [body_hash for _, _, body_hash in tasks]
+    try:
+        summaries = summarize_task_bodies([body for _, body, _ in tasks], known_summaries=known)
+
+        with _db_cursor(connect) as (conn, cursor):
+            _store_summaries(cursor, task_ids, hashes, summaries, known)
+            # 処理中に本文が変わって再エンキューされたものは残す
+            cursor.execute("""
+                DELETE FROM task_summary_queue q
+                USING unnest(%s::bigint[], %s::text[]) AS d(task_id, body_hash)
+                WHERE q.organization_id = %s
+                  AND q.task_id = d.task_id
+                  AND q.body_hash = d.body_hash
+            """, (task_ids, hashes, _ORGANIZATION_ID))
+            conn.commit()
+        result["success"] = len(tasks)
+    except Exception as e:
+        # 書き込み前に接続を閉じるため、未コミットの変更は破棄される
+        print(f"❌ 要約キュー処理失敗: {type(e).__name__}")
+        result["failed"] = len(tasks)
+
+    print(f"📊 要約キュー処理完了: {result}")
+    return result
+
+
 def backfill_task_summaries(conn, cursor, limit: int = 50) -> dict:
     """
     既存タスクの要約を一括生成する（NULLのみ）
@@ -1146,30 +1622,22 @@ def backfill_task_summaries(conn, cursor, limit: int = 50) -> dict:
     tasks = cursor.fetchall()
 
     result = {"total": len(tasks), "success": 0, "failed": 0}
+    if not tasks:
+        return result
 
-    for task_id, body in tasks:
+    # ★★★ v11.3.0: 1件ずつのLLM呼び出し + sleep を廃止し、バッチ要約で一括更新 ★★★
+    try:
+        _summarize_and_store(cursor, [t[0] for t in tasks], [t[1] for t in tasks])
+        conn.commit()
+        result["success"] = len(tasks)
+        print(f"✅ 要約生成完了: {len(tasks)}件")
+    except Exception as e:
+        print(f"❌ 要約生成失敗: error={type(e).__name__}")
+        result["failed"] = len(tasks)
         try:
-            summary = generate_task_summary(body)
-            cursor.execute("""
-                UPDATE chatwork_tasks
-                SET summary = %s
-                WHERE task_id = %s
-                  AND organization_id = %s
-            """, (summary, task_id, _ORGANIZATION_ID))
-            conn.commit()
-            result["success"] += 1
-            print(f"✅ 要約生成完了: task_id={task_id}")
-
-            # レート制限対策で少し待つ
-            time.sleep(0.3)
-
-        except Exception as e:
-            print(f"❌ 要約生成失敗: task_id={task_id}, error={e}")
-            result["failed"] += 1
-            try:
-                conn.rollback()
-            except Exception:
-                pass
+            conn.rollback()
+        except Exception:
+            pass
 
     return result
 
@@ -1238,28 +1706,15 @@ def regenerate_all_summaries(conn, cursor, offset: int = 0, limit: int = 50) ->
 
     print(f"📊 再生成バッチ開始: offset={offset}, limit={limit}, 取得件数={len(tasks)}, 全件数={total_count}")
 
-    for task_id, body in tasks:
+    # ★★★ v11.3.0: 1件ずつのLLM呼び出し + sleep(5) を廃止し、バッチ要約で一括更新 ★★★
+    if tasks:
         try:
-            summary = generate_task_summary(body)
-            cursor.execute("""
-                UPDATE chatwork_tasks
-                SET summary = %s
-                WHERE task_id = %s
-                  AND organization_id = %s
-            """, (summary, task_id, _ORGANIZATION_ID))
+            _summarize_and_store(cursor, [t[0] for t in tasks], [t[1] for t in tasks])
             conn.commit()
-            result["success"] += 1
-            # 要約が長い場合は30文字で切る
-            summary_preview = summary[:30] + "..." if len(summary) > 30 else summary
-            print(f"✅ [{offset + result['success']}/{total_count}] task_id={task_id}, summary={summary_preview}")
-
-            # v10.8.2: レート制限対策（Gemini課金版: 1000+ RPM）
-            # 5秒間隔で十分
-            time.sleep(5)
-
+            result["success"] = len(tasks)
         except Exception as e:
-            print(f"❌ 要約再生成失敗: task_id={task_id}, error={e}")
-            result["failed"] += 1
+            print(f"❌ 要約再生成失敗: error={type(e).__name__}")
+            result["failed"] = len(tasks)
             try:
                 conn.rollback()
             except Exception:
@@ -1334,53 +1789,61 @@ def regenerate_bad_summaries(
 
     print(f"📊 低品質要約チェック開始: org={organization_id}, offset={offset}, limit={limit}, チェック件数={len(tasks)}")
 
+    # 現在の要約が有効かチェック
+    bad_tasks = []
     for task_id, body, current_summary in tasks:
         try:
-            # 現在の要約が有効かチェック
             if validate_summary(current_summary, body):
                 continue  # 有効な要約はスキップ
+        except Exception as e:
+            print(f"❌ 処理エラー: task_id={task_id}, error={type(e).__name__}")
+            result["failed"] += 1
+            continue
 
-            # 低品質要約を発見
-            result["bad_found"] += 1
-            summary_preview = current_summary[:30] if current_summary else ""
-            print(f"🔍 低品質要約発見: task_id={task_id}, summary='{summary_preview}...'")
-
-            # 再生成
-            new_summary = generate_task_summary(body)
-            if new_summary and validate_summary(new_summary, body):
-                # v10.14.1: 冪等性チェック - 同一要約ならスキップ
-                if new_summary.strip() == (current_summary or "").strip():
-                    result["skipped_same"] += 1
-                    print(f"⏭️ 冪等性スキップ: task_id={task_id}（新旧要約同一）")
-                    continue
+        # 低品質要約を発見
+        result["bad_found"] += 1
+        summary_preview = current_summary[:30] if current_summary else ""
+        print(f"🔍 低品質要約発見: task_id={task_id}, summary='{summary_preview}...'")
+        bad_tasks.append((task_id, body, current_summary))
+
+    # ★★★ v11.3.0: 低品質分をまとめてバッチ要約（sleep(3)を廃止）★★★
+    new_summaries = summarize_task_bodies([body for _, body, _ in bad_tasks]) if bad_tasks else []
+
+    update_ids = []
+    update_summaries = []
+    update_hashes = []
+    for (task_id, body, current_summary), new_summary in zip(bad_tasks, new_summaries):
+        if new_summary and validate_summary(new_summary, body):
+            # v10.14.1: 冪等性チェック - 同一要約ならスキップ
+            if new_summary.strip() == (current_summary or "").strip():
+                result["skipped_same"] += 1
+                print(f"⏭️ 冪等性スキップ: task_id={task_id}（新旧要約同一）")
+                continue
 
-                # v10.14.3: organization_idフィルタ復活
-                cursor.execute("""
-                    UPDATE chatwork_tasks
-                    SET summary = %s
-                    WHERE task_id = %s
-                      AND organization_id = %s
-                """, (new_summary, task_id, _ORGANIZATION_ID))
-                conn.commit()
-                result["regenerated"] += 1
-                print(f"✅ 再生成成功: task_id={task_id}, new_summary='{new_summary}'")
-
-                # v10.14.1: 監査ログ用に記録
-                audit_items.append({
-                    "task_id": str(task_id),
-                    "old_summary": current_summary[:50] if current_summary else None,
-                    "new_summary": new_summary[:50] if new_summary else None,
-                })
-            else:
-                result["failed"] += 1
-                print(f"⚠️ 再生成でも低品質: task_id={task_id}")
+            update_ids.append(task_id)
+            update_summaries.append(new_summary)
+            update_hashes.append(task_body_hash(body))
+            print(f"✅ 再生成成功: task_id={task_id}, new_summary='{new_summary}'")
 
-            # レート制限対策
-            time.sleep(3)
+            # v10.14.1: 監査ログ用に記録
+            audit_items.append({
+                "task_id": str(task_id),
+                "old_summary": current_summary[:50] if current_summary else None,
+                "new_summary": new_summary[:50] if new_summary else None,
+            })
+        else:
+            result["failed"] += 1
+            print(f"⚠️ 再生成でも低品質: task_id={task_id}")
 
+    if update_ids:
+        try:
+            _bulk_update_summaries(cursor, update_ids, update_summaries, update_hashes)
+            conn.commit()
+            result["regenerated"] = len(update_ids)
         except Exception as e:
-            print(f"❌ 処理エラー: task_id={task_id}, error={e}")
-            result["failed"] += 1
+            print(f"❌ 要約更新エラー: error={type(e).__name__}")
+            result["failed"] += len(update_ids)
+            audit_items = []
             try:
                 conn.rollback()
             except Exception:
@@ -1534,9 +1997,11 @@ DEADLINE_ALERT_DAYS = {
 # =====================================================
 # ChatWork APIレート制限: 300回/5分
 # 対策:
-#   1. 429エラー時の自動リトライ（指数バックオフ）
+#   1. 429エラー時の自動リトライ（v11.3.0: Retry-After に従う）
 #   2. APIコール数の監視・ログ出力
 #   3. ルームメンバーキャッシュ
+#   4. v11.3.0: lib/chatwork_transport.py の共通トランスポート経由で呼び出す
+#      （x-ratelimit-* 連動のレート予算・BATCHレーン・同一GETの合流・TTLキャッシュ）
 # =====================================================
 
 
@@ -1546,9 +2011,12 @@ class APICallCounter:
     def __init__(self):
         self.count = 0
         self.start_time = time.time()
+        # v11.3.0: ルーム並列同期で複数スレッドから呼ばれる
+        self._lock = threading.Lock()
 
     def increment(self):
-        self.count += 1
+        with self._lock:
+            self.count += 1
 
     def get_count(self):
         return self.count
@@ -1595,6 +2063,12 @@ def call_chatwork_api_with_retry(
     """
     ChatWork APIを呼び出す（レート制限時は自動リトライ）
 
+    v11.3.0: 共通トランスポートの BATCH レーンで送信する。
+    レート予算はプロセス内の並列スレッドと、x-ratelimit-* ヘッダー経由で
+    他サービス（chatwork-webhook等）の使用分も含めて共有し、
+    ライブ返信用の予約枠には手を付けない。
+    429 は Retry-After（無ければ60秒）待って再試行する。
+
     Args:
         method: HTTPメソッド（GET, POST, PUT, DELETE）
         url: APIのURL
@@ -1602,67 +2076,52 @@ def call_chatwork_api_with_retry(
         data: リクエストボディ
         params: クエリパラメータ
         max_retries: 最大リトライ回数
-        initial_wait: 初回待機時間（秒）
+        initial_wait: 未使用（互換性のため残している）
         timeout: タイムアウト（秒）
 
     Returns:
         (response, success): レスポンスと成功フラグのタプル
     """
-    wait_time = initial_wait
-    counter = get_api_call_counter()
+    if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
 
-    for attempt in range(max_retries + 1):
-        try:
-            counter.increment()
-
-            if method.upper() == "GET":
-                response = httpx.get(url, headers=headers, params=params, timeout=timeout)
-            elif method.upper() == "POST":
-                response = httpx.post(url, headers=headers, data=data, timeout=timeout)
-            elif method.upper() == "PUT":
-                response = httpx.put(url, headers=headers, data=data, timeout=timeout)
-            elif method.upper() == "DELETE":
-                response = httpx.delete(url, headers=headers, timeout=timeout)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
-            # 成功（2xx）
-            if response.status_code < 400:
-                return response, True
-
-            # レート制限（429）
-            if response.status_code == 429:
-                if attempt < max_retries:
-                    print(f"⚠️ Rate limit hit (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
-                    wait_time *= 2  # 指数バックオフ
-                    continue
-                else:
-                    print(f"❌ Rate limit hit (429). Max retries exceeded.")
-                    return response, False
-
-            # その他のエラー（リトライしない）
-            return response, False
+    try:
+        response = get_chatwork_transport().request(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            priority=Priority.BATCH,
+            timeout=timeout,
+            max_attempts=max_retries + 1,
+            on_send=get_api_call_counter().increment,
+        )
+    except httpx.TimeoutException:
+        print(f"⚠️ API timeout after {max_retries + 1} attempts")
+        return None, False
+    except Exception as e:
+        print(f"❌ API error: {type(e).__name__}")
+        return None, False
 
-        except httpx.TimeoutException:
-            print(f"⚠️ API timeout on attempt {attempt + 1}")
-            if attempt < max_retries:
-                time.sleep(wait_time)
-                wait_time *= 2
-                continue
-            return None, False
+    # 成功（2xx）
+    if response.status_code < 400:
+        return response, True
 
-        except Exception as e:
-            print(f"❌ API error: {e}")
-            return None, False
+    if response.status_code == 429:
+        print(f"❌ Rate limit hit (429). Max retries exceeded.")
 
-    return None, False
+    # その他のエラー（リトライしない）
+    return response, False
 
 
 def get_room_members_with_cache(room_id):
     """
     ルームメンバーを取得（キャッシュあり・リトライ機構付き）
     同一リクエスト内で同じルームを複数回参照する場合に効率的
+
+    v11.3.0: 並列スレッドが同時に同じルームを取得しても共通トランスポートで
+    1回のAPIコールに合流し、ウォームスタート間もTTLキャッシュ（300秒）を再利用する
     """
     room_id_str = str(room_id)
     if room_id_str in _room_members_api_cache:
@@ -7485,6 +7944,366 @@ def send_deadline_alert_to_requester(
         return False
 
 
+# =====================================================
+# v11.3.0: バルク・並列タスク同期
+# =====================================================
+# Before: ルームを1つずつ直列に処理し、タスクごとに SELECT → UPDATE/INSERT → commit
+#   → 総タスク数に比例してクエリが増え、ジョブ全体で1本の接続を握り続ける
+# After:
+#   1. ChatWork APIからの取得はスレッドプールで並列化（共通トランスポートで予算共有）
+#   2. ルーム内の既存行は task_id = ANY(%s) の1クエリで取得し、差分をメモリで計算
+#   3. 変更のあったタスクだけを複数行 INSERT ... ON CONFLICT DO UPDATE で一括反映
+#   4. 変更のないタスクは last_synced_at のみ1クエリで更新（stale判定用）
+# =====================================================
+
+# ルーム取得の並列数
+SYNC_ROOM_CONCURRENCY = int(os.environ.get("SYNC_ROOM_CONCURRENCY", "8"))
+
+# 1回のバルクUPSERTで送る最大行数
+SYNC_UPSERT_CHUNK_SIZE = 500
+
+
+def _parse_limit_time(limit_time):
+    """ChatWork APIのlimit_timeをUNIXタイムスタンプ（int）に変換"""
+    if not limit_time:
+        return None
+    if isinstance(limit_time, (int, float)):
+        return int(limit_time)
+    if isinstance(limit_time, str):
+        try:
+            # "2025-12-17T15:52:53+00:00" → datetime
+            dt = datetime.fromisoformat(limit_time.replace('Z', '+00:00'))
+            return int(dt.timestamp())
+        except Exception as e:
+            print(f"❌ Failed to parse limit_time string: {type(e).__name__}")
+            return None
+    print(f"⚠️ Unknown limit_time type: {type(limit_time)}")
+    return None
+
+
+def _summary_needs_regeneration(task_id, old_body, body, old_summary):
+    """
+    既存タスクのsummaryを再生成すべきか判定（v10.18.1）
+
+    条件: bodyが変更された / summaryがNULL・空 / summaryが低品質
+    """
+    if old_body != body:
+        print(f"📝 bodyが変更されたためsummary再生成: task_id={task_id}")
+        return True
+    if not old_summary or old_summary.strip() == "":
+        print(f"📝 summaryがNULLのため生成: task_id={task_id}")
+        return True
+    try:
+        if not lib_validate_summary(old_summary, body):
+            print(f"📝 summaryが低品質のため再生成: task_id={task_id}")
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def fetch_rooms_tasks_concurrently(rooms, include_done=False, max_workers=None):
+    """
+    複数ルームのタスクをChatWork APIから並列取得
+
+    APIコールは call_chatwork_api_with_retry 経由で共通トランスポートのレート予算を共有するため、
+    並列数を上げても5分あたりのコール数は予算内に収まる。
+
+    Args:
+        rooms: get_all_rooms() の戻り値（除外ルームは除去済み）
+        include_done: doneタスクも取得するか
+        max_workers: 並列数（省略時は SYNC_ROOM_CONCURRENCY）
+
+    Returns:
+        {room_id: (open_tasks, done_tasks)}
+    """
+    def _fetch(room):
+        room_id = room['room_id']
+        open_tasks = get_room_tasks(room_id, 'open')
+        done_tasks = get_room_tasks(room_id, 'done') if include_done else []
+        return room_id, (open_tasks, done_tasks)
+
+    if not rooms:
+        return {}
+
+    workers = max(1, min(max_workers or SYNC_ROOM_CONCURRENCY, len(rooms)))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="room-sync") as executor:
+        for room_id, tasks in executor.map(_fetch, rooms):
+            results[room_id] = tasks
+    return results
+
+
+def _load_existing_tasks(cursor, task_ids):
+    """ルーム内の既存タスク行を1クエリで取得（{task_id: row dict}）"""
+    if not task_ids:
+        return {}
+    cursor.execute("""
+        SELECT task_id, status, limit_time, assigned_by_name, body, summary,
+               completion_notified, room_name, assigned_to_name
+        FROM chatwork_tasks
+        WHERE organization_id = %s
+          AND task_id = ANY(%s)
+    """, (_ORGANIZATION_ID, list(task_ids)))
+    existing = {}
+    for row in cursor.fetchall():
+        existing[row[0]] = {
+            "status": row[1],
+            "limit_time": row[2],
+            "assigned_by_name": row[3],
+            "body": row[4],
+            "summary": row[5],
+            "completion_notified": row[6],
+            "room_name": row[7],
+            "assigned_to_name": row[8],
+        }
+    return existing
+
+
+def _load_primary_departments(cursor, account_ids):
+    """担当者の主所属部署を1クエリで取得（{chatwork_account_id: department_id}）"""
+    if not account_ids:
+        return {}
+    try:
+        cursor.execute("""
+            SELECT DISTINCT ON (u.chatwork_account_id) u.chatwork_account_id, ud.department_id
+            FROM user_departments ud
+            JOIN users u ON ud.user_id = u.id
+            WHERE u.chatwork_account_id = ANY(%s)
+              AND ud.is_primary = TRUE
+              AND ud.ended_at IS NULL
+            ORDER BY u.chatwork_account_id
+        """, (sorted(account_ids),))
+        return {str(row[0]): str(row[1]) for row in cursor.fetchall() if row[1] is not None}
+    except Exception as e:
+        print(f"⚠️ department_id取得エラー（NULLで継続）: {type(e).__name__}")
+        return {}
+
+
+def _bulk_upsert_tasks(cursor, rows):
+    """
+    変更のあったタスクを複数行 INSERT ... ON CONFLICT DO UPDATE で反映
+
+    既存行の更新内容は v10.18.1 のUPDATEと同じ
+    （status/body/limit_time/last_synced_at/room_name/assigned_to_name/summary）。
+    他組織の同一task_idは更新しない。
+
+    Returns:
+        新規挿入された task_id の集合
+    """
+    inserted = set()
+    for start in range(0, len(rows), SYNC_UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + SYNC_UPSERT_CHUNK_SIZE]
+        placeholders = ", ".join(
+            ["(%s, %s, %s, %s, %s, %s, 'open', %s, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s, %s)"] * len(chunk)
+        )
+        params = []
+        for row in chunk:
+            params.extend(row)
+        cursor.execute(f"""
+            INSERT INTO chatwork_tasks
+            (task_id, room_id, assigned_to_account_id, assigned_by_account_id, body, limit_time, status,
+             skip_tracking, last_synced_at, room_name, assigned_to_name, assigned_by_name, summary, department_id, organization_id)
+            VALUES {placeholders}
+            ON CONFLICT (task_id) DO UPDATE
+            SET status = 'open',
+                body = EXCLUDED.body,
+                limit_time = EXCLUDED.limit_time,
+                last_synced_at = CURRENT_TIMESTAMP,
+                room_name = EXCLUDED.room_name,
+                assigned_to_name = EXCLUDED.assigned_to_name,
+                summary = EXCLUDED.summary
+            WHERE chatwork_tasks.organization_id = EXCLUDED.organization_id
+            RETURNING task_id, (xmax = 0) AS inserted
+        """, tuple(params))
+        for task_id, was_inserted in cursor.fetchall():
+            if was_inserted:
+                inserted.add(task_id)
+    return inserted
+
+
+def sync_room_open_tasks(conn, cursor, room_id, room_name, open_tasks, existing, phase1_start_date):
+    """
+    1ルーム分のopenタスクをDBへ差分同期
+
+    Returns:
+        {"inserted": int, "updated": int, "unchanged": int}
+    """
+    phase1_timestamp = int(phase1_start_date.timestamp()) if phase1_start_date else None
+
+    new_tasks = [t for t in open_tasks if t['task_id'] not in existing]
+    departments = _load_primary_departments(
+        cursor, {str(t['account']['account_id']) for t in new_tasks}
+    )
+
+    upsert_rows = []
+    alert_candidates = {}
+    unchanged_ids = []
+    summary_queue = []
+    summary_discards = []
+
+    for task in open_tasks:
+        task_id = task['task_id']
+        assigned_to_id = task['account']['account_id']
+        assigned_by_id = task.get('assigned_by_account', {}).get('account_id')
+        body = task['body']
+        assigned_to_name = task['account']['name']
+        # assigned_by_nameはAPIから直接取得できないため空文字列
+        assigned_by_name = ""
+        limit_datetime = _parse_limit_time(task.get('limit_time'))
+
+        old = existing.get(task_id)
+        if old is None:
+            skip_tracking = bool(
+                phase1_timestamp and limit_datetime and limit_datetime < phase1_timestamp
+            )
+            # v11.3.0: LLM要約はキューに回し、確定できるものだけ即時に設定
+            summary = resolve_task_summary_locally(body)
+            if summary is None:
+                summary_queue.append((task_id, body))
+            upsert_rows.append((
+                task_id, room_id, assigned_to_id, assigned_by_id, body, limit_datetime,
+                skip_tracking, room_name, assigned_to_name, assigned_by_name, summary,
+                departments.get(str(assigned_to_id)), _ORGANIZATION_ID,
+            ))
+            if limit_datetime and assigned_by_id:
+                alert_candidates[task_id] = (task, limit_datetime, assigned_by_id)
+            continue
+
+        # ★ 期限変更検知（P1-030）
+        old_limit_time = old["limit_time"]
+        if old_limit_time is not None and limit_datetime is not None and old_limit_time != limit_datetime:
+            task_info = {
+                "body": body,
+                "assigned_to_name": assigned_to_name,
+                "assigned_to_account_id": assigned_to_id,
+                "assigned_by_name": old["assigned_by_name"] or assigned_by_name
+            }
+            try:
+                detect_and_report_limit_changes(cursor, task_id, old_limit_time, limit_datetime, task_info)
+            except Exception as e:
+                print(f"⚠️ 期限変更検知処理エラー（同期は続行）: {type(e).__name__}")
+
+        # 再生成が必要な場合も、LLM要約が確定するまでは旧summaryを表示に使う
+        new_summary = old["summary"]
+        if _summary_needs_regeneration(task_id, old["body"], body, old["summary"]):
+            local_summary = resolve_task_summary_locally(body)
+            if local_summary:
+                new_summary = local_summary
+                # 旧本文で積まれたキュー項目が確定済みの要約を上書きしないよう外す
+                summary_discards.append(task_id)
+            else:
+                summary_queue.append((task_id, body))
+
+        changed = (
+            old["status"] != 'open'
+            or old["body"] != body
+            or old_limit_time != limit_datetime
+            or old["room_name"] != room_name
+            or old["assigned_to_name"] != assigned_to_name
+            or old["summary"] != new_summary
+        )
+        if not changed:
+            unchanged_ids.append(task_id)
+            continue
+
+        # 既存行の更新ではskip_tracking/department_idはON CONFLICT側で無視される
+        upsert_rows.append((
+            task_id, room_id, assigned_to_id, assigned_by_id, body, limit_datetime,
+            False, room_name, assigned_to_name, assigned_by_name, new_summary,
+            None, _ORGANIZATION_ID,
+        ))
+
+    inserted = _bulk_upsert_tasks(cursor, upsert_rows) if upsert_rows else set()
+
+    if unchanged_ids:
+        cursor.execute("""
+            UPDATE chatwork_tasks
+            SET last_synced_at = CURRENT_TIMESTAMP
+            WHERE organization_id = %s
+              AND task_id = ANY(%s)
+        """, (_ORGANIZATION_ID, unchanged_ids))
+
+    # v11.3.0: 要約生成は /process-summary-queue のワーカーで行う
+    queued = enqueue_task_summaries(cursor, summary_queue)
+    discard_task_summaries(cursor, summary_discards)
+
+    # INSERTをコミットしてから通知処理を実行（通知エラーでも登録は保持される）
+    conn.commit()
+
+    # =====================================================
+    # v10.3.1: 期限ガードレール（手動追加時）
+    # 新規タスクの期限が「今日」または「明日」なら依頼者にアラート送信
+    # =====================================================
+    for task_id in inserted:
+        candidate = alert_candidates.get(task_id)
+        if not candidate:
+            continue
+        task, limit_datetime, assigned_by_id = candidate
+        try:
+            send_deadline_alert_to_requester(
+                task_id=task_id,
+                task_name=task['body'],
+                limit_timestamp=limit_datetime,
+                assigned_by_account_id=str(assigned_by_id),
+                assigned_to_name=task['account']['name'],
+                room_id=str(room_id),
+                conn=conn
+            )
+        except Exception as e:
+            print(f"⚠️ 期限ガードレール処理エラー（同期は続行）: {type(e).__name__}")
+
+    return {
+        "inserted": len(inserted),
+        "updated": len(upsert_rows) - len(inserted),
+        "unchanged": len(unchanged_ids),
+        "summary_queued": queued,
+    }
+
+
+def sync_room_done_tasks(conn, cursor, room_id, done_tasks, existing):
+    """
+    1ルーム分のdoneタスクをDBへ差分同期（openだった行のみ完了に更新）
+
+    Returns:
+        完了に更新した件数
+    """
+    newly_done = [
+        task for task in done_tasks
+        if task['task_id'] in existing and existing[task['task_id']]["status"] == 'open'
+    ]
+    if not newly_done:
+        return 0
+
+    cursor.execute("""
+        UPDATE chatwork_tasks
+        SET status = 'done',
+            completed_at = CURRENT_TIMESTAMP,
+            last_synced_at = CURRENT_TIMESTAMP
+        WHERE organization_id = %s
+          AND task_id = ANY(%s)
+    """, (_ORGANIZATION_ID, [task['task_id'] for task in newly_done]))
+
+    # 完了通知を送信（まだ送信していない場合）
+    notified_ids = []
+    for task in newly_done:
+        old = existing[task['task_id']]
+        if not old["completion_notified"]:
+            send_completion_notification(room_id, task, old["assigned_by_name"])
+            notified_ids.append(task['task_id'])
+
+    if notified_ids:
+        cursor.execute("""
+            UPDATE chatwork_tasks
+            SET completion_notified = TRUE
+            WHERE organization_id = %s
+              AND task_id = ANY(%s)
+        """, (_ORGANIZATION_ID, notified_ids))
+
+    conn.commit()
+    return len(newly_done)
+
+
 @app.route("/", methods=["POST"])
 def sync_chatwork_tasks():
     """
@@ -7546,6 +8365,7 @@ def sync_chatwork_tasks():
         # ★★★ v10.3.4: メンバー同期は週1回の別ジョブに分離 ★★★
         # sync_room_members() は sync_room_members_handler() で実行
 
+        # ★★★ v11.3.0: 設定の読み込みは短命な接続で行い、API取得中は接続を保持しない ★★★
         conn = get_db_connection()
         cursor = conn.cursor()
         # Phase1開始日を取得
@@ -7558,269 +8378,53 @@ def sync_chatwork_tasks():
         # 除外ルーム一覧を取得
         cursor.execute("SELECT room_id FROM excluded_rooms")
         excluded_rooms = set(row[0] for row in cursor.fetchall())
+        cursor.close()
+        conn.close()
+        cursor = None
+        conn = None
 
         # ★★★ v10.3.4: 全ルーム取得（1回のみ）★★★
         rooms = get_all_rooms()
         print(f"📊 対象ルーム数: {len(rooms)}")
-        
+
+        target_rooms = []
         for room in rooms:
-            room_id = room['room_id']
-            room_name = room['name']
-            
             # 除外ルームはスキップ
-            if room_id in excluded_rooms:
-                print(f"Skipping excluded room: {room_id} ({room_name})")
+            if room['room_id'] in excluded_rooms:
+                print(f"Skipping excluded room: {room['room_id']} ({room['name']})")
                 continue
-            
-            print(f"Syncing room: {room_id} ({room_name})")
-            
-            # 未完了タスクを取得
-            open_tasks = get_room_tasks(room_id, 'open')
-            
-            for task in open_tasks:
-                task_id = task['task_id']
-                assigned_to_id = task['account']['account_id']
-                assigned_by_id = task.get('assigned_by_account', {}).get('account_id')
-                body = task['body']
-                limit_time = task.get('limit_time')
-                
-                # 名前を取得
-                assigned_to_name = task['account']['name']
-                # assigned_by_nameはAPIから直接取得できないため、別途取得が必要
-                # ここでは簡易的に空文字列を設定（後で改善可能）
-                assigned_by_name = ""
-                
-                # limit_timeをUNIXタイムスタンプに変換
-                limit_datetime = None
-                if limit_time:
-                    if isinstance(limit_time, str):
-                        # ISO 8601形式の文字列をUNIXタイムスタンプに変換
-                        try:
-                            # Python 3.7+のfromisoformatを使用（dateutilは不要）
-                            # "2025-12-17T15:52:53+00:00" → datetime
-                            dt = datetime.fromisoformat(limit_time.replace('Z', '+00:00'))
-                            limit_datetime = int(dt.timestamp())
-                            print(f"✅ Converted string to timestamp: {limit_datetime}")
-                        except Exception as e:
-                            print(f"❌ Failed to parse limit_time string: {e}")
-                            limit_datetime = None
-                    elif isinstance(limit_time, (int, float)):
-                        # 既にUNIXタイムスタンプの場合
-                        limit_datetime = int(limit_time)
-                        print(f"✅ Already timestamp: {limit_datetime}")
-                    else:
-                        print(f"⚠️ Unknown limit_time type: {type(limit_time)}")
-                        limit_datetime = None
-                
-                # skip_trackingの判定
-                skip_tracking = False
-                if phase1_start_date and limit_datetime:
-                    # limit_datetimeはUNIXタイムスタンプなので、phase1_start_dateもタイムスタンプに変換
-                    phase1_timestamp = int(phase1_start_date.timestamp())
-                    if limit_datetime < phase1_timestamp:
-                        skip_tracking = True
-                
-                # DBに存在するか確認（期限変更検知のためlimit_timeも取得）
-                # ★★★ v10.18.1: bodyとsummaryも取得（summary更新判定用）★★★
-                cursor.execute("""
-                    SELECT task_id, status, limit_time, assigned_by_name, body, summary FROM chatwork_tasks WHERE task_id = %s AND organization_id = %s
-                """, (task_id, _ORGANIZATION_ID))
-                existing = cursor.fetchone()
-
-                if existing:
-                    old_limit_time = existing[2]
-                    db_assigned_by_name = existing[3]
-                    old_body = existing[4]
-                    old_summary = existing[5]
-                    
-                    # ★ 期限変更検知（P1-030）
-                    if old_limit_time is not None and limit_datetime is not None and old_limit_time != limit_datetime:
-                        task_info = {
-                            "body": body,
-                            "assigned_to_name": assigned_to_name,
-                            "assigned_to_account_id": assigned_to_id,
-                            "assigned_by_name": db_assigned_by_name or assigned_by_name
-                        }
-                        try:
-                            detect_and_report_limit_changes(cursor, task_id, old_limit_time, limit_datetime, task_info)
-                        except Exception as e:
-                            print(f"⚠️ 期限変更検知処理エラー（同期は続行）: {e}")
-                    
-                    # 既存タスクの更新
-                    # ★★★ v10.18.1: summaryの更新判定 ★★★
-                    # bodyが変更された場合、またはsummaryがNULL/低品質の場合に再生成
-                    new_summary = old_summary
-                    should_regenerate_summary = False
-
-                    # 条件1: bodyが変更された
-                    if old_body != body:
-                        should_regenerate_summary = True
-                        print(f"📝 bodyが変更されたためsummary再生成: task_id={task_id}")
-
-                    # 条件2: summaryがNULLまたは空
-                    if not old_summary or old_summary.strip() == "":
-                        should_regenerate_summary = True
-                        print(f"📝 summaryがNULLのため生成: task_id={task_id}")
-
-                    # 条件3: summaryが低品質（挨拶で始まる、途中で途切れている等）
-                    if old_summary:
-                        try:
-                            if not lib_validate_summary(old_summary, body):
-                                should_regenerate_summary = True
-                                print(f"📝 summaryが低品質のため再生成: task_id={task_id}, old_summary={old_summary[:20]}...")
-                        except:
-                            pass
+            target_rooms.append(room)
 
-                    if should_regenerate_summary:
-                        try:
-                            new_summary = generate_task_summary(body)
-                            print(f"📝 UPDATE用要約生成: {new_summary[:30]}..." if new_summary and len(new_summary) > 30 else f"📝 UPDATE用要約生成: {new_summary}")
-                        except Exception as e:
-                            print(f"⚠️ UPDATE用要約生成エラー: {e}")
-                            # フォールバック
-                            try:
-                                clean_body = lib_clean_chatwork_tags(body)
-                                new_summary = lib_prepare_task_display_text(clean_body, max_length=40)
-                            except:
-                                # 最終手段: 自然な位置で切る
-                                if body and len(body) > 40:
-                                    truncated = body[:40]
-                                    for sep in ["。", "、", "を", "に", "で", "が", "は"]:
-                                        pos = truncated.rfind(sep)
-                                        if pos > 20:
-                                            new_summary = truncated[:pos + 1] + "..."
-                                            break
-                                    else:
-                                        new_summary = truncated + "..."
-                                else:
-                                    new_summary = body if body else "（タスク内容なし）"
-
-                    cursor.execute("""
-                        UPDATE chatwork_tasks
-                        SET status = 'open',
-                            body = %s,
-                            limit_time = %s,
-                            last_synced_at = CURRENT_TIMESTAMP,
-                            room_name = %s,
-                            assigned_to_name = %s,
-                            summary = %s
-                        WHERE task_id = %s
-                          AND organization_id = %s
-                    """, (body, limit_datetime, room_name, assigned_to_name, new_summary, task_id, _ORGANIZATION_ID))
-                    # ★★★ v10.4.0: UPDATEをコミット ★★★
-                    conn.commit()
-                else:
-                    # 新規タスクの挿入
-                    # ★★★ v10.17.0: タスク要約を生成（エラー時も必ずフォールバック） ★★★
-                    summary = None
-                    try:
-                        summary = generate_task_summary(body)
-                        print(f"📝 要約生成: {summary[:30]}..." if summary and len(summary) > 30 else f"📝 要約生成: {summary}")
-                    except Exception as e:
-                        print(f"⚠️ 要約生成エラー: {e}")
-                        # ★★★ v10.17.0: フォールバック処理 ★★★
-                        # AI要約が失敗しても、品質の高いフォールバックを保証
-                        try:
-                            from lib import clean_chatwork_tags, prepare_task_display_text
-                            clean_body = clean_chatwork_tags(body)
-                            summary = prepare_task_display_text(clean_body, max_length=40)
-                            print(f"📝 フォールバック要約: {summary}")
-                        except Exception as fallback_e:
-                            print(f"⚠️ フォールバックもエラー: {fallback_e}")
-                            # 最終手段: デフォルトメッセージ
-                            summary = "（タスク内容を確認してください）"
-                            print(f"📝 デフォルト要約使用: {summary}")
-
-                    # ★★★ v10.18.1: department_id取得（Phase 3.5対応） ★★★
-                    department_id = None
-                    try:
-                        cursor.execute("""
-                            SELECT ud.department_id
-                            FROM user_departments ud
-                            JOIN users u ON ud.user_id = u.id
-                            WHERE u.chatwork_account_id = %s
-                              AND ud.is_primary = TRUE
-                              AND ud.ended_at IS NULL
-                            LIMIT 1
-                        """, (str(assigned_to_id),))
-                        dept_row = cursor.fetchone()
-                        department_id = str(dept_row[0]) if dept_row else None
-                    except Exception as e:
-                        print(f"⚠️ department_id取得エラー（NULLで継続）: {e}")
-
-                    cursor.execute("""
-                        INSERT INTO chatwork_tasks
-                        (task_id, room_id, assigned_to_account_id, assigned_by_account_id, body, limit_time, status,
-                         skip_tracking, last_synced_at, room_name, assigned_to_name, assigned_by_name, summary, department_id, organization_id)
-                        VALUES (%s, %s, %s, %s, %s, %s, 'open', %s, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (task_id) DO NOTHING
-                    """, (task_id, room_id, assigned_to_id, assigned_by_id, body,
-                          limit_datetime, skip_tracking, room_name, assigned_to_name, assigned_by_name, summary, department_id, _ORGANIZATION_ID))
-
-                    # ★★★ v10.4.0: INSERTをコミットしてから通知処理を実行 ★★★
-                    # 通知処理でエラーが発生してもタスクの登録は保持される
-                    conn.commit()
-
-                    # =====================================================
-                    # v10.3.1: 期限ガードレール（手動追加時）
-                    # =====================================================
-                    # 新規タスクの期限が「今日」または「明日」なら依頼者にアラート送信
-                    # =====================================================
-                    if limit_datetime and assigned_by_id:
-                        try:
-                            send_deadline_alert_to_requester(
-                                task_id=task_id,
-                                task_name=body,
-                                limit_timestamp=limit_datetime,
-                                assigned_by_account_id=str(assigned_by_id),
-                                assigned_to_name=assigned_to_name,
-                                room_id=str(room_id),
-                                conn=conn
-                            )
-                        except Exception as e:
-                            print(f"⚠️ 期限ガードレール処理エラー（同期は続行）: {e}")
+        # ★★★ v11.3.0: ルームのタスクを並列取得（APIレート予算は共有）★★★
+        fetch_start = time.time()
+        room_tasks = fetch_rooms_tasks_concurrently(target_rooms, include_done=include_done)
+        print(f"📥 タスク取得完了: {len(room_tasks)}ルーム, {time.time() - fetch_start:.2f}s")
+
+        # ★★★ v11.3.0: ルームごとに既存行を一括取得 → 差分のみバルク反映 ★★★
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0, "summary_queued": 0, "done": 0}
+
+        for room in target_rooms:
+            room_id = room['room_id']
+            room_name = room['name']
+            open_tasks, done_tasks = room_tasks.get(room_id, ([], []))
+            print(f"Syncing room: {room_id} ({room_name}) open={len(open_tasks)} done={len(done_tasks)}")
+
+            task_ids = {t['task_id'] for t in open_tasks} | {t['task_id'] for t in done_tasks}
+            existing = _load_existing_tasks(cursor, task_ids)
+
+            stats = sync_room_open_tasks(
+                conn, cursor, room_id, room_name, open_tasks, existing, phase1_start_date
+            )
+            for key, value in stats.items():
+                totals[key] += value
 
             # ★★★ v10.3.4: 完了タスクの同期は include_done=true の時のみ ★★★
             if include_done:
-                done_tasks = get_room_tasks(room_id, 'done')
-
-                for task in done_tasks:
-                    task_id = task['task_id']
-
-                    # DBに存在するか確認
-                    cursor.execute("""
-                        SELECT task_id, status, completion_notified, assigned_by_name
-                        FROM chatwork_tasks
-                        WHERE task_id = %s
-                          AND organization_id = %s
-                    """, (task_id, _ORGANIZATION_ID))
-                    existing = cursor.fetchone()
-
-                    if existing:
-                        old_status = existing[1]
-                        completion_notified = existing[2]
-                        assigned_by_name = existing[3]
-
-                        # ステータスが変更された場合
-                        if old_status == 'open':
-                            cursor.execute("""
-                                UPDATE chatwork_tasks
-                                SET status = 'done',
-                                    completed_at = CURRENT_TIMESTAMP,
-                                    last_synced_at = CURRENT_TIMESTAMP
-                                WHERE task_id = %s
-                                  AND organization_id = %s
-                            """, (task_id, _ORGANIZATION_ID))
-
-                            # 完了通知を送信（まだ送信していない場合）
-                            if not completion_notified:
-                                send_completion_notification(room_id, task, assigned_by_name)
-                                cursor.execute("""
-                                    UPDATE chatwork_tasks
-                                    SET completion_notified = TRUE
-                                    WHERE task_id = %s
-                                      AND organization_id = %s
-                                """, (task_id, _ORGANIZATION_ID))
+                totals["done"] += sync_room_done_tasks(conn, cursor, room_id, done_tasks, existing)
+
+        print(f"📊 同期結果: {totals}")
 
         conn.commit()
         print(f"=== Task sync completed ({sync_mode}) ===")
@@ -7859,9 +8463,6 @@ def sync_chatwork_tasks():
                     offset = batch_result["next_offset"]
                     batch_num += 1
 
-                    # 各バッチ間で少し待つ（API負荷軽減）
-                    time.sleep(1)
-
                 backfill_result = {
                     "total": total_count,
                     "success": total_success,
@@ -7910,9 +8511,6 @@ def sync_chatwork_tasks():
                     offset = batch_result["next_offset"]
                     batch_num += 1
 
-                    # 各バッチ間で少し待つ（API負荷軽減）
-                    time.sleep(1)
-
                 backfill_result = {
                     "total_checked": total_checked,
                     "bad_found": total_bad,
@@ -7984,6 +8582,35 @@ def sync_chatwork_tasks():
         get_api_call_counter().log_summary("sync_chatwork_tasks")
 
 
+# =====================================================
+# v11.3.0: 要約生成キュー処理のエントリーポイント
+# =====================================================
+@app.route("/process-summary-queue", methods=["POST"])
+def process_summary_queue_handler():
+    """
+    Cloud Run: タスク同期で積まれた要約生成キューを処理
+
+    ★★★ v11.3.0: 要約生成を同期処理から分離 ★★★
+    パラメータ:
+    - limit: 処理する最大件数（デフォルト SUMMARY_QUEUE_DRAIN_LIMIT）
+    """
+    request = flask_request
+    try:
+        limit = int(request.args.get('limit', SUMMARY_QUEUE_DRAIN_LIMIT))
+    except ValueError:
+        limit = SUMMARY_QUEUE_DRAIN_LIMIT
+
+    print(f"=== Starting summary queue processing (limit={limit}) ===")
+    try:
+        # LLM呼び出し中は接続を保持しないよう、接続の取得・返却はワーカー側で行う
+        result = process_task_summary_queue(limit=limit)
+        return (f"Summary queue processed: {result['success']}/{result['total']}", 200)
+    except Exception as e:
+        print(f"Error during summary queue processing: {type(e).__name__}")
+        traceback.print_exc()
+        return (f'Error: {type(e).__name__}', 500)
+
+
 # =====================================================
 # v10.3.4: メンバー同期用エントリーポイント（週1回実行）
 # =====================================================
@@ -151,6 +151,15 @@ locals {
       body        = ""
     }
 
+    sync-task-summaries-job = {
+      description = "Process task summary queue every 10 minutes"
+      schedule    = "*/10 * * * *"
+      function    = "sync-chatwork-tasks"
+      path        = "/process-summary-queue"
+      http_method = "POST"
+      body        = ""
+    }
+
     sync-room-members-job = {
       description = "Sync room members weekly (Monday 8:00)"
       schedule    = "0 8 * * 1"
@@ -821,6 +821,223 @@ class TestAudioProcessor:
                 await audio_processor.process(input_data)
 
 
+# =============================================================================
+# 分割文字起こしテスト（v11.3.0）
+# =============================================================================
+
+
+def _wav(seconds, silence=None, rate=1000):
+    """8bit/モノラルのWAV（silence=(開始秒, 終了秒) の区間だけ無音）"""
+    import io
+    import wave
+
+    # 秒ごとに振幅を変える（チャンクの内容が重複しないように）
+    frames = bytearray(b"".join(
+        bytes([148 + i % 90, 108 - i % 90]) * (rate // 2) for i in range(seconds)
+    ))
+    if silence:
+        start, end = silence
+        frames[start * rate:end * rate] = b"\x80" * ((end - start) * rate)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(1)
+        writer.setframerate(rate)
+        writer.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def _mp3(frame_count):
+    """MPEG1 Layer III / 128kbps / 44.1kHz のフレーム列（ID3タグ付き）"""
+    frame = b"\xff\xfb\x90\x00" + b"\x00" * 413  # 417バイト
+    return b"ID3\x04\x00\x00\x00\x00\x00\x00" + frame * frame_count
+
+
+class TestAudioSegmenter:
+    """audio_segmenter のテスト"""
+
+    def test_wav_cuts_at_silence(self):
+        from lib.capabilities.multimodal.audio_segmenter import split_audio
+
+        segments = split_audio(_wav(50, silence=(36, 39)), "wav", window_seconds=40)
+
+        assert len(segments) == 2
+        assert 36 <= segments[0].end_seconds <= 39
+        # 無音で切った場合は重ねない
+        assert segments[1].start_seconds == segments[0].end_seconds
+        assert segments[0].keep_until == segments[1].keep_from
+
+    def test_wav_fixed_windows_overlap(self):
+        from lib.capabilities.multimodal.audio_segmenter import split_audio
+
+        segments = split_audio(_wav(100), "wav", window_seconds=40, overlap_seconds=4)
+
+        assert [s.start_seconds for s in segments] == [0, 36, 72]
+        assert segments[-1].end_seconds == 100
+        # 採用区間は重ねた区間の中点でつながる
+        assert [s.keep_until for s in segments[:-1]] == [38, 74]
+        assert all(a.keep_until == b.keep_from for a, b in zip(segments, segments[1:]))
+        assert all(s.data[:4] == b"RIFF" for s in segments)
+
+    def test_mp3_cuts_on_frame_boundaries(self):
+        from lib.capabilities.multimodal.audio_segmenter import split_audio
+
+        segments = split_audio(_mp3(1000), "mpga", window_seconds=10, overlap_seconds=1)
+
+        assert len(segments) == 3
+        assert all(s.data[:2] == b"\xff\xfb" and len(s.data) % 417 == 0 for s in segments)
+        assert segments[-1].end_seconds == pytest.approx(1000 * 1152 / 44100)
+
+    def test_unsupported_or_broken_data_is_not_split(self):
+        from lib.capabilities.multimodal.audio_segmenter import split_audio
+
+        assert split_audio(b"fLaC" + b"\x00" * 100, "flac") is None
+        assert split_audio(b"RIFF\x00\x00\x00\x00WAVE" + b"\x00" * 100, "wav") is None
+        assert split_audio(b"ID3" + b"\x00" * 100, "mp3") is None
+
+    def test_stitch_offsets_and_drops_overlap(self):
+        from lib.capabilities.multimodal.audio_segmenter import AudioSegment, stitch_transcripts
+
+        segments = [
+            AudioSegment(0, 0.0, 40.0, 0.0, 38.0, b"", "wav"),
+            AudioSegment(1, 36.0, 60.0, 38.0, float("inf"), b"", "wav"),
+        ]
+        results = [
+            {"language": "ja", "segments": [
+                {"start": 0.0, "end": 20.0, "text": "前半。"},
+                {"start": 35.0, "end": 39.5, "text": "境界。"},
+            ]},
+            {"language": "ja", "segments": [
+                {"start": 0.0, "end": 3.5, "text": "境界。"},
+                {"start": 5.0, "end": 9.0, "text": "後半。"},
+            ]},
+        ]
+
+        stitched = stitch_transcripts(segments, results)
+
+        assert stitched["text"] == "前半。境界。後半。"
+        assert [(s["id"], s["start"], s["end"]) for s in stitched["segments"]] == [
+            (0, 0.0, 20.0), (1, 35.0, 39.5), (2, 41.0, 45.0),
+        ]
+
+
+class TestChunkedTranscription:
+    """AudioProcessor の分割文字起こしのテスト"""
+
+    @pytest.fixture
+    def processor(self, mock_pool, org_id):
+        from lib.capabilities.multimodal.audio_segmenter import SegmentTranscriptCache
+
+        return AudioProcessor(
+            pool=mock_pool,
+            organization_id=org_id,
+            openai_api_key="test-openai-key",
+            transcribe_concurrency=2,
+            segment_cache=SegmentTranscriptCache(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_long_audio_is_transcribed_per_segment(self, processor):
+        import asyncio
+
+        active = 0
+        peak = 0
+
+        async def transcribe(audio_data, filename, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"language": "ja", "segments": [
+                {"start": 1.0, "end": 2.0, "text": f"{filename}。"},
+            ]}
+
+        with patch.object(processor._whisper_client, "transcribe", side_effect=transcribe):
+            result = await processor._transcribe_audio(_wav(1500), "meeting.wav")
+
+        assert peak == 2
+        assert [s["start"] for s in result["segments"]] == [1.0, 598.0, 1195.0]
+        assert result["text"] == "segment_000.wav。segment_001.wav。segment_002.wav。"
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_is_retried_and_resumed(self, processor):
+        calls = []
+        failures = []
+
+        async def transcribe(audio_data, filename, **kwargs):
+            calls.append(filename)
+            if filename == "segment_001.wav" and len(failures) < 3:
+                failures.append(filename)
+                raise WhisperAPITimeoutError()
+            return {"language": "ja", "text": filename, "segments": []}
+
+        audio = _wav(1500)
+        with patch.object(processor._whisper_client, "transcribe", side_effect=transcribe), \
+                patch("lib.capabilities.multimodal.audio_processor.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(AudioTranscriptionError):
+                await processor._transcribe_audio(audio, "meeting.wav")
+            # 初回 + 再試行2回で失敗
+            assert calls.count("segment_001.wav") == 3
+
+            calls.clear()
+            result = await processor._transcribe_audio(audio, "meeting.wav")
+
+        # 成功済みのチャンクは送り直さない
+        assert calls == ["segment_001.wav"]
+        assert result["text"] == "segment_000.wavsegment_001.wavsegment_002.wav"
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_retried(self, processor):
+        calls = []
+
+        async def transcribe(audio_data, filename, **kwargs):
+            calls.append(filename)
+            if filename == "segment_001.wav":
+                raise WhisperAPIError("Whisper API HTTP error (HTTPStatusError)")
+            return {"language": "ja", "text": filename, "segments": []}
+
+        sleep = AsyncMock()
+        with patch.object(processor._whisper_client, "transcribe", side_effect=transcribe), \
+                patch("lib.capabilities.multimodal.audio_processor.asyncio.sleep", new=sleep):
+            with pytest.raises(AudioTranscriptionError):
+                await processor._transcribe_audio(_wav(1500), "meeting.wav")
+
+        assert calls.count("segment_001.wav") == 1
+        sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unsplittable_large_audio_raises_file_too_large(self, processor):
+        from lib.capabilities.multimodal.exceptions import FileTooLargeError
+
+        audio = b"\x00" * (MAX_AUDIO_SIZE_BYTES + 1)
+        with patch.object(processor._whisper_client, "transcribe", new=AsyncMock()) as transcribe:
+            with pytest.raises(FileTooLargeError) as exc_info:
+                await processor._transcribe_audio(audio, "meeting.m4a", audio_format="m4a")
+
+        transcribe.assert_not_awaited()
+        assert exc_info.value.actual_size_bytes == len(audio)
+        assert exc_info.value.max_size_bytes == MAX_AUDIO_SIZE_BYTES
+        assert exc_info.value.input_type == InputType.AUDIO
+
+    def test_validate_allows_large_segmentable_audio(self, processor, org_id):
+        from lib.capabilities.multimodal.exceptions import FileTooLargeError
+
+        large_wav = b"RIFF\x00\x00\x00\x00WAVE" + b"\x00" * MAX_AUDIO_SIZE_BYTES
+        processor.validate(MultimodalInput(
+            input_type=InputType.AUDIO,
+            organization_id=org_id,
+            audio_data=large_wav,
+        ))
+
+        with pytest.raises(FileTooLargeError):
+            processor.validate(MultimodalInput(
+                input_type=InputType.AUDIO,
+                organization_id=org_id,
+                audio_data=b"fLaC" + b"\x00" * MAX_AUDIO_SIZE_BYTES,
+            ))
+
+
 # =============================================================================
 # ファクトリ関数テスト
 # =============================================================================
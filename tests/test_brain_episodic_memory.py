@@ -329,6 +329,70 @@ class TestEpisodicMemoryRecall:
                 assert results[i].relevance_score >= results[i + 1].relevance_score
 
 
+class TestEpisodicMemoryRecallIndex:
+    """想起用インデックス（転置索引・ユーザーパーティション・タイムライン）のテスト"""
+
+    def _episode(self, episode_id, keywords=(), user_id=None, entities=(), occurred_at=None):
+        return Episode(
+            id=episode_id,
+            user_id=user_id,
+            keywords=list(keywords),
+            related_entities=[RelatedEntity(entity_type="person", entity_id=e) for e in entities],
+            occurred_at=occurred_at,
+        )
+
+    def test_keyword_recall_respects_user_partition(self):
+        """本人と組織全体のエピソードだけがキーワードで想起される"""
+        memory = create_episodic_memory()
+        memory.save_episode(self._episode("mine", ["目標"], user_id="user_a"))
+        memory.save_episode(self._episode("org", ["目標", "会議"]))
+        memory.save_episode(self._episode("other", ["目標"], user_id="user_b"))
+
+        results = memory._recall_by_keywords("目標", user_id="user_a")
+
+        assert [r.episode.id for r in results] == ["mine", "org"]
+        assert results[1].relevance_score == pytest.approx(0.5)
+
+    def test_entity_and_temporal_recall_use_index(self):
+        """エンティティ索引とタイムラインから該当分のみ返す"""
+        memory = create_episodic_memory()
+        base = datetime(2026, 1, 15, tzinfo=JST)
+        memory.save_episode(self._episode("near", entities=["p1", "p2"], occurred_at=base + timedelta(days=2)))
+        memory.save_episode(self._episode("far", entities=["p3"], occurred_at=base + timedelta(days=30)))
+
+        entity_results = memory._recall_by_entities([{"entity_id": "p1"}])
+        temporal_results = memory._recall_by_temporal(reference_time=base)
+
+        assert [r.episode.id for r in entity_results] == ["near"]
+        assert entity_results[0].relevance_score == pytest.approx(0.4)
+        assert [r.episode.id for r in temporal_results] == ["near"]
+
+    def test_index_follows_resave_and_cleanup(self):
+        """再保存・忘却削除で索引が更新される"""
+        memory = create_episodic_memory()
+        memory.save_episode(self._episode("ep", ["旧案"], occurred_at=datetime(2026, 1, 1, tzinfo=JST)))
+        memory.save_episode(self._episode("ep", ["新案"], occurred_at=datetime(2026, 3, 1, tzinfo=JST)))
+
+        assert memory._recall_by_keywords("旧案") == []
+        assert [r.episode.id for r in memory._recall_by_keywords("新案")] == ["ep"]
+        assert memory._recall_by_temporal(reference_time=datetime(2026, 1, 1, tzinfo=JST)) == []
+
+        episode = memory._memory_cache["ep"]
+        episode.decay_factor = 0.1
+        episode.importance_score = 0.1
+        memory.cleanup_forgotten()
+
+        assert memory._recall_by_keywords("新案") == []
+        assert memory._recall_by_temporal(reference_time=datetime(2026, 3, 1, tzinfo=JST)) == []
+
+    def test_replacing_cache_dict_rebuilds_index(self):
+        """キャッシュ辞書を差し替えても索引が張り直される"""
+        memory = create_episodic_memory()
+        memory._memory_cache = {"ep": self._episode("ep", ["目標"])}
+
+        assert [r.episode.id for r in memory._recall_by_keywords("目標")] == ["ep"]
+
+
 class TestEpisodicMemoryDecay:
     """忘却のテスト"""
 
@@ -883,6 +883,76 @@ class TestOrganizationGraphPathFinding:
         assert path == ["user1"]
 
 
+class TestOrganizationGraphAdjacencyIndex:
+    """隣接リスト索引と経路クエリのテスト（v11.3.0）"""
+
+    async def _chain_graph(self):
+        graph = OrganizationGraph()
+        for a, b, strength in [
+            ("u1", "u2", 0.9), ("u2", "u3", 0.9), ("u3", "u5", 0.9),
+            ("u1", "u4", 0.2), ("u4", "u5", 0.2),
+        ]:
+            await graph.upsert_relationship(PersonRelationship(
+                person_a_id=a, person_b_id=b, strength=strength,
+            ))
+        return graph
+
+    @pytest.mark.asyncio
+    async def test_bidirectional_bfs_finds_shortest_path(self):
+        graph = await self._chain_graph()
+
+        path = await graph.find_communication_path("u1", "u5")
+
+        assert path == ["u1", "u4", "u5"]
+
+    @pytest.mark.asyncio
+    async def test_path_respects_direction(self):
+        """一方向の関係は逆向きに辿らない"""
+        graph = await self._chain_graph()
+
+        assert await graph.find_communication_path("u5", "u1") == []
+
+    @pytest.mark.asyncio
+    async def test_strongest_path_prefers_strong_links(self):
+        graph = await self._chain_graph()
+
+        path = await graph.find_strongest_path("u1", "u5")
+
+        assert path == ["u1", "u2", "u3", "u5"]
+        assert await graph.find_strongest_path("u1", "u5", min_strength=0.95) == []
+
+    @pytest.mark.asyncio
+    async def test_k_hop_neighbors(self):
+        graph = await self._chain_graph()
+
+        neighbors = await graph.get_k_hop_neighbors("u1", k=2)
+
+        assert neighbors == {"u2": 1, "u4": 1, "u3": 2, "u5": 2}
+
+    @pytest.mark.asyncio
+    async def test_index_follows_cache_updates(self):
+        """関係の上書き・削除・辞書の差し替えで索引が追従する"""
+        graph = OrganizationGraph()
+        await graph.upsert_relationship(PersonRelationship(
+            person_a_id="u1", person_b_id="u2", relationship_type=RelationshipType.COLLABORATES_WITH,
+        ))
+        await graph.upsert_relationship(PersonRelationship(
+            person_a_id="u1", person_b_id="u2", relationship_type=RelationshipType.REPORTS_TO,
+        ))
+
+        assert await graph.get_collaborators("u1") == []
+        assert await graph.get_manager("u1") == "u2"
+
+        del graph._relationship_cache["u1:u2"]
+        assert await graph.get_manager("u1") is None
+
+        graph._relationship_cache = {"u3:u1": PersonRelationship(
+            person_a_id="u3", person_b_id="u1", bidirectional=True,
+        )}
+        assert await graph.get_collaborators("u1") == ["u3"]
+        assert await graph.find_communication_path("u1", "u3") == ["u1", "u3"]
+
+
 # =============================================================================
 # 紹介者提案テスト
 # =============================================================================
@@ -449,7 +449,7 @@ class TestDirectionAndFilterPaths:
         target_node = KnowledgeNode(
             organization_id="org-1", name="Node B", node_type="person",
         )
-        mem._knowledge_graph.find_node_by_id.return_value = target_node
+        mem._knowledge_graph.find_nodes_by_ids.return_value = {"node-B": target_node}
 
         result = mem.get_related_nodes(MagicMock(), "node-A", direction="outgoing")
         assert len(result) == 1
@@ -475,7 +475,7 @@ class TestDirectionAndFilterPaths:
         source_node = KnowledgeNode(
             organization_id="org-1", name="Node A", node_type="person",
         )
-        mem._knowledge_graph.find_node_by_id.return_value = source_node
+        mem._knowledge_graph.find_nodes_by_ids.return_value = {"node-A": source_node}
 
         result = mem.get_related_nodes(MagicMock(), "node-B", direction="incoming")
         assert len(result) == 1
@@ -522,7 +522,9 @@ class TestDirectionAndFilterPaths:
         )
         mem._knowledge_graph.find_edges_from.return_value = [edge1, edge2]
         node_b = KnowledgeNode(organization_id="org-1", name="B", node_type="org")
-        mem._knowledge_graph.find_node_by_id.return_value = node_b
+        mem._knowledge_graph.find_nodes_by_ids.side_effect = (
+            lambda conn, ids: {i: node_b for i in ids}
+        )
 
         # manages のみフィルタ
         result = mem.get_related_nodes(
@@ -0,0 +1,260 @@
+"""
+lib/chatwork_transport.py のテスト
+
+レート予算（ヘッダー連動・優先レーン）、同一GETの合流、
+TTL/ETagキャッシュと書き込み時の破棄を検証する。
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from lib.chatwork_transport import (
+    ChatworkRateLimiter,
+    ChatworkTransport,
+    Priority,
+    cache_ttl_for,
+    normalize_endpoint,
+)
+
+
+HEADERS = {"X-ChatWorkToken": "token"}
+
+
+class FakeClock:
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _response(status=200, json=None, headers=None):
+    return httpx.Response(status, json=json if json is not None else [], headers=headers or {})
+
+
+class TestChatworkRateLimiter:
+
+    def _limiter(self, capacity=10, reserved=3):
+        clock = FakeClock()
+        limiter = ChatworkRateLimiter(
+            capacity=capacity,
+            window_seconds=10.0,
+            reserved_for_interactive=reserved,
+            clock=clock,
+            wall_clock=clock,
+        )
+        return limiter, clock
+
+    def test_batch_leaves_reserve_for_interactive(self):
+        limiter, _ = self._limiter()
+
+        granted = 0
+        while limiter.try_acquire(Priority.BATCH) == 0:
+            granted += 1
+
+        assert granted == 7
+        assert all(limiter.try_acquire(Priority.INTERACTIVE) == 0 for _ in range(3))
+        assert limiter.try_acquire(Priority.INTERACTIVE) > 0
+
+    def test_refills_at_window_rate(self):
+        limiter, clock = self._limiter(reserved=0)
+        for _ in range(10):
+            limiter.try_acquire()
+
+        wait = limiter.try_acquire()
+        assert wait == pytest.approx(1.0)
+
+        assert limiter.acquire(sleep=clock.sleep) == pytest.approx(1.0)
+
+    def test_server_headers_override_local_estimate(self):
+        limiter, clock = self._limiter(capacity=300, reserved=30)
+
+        # 他サービスが使い切りかけている → サーバーの残数に合わせる
+        limiter.update_from_headers({"x-ratelimit-remaining": "31", "x-ratelimit-reset": str(int(clock.now + 120))})
+
+        assert limiter.try_acquire(Priority.BATCH) == 0
+        # 残り30は予約枠 → BATCHはリセットまで待つ
+        assert limiter.try_acquire(Priority.BATCH) == pytest.approx(120.0)
+        assert limiter.try_acquire(Priority.INTERACTIVE) == 0
+
+        # リセット時刻を過ぎたら満タンに戻る
+        clock.sleep(120)
+        assert limiter.tokens == 300
+
+    def test_ignores_non_numeric_headers(self):
+        limiter, _ = self._limiter()
+
+        limiter.update_from_headers({"x-ratelimit-remaining": "n/a"})
+
+        assert limiter.tokens == 10
+
+    def test_batch_yields_to_waiting_interactive(self):
+        limiter, _ = self._limiter(reserved=0)
+        for _ in range(10):
+            limiter.try_acquire()
+
+        limiter._set_waiting(+1)
+        try:
+            assert limiter.try_acquire(Priority.BATCH) > 0
+        finally:
+            limiter._set_waiting(-1)
+
+
+class TestChatworkTransport:
+
+    def test_caches_members_and_counts_sends(self):
+        transport = ChatworkTransport(sleep=lambda s: None)
+        sends = []
+
+        with patch("lib.chatwork_transport.httpx.request", return_value=_response(json=[{"account_id": 1}])) as req:
+            first = transport.request("GET", "https://api.chatwork.com/v2/rooms/1/members", HEADERS, on_send=lambda: sends.append(1))
+            second = transport.request("GET", "/rooms/1/members", HEADERS, on_send=lambda: sends.append(1))
+
+        assert first.json() == second.json() == [{"account_id": 1}]
+        assert req.call_count == 1
+        assert len(sends) == 1
+        assert transport.stats.cache_hits == 1
+
+    def test_client_can_bypass_member_cache(self):
+        from lib.chatwork import ChatworkClient
+
+        transport = ChatworkTransport(sleep=lambda s: None)
+        with patch("lib.chatwork.get_settings"):
+            client = ChatworkClient(api_token="token", transport=transport)
+
+        with patch("lib.chatwork_transport.httpx.request", side_effect=[
+            _response(json=[{"account_id": 1}, {"account_id": 2}]),
+            _response(json=[{"account_id": 1}]),
+        ]) as req:
+            assert len(client.get_room_members(1)) == 2
+            # 権限判定用の取得はキャッシュを読まず、最新の結果でキャッシュを更新する
+            assert client.get_room_members(1, use_cache=False) == [{"account_id": 1}]
+            assert client.get_room_members(1) == [{"account_id": 1}]
+
+        assert req.call_count == 2
+
+    def test_uncached_paths_always_hit_api(self):
+        transport = ChatworkTransport(sleep=lambda s: None)
+
+        with patch("lib.chatwork_transport.httpx.request", return_value=_response(json=[])) as req:
+            transport.request("GET", "/rooms/1/messages", HEADERS)
+            transport.request("GET", "/rooms/1/messages", HEADERS)
+
+        assert req.call_count == 2
+
+    def test_etag_revalidation_reuses_body(self):
+        transport = ChatworkTransport(sleep=lambda s: None)
+        responses = [
+            _response(json=[{"room_id": 1}], headers={"ETag": '"v1"'}),
+            _response(status=304),
+        ]
+
+        with patch("lib.chatwork_transport.httpx.request", side_effect=responses) as req:
+            transport.request("GET", "/rooms", HEADERS)
+            # 期限切れにする
+            for _, entry in transport.cache.items():
+                entry.expires_at = 0
+            result = transport.request("GET", "/rooms", HEADERS)
+
+        assert result.status_code == 200
+        assert result.json() == [{"room_id": 1}]
+        assert req.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert transport.stats.revalidated == 1
+
+    def test_write_invalidates_room_cache(self):
+        transport = ChatworkTransport(sleep=lambda s: None)
+
+        with patch("lib.chatwork_transport.httpx.request", return_value=_response(json=[])) as req:
+            transport.request("GET", "/rooms/1/tasks", HEADERS, params={"status": "open"})
+            transport.request("GET", "/rooms/2/tasks", HEADERS, params={"status": "open"})
+            transport.request("POST", "/rooms/1/tasks", HEADERS, data={"body": "x"})
+            transport.request("GET", "/rooms/1/tasks", HEADERS, params={"status": "open"})
+            transport.request("GET", "/rooms/2/tasks", HEADERS, params={"status": "open"})
+
+        # room 1 は再取得、room 2 はキャッシュのまま
+        assert req.call_count == 4
+
+    def test_coalesces_identical_inflight_gets(self):
+        transport = ChatworkTransport(sleep=lambda s: None)
+        release = threading.Event()
+        calls = []
+
+        def slow_request(**kwargs):
+            calls.append(kwargs["url"])
+            release.wait(5)
+            return _response(json=[{"task_id": 1}])
+
+        results = []
+        with patch("lib.chatwork_transport.httpx.request", side_effect=slow_request):
+            threads = [
+                threading.Thread(target=lambda: results.append(
+                    transport.request("GET", "/rooms/9/tasks", HEADERS, params={"status": "open"}, use_cache=False).json()
+                ))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            deadline = time.monotonic() + 5
+            while transport.stats.coalesced < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            for t in threads:
+                t.join(5)
+
+        assert len(calls) == 1
+        assert results == [[{"task_id": 1}]] * 4
+        assert transport.stats.coalesced == 3
+
+    def test_rate_limited_retry_uses_retry_after_and_headers(self):
+        clock = FakeClock()
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock.sleep(seconds)
+
+        transport = ChatworkTransport(
+            limiter_factory=lambda: ChatworkRateLimiter(clock=clock, wall_clock=clock),
+            sleep=sleep,
+        )
+        responses = [
+            _response(status=429, headers={"Retry-After": "7", "x-ratelimit-remaining": "0"}),
+            _response(json={"message_id": "1"}),
+        ]
+
+        with patch("lib.chatwork_transport.httpx.request", side_effect=responses):
+            result = transport.request("POST", "/rooms/1/messages", HEADERS, data={"body": "hi"})
+
+        assert result.status_code == 200
+        assert sleeps == [7]
+        assert transport.stats.rate_limited == 1
+
+    def test_timeout_raises_after_attempts(self):
+        sleeps = []
+        transport = ChatworkTransport(sleep=sleeps.append)
+
+        with patch("lib.chatwork_transport.httpx.request", side_effect=httpx.TimeoutException("t")) as req:
+            with pytest.raises(httpx.TimeoutException):
+                transport.request("GET", "/rooms", HEADERS, max_attempts=3)
+
+        assert req.call_count == 3
+        assert sleeps == [1.0, 2.0]
+
+
+class TestHelpers:
+
+    def test_normalize_endpoint(self):
+        assert normalize_endpoint("https://api.chatwork.com/v2/rooms/1/members") == "/rooms/1/members"
+        assert normalize_endpoint("/rooms?x=1") == "/rooms"
+
+    def test_cache_ttl_rules(self):
+        assert cache_ttl_for("/rooms/1/members") == 300.0
+        assert cache_ttl_for("/rooms/1/messages") is None
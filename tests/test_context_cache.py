@@ -0,0 +1,259 @@
+# tests/test_context_cache.py
+"""
+ContextCache（ContextBuilderのリクエスト横断キャッシュ）のテスト
+"""
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from lib.brain.context_builder import ContextBuilder, TaskInfo
+from lib.brain.context_cache import (
+    ContextCache,
+    CACHEABLE_SECTIONS,
+    SECTION_TASKS,
+    SECTION_GOALS,
+    SECTION_CEO_TEACHINGS,
+    get_context_cache,
+    invalidate_context_cache,
+)
+
+
+ORG = "5f98365f-e7c5-4f48-9918-7fe9aabae5df"
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+# =============================================================================
+# ContextCache 単体
+# =============================================================================
+
+
+class TestContextCache:
+
+    def test_lookup_miss_then_hit(self):
+        cache = ContextCache()
+        hits, gen = cache.lookup(ORG, "room1", "user1", [SECTION_TASKS])
+        assert hits == {}
+
+        assert cache.put(ORG, "room1", "user1", {SECTION_TASKS: ["t1"]}, gen)
+        hits, _ = cache.lookup(ORG, "room1", "user1", [SECTION_TASKS])
+        assert hits == {SECTION_TASKS: ["t1"]}
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ContextCache(ttl_seconds={SECTION_TASKS: 10}, clock=clock)
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_TASKS])
+        cache.put(ORG, "r", "u", {SECTION_TASKS: []}, gen)
+
+        clock.now += 9
+        assert SECTION_TASKS in cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0]
+        clock.now += 2
+        assert cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0] == {}
+
+    def test_invalidate_only_target_section(self):
+        cache = ContextCache()
+        _, gen = cache.lookup(ORG, "r", "u", CACHEABLE_SECTIONS)
+        cache.put(ORG, "r", "u", {SECTION_TASKS: [], SECTION_GOALS: []}, gen)
+
+        cache.invalidate(ORG, [SECTION_TASKS], user_id="u")
+
+        hits, _ = cache.lookup(ORG, "r", "u", CACHEABLE_SECTIONS)
+        assert SECTION_TASKS not in hits
+        assert SECTION_GOALS in hits
+
+    def test_invalidate_org_wide_across_rooms(self):
+        cache = ContextCache()
+        for room in ("r1", "r2"):
+            _, gen = cache.lookup(ORG, room, "u", [SECTION_GOALS])
+            cache.put(ORG, room, "u", {SECTION_GOALS: []}, gen)
+        _, gen = cache.lookup("other_org", "r1", "u", [SECTION_GOALS])
+        cache.put("other_org", "r1", "u", {SECTION_GOALS: []}, gen)
+
+        removed = cache.invalidate(ORG, [SECTION_GOALS])
+
+        assert removed == 2
+        assert cache.lookup("other_org", "r1", "u", [SECTION_GOALS])[0]
+
+    def test_stale_put_after_invalidate_is_dropped(self):
+        """取得中にinvalidateされた場合、古いデータは保存しない"""
+        cache = ContextCache()
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_TASKS])
+        cache.invalidate(ORG, [SECTION_TASKS])
+
+        assert cache.put(ORG, "r", "u", {SECTION_TASKS: ["stale"]}, gen) is False
+        assert cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0] == {}
+
+    def test_variant_mismatch_is_miss(self):
+        cache = ContextCache()
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_CEO_TEACHINGS])
+        cache.put(
+            ORG, "r", "u", {SECTION_CEO_TEACHINGS: ["t"]}, gen,
+            variants={SECTION_CEO_TEACHINGS: "挨拶"},
+        )
+
+        hits, _ = cache.lookup(
+            ORG, "r", "u", [SECTION_CEO_TEACHINGS],
+            variants={SECTION_CEO_TEACHINGS: "別の話題"},
+        )
+        assert hits == {}
+
+    def test_org_scoped_section_is_shared_across_users(self):
+        """CEO教えは (組織, キーワード) 単位で、ユーザー・ルームをまたいでヒットする"""
+        cache = ContextCache()
+        variants = {SECTION_CEO_TEACHINGS: "品質 納期"}
+        _, gen = cache.lookup(ORG, "r1", "u1", [SECTION_CEO_TEACHINGS], variants)
+        cache.put(ORG, "r1", "u1", {SECTION_CEO_TEACHINGS: ["t"]}, gen, variants)
+
+        hits, _ = cache.lookup(ORG, "r2", "u2", [SECTION_CEO_TEACHINGS], variants)
+        assert hits == {SECTION_CEO_TEACHINGS: ["t"]}
+        assert cache.lookup("other_org", "r2", "u2", [SECTION_CEO_TEACHINGS], variants)[0] == {}
+
+        # ユーザー指定の破棄でも組織単位のセクションは破棄される
+        assert cache.invalidate(ORG, [SECTION_CEO_TEACHINGS], user_id="u9") == 1
+        assert cache.lookup(ORG, "r1", "u1", [SECTION_CEO_TEACHINGS], variants)[0] == {}
+
+    def test_org_scoped_entries_do_not_evict_user_entries(self):
+        cache = ContextCache(max_entries=1, org_scoped_max_entries=2)
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_TASKS])
+        cache.put(ORG, "r", "u", {SECTION_TASKS: ["t1"]}, gen)
+
+        for query in ("a", "b", "c"):
+            variants = {SECTION_CEO_TEACHINGS: query}
+            _, gen = cache.lookup(ORG, "r", "u", [SECTION_CEO_TEACHINGS], variants)
+            cache.put(ORG, "r", "u", {SECTION_CEO_TEACHINGS: [query]}, gen, variants)
+
+        assert cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0] == {SECTION_TASKS: ["t1"]}
+        stats = cache.get_stats()
+        assert stats["org_scoped_entries"] == 2
+        assert stats["evictions"] == 1
+
+    def test_lru_eviction(self):
+        cache = ContextCache(max_entries=2)
+        for user in ("u1", "u2", "u3"):
+            _, gen = cache.lookup(ORG, "r", user, [SECTION_TASKS])
+            cache.put(ORG, "r", user, {SECTION_TASKS: []}, gen)
+
+        assert cache.lookup(ORG, "r", "u1", [SECTION_TASKS])[0] == {}
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_returned_list_is_copy(self):
+        cache = ContextCache()
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_TASKS])
+        cache.put(ORG, "r", "u", {SECTION_TASKS: ["t1"]}, gen)
+
+        hits, _ = cache.lookup(ORG, "r", "u", [SECTION_TASKS])
+        hits[SECTION_TASKS].append("mutated")
+
+        assert cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0][SECTION_TASKS] == ["t1"]
+
+    def test_invalidate_helper_targets_singleton(self):
+        cache = get_context_cache()
+        cache.clear()
+        _, gen = cache.lookup(ORG, "r", "u", [SECTION_GOALS])
+        cache.put(ORG, "r", "u", {SECTION_GOALS: []}, gen)
+
+        invalidate_context_cache(ORG, [SECTION_GOALS], user_id="u")
+
+        assert cache.lookup(ORG, "r", "u", [SECTION_GOALS])[0] == {}
+
+    def test_invalidate_helper_ignores_empty_org(self):
+        invalidate_context_cache("", [SECTION_GOALS])
+        invalidate_context_cache(None)
+
+
+# =============================================================================
+# ContextBuilder 統合
+# =============================================================================
+
+
+def _make_builder(cache):
+    pool = MagicMock()
+    conn = MagicMock()
+    conn.execute.return_value.fetchone.return_value = None
+    conn.execute.return_value.fetchall.return_value = []
+    pool.connect.return_value.__enter__ = MagicMock(return_value=conn)
+    pool.connect.return_value.__exit__ = MagicMock(return_value=False)
+    memory_access = MagicMock()
+    memory_access.get_recent_conversation = AsyncMock(return_value=[])
+    return ContextBuilder(pool=pool, memory_access=memory_access, context_cache=cache)
+
+
+class TestContextBuilderWithCache:
+
+    @pytest.mark.asyncio
+    async def test_second_build_skips_db(self):
+        """2回目のbuildは全セクションヒットでDB接続しない"""
+        builder = _make_builder(ContextCache())
+
+        await builder.build("u", "r", ORG, "こんにちは")
+        assert builder.pool.connect.call_count == 1
+
+        await builder.build("u", "r", ORG, "こんにちは")
+        assert builder.pool.connect.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_only_invalidated_sections_are_refetched(self):
+        cache = ContextCache()
+        builder = _make_builder(cache)
+        await builder.build("u", "r", ORG, "こんにちは")
+
+        cache.invalidate(ORG, [SECTION_TASKS], user_id="u")
+
+        with patch.object(
+            builder, "_fetch_all_db_data", new_callable=AsyncMock,
+        ) as mock_fetch:
+            mock_fetch.return_value = {
+                SECTION_TASKS: [TaskInfo(task_id="1", body="新しいタスク")],
+                "_fetched": {SECTION_TASKS},
+            }
+            context = await builder.build("u", "r", ORG, "こんにちは")
+
+        assert mock_fetch.call_args.kwargs["sections"] == {SECTION_TASKS}
+        assert [t.task_id for t in context.recent_tasks] == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_sections_are_not_cached(self):
+        cache = ContextCache()
+        builder = _make_builder(cache)
+
+        with patch.object(
+            builder, "_fetch_all_db_data", new_callable=AsyncMock,
+        ) as mock_fetch:
+            mock_fetch.return_value = {SECTION_TASKS: [], "_fetched": set()}
+            await builder.build("u", "r", ORG, "こんにちは")
+
+        assert cache.lookup(ORG, "r", "u", [SECTION_TASKS])[0] == {}
+
+    @pytest.mark.asyncio
+    async def test_ceo_teachings_keyed_on_search_keywords(self):
+        """CEO教えはメッセージ本文ではなく検索キーワードの集合でキャッシュする"""
+        cache = ContextCache()
+        builder = _make_builder(cache)
+        builder.ceo_teaching_repository = MagicMock()
+        builder.ceo_teaching_repository.search_teachings_with_conn.return_value = []
+
+        await builder.build("u1", "r", ORG, "品質 と 納期")
+        await builder.build("u2", "r", ORG, "納期 と 品質 品質")
+
+        assert builder.ceo_teaching_repository.search_teachings_with_conn.call_count == 1
+        variants = {SECTION_CEO_TEACHINGS: "と 品質 納期"}
+        assert cache.lookup(ORG, "r9", "u9", [SECTION_CEO_TEACHINGS], variants)[0] == {
+            SECTION_CEO_TEACHINGS: [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_without_cache_always_fetches(self):
+        builder = _make_builder(None)
+
+        await builder.build("u", "r", ORG, "こんにちは")
+        await builder.build("u", "r", ORG, "こんにちは")
+
+        assert builder.pool.connect.call_count == 2
@@ -0,0 +1,232 @@
+"""
+部署クロージャ・キャッシュのテスト
+
+api/app/services/department_closure.py と AccessControlService のバッチ判定
+（can_access_departments / can_access_tasks）について、
+既存のLTREEクエリと同じ範囲になること、キャッシュ済みならDBを叩かないこと、
+ツリーのバージョン変更・明示的な無効化で読み直すこと、
+DBエラー時にロールバックして接続を使える状態に戻すことを検証する。
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from app.services.access_control import AccessControlService, get_access_scope_sync
+from app.services.department_closure import (
+    DEPARTMENT_TREE_SQL,
+    DEPARTMENT_TREE_VERSION_SQL,
+    USER_MEMBERSHIP_SQL,
+    DepartmentAccessCache,
+    DepartmentClosure,
+    get_department_access_cache,
+    membership_to_scope,
+    resolve_access_scope_sync,
+)
+
+
+ORG = "org_test_001"
+
+# hq ─┬─ sales ─┬─ tokyo ── shibuya
+#     │         └─ osaka（無効）
+#     └─ dev
+TREE_ROWS = [
+    ("hq", None, "hq", True),
+    ("sales", "hq", "hq.sales", True),
+    ("tokyo", "sales", "hq.sales.tokyo", True),
+    ("shibuya", "tokyo", "hq.sales.tokyo.shibuya", True),
+    ("osaka", "sales", "hq.sales.osaka", False),
+    ("dev", "hq", "hq.dev", True),
+]
+
+
+def _result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    result.fetchone.return_value = rows[0] if rows else None
+    return result
+
+
+class FakeConn:
+    """クエリ種別ごとに行を返す同期コネクション"""
+
+    def __init__(self, version=0, membership=None, fail=()):
+        self.version = version
+        self.membership = membership or [("sales", 4)]
+        self.fail = set(fail)
+        self.calls = []
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def execute(self, query, params=None):
+        kind = {
+            DEPARTMENT_TREE_VERSION_SQL: "version",
+            DEPARTMENT_TREE_SQL: "tree",
+            USER_MEMBERSHIP_SQL: "membership",
+        }.get(query)
+        if kind in self.fail:
+            self.calls.append(f"{kind}!")
+            raise Exception(f"{kind} query failed")
+        if query is DEPARTMENT_TREE_VERSION_SQL:
+            self.calls.append("version")
+            return _result([(self.version,)] if self.version else [])
+        if query is DEPARTMENT_TREE_SQL:
+            self.calls.append("tree")
+            return _result(TREE_ROWS)
+        if query is USER_MEMBERSHIP_SQL:
+            self.calls.append("membership")
+            return _result(self.membership)
+        raise AssertionError("unexpected query")
+
+
+class TestDepartmentClosure:
+
+    def test_matches_ltree_semantics(self):
+        closure = DepartmentClosure.from_rows(ORG, 1, TREE_ROWS)
+
+        # 配下は自分を含まず、無効部署を含まない
+        assert closure.descendants["sales"] == {"tokyo", "shibuya"}
+        assert closure.descendants["hq"] == {"sales", "tokyo", "shibuya", "dev"}
+        assert closure.children["sales"] == {"tokyo"}
+        assert "osaka" not in closure.active_ids
+
+    def test_scope_by_role_level(self):
+        closure = DepartmentClosure.from_rows(ORG, 1, TREE_ROWS)
+
+        leader = membership_to_scope(closure, [("sales", 3)])
+        director = membership_to_scope(closure, [("sales", 4), ("dev", None)])
+        admin = membership_to_scope(closure, [("dev", 5)])
+        no_role = membership_to_scope(closure, [("tokyo", None)])
+
+        assert leader.department_ids == {"sales", "tokyo"}
+        assert director.department_ids == {"sales", "tokyo", "shibuya", "dev"}
+        assert admin.has_full_access and admin.department_ids == closure.active_ids
+        assert (no_role.role_level, no_role.department_ids) == (2, {"tokyo"})
+
+
+class TestResolveAccessScope:
+
+    def test_cached_scope_skips_database(self):
+        cache = DepartmentAccessCache(version_check_seconds=60, scope_ttl_seconds=60)
+        conn = FakeConn()
+
+        first = resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        second = resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+
+        assert first is second
+        assert conn.calls == ["version", "tree", "membership"]
+
+    def test_version_change_reloads_tree(self):
+        cache = DepartmentAccessCache(version_check_seconds=0, scope_ttl_seconds=60)
+        conn = FakeConn(version=1)
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+
+        # バージョンが同じなら確認だけ
+        conn.calls.clear()
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.calls == ["version"]
+
+        # トリガーでバージョンが進むと、ツリーと所属を読み直す
+        conn.calls.clear()
+        conn.version = 2
+        scope = resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.calls == ["version", "tree", "membership"]
+        assert scope.tree_version == 2
+
+    def test_explicit_invalidation(self):
+        cache = DepartmentAccessCache(version_check_seconds=60, scope_ttl_seconds=60)
+        conn = FakeConn()
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+
+        conn.calls.clear()
+        cache.invalidate_user(ORG, "u1")
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.calls == ["membership"]
+
+        conn.calls.clear()
+        cache.invalidate_organization(ORG)
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.calls == ["version", "tree", "membership"]
+
+    def test_missing_version_table_rolls_back_and_reloads_tree(self):
+        # department_tree_versions マイグレーション未適用
+        cache = DepartmentAccessCache(version_check_seconds=0, scope_ttl_seconds=60)
+        conn = FakeConn(fail={"version"})
+
+        scope = resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert scope.department_ids == {"sales", "tokyo", "shibuya"}
+        assert conn.rollbacks == 1
+
+        # バージョンで照合できないため、確認のたびにツリーを読み直す
+        conn.calls.clear()
+        resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.calls == ["version!", "tree", "membership"]
+
+    def test_membership_error_rolls_back_and_raises(self):
+        cache = DepartmentAccessCache(version_check_seconds=60, scope_ttl_seconds=60)
+        conn = FakeConn(fail={"membership"})
+
+        with pytest.raises(Exception, match="membership"):
+            resolve_access_scope_sync(conn, "u1", ORG, cache=cache)
+        assert conn.rollbacks == 1
+
+    def test_get_access_scope_sync_returns_none_after_rollback(self):
+        get_department_access_cache().clear()
+        conn = FakeConn(fail={"tree"})
+
+        assert get_access_scope_sync(conn, "u1", ORG) is None
+        assert conn.rollbacks == 1
+        get_department_access_cache().clear()
+
+
+class TestBatchAccessChecks:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_department_access_cache().clear()
+        yield
+        get_department_access_cache().clear()
+
+    @pytest.fixture
+    def session(self):
+        conn = FakeConn(membership=[("sales", 3)])
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=conn.execute)
+        session.calls = conn.calls
+        return session
+
+    @pytest.mark.asyncio
+    async def test_many_checks_in_one_resolution(self, session):
+        service = AccessControlService(session)
+
+        departments = await service.can_access_departments(
+            "u1", ["sales", "tokyo", "shibuya", "dev"], ORG
+        )
+        tasks = await service.can_access_tasks(
+            "u1", {"t1": "tokyo", "t2": None, "t3": "dev"}, ORG
+        )
+
+        assert departments == {"sales": True, "tokyo": True, "shibuya": False, "dev": False}
+        assert tasks == {"t1": True, "t2": True, "t3": False}
+        assert session.calls == ["version", "tree", "membership"]
+
+    @pytest.mark.asyncio
+    async def test_database_error_denies_access(self):
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=Exception("DB error"))
+        session.rollback = AsyncMock()
+        service = AccessControlService(session)
+
+        departments = await service.can_access_departments("u1", ["sales"], ORG)
+        tasks = await service.can_access_tasks("u1", {"t1": "sales", "t2": None}, ORG)
+
+        assert departments == {"sales": False}
+        assert tasks == {"t1": False, "t2": True}
+        # 失敗したクエリの後も同じセッションを使えるようロールバックする
+        assert session.rollback.await_count >= 1
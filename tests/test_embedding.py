@@ -11,6 +11,10 @@ from lib.embedding import (
     EmbeddingClient,
     EmbeddingResult,
     BatchEmbeddingResult,
+    EmbeddingCache,
+    EmbeddingStore,
+    get_shared_embedding_cache,
+    make_embedding_cache_key,
     embed_text,
     embed_text_sync,
     get_embedding_client,
@@ -19,6 +23,14 @@ from lib.embedding import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_embedding_cache():
+    """プロセス共通キャッシュはテスト間で持ち越さない"""
+    get_shared_embedding_cache().clear()
+    yield
+    get_shared_embedding_cache().clear()
+
+
 class TestEmbeddingClient:
     """EmbeddingClient のテスト"""
 
@@ -97,6 +109,129 @@ class TestEmbeddingClient:
         assert cost == 0.0
 
 
+class InMemoryStore(EmbeddingStore):
+    """テスト用の永続ストア"""
+
+    def __init__(self):
+        self.data = {}
+        self.get_calls = 0
+
+    def get_many(self, keys):
+        self.get_calls += 1
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def put_many(self, model, task_type, vectors):
+        self.data.update(vectors)
+
+
+class TestEmbeddingCache:
+    """v11.3.0: エンベディングキャッシュのテスト"""
+
+    def test_cache_key_depends_on_model_and_task_type(self):
+        base = make_embedding_cache_key("m", "RETRIEVAL_DOCUMENT", "経費精算")
+        assert base == make_embedding_cache_key("m", "RETRIEVAL_DOCUMENT", "経費精算")
+        assert base != make_embedding_cache_key("m", "RETRIEVAL_QUERY", "経費精算")
+        assert base != make_embedding_cache_key("m2", "RETRIEVAL_DOCUMENT", "経費精算")
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put_many({"a": [1.0], "b": [2.0]})
+        cache.get_many(["a"])
+        cache.put_many({"c": [3.0]})
+
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_embedding_store_requires_get_and_put(self):
+        class GetOnlyStore(EmbeddingStore):
+            def get_many(self, keys):
+                return {}
+
+        with pytest.raises(TypeError):
+            GetOnlyStore()
+        assert isinstance(InMemoryStore(), EmbeddingStore)
+
+    def test_zero_entries_disables_cache(self):
+        cache = EmbeddingCache(max_entries=0)
+        cache.put_many({"a": [1.0]})
+        assert cache.get_many(["a"]) == {}
+
+    def test_embed_query_sync_hits_cache(self, mock_openai_embedding):
+        """同じクエリの2回目はAPIを呼ばない"""
+        client = EmbeddingClient(api_key="test-key")
+        embed = mock_openai_embedding['client'].models.embed_content
+
+        first = client.embed_query_sync("有給申請の方法は？")
+        second = client.embed_query_sync("有給申請の方法は？")
+
+        assert embed.call_count == 1
+        assert first.vector == second.vector
+        # 文書用とクエリ用は別キー
+        client.embed_text_sync("有給申請の方法は？")
+        assert embed.call_count == 2
+
+    def test_embed_texts_sync_dedups_and_uses_cache(self, mock_openai_embedding):
+        client = EmbeddingClient(api_key="test-key")
+        embed = mock_openai_embedding['client'].models.embed_content
+        client.embed_text_sync("A")
+
+        result = client.embed_texts_sync(["A", "B", "B", "C"])
+
+        assert len(result.results) == 4
+        assert result.cached_count == 1
+        assert embed.call_args.kwargs["contents"] == ["B", "C"]
+
+    def test_persistent_store_is_second_level(self, mock_openai_embedding):
+        """L2ヒットはAPIを呼ばずL1に昇格する"""
+        store = InMemoryStore()
+        EmbeddingClient(api_key="test-key", persistent_store=store).embed_text_sync("A")
+        get_shared_embedding_cache().clear()  # 別プロセスを想定
+
+        client = EmbeddingClient(api_key="test-key", persistent_store=store)
+        embed = mock_openai_embedding['client'].models.embed_content
+        embed.reset_mock()
+        store.get_calls = 0
+        client.embed_text_sync("A")
+        client.embed_text_sync("A")
+
+        assert embed.call_count == 0
+        assert store.get_calls == 1
+
+    def test_clients_share_process_cache(self, mock_openai_embedding):
+        """リクエストごとにクライアントを作ってもキャッシュが効く"""
+        embed = mock_openai_embedding['client'].models.embed_content
+        EmbeddingClient(api_key="test-key").embed_query_sync("有給申請の方法は？")
+        EmbeddingClient(api_key="test-key").embed_query_sync("有給申請の方法は？")
+
+        assert embed.call_count == 1
+
+    def test_with_persistent_store_shares_api_client_and_cache(self, mock_openai_embedding):
+        base = EmbeddingClient(api_key="test-key")
+        store = InMemoryStore()
+
+        client = base.with_persistent_store(store)
+        client.embed_text_sync("A")
+
+        assert client.cache is base.cache
+        assert client._client is base._client
+        assert base.persistent_store is None
+        assert store.data
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_async_concurrent_batches(self, mock_openai_embedding):
+        """未取得分をバッチに分けて全件返す（入力順を維持）"""
+        client = EmbeddingClient(api_key="test-key", max_concurrency=2)
+        embed = mock_openai_embedding['client'].models.embed_content
+        texts = [f"テキスト{i}" for i in range(5)] + ["テキスト0"]
+
+        result = await client.embed_texts(texts, batch_size=2)
+
+        assert len(result.results) == 6
+        assert embed.call_count == 3  # 5種類 / バッチ2件
+        again = await client.embed_texts(texts, batch_size=2)
+        assert embed.call_count == 3
+        assert again.cached_count == 5
+
+
 class TestEmbeddingResult:
     """EmbeddingResult のテスト"""
 
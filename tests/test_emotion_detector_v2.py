@@ -18,7 +18,10 @@ Author: Claude Code（経営参謀・SE・PM）
 Created: 2026-02-04
 """
 
+import asyncio
 import json
+
+import httpx
 import pytest
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -1139,5 +1142,99 @@ class TestEdgeCases:
         assert risk == EmotionRiskLevel.MEDIUM
 
 
+# ================================================================
+# 16. バッチ感情分析のテスト
+# ================================================================
+
+class TestBatchSentiment:
+    """既存スコアの一括取得・バッチLLM分析・並行実行のテスト"""
+
+    @staticmethod
+    def _messages(n, prefix=1000):
+        now = datetime.now(timezone.utc)
+        return [
+            {'message_id': str(prefix + i), 'room_id': '100', 'body': f'メッセージ{i}です。よろしく', 'send_time': now}
+            for i in range(n)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_maps_local_ids_back_to_messages(self, detector):
+        """連番idで返った結果をメッセージIDに戻し、不正な要素は捨てる"""
+        messages = self._messages(3)
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            content = json.dumps({"results": [
+                {"id": 2, "sentiment_score": -3, "sentiment_label": "very_negative",
+                 "detected_emotions": ["疲労"], "confidence": 0.9},
+                {"id": 0, "sentiment_score": 0.1, "sentiment_label": "neutral",
+                 "detected_emotions": [], "confidence": 0.8},
+                {"id": 7, "sentiment_score": 0.5, "sentiment_label": "positive",
+                 "detected_emotions": [], "confidence": 0.8},
+            ]})
+            return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+        with patch.dict('os.environ', {'OPENROUTER_API_KEY': 'test-key'}):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                results = await detector._analyze_sentiment_batch(client, messages)
+
+        assert set(results) == {'1000', '1002'}
+        assert results['1002']['sentiment_score'] == -1.0
+        payload = seen[0]
+        assert payload['response_format']['type'] == 'json_schema'
+        assert [item['id'] for item in json.loads(payload['messages'][1]['content'])] == [0, 1, 2]
+        assert '1000' not in payload['messages'][1]['content']
+
+    @pytest.mark.asyncio
+    async def test_prepare_uses_existing_scores_and_caches_results(self, detector, mock_conn):
+        """既存スコアは1クエリで取得し、未分析分だけLLMへ。以降はキャッシュから返す"""
+        messages = self._messages(3)
+        mock_result = MagicMock()
+        mock_result.__iter__.return_value = iter([(1000, -0.4, 'negative', 0.7, ['不安'])])
+        mock_conn.execute.return_value = mock_result
+        analyzed = {'1001': {'sentiment_score': 0.3, 'sentiment_label': 'positive',
+                             'confidence': 0.8, 'detected_emotions': []}}
+
+        with patch.object(detector, '_score_message_groups', return_value=analyzed) as score:
+            with patch.object(detector, '_save_emotion_scores', return_value=None) as save:
+                await detector._prepare_sentiment_scores([messages])
+
+        assert [m['message_id'] for m in score.call_args[0][0][0]] == ['1001', '1002']
+        assert [m['message_id'] for m, _ in save.call_args[0][0]] == ['1001']
+
+        mock_conn.execute.reset_mock()
+        with patch.object(detector, '_analyze_sentiment') as single:
+            scores = [await detector._get_or_calculate_sentiment(m) for m in messages]
+
+        assert [s and s['sentiment_score'] for s in scores] == [-0.4, 0.3, None]
+        mock_conn.execute.assert_not_called()
+        single.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_score_groups_in_concurrent_batches(self, mock_conn, org_id):
+        """ユーザーごとにバッチへ分割し、同時リクエスト数を上限内で並行実行"""
+        detector = EmotionDetector(mock_conn, org_id, sentiment_batch_size=2, sentiment_max_concurrency=2)
+        groups = [self._messages(3, prefix=1000), self._messages(2, prefix=2000), self._messages(1, prefix=3000)]
+        in_flight, peak, sizes = 0, 0, []
+
+        async def fake_batch(client, batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            sizes.append(len(batch))
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {str(m['message_id']): {'sentiment_score': 0.0, 'sentiment_label': 'neutral'} for m in batch}
+
+        with patch.dict('os.environ', {'OPENROUTER_API_KEY': 'test-key'}):
+            with patch.object(detector, '_analyze_sentiment_batch', side_effect=fake_batch):
+                results = await detector._score_message_groups(groups)
+
+        assert sorted(sizes) == [1, 1, 2, 2]
+        assert peak == 2
+        assert len(results) == 6
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
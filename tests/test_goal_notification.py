@@ -4,6 +4,8 @@ lib/goal_notification.py のテスト
 Phase 2.5 目標通知サービスのユニットテスト
 """
 
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock, call
 from datetime import date, datetime, timedelta
@@ -23,6 +25,10 @@ from lib.goal_notification import (
     scheduled_daily_check,
     scheduled_daily_reminder,
     scheduled_morning_feedback,
+    GoalNotification,
+    NotificationDispatcher,
+    SlidingWindowRateLimiter,
+    JST,
 )
 
 
@@ -594,115 +600,345 @@ class TestSendTeamSummaryToLeader:
         assert error == "already_sent_or_processing"
 
 
+def _routing_conn(routes):
+    """
+    SQL文の内容で結果を返し分けるDB接続モック
+
+    routes: [(SQLに含まれる文字列, 行リスト or params を受け取る関数)]（先勝ち）
+    """
+    conn = MagicMock()
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        rows = []
+        for keyword, value in routes:
+            if keyword in sql:
+                rows = value(params) if callable(value) else value
+                break
+        result = MagicMock()
+        result.fetchall.return_value = rows
+        result.fetchone.return_value = rows[0] if rows else None
+        return result
+
+    conn.execute.side_effect = execute
+    return conn
+
+
+def _claim_all(params):
+    """一括確保で全員を確保できた場合"""
+    return [(target_id,) for target_id in params['target_ids']]
+
+
+def _executed(conn, keyword):
+    """keyword を含むSQLの (sql, params) 一覧"""
+    return [
+        (str(c.args[0]), c.args[1] if len(c.args) > 1 else None)
+        for c in conn.execute.call_args_list
+        if keyword in str(c.args[0])
+    ]
+
+
+def _test_dispatcher(send_func, max_workers=4):
+    return NotificationDispatcher(
+        send_func,
+        max_workers=max_workers,
+        rate_limiter=SlidingWindowRateLimiter([(1.0, 1000)]),
+    )
+
+
+GOAL_USERS = [
+    ("user_001", "山田太郎", "12345"),
+    ("user_002", "鈴木花子", "12346"),
+]
+
+GOAL_ROWS = [
+    ("user_001", "g1", "目標", "numeric", 100, 50, "件", None),
+    ("user_002", "g2", "粗利", "numeric", 3000000, 1000000, "円", None),
+]
+
+
 class TestScheduledDailyCheck:
     """scheduled_daily_check のテスト"""
 
-    def test_processes_all_users(self, mock_goal_db_conn, mock_chatwork_send):
-        """全ユーザーを処理"""
-        call_count = [0]
-
-        def side_effect(*args, **kwargs):
-            call_count[0] += 1
-            mock_result = MagicMock()
-            if call_count[0] == 1:
-                # ユーザー一覧取得
-                mock_result.fetchall.return_value = [
-                    ("user_001", "山田太郎", "12345"),
-                    ("user_002", "鈴木花子", "12346"),
-                ]
-            elif call_count[0] in [2, 5]:
-                # 目標取得
-                mock_result.fetchall.return_value = [
-                    ("g1", "目標", "numeric", 100, 50, "件", None)
-                ]
-            else:
-                # その他のクエリ
-                mock_result.fetchone.return_value = None
-            return mock_result
+    def _conn(self, claim=_claim_all):
+        return _routing_conn([
+            ("SET status = 'cancelled'", []),
+            ("INSERT INTO notification_logs", claim),
+            ("UPDATE notification_logs", []),
+            ("SELECT user_id, id, title", GOAL_ROWS),
+            ("u.chatwork_room_id IS NOT NULL", GOAL_USERS),
+        ])
 
-        mock_goal_db_conn.execute.side_effect = side_effect
+    def test_processes_all_users(self, mock_chatwork_send):
+        """全ユーザーを処理"""
+        conn = self._conn()
 
         results = scheduled_daily_check(
-            conn=mock_goal_db_conn,
+            conn=conn,
             org_id="org_test",
             send_message_func=mock_chatwork_send,
             dry_run=True,  # ドライランでテスト
         )
 
-        assert "success" in results or "skipped" in results
+        assert results["skipped"] == 2
+        assert results["success"] == 0
+        # ドライランでは notification_logs に書き込まない
+        assert _executed(conn, "notification_logs") == []
+
+    def test_prefetches_goals_once_and_bulk_logs(self):
+        """目標は1クエリで取得し、通知ログは一括で確保・更新する"""
+        conn = self._conn(claim=lambda params: [("user_001",)])
+        sent = []
+        send = lambda room_id, message: sent.append((room_id, message))
+
+        results = scheduled_daily_check(
+            conn=conn,
+            org_id="org_test",
+            send_message_func=send,
+            dispatcher=_test_dispatcher(send),
+        )
+
+        # user_002 は既に送信済み（確保できなかった）
+        assert results == {'success': 1, 'skipped': 1, 'failed': 0, 'blocked': 0}
+        assert len(sent) == 1
+        assert sent[0][0] == "12345"
+        assert "山田太郎" in sent[0][1]
+
+        assert len(_executed(conn, "SELECT user_id, id, title")) == 1
+        (_, claim_params), = _executed(conn, "INSERT INTO notification_logs")
+        assert claim_params['target_ids'] == ["user_001", "user_002"]
+        (_, update_params), = _executed(conn, "UPDATE notification_logs")
+        assert update_params['target_ids'] == ["user_001"]
+        assert update_params['statuses'] == ["success"]
+
+    def test_send_error_is_recorded_as_failed(self):
+        """送信エラーは failed として一括記録"""
+        conn = self._conn()
+
+        def send(room_id, message):
+            if room_id == "12346":
+                raise Exception("API error")
+
+        results = scheduled_daily_check(
+            conn=conn,
+            org_id="org_test",
+            send_message_func=send,
+            dispatcher=_test_dispatcher(send),
+        )
+
+        assert results["success"] == 1
+        assert results["failed"] == 1
+        (_, update_params), = _executed(conn, "UPDATE notification_logs")
+        statuses = dict(zip(update_params['target_ids'], update_params['statuses']))
+        assert statuses == {"user_001": "success", "user_002": "failed"}
+        errors = dict(zip(update_params['target_ids'], update_params['error_messages']))
+        assert errors["user_001"] is None
+        assert "API error" in errors["user_002"]
+
+    def test_test_guard_blocks_before_prefetch(self, mock_chatwork_send):
+        """テストガードでブロックされたユーザーは目標も取得しない"""
+        conn = self._conn()
+
+        with patch("lib.goal_notification.is_goal_test_send_allowed", side_effect=lambda r: r == "12345"):
+            results = scheduled_daily_check(
+                conn=conn,
+                org_id="org_test",
+                send_message_func=mock_chatwork_send,
+                dispatcher=_test_dispatcher(mock_chatwork_send),
+            )
+
+        assert results["blocked"] == 1
+        assert results["success"] == 1
+        (_, goal_params), = _executed(conn, "SELECT user_id, id, title")
+        assert goal_params['user_ids'] == ["user_001"]
 
 
 class TestScheduledDailyReminder:
     """scheduled_daily_reminder のテスト"""
 
-    def test_processes_unanswered_users(self, mock_goal_db_conn, mock_chatwork_send):
+    def test_processes_unanswered_users(self, mock_chatwork_send):
         """未回答ユーザーを処理"""
-        call_count = [0]
-
-        def side_effect(*args, **kwargs):
-            call_count[0] += 1
-            mock_result = MagicMock()
-            if call_count[0] == 1:
-                # ユーザー一覧取得
-                mock_result.fetchall.return_value = [
-                    ("user_001", "山田太郎", "12345"),
-                ]
-            else:
-                mock_result.fetchone.return_value = None
-            return mock_result
-
-        mock_goal_db_conn.execute.side_effect = side_effect
+        conn = _routing_conn([
+            ("u.chatwork_room_id IS NOT NULL", [("user_001", "山田太郎", "12345")]),
+        ])
 
         results = scheduled_daily_reminder(
-            conn=mock_goal_db_conn,
+            conn=conn,
             org_id="org_test",
             send_message_func=mock_chatwork_send,
             dry_run=True,
         )
 
-        assert "success" in results or "skipped" in results
+        assert results["skipped"] == 1
+        assert _executed(conn, "notification_logs") == []
+
+    def test_skips_answered_and_ignored_users(self):
+        """回答済み・連続無視のユーザーを一括判定して除外"""
+        conn = _routing_conn([
+            ("INSERT INTO notification_logs", _claim_all),
+            ("UPDATE notification_logs", []),
+            ("SELECT DISTINCT g.user_id", [("user_001",)]),
+            ("COUNT(*) AS ignored_days", [("user_002", 3)]),
+            ("u.chatwork_room_id IS NOT NULL", GOAL_USERS + [("user_003", "佐藤次郎", "12347")]),
+        ])
+        sent = []
+        send = lambda room_id, message: sent.append(room_id)
+
+        results = scheduled_daily_reminder(
+            conn=conn,
+            org_id="org_test",
+            send_message_func=send,
+            dispatcher=_test_dispatcher(send),
+        )
+
+        is_monday = datetime.now(JST).date().weekday() == 0
+        expected_rooms = {"12346", "12347"} if is_monday else {"12347"}
+        assert set(sent) == expected_rooms
+        assert results["success"] == len(expected_rooms)
+        assert results["skipped"] == 3 - len(expected_rooms)
+        # 回答状況・無視日数はそれぞれ1クエリ
+        assert len(_executed(conn, "SELECT DISTINCT g.user_id")) == 1
+        assert len(_executed(conn, "COUNT(*) AS ignored_days")) == 1
 
 
 class TestScheduledMorningFeedback:
     """scheduled_morning_feedback のテスト"""
 
-    def test_sends_individual_feedback_and_team_summary(self, mock_goal_db_conn, mock_chatwork_send):
+    def _conn(self):
+        return _routing_conn([
+            ("INSERT INTO notification_logs", _claim_all),
+            ("UPDATE notification_logs", []),
+            ("INSERT INTO audit_logs", []),
+            ("ud.department_id = ANY", [
+                ("dept_001", "user_001", "山田太郎", "g1", "目標", "numeric", 100, 80, "件"),
+                ("dept_001", "user_002", "鈴木花子", "g2", "目標", "numeric", 100, 20, "件"),
+            ]),
+            ("JOIN roles", [
+                ("leader_001", "部長A", "99999", "dept_001", "営業部"),
+                ("leader_002", "部長B", "99998", "dept_002", "総務部"),
+            ]),
+            ("SELECT g.user_id, gp.goal_id", [
+                ("user_001", "g1", 10, 80, "ノート", "選択"),
+            ]),
+            ("SELECT user_id, id, title", GOAL_ROWS[:1]),
+            ("gp.progress_date = :yesterday", [("user_001", "山田太郎", "12345")]),
+        ])
+
+    def test_sends_individual_feedback_and_team_summary(self, mock_chatwork_send):
         """個人フィードバックとチームサマリーの両方を送信"""
-        call_count = [0]
+        conn = self._conn()
+        sent = {}
 
-        def side_effect(*args, **kwargs):
-            call_count[0] += 1
-            mock_result = MagicMock()
-            if call_count[0] == 1:
-                # 進捗報告したユーザー一覧
-                mock_result.fetchall.return_value = [
-                    ("user_001", "山田太郎", "12345"),
-                ]
-            elif call_count[0] == 2:
-                # 目標取得
-                mock_result.fetchall.return_value = [
-                    ("g1", "目標", "numeric", 100, 80, "件", None)
-                ]
-            elif call_count[0] == 3:
-                # 進捗データ取得
-                mock_result.fetchall.return_value = [
-                    ("g1", 10, 80, "ノート", "選択")
-                ]
-            else:
-                mock_result.fetchone.return_value = None
-                mock_result.fetchall.return_value = []
-            return mock_result
+        def send(room_id, message):
+            sent[room_id] = message
 
-        mock_goal_db_conn.execute.side_effect = side_effect
+        results = scheduled_morning_feedback(
+            conn=conn,
+            org_id="org_test",
+            send_message_func=send,
+            dispatcher=_test_dispatcher(send),
+        )
+
+        # 個人フィードバック1件 + チームサマリー1件（総務部はメンバーなし）
+        assert results["success"] == 2
+        assert "山田太郎" in sent["12345"]
+        assert "部長A" in sent["99999"]
+        assert "鈴木花子" in sent["99999"]
+        assert "99998" not in sent
+
+        # 部署メンバーは1クエリでまとめて取得
+        (_, member_params), = _executed(conn, "ud.department_id = ANY")
+        assert member_params['department_ids'] == ["dept_001", "dept_002"]
+
+        # チームサマリーは metadata 付きで確保し、監査ログを記録
+        claims = _executed(conn, "INSERT INTO notification_logs")
+        summary_claim = next(p for _, p in claims if p['notification_type'] == "goal_team_summary")
+        assert "営業部" in summary_claim['metadata'][0]
+        (_, audit_rows), = _executed(conn, "INSERT INTO audit_logs")
+        assert audit_rows[0]['user_id'] == "leader_001"
+
+    def test_dry_run(self, mock_chatwork_send):
+        """ドライランでは送信・記録しない"""
+        conn = self._conn()
 
         results = scheduled_morning_feedback(
-            conn=mock_goal_db_conn,
+            conn=conn,
             org_id="org_test",
             send_message_func=mock_chatwork_send,
             dry_run=True,
         )
 
-        assert "success" in results or "skipped" in results
+        assert results["skipped"] == 2
+        assert _executed(conn, "notification_logs") == []
+        assert _executed(conn, "audit_logs") == []
+
+
+class TestSlidingWindowRateLimiter:
+    """SlidingWindowRateLimiter のテスト"""
+
+    def _limiter(self, windows):
+        clock = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        limiter = SlidingWindowRateLimiter(windows, clock=lambda: clock[0], sleep=sleep)
+        return limiter, sleeps
+
+    def test_waits_until_window_frees(self):
+        limiter, sleeps = self._limiter([(1.0, 2)])
+
+        waited = [limiter.acquire() for _ in range(5)]
+
+        assert waited == [0.0, 0.0, 1.0, 0.0, 1.0]
+        assert sleeps == [1.0, 1.0]
+
+    def test_longest_window_bounds_total_rate(self):
+        limiter, _ = self._limiter([(1.0, 10), (300.0, 20)])
+
+        for _ in range(20):
+            limiter.acquire()
+
+        # 5分枠を使い切ったら、最初の送信から300秒経つまで待つ
+        assert limiter.acquire() == pytest.approx(300.0 - 1.0)
+
+
+class TestNotificationDispatcher:
+    """NotificationDispatcher のテスト"""
+
+    def _notification(self, i, render=None):
+        return GoalNotification(
+            recipient_id=f"user_{i}",
+            recipient_name=f"ユーザー{i}",
+            chatwork_room_id=str(i),
+            render=render or (lambda: "message"),
+        )
+
+    def test_sends_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        dispatcher = _test_dispatcher(lambda room_id, message: barrier.wait(), max_workers=3)
+        notifications = [self._notification(i) for i in range(3)]
+
+        dispatcher.dispatch(notifications)
+
+        assert [n.status for n in notifications] == ["success"] * 3
+
+    def test_render_error_marks_failed(self):
+        send = MagicMock()
+        dispatcher = _test_dispatcher(send)
+
+        def broken():
+            raise ValueError("bad goal")
+
+        notifications = [self._notification(1, render=broken), self._notification(2)]
+        dispatcher.dispatch(notifications)
+
+        assert notifications[0].status == "failed"
+        assert "bad goal" in notifications[0].error_message
+        assert notifications[1].status == "success"
+        send.assert_called_once_with("2", "message")
 
 
 class TestCurrencyFormatting:
@@ -0,0 +1,185 @@
+"""
+lib/meetings/hierarchical_minutes.py のテスト
+
+長いトランスクリプトを発言単位・時間窓で分割し、区間メモを並行に抽出してから
+統合すること（会議の終盤までLLMに届くこと）、区間メモのキャッシュ、
+短いトランスクリプトは従来どおり1回の呼び出しで済むことを検証する。
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from lib.meetings.hierarchical_minutes import (
+    MINUTES_MAP_SYSTEM_PROMPT,
+    MINUTES_MERGE_SYSTEM_PROMPT,
+    HierarchicalMinutesGenerator,
+    PartialMinutesCache,
+    split_transcript,
+    split_transcript_text,
+)
+from lib.meetings.minutes_generator import (
+    CHATWORK_MINUTES_SYSTEM_PROMPT,
+    MAX_TRANSCRIPT_CHARS,
+    build_chatwork_minutes_prompt,
+)
+from lib.meetings.vtt_parser import VTTSegment, VTTTranscript
+
+
+def _ts(seconds):
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}.000"
+
+
+def _vtt(minutes, text="今期の売上目標について議論しました。" * 8):
+    """1分ごとに話者が交代する会議（各発言は2セグメント）"""
+    segments = []
+    for minute in range(minutes):
+        speaker = "田中" if minute % 2 == 0 else "佐藤"
+        for half in (0, 30):
+            start = minute * 60 + half
+            segments.append(VTTSegment(_ts(start), _ts(start + 30), speaker, f"{minute}分: {text}"))
+    return VTTTranscript(segments=segments)
+
+
+def _partial(summary):
+    return json.dumps({
+        "summary": summary,
+        "topics": [{"title": summary, "start": "", "details": "詳細"}],
+        "decisions": [],
+        "action_items": [{"task": f"{summary}の対応", "assignee": "田中"}],
+        "facts": [],
+    }, ensure_ascii=False)
+
+
+class RecordingLLM:
+    """プロンプトを記録し、区間メモには区間番号入りのJSONを返すLLM"""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, prompt, system_prompt):
+        self.calls.append((prompt, system_prompt))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if system_prompt == CHATWORK_MINUTES_SYSTEM_PROMPT:
+            return "■ 議題（00:00〜）\n内容"
+        return _partial(prompt.split("\n", 1)[0])
+
+    def prompts(self, system_prompt):
+        return [p for p, s in self.calls if s == system_prompt]
+
+
+class TestSplitTranscript:
+
+    def test_chunks_follow_turns_and_time_windows(self):
+        chunks = split_transcript(_vtt(40), max_chars=100000, max_seconds=900)
+
+        assert [round(c.start_seconds) for c in chunks] == [0, 900, 1800]
+        assert chunks[-1].end_seconds == 40 * 60
+        # 同じ話者の連続するセグメントは1行（発言）にまとまる
+        assert chunks[0].text.count("\n") == 14
+        assert chunks[0].text.startswith("[00:00] 田中: 0分:")
+        assert chunks[1].time_range == "15:00〜30:00"
+
+    def test_chunks_respect_character_limit(self):
+        chunks = split_transcript(_vtt(30), max_chars=2000)
+
+        assert len(chunks) > 1
+        assert all(len(c.text) <= 2000 for c in chunks)
+        assert "29分" in chunks[-1].text
+
+    def test_plain_text_is_split_at_sentences(self):
+        text = "田中: " + "売上の話をしました。" * 300 + "\n佐藤: 了解です。"
+
+        chunks = split_transcript_text(text, max_chars=1000)
+
+        assert all(len(c.text) <= 1000 for c in chunks)
+        assert all(c.text.endswith("。") for c in chunks)
+        assert "".join(c.text.replace("\n", "") for c in chunks) == text.replace("\n", "")
+
+
+class TestHierarchicalMinutesGenerator:
+
+    @pytest.mark.asyncio
+    async def test_short_transcript_is_one_call(self):
+        llm = RecordingLLM()
+        generator = HierarchicalMinutesGenerator(llm, cache=PartialMinutesCache())
+        text = "田中: 短い会議でした。"
+
+        result = await generator.generate(split_transcript_text(text), "朝会", transcript_text=text)
+
+        assert result.startswith("■")
+        assert llm.calls == [(build_chatwork_minutes_prompt(text, "朝会"), CHATWORK_MINUTES_SYSTEM_PROMPT)]
+
+    @pytest.mark.asyncio
+    async def test_long_transcript_is_mapped_then_reduced(self):
+        llm = RecordingLLM()
+        cache = PartialMinutesCache()
+        generator = HierarchicalMinutesGenerator(llm, concurrency=2, cache=cache)
+        chunks = split_transcript(_vtt(90))
+        assert sum(len(c.text) for c in chunks) > MAX_TRANSCRIPT_CHARS
+
+        await generator.generate(chunks, "定例会議")
+
+        maps = llm.prompts(MINUTES_MAP_SYSTEM_PROMPT)
+        reduce_prompts = llm.prompts(CHATWORK_MINUTES_SYSTEM_PROMPT)
+        assert len(maps) == len(chunks) and llm.peak == 2
+        assert len(reduce_prompts) == 1
+        # 会議の終盤まで統合プロンプトに届く
+        assert f"区間 {len(chunks)}/{len(chunks)}" in reduce_prompts[0]
+        assert "会議タイトル: 定例会議" in reduce_prompts[0]
+        assert "[... 省略 ...]" not in reduce_prompts[0]
+
+        # 再実行では区間メモをキャッシュから使う
+        llm.calls.clear()
+        await generator.generate(chunks, "定例会議")
+        assert [s for _, s in llm.calls] == [CHATWORK_MINUTES_SYSTEM_PROMPT]
+
+    @pytest.mark.asyncio
+    async def test_partials_are_condensed_when_too_long(self):
+        llm = RecordingLLM()
+        generator = HierarchicalMinutesGenerator(
+            llm, cache=PartialMinutesCache(), max_reduce_chars=600,
+        )
+
+        await generator.generate(split_transcript(_vtt(90), max_chars=3000), "定例会議")
+
+        assert llm.prompts(MINUTES_MERGE_SYSTEM_PROMPT)
+        assert len(llm.prompts(CHATWORK_MINUTES_SYSTEM_PROMPT)) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_json_partial_is_used_as_summary_and_not_cached(self):
+        cache = PartialMinutesCache()
+
+        def llm(prompt, system_prompt):
+            return "JSONではない区間メモ" if system_prompt == MINUTES_MAP_SYSTEM_PROMPT else "議事録"
+
+        generator = HierarchicalMinutesGenerator(llm, cache=cache)
+
+        assert await generator.generate(split_transcript(_vtt(90)), "会議") == "議事録"
+        assert len(cache) == 0
+
+
+class TestZoomIntegration:
+
+    @pytest.mark.asyncio
+    async def test_zoom_chunks_are_sanitized_before_llm(self):
+        from lib.meetings.zoom_brain_interface import ZoomBrainInterface
+
+        llm = RecordingLLM()
+        interface = ZoomBrainInterface(MagicMock(), "org_test", zoom_client=MagicMock())
+        vtt = _vtt(90, text="連絡先は090-1234-5678です。" + "議論を続けました。" * 8)
+        sanitized, _ = interface.sanitizer.sanitize(vtt.full_text)
+
+        minutes = await interface._generate_minutes(sanitized, "定例会議", llm, vtt_transcript=vtt)
+
+        assert minutes.startswith("■")
+        maps = llm.prompts(MINUTES_MAP_SYSTEM_PROMPT)
+        assert len(maps) > 1
+        assert all("090-1234-5678" not in p for p in maps)
@@ -24,6 +24,8 @@ from lib.brain.hybrid_search import (
     MAX_QUERY_LENGTH,
     SEARCH_TIMEOUT_SECONDS,
     escape_ilike,
+    tokenize_bigrams,
+    bm25_scores,
 )
 
 
@@ -419,6 +421,69 @@ class TestKeywordSearch:
         results = await searcher._keyword_search("テスト")
         assert results == []
 
+    @pytest.mark.asyncio
+    async def test_results_ranked_by_bm25(self, searcher, mock_pool):
+        """v11.3.0: DBの取得順ではなくBM25スコア順に並ぶ"""
+        conn = mock_pool.connect.return_value
+        knowledge_result = MagicMock()
+        knowledge_result.fetchall.return_value = [
+            ("1", "出張申請", "出張の手順", "rule"),
+            ("2", "経費精算", "経費精算の手順", "rule"),
+        ]
+        chunks_result = MagicMock()
+        chunks_result.fetchall.return_value = []
+        conn.execute.side_effect = [knowledge_result, chunks_result]
+
+        results = await searcher._keyword_search("経費精算", limit=1)
+
+        assert [r["id"] for r in results] == ["knowledge_2"]
+        assert results[0]["score"] > 0
+
+    @pytest.mark.asyncio
+    async def test_uses_trigram_candidates(self, searcher, mock_pool):
+        """v11.3.0: pg_trgm の単語類似度で候補を取得し、候補数は limit の倍数"""
+        conn = mock_pool.connect.return_value
+        empty = MagicMock()
+        empty.fetchall.return_value = []
+        conn.execute.side_effect = [empty, MagicMock(fetchall=Mock(return_value=[]))]
+
+        await searcher._keyword_search("経費", limit=4)
+
+        sql, params = conn.execute.call_args_list[0].args
+        assert "<%" in str(sql)
+        assert "CASE" not in str(sql)
+        assert params["limit"] == 20
+        assert params["raw_query"] == "経費"
+
+
+# =============================================================================
+# 日本語バイグラムBM25テスト（v11.3.0）
+# =============================================================================
+
+
+class TestBM25:
+    """tokenize_bigrams / bm25_scores のテスト"""
+
+    def test_bigrams_split_on_punctuation(self):
+        assert tokenize_bigrams("経費精算、出張") == ["経費", "費精", "精算", "出張"]
+
+    def test_bigrams_normalize_width_and_case(self):
+        assert tokenize_bigrams("ＡＢＣ") == ["ab", "bc"]
+
+    def test_single_char_segment(self):
+        assert tokenize_bigrams("A 経費") == ["a", "経費"]
+
+    def test_more_matching_terms_scores_higher(self):
+        scores = bm25_scores("経費精算", [("", "経費"), ("", "経費精算の申請")])
+        assert scores[1] > scores[0] > 0
+
+    def test_title_match_is_boosted(self):
+        scores = bm25_scores("経費", [("経費", "申請方法"), ("申請方法", "経費")])
+        assert scores[0] > scores[1]
+
+    def test_no_overlap_is_zero(self):
+        assert bm25_scores("経費", [("出張", "旅費")]) == [0.0]
+
 
 # =============================================================================
 # ハイブリッド検索統合テスト
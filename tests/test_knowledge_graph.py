@@ -540,8 +540,8 @@ class TestFindRelatedNodes:
         node2 = create_test_node(node_id=TEST_NODE_ID_2, name="関連ノード")
         edge = create_test_edge()
 
-        with patch.object(graph, 'find_edges_from', return_value=[edge]):
-            with patch.object(graph, 'find_node_by_id', return_value=node2):
+        with patch.object(graph, 'find_edges_from_many', return_value={TEST_NODE_ID: [edge]}):
+            with patch.object(graph, 'find_nodes_by_ids', return_value={TEST_NODE_ID_2: node2}):
                 result = graph.find_related_nodes(conn, TEST_NODE_ID)
 
         assert len(result) >= 0
@@ -551,7 +551,7 @@ class TestFindRelatedNodes:
         graph = KnowledgeGraph(TEST_ORG_ID)
         conn = MagicMock()
 
-        with patch.object(graph, 'find_edges_from', return_value=[]):
+        with patch.object(graph, 'find_edges_from_many', return_value={}):
             result = graph.find_related_nodes(
                 conn, TEST_NODE_ID,
                 relation_types=[EdgeType.IS_A],
@@ -580,7 +580,7 @@ class TestFindPath:
         graph = KnowledgeGraph(TEST_ORG_ID)
         conn = MagicMock()
 
-        with patch.object(graph, 'find_edges_from', return_value=[]):
+        with patch.object(graph, 'find_edges_from_many', return_value={}):
             result = graph.find_path(conn, TEST_NODE_ID, TEST_NODE_ID_2)
 
         assert result is None
@@ -594,18 +594,80 @@ class TestFindPath:
         node2 = create_test_node(node_id=TEST_NODE_ID_2)
         edge = create_test_edge(target_node_id=TEST_NODE_ID_2)
 
-        def mock_find_node(conn, node_id):
-            if node_id == TEST_NODE_ID:
-                return node1
-            return node2
+        def mock_find_nodes(conn, node_ids):
+            nodes = {TEST_NODE_ID: node1, TEST_NODE_ID_2: node2}
+            return {node_id: nodes[node_id] for node_id in node_ids}
 
-        with patch.object(graph, 'find_edges_from', return_value=[edge]):
-            with patch.object(graph, 'find_node_by_id', side_effect=mock_find_node):
+        with patch.object(graph, 'find_edges_from_many', return_value={TEST_NODE_ID: [edge]}):
+            with patch.object(graph, 'find_nodes_by_ids', side_effect=mock_find_nodes):
                 result = graph.find_path(conn, TEST_NODE_ID, TEST_NODE_ID_2)
 
         assert result is not None
 
 
+class TestFrontierTraversal:
+    """1層1クエリでの探索とCSRスナップショットのテスト（v11.3.0）"""
+
+    def _chain(self):
+        ids = [str(uuid4()) for _ in range(4)]
+        edges = [
+            create_test_edge(source_node_id=ids[0], target_node_id=ids[1]),
+            create_test_edge(source_node_id=ids[1], target_node_id=ids[2]),
+            create_test_edge(source_node_id=ids[2], target_node_id=ids[3]),
+        ]
+        nodes = {node_id: create_test_node(node_id=node_id) for node_id in ids}
+        return ids, edges, nodes
+
+    def _fake_edges_from_many(self, edges):
+        calls = []
+
+        def _find(conn, node_ids):
+            node_ids = list(node_ids)
+            calls.append(node_ids)
+            return {
+                node_id: [e for e in edges if e.source_node_id == node_id]
+                for node_id in node_ids
+            }
+        return _find, calls
+
+    def test_find_path_one_query_per_level(self):
+        graph = KnowledgeGraph(TEST_ORG_ID)
+        ids, edges, nodes = self._chain()
+        find_edges, calls = self._fake_edges_from_many(edges)
+        find_nodes = MagicMock(side_effect=lambda conn, node_ids: {i: nodes[i] for i in node_ids})
+
+        with patch.object(graph, 'find_edges_from_many', side_effect=find_edges), \
+                patch.object(graph, 'find_nodes_by_ids', find_nodes):
+            result = graph.find_path(MagicMock(), ids[0], ids[3])
+
+        assert [node.id for node, _ in result] == ids
+        assert result[0][1] is None
+        assert len(calls) == 3
+        find_nodes.assert_called_once()
+
+    def test_find_path_respects_max_depth(self):
+        graph = KnowledgeGraph(TEST_ORG_ID)
+        ids, edges, nodes = self._chain()
+        find_edges, _ = self._fake_edges_from_many(edges)
+
+        with patch.object(graph, 'find_edges_from_many', side_effect=find_edges):
+            assert graph.find_path(MagicMock(), ids[0], ids[3], max_depth=2) is None
+
+    def test_edges_from_many_groups_bidirectional_edges(self):
+        graph = KnowledgeGraph(TEST_ORG_ID)
+        conn = MagicMock()
+        row = (
+            TEST_EDGE_ID, TEST_ORG_ID, TEST_NODE_ID, TEST_NODE_ID_2, "related_to",
+            0.5, 0.8, {}, True, 1, "system", datetime.now(), datetime.now(),
+        )
+        conn.execute.return_value.fetchall.return_value = [row]
+
+        grouped = graph.find_edges_from_many(conn, [TEST_NODE_ID, TEST_NODE_ID_2])
+
+        assert set(grouped) == {TEST_NODE_ID, TEST_NODE_ID_2}
+        assert conn.execute.call_count == 1
+
+
 class TestGetSubgraph:
     """get_subgraph()メソッドのテスト"""
 
@@ -617,7 +679,7 @@ class TestGetSubgraph:
         center_node = create_test_node(node_id=TEST_NODE_ID, name="中心")
 
         with patch.object(graph, 'find_node_by_id', return_value=center_node):
-            with patch.object(graph, 'find_edges_from', return_value=[]):
+            with patch.object(graph, 'find_edges_from_many', return_value={}):
                 result = graph.get_subgraph(conn, TEST_NODE_ID)
 
         assert isinstance(result, KnowledgeSubgraph)
@@ -592,3 +592,30 @@ class TestFilterByAccessControl:
 
         assert len(filtered) == 2
         assert count == 0
+
+
+class TestEmbeddingClientReuse:
+    """v11.3.0: リクエストごとのサービス生成でもエンベディングキャッシュを共有する"""
+
+    def test_default_client_is_shared_and_gets_org_store(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_AI_API_KEY", "mock-key")
+
+        with patch("app.services.knowledge_search.get_vector_store"), \
+                patch("app.services.knowledge_search.get_db_pool") as get_pool:
+            first = KnowledgeSearchService(db_conn=AsyncMock())
+            second = KnowledgeSearchService(db_conn=AsyncMock())
+            client = first._embedding_client_for("org-uuid")
+
+        assert first.embedding_client is second.embedding_client
+        assert client.persistent_store.organization_id == "org-uuid"
+        assert client.persistent_store.pool is get_pool.return_value
+        assert client.cache is first.embedding_client.cache
+        assert first.embedding_client.persistent_store is None
+
+    def test_explicit_client_is_used_as_is(self):
+        embedding_client = MagicMock()
+
+        with patch("app.services.knowledge_search.get_vector_store"):
+            service = KnowledgeSearchService(db_conn=AsyncMock(), embedding_client=embedding_client)
+
+        assert service._embedding_client_for("org-uuid") is embedding_client
@@ -5,11 +5,17 @@ LLM Brain モニタリングモジュールのテスト
 Task #9: 本番ログ分析・エラー率確認
 """
 
+import json
 import pytest
 from datetime import datetime, timedelta
 import time
+from unittest.mock import MagicMock
 
+from lib.latency_histogram import LatencyHistogram, merge_histogram_snapshots
 from lib.brain.monitoring import (
+    STAGE_CONTEXT_BUILD,
+    STAGE_LLM,
+    LatencyMinutesWriter,
     LLMBrainMonitor,
     MonitoringThresholds,
     RequestMetrics,
@@ -298,6 +304,106 @@ class TestLLMBrainMonitor:
         assert metrics.tools_used["chatwork_task_search"] == 1
 
 
+class TestLatencyPercentiles:
+    """分バケット・ヒストグラムによるパーセンタイル集計のテスト（v11.3.0）"""
+
+    def test_histogram_percentiles_within_bucket_error(self):
+        """パーセンタイルの相対誤差がバケット幅（5%）以内であること"""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+
+        for q, exact in [(50, 5000), (95, 9500), (99, 9900)]:
+            assert abs(histogram.percentile(q) - exact) / exact <= 0.05
+        assert histogram.percentile(100) == 10000
+        assert len(histogram.counts) < 200
+
+    def test_histogram_merge_matches_single_histogram(self):
+        """分割して記録→マージした結果が一括記録と一致すること"""
+        whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 2001):
+            whole.record(value)
+            (left if value % 2 else right).record(value)
+
+        merged = merge_histogram_snapshots([
+            {"response_time_ms": left.to_dict()},
+            {"response_time_ms": right.to_dict()},
+        ])["response_time_ms"]
+
+        assert merged.counts == whole.counts
+        assert merged.count == whole.count
+        assert merged.percentile(99) == whole.percentile(99)
+
+    def test_stage_timings_and_tail_latency(self, monitor):
+        """段階別時間とp95/p99が集計されること"""
+        for i in range(100):
+            monitor.complete_request(
+                request_id=f"r{i}",
+                success=True,
+                confidence=0.9,
+                input_tokens=1000,
+                output_tokens=200,
+                response_time_ms=9000 if i >= 95 else 1000,
+                stage_timings_ms={STAGE_LLM: 800.0, STAGE_CONTEXT_BUILD: 100.0},
+                organization_id="org-a",
+            )
+
+        d = monitor.get_current_metrics().to_dict()
+        assert d["response_time_ms"]["p50"] == pytest.approx(1000, rel=0.05)
+        assert d["response_time_ms"]["p99"] == pytest.approx(9000, rel=0.05)
+        assert d["response_time_ms"]["max"] == 9000
+        assert d["stage_timings_ms"][STAGE_LLM]["count"] == 100
+        assert d["stage_timings_ms"][STAGE_LLM]["p95"] == pytest.approx(800, rel=0.05)
+        assert d["tokens"]["input"]["p50"] == pytest.approx(1000, rel=0.05)
+
+    def test_minute_buckets_are_bounded_and_filtered_by_org(self, monitor, monkeypatch):
+        """保持期間を過ぎたバケットが上書きされ、組織別に集計できること"""
+        now = [1_800_000_000.0]
+        monkeypatch.setattr("lib.brain.monitoring.time.time", lambda: now[0])
+
+        for minute in range(90):
+            now[0] = 1_800_000_000.0 + minute * 60
+            org = "org-a" if minute % 2 else "org-b"
+            monitor.complete_request(request_id="r", success=True, response_time_ms=100, organization_id=org)
+
+        assert len(monitor._slots) == 60
+        assert monitor.get_current_metrics(window_minutes=60).total_requests == 60
+        assert monitor.get_current_metrics(window_minutes=10, organization_id="org-a").total_requests == 5
+
+    def test_collect_closed_minutes_once(self, monitor, monkeypatch):
+        """確定した分だけが一度ずつ取り出されること"""
+        now = [1_800_000_000.0]
+        monkeypatch.setattr("lib.brain.monitoring.time.time", lambda: now[0])
+        monitor.complete_request(request_id="r1", success=True, response_time_ms=100, organization_id="org-a")
+        monitor.complete_request(request_id="r2", success=False, response_time_ms=100)
+
+        assert monitor.collect_closed_minutes() == []
+
+        now[0] += 60
+        closed = monitor.collect_closed_minutes()
+        assert [(org, bucket.total_requests) for org, _, bucket in closed] == [("org-a", 1)]
+        assert monitor.collect_closed_minutes() == []
+
+    def test_writer_persists_closed_minutes(self, monitor, monkeypatch):
+        """確定した分バケットを1組織1行で保存すること"""
+        now = [1_800_000_000.0]
+        monkeypatch.setattr("lib.brain.monitoring.time.time", lambda: now[0])
+        pool = MagicMock()
+        conn = pool.connect.return_value.__enter__.return_value
+        writer = LatencyMinutesWriter(pool, service="chatwork-webhook", instance_id="rev:host")
+        monitor.complete_request(request_id="r", success=True, response_time_ms=100, organization_id="org-a")
+
+        assert not writer.is_due()
+        now[0] += 60
+        assert writer.is_due()
+        assert writer.write(monitor) == 1
+
+        insert_params = [c.args[1] for c in conn.execute.call_args_list if "INSERT" in str(c.args[0])]
+        assert insert_params[0]["request_count"] == 1
+        assert "response_time_ms" in json.loads(insert_params[0]["histograms"])
+        assert not writer.is_due()
+
+
 # =============================================================================
 # ヘルスステータステスト
 # =============================================================================
@@ -0,0 +1,265 @@
+# tests/test_llm_streaming.py
+"""
+lib/brain/llm_streaming.py / LLMBrain ストリーミング経路のテスト
+
+SSEチャンクが非ストリーミング時と同じレスポンス形式に組み立てられること、
+【思考過程】を流さず【応答】以降だけが差分として通知されること、
+Tool確定時点のコールバックでストリームを打ち切れること、
+Guardianの憲法違反・NGパターンに一致する応答が一部も送られないことを検証する。
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from lib.brain.guardian_layer import GuardianAction, GuardianLayer
+from lib.brain.llm_brain import LLMBrain
+from lib.brain.llm_streaming import (
+    AnthropicStreamAssembler,
+    GuardedTextBuffer,
+    OpenAIStreamAssembler,
+    ResponseTextFilter,
+    StopStreaming,
+    StreamTextGuard,
+    get_stream_callback,
+    parse_sse_data,
+    stream_to,
+)
+
+
+def _sse(*payloads):
+    lines = [f"data: {json.dumps(p, ensure_ascii=False)}" for p in payloads]
+    lines.append("data: [DONE]")
+    return ("\n\n".join(lines) + "\n\n").encode("utf-8")
+
+
+def _text_chunk(text):
+    return {"choices": [{"index": 0, "delta": {"content": text}}]}
+
+
+class TestResponseTextFilter:
+
+    def test_marker_split_across_chunks(self):
+        f = ResponseTextFilter()
+        out = [f.feed(d) for d in ["【思考過程】考え中【応", "答】\n", "こんに", "ちは"]]
+
+        assert "".join(out) == "こんにちは"
+        assert out[0] == ""
+
+    def test_parse_sse_data_ignores_comments_and_events(self):
+        assert parse_sse_data(": keep-alive") is None
+        assert parse_sse_data("event: message_start") is None
+        assert parse_sse_data("data: {}") == "{}"
+
+
+class TestGuardedTextBuffer:
+
+    def test_holds_back_tail_until_checked(self):
+        buffer = GuardedTextBuffer(StreamTextGuard(check=lambda text: True, holdback_chars=3))
+
+        assert buffer.feed("abcd", "abcd") == "a"
+        assert buffer.feed("ef", "ef") == "bc"
+        assert buffer.flush() == "def"
+
+    def test_violation_drops_pending_text(self):
+        buffer = GuardedTextBuffer(StreamTextGuard(check=lambda text: "NG" not in text, holdback_chars=4))
+
+        assert buffer.feed("hello N", "hello N") == "hel"
+        with pytest.raises(StopStreaming):
+            buffer.feed("G", "G")
+        assert buffer.flush() == ""
+
+    def test_guardian_precheck_text_matches_check_patterns(self):
+        guardian = GuardianLayer(rate_limiter=MagicMock())
+
+        assert guardian.precheck_text("こんにちは").action == GuardianAction.ALLOW
+        assert guardian.precheck_text("APIキーは sk-123").action == GuardianAction.BLOCK
+        assert guardian.precheck_text("この人は見れないので").action == GuardianAction.BLOCK
+        assert guardian.stream_holdback_chars >= max(len("この人は見れない"), len(r"APIキー[は:：]\s*\S+"))
+
+
+class TestStreamAssemblers:
+
+    def test_openai_tool_call_completes_when_next_index_starts(self):
+        asm = OpenAIStreamAssembler()
+        first = asm.feed({"choices": [{"delta": {"tool_calls": [
+            {"index": 0, "id": "c1", "function": {"name": "task_create", "arguments": '{"ti'}},
+        ]}}]})
+        second = asm.feed({"choices": [{"delta": {"tool_calls": [
+            {"index": 0, "function": {"arguments": 'tle": "A"}'}},
+            {"index": 1, "id": "c2", "function": {"name": "task_search", "arguments": "{}"}},
+        ]}}]})
+        last = asm.feed({"choices": [{"delta": {}, "finish_reason": "tool_calls"}], "usage": {"total_tokens": 9}})
+
+        assert first == []
+        assert [c["id"] for c in second] == ["c1"]
+        assert json.loads(second[0]["function"]["arguments"]) == {"title": "A"}
+        assert [c["id"] for c in last] == ["c2"]
+        response = asm.to_response()
+        assert len(response["choices"][0]["message"]["tool_calls"]) == 2
+        assert response["usage"] == {"total_tokens": 9}
+
+    def test_anthropic_tool_use_completes_on_block_stop(self):
+        asm = AnthropicStreamAssembler()
+        events = [
+            {"type": "message_start", "message": {"usage": {"input_tokens": 5}}},
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "了解"}},
+            {"type": "content_block_stop", "index": 0},
+            {"type": "content_block_start", "index": 1,
+             "content_block": {"type": "tool_use", "id": "t1", "name": "task_create"}},
+            {"type": "content_block_delta", "index": 1,
+             "delta": {"type": "input_json_delta", "partial_json": '{"title": '}},
+            {"type": "content_block_delta", "index": 1,
+             "delta": {"type": "input_json_delta", "partial_json": '"A"}'}},
+        ]
+        for event in events:
+            assert asm.feed(event) == []
+
+        completed = asm.feed({"type": "content_block_stop", "index": 1})
+        asm.feed({"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 7}})
+
+        assert completed[0]["input"] == {"title": "A"}
+        response = asm.to_response()
+        assert [b["type"] for b in response["content"]] == ["text", "tool_use"]
+        assert response["usage"] == {"input_tokens": 5, "output_tokens": 7}
+
+
+class TestLLMBrainStreaming:
+
+    @pytest.fixture
+    def brain(self):
+        with patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-or-test-key"}):
+            yield LLMBrain(use_openrouter=True)
+
+    def _install_transport(self, brain, body, seen):
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+        brain._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    async def test_streams_response_text_only(self, brain):
+        body = _sse(
+            _text_chunk("【思考過程】挨拶なので"),
+            _text_chunk("返す\n【応答】こんに"),
+            _text_chunk("ちは！"),
+            {"choices": [{"delta": {}, "finish_reason": "stop"}], "usage": {"prompt_tokens": 3, "completion_tokens": 4}},
+        )
+        seen, events = [], []
+        self._install_transport(brain, body, seen)
+
+        async def on_event(event):
+            events.append(event)
+
+        with stream_to(on_event):
+            result = await brain._call_llm("system", [{"role": "user", "content": "hi"}], [])
+
+        assert get_stream_callback() is None
+        assert seen[0]["stream"] is True
+        assert "".join(e.text for e in events if e.type == "text_delta") == "こんにちは！"
+        assert result.text_response == "こんにちは！"
+        assert not result.tool_calls
+
+    @pytest.mark.asyncio
+    async def test_on_tool_call_can_stop_stream(self, brain):
+        body = _sse(
+            {"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "id": "c1", "function": {"name": "task_create", "arguments": '{"title": "A"}'}},
+            ]}}]},
+            {"choices": [{"delta": {"tool_calls": [
+                {"index": 1, "id": "c2", "function": {"name": "task_delete", "arguments": "{}"}},
+            ]}}]},
+            {"choices": [{"delta": {}, "finish_reason": "tool_calls"}]},
+        )
+        seen, checked = [], []
+        self._install_transport(brain, body, seen)
+
+        async def on_event(event):
+            if event.type == "tool_call":
+                checked.append(("event", event.tool_call.tool_name))
+
+        async def guard(tool_call):
+            checked.append(("guard", tool_call.tool_name))
+            raise StopStreaming()
+
+        with stream_to(on_event):
+            result = await brain._call_llm("system", [{"role": "user", "content": "add"}], [], on_tool_call=guard)
+
+        assert checked == [("event", "task_create"), ("guard", "task_create")]
+        assert [tc.tool_name for tc in result.tool_calls] == ["task_create"]
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_abort_generation(self, brain):
+        body = _sse(_text_chunk("【応答】やあ"), _text_chunk("こんにちは"))
+        self._install_transport(brain, body, [])
+        calls = []
+
+        async def broken(event):
+            calls.append(event)
+            raise ConnectionError("socket closed")
+
+        with stream_to(broken):
+            result = await brain._call_llm("system", [{"role": "user", "content": "hi"}], [])
+
+        assert len(calls) == 1
+        assert result.text_response == "やあこんにちは"
+
+    @pytest.mark.asyncio
+    async def test_ng_pattern_reply_is_never_partially_emitted(self, brain):
+        secret = "hunter2-very-secret"
+        reply = "承知しました。ご依頼の件ですが、管理画面のパスワードは " + secret + " です。"
+        # 1文字ずつ届く最悪ケース
+        body = _sse(
+            _text_chunk("【思考過程】質問に答える\n【応答】"),
+            *[_text_chunk(ch) for ch in reply],
+            {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+        )
+        self._install_transport(brain, body, [])
+        guardian = GuardianLayer(rate_limiter=MagicMock())
+        text_guard = StreamTextGuard(
+            check=lambda text: guardian.precheck_text(text).action == GuardianAction.ALLOW,
+            holdback_chars=guardian.stream_holdback_chars,
+        )
+        events = []
+
+        async def on_event(event):
+            events.append(event)
+
+        with stream_to(on_event):
+            result = await brain._call_llm(
+                "system", [{"role": "user", "content": "pw?"}], [], text_guard=text_guard,
+            )
+
+        streamed = "".join(e.text for e in events if e.type == "text_delta")
+        assert "パスワード" not in streamed
+        assert secret[0] not in streamed
+        # 打ち切った時点までの結果は最終判定（GuardianLayer.check）でBLOCKされる
+        assert guardian.precheck_text(result.text_response or "").action == GuardianAction.BLOCK
+
+    @pytest.mark.asyncio
+    async def test_guarded_stream_flushes_clean_reply(self, brain):
+        body = _sse(
+            _text_chunk("【応答】今日の"),
+            _text_chunk("タスクは3件です。"),
+            {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+        )
+        self._install_transport(brain, body, [])
+        guardian = GuardianLayer(rate_limiter=MagicMock())
+        text_guard = StreamTextGuard(
+            check=lambda text: guardian.precheck_text(text).action == GuardianAction.ALLOW,
+            holdback_chars=guardian.stream_holdback_chars,
+        )
+        events = []
+
+        async def on_event(event):
+            events.append(event)
+
+        with stream_to(on_event):
+            await brain._call_llm("system", [{"role": "user", "content": "tasks"}], [], text_guard=text_guard)
+
+        assert "".join(e.text for e in events if e.type == "text_delta") == "今日のタスクは3件です。"
@@ -0,0 +1,267 @@
+"""
+lib/local_vector_store.py / lib/vector_store.py のテスト
+
+NumPyベースのローカルベクターストアが PineconeClient と同じ
+インターフェース・フィルタ挙動で動作することを検証する。
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lib.vector_store import (
+    VectorStore,
+    build_access_control_filter,
+    create_vector_store,
+    get_vector_store,
+    matches_filter,
+)
+from lib.local_vector_store import LocalVectorStore
+
+
+ORG = "5f98365f-e7c5-4f48-9918-7fe9aabae5df"
+OTHER_ORG = "other-org"
+
+
+def _vec(*head, dim=8):
+    v = [0.0] * dim
+    v[:len(head)] = head
+    return v
+
+
+@pytest.fixture
+def docs():
+    return [
+        {"id": "pub", "values": _vec(1.0, 0.0), "metadata": {"classification": "public", "document_id": "doc1"}},
+        {"id": "int", "values": _vec(0.9, 0.1), "metadata": {"classification": "internal", "document_id": "doc1"}},
+        {"id": "conf_a", "values": _vec(0.8, 0.2), "metadata": {"classification": "confidential", "department_id": "dept_a", "document_id": "doc2"}},
+        {"id": "conf_b", "values": _vec(0.7, 0.3), "metadata": {"classification": "confidential", "department_id": "dept_b", "document_id": "doc3"}},
+    ]
+
+
+class TestMatchesFilter:
+
+    def test_access_control_filter_semantics(self):
+        f = build_access_control_filter(["public", "confidential"], ["dept_a"])
+        assert matches_filter({"classification": "public"}, f)
+        assert matches_filter({"classification": "confidential", "department_id": "dept_a"}, f)
+        assert not matches_filter({"classification": "confidential", "department_id": "dept_b"}, f)
+
+    def test_empty_departments_blocks_confidential(self):
+        f = build_access_control_filter(["confidential"], [])
+        assert not matches_filter({"classification": "confidential", "department_id": "dept_a"}, f)
+
+    def test_comparison_operators(self):
+        assert matches_filter({"version": 2}, {"version": {"$gte": 2}})
+        assert not matches_filter({"version": 1}, {"version": {"$gt": 1}})
+        assert matches_filter({}, {"version": {"$exists": False}})
+
+
+class TestLocalVectorStore:
+
+    @pytest.mark.asyncio
+    async def test_search_orders_by_cosine_similarity(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+
+        response = await store.search(ORG, _vec(1.0, 0.0), top_k=2)
+
+        assert [r.id for r in response.results] == ["pub", "int"]
+        assert response.results[0].score == pytest.approx(1.0)
+        assert response.namespace == "org_" + ORG
+
+    @pytest.mark.asyncio
+    async def test_namespaces_are_isolated(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+
+        response = await store.search(OTHER_ORG, _vec(1.0, 0.0), top_k=5)
+        assert response.results == []
+
+    @pytest.mark.asyncio
+    async def test_search_with_access_control(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+
+        response = await store.search_with_access_control(
+            organization_id=ORG,
+            query_vector=_vec(0.0, 1.0),
+            accessible_classifications=["public", "internal", "confidential"],
+            accessible_department_ids=["dept_a"],
+            top_k=10,
+        )
+
+        assert {r.id for r in response.results} == {"pub", "int", "conf_a"}
+
+    @pytest.mark.asyncio
+    async def test_upsert_overwrites_and_reindexes_metadata(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+        await store.upsert_vectors(ORG, [
+            {"id": "pub", "values": _vec(0.0, 1.0), "metadata": {"classification": "confidential", "department_id": "dept_b"}},
+        ])
+
+        response = await store.search(ORG, _vec(1.0), top_k=10, filters={"classification": "public"})
+        assert response.results == []
+        stats = await store.describe_index_stats(ORG)
+        assert stats["vector_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_delete_document_vectors_and_update_metadata(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+
+        await store.delete_document_vectors(ORG, "doc1")
+        updated = await store.update_metadata_batch(ORG, [
+            {"id": "conf_b", "metadata": {"department_id": "dept_a"}},
+        ])
+
+        response = await store.search(ORG, _vec(1.0), top_k=10, filters={"department_id": {"$in": ["dept_a"]}})
+        assert updated == 1
+        assert {r.id for r in response.results} == {"conf_a", "conf_b"}
+        assert (await store.describe_index_stats(ORG))["vector_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_dimension_mismatch_raises(self, docs):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+
+        with pytest.raises(ValueError, match="次元数"):
+            await store.search(ORG, [1.0, 0.0], top_k=1)
+
+    @pytest.mark.asyncio
+    async def test_persist_and_reload_memory_mapped(self, docs, tmp_path):
+        store = LocalVectorStore(base_dir=str(tmp_path))
+        await store.upsert_vectors(ORG, docs)
+        await store.flush()
+
+        reloaded = LocalVectorStore(base_dir=str(tmp_path))
+        response = await reloaded.search(ORG, _vec(1.0, 0.0), top_k=1)
+        assert [r.id for r in response.results] == ["pub"]
+        assert isinstance(reloaded._indexes["org_" + ORG].vectors, np.memmap)
+
+        # 読み込み後の書き込みでメモリにコピーされる
+        await reloaded.upsert_vectors(ORG, [{"id": "new", "values": _vec(0.0, 0.0, 1.0), "metadata": {}}])
+        response = await reloaded.search(ORG, _vec(0.0, 0.0, 1.0), top_k=1)
+        assert response.results[0].id == "new"
+
+    @pytest.mark.asyncio
+    async def test_reader_reloads_namespace_saved_by_another_store(self, docs, tmp_path):
+        writer = LocalVectorStore(base_dir=str(tmp_path))
+        await writer.upsert_vectors(ORG, docs[:1])
+        await writer.flush()
+
+        reader = LocalVectorStore(base_dir=str(tmp_path))
+        assert (await reader.describe_index_stats(ORG))["vector_count"] == 1
+        cached = reader._indexes["org_" + ORG]
+
+        # 変更がなければキャッシュ済みインデックスをそのまま使う
+        await reader.search(ORG, _vec(1.0, 0.0), top_k=1)
+        assert reader._indexes["org_" + ORG] is cached
+
+        await writer.upsert_vectors(ORG, docs[1:])
+        await writer.flush()
+
+        assert (await reader.describe_index_stats(ORG))["vector_count"] == 4
+        assert reader._indexes["org_" + ORG].version == 2
+        # 自分の保存では読み直さない
+        assert writer._indexes["org_" + ORG].stamp is not None
+        index = writer._indexes["org_" + ORG]
+        await writer.search(ORG, _vec(1.0, 0.0), top_k=1)
+        assert writer._indexes["org_" + ORG] is index
+
+    @pytest.mark.asyncio
+    async def test_unsaved_changes_are_not_discarded_by_reload(self, docs, tmp_path):
+        writer = LocalVectorStore(base_dir=str(tmp_path))
+        await writer.upsert_vectors(ORG, docs[:1])
+        await writer.flush()
+        other = LocalVectorStore(base_dir=str(tmp_path))
+        await other.upsert_vectors(ORG, docs[1:2])
+
+        await writer.upsert_vectors(ORG, docs[2:])
+        await writer.flush()
+
+        # other は未保存の変更を持つので読み直さない
+        stats = await other.describe_index_stats(ORG)
+        assert stats["vector_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ivf_matches_flat_search(self):
+        rng = np.random.default_rng(42)
+        data = rng.normal(size=(500, 16)).astype(np.float32)
+        vectors = [
+            {"id": f"v{i}", "values": data[i].tolist(), "metadata": {"classification": "internal"}}
+            for i in range(len(data))
+        ]
+        store = LocalVectorStore(nprobe=4)
+        await store.upsert_vectors(ORG, vectors)
+        query = data[10].tolist()
+        flat = await store.search(ORG, query, top_k=1)
+
+        assert store.build_ivf(ORG, nlist=8) == 8
+        ivf = await store.search(ORG, query, top_k=1)
+
+        assert flat.results[0].id == ivf.results[0].id == "v10"
+
+    def test_generate_id_is_shared_with_pinecone(self):
+        store = LocalVectorStore()
+        assert isinstance(store, VectorStore)
+        assert store.generate_pinecone_id(ORG, "doc_a", 1, 0) == f"{ORG}_doc_a_v1_chunk0"
+
+    def test_vector_store_is_abstract(self):
+        class PartialStore(VectorStore):
+            async def search(self, organization_id, query_vector, top_k=5, filters=None, include_metadata=True):
+                return None
+
+        with pytest.raises(TypeError):
+            VectorStore()
+        with pytest.raises(TypeError):
+            PartialStore()
+
+    @pytest.mark.asyncio
+    async def test_mutations_and_stats_run_off_event_loop(self, docs, monkeypatch):
+        store = LocalVectorStore()
+        await store.upsert_vectors(ORG, docs)
+        offloaded = []
+        to_thread = asyncio.to_thread
+
+        async def record(func, *args, **kwargs):
+            offloaded.append(func.__name__)
+            return await to_thread(func, *args, **kwargs)
+
+        monkeypatch.setattr(asyncio, "to_thread", record)
+        await store.update_metadata_batch(ORG, [{"id": "pub", "metadata": {"category": "faq"}}])
+        await store.delete_vectors(ORG, ["int"])
+        await store.delete_by_filter(ORG, {"document_id": "doc3"})
+        await store.describe_index_stats(ORG)
+
+        assert offloaded == [
+            "_update_metadata_sync", "_delete_ids_sync", "_delete_by_filter_sync", "_describe_sync",
+        ]
+
+    def test_create_vector_store_local_backend(self, tmp_path, monkeypatch):
+        from lib.config import get_settings
+        monkeypatch.setenv("LOCAL_VECTOR_STORE_DIR", str(tmp_path))
+        get_settings.cache_clear()
+
+        try:
+            store = create_vector_store("local")
+        finally:
+            monkeypatch.delenv("LOCAL_VECTOR_STORE_DIR")
+            get_settings.cache_clear()
+
+        assert isinstance(store, LocalVectorStore)
+        assert store.base_dir == str(tmp_path)
+
+    def test_get_vector_store_is_shared_per_backend(self, monkeypatch):
+        import lib.vector_store as vector_store
+        monkeypatch.setattr(vector_store, "_shared_stores", {})
+
+        store = get_vector_store("local")
+        assert get_vector_store("LOCAL") is store
+        assert isinstance(store, LocalVectorStore)
+
+    def test_create_vector_store_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_vector_store("faiss")
@@ -0,0 +1,42 @@
+"""
+lib/lru_cache.py のテスト
+
+最大件数を超えたら最も古いエントリから破棄されること、
+get / put で最新側へ移動することを検証する。
+"""
+
+from lib.lru_cache import LRUCache
+
+
+class TestLRUCache:
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        assert cache.get("a") == 1  # a が最新になる
+        evicted = cache.put("c", 3)
+
+        assert evicted == 1
+        assert cache.get("b") is None
+        assert cache.items() == [("a", 1), ("c", 3)]
+        assert len(cache) == 2
+
+    def test_get_many_and_put_many(self):
+        cache = LRUCache(max_entries=3)
+
+        assert cache.put_many({"a": 1, "b": 2, "c": 3, "d": 4}) == 1
+        assert cache.get_many(["a", "b", "d", "x"]) == {"b": 2, "d": 4}
+
+    def test_pop_and_discard_where(self):
+        cache = LRUCache(max_entries=10)
+        cache.put_many({("org1", "r1"): 1, ("org1", "r2"): 2, ("org2", "r1"): 3})
+
+        assert cache.pop(("org1", "r1")) == 1
+        assert cache.pop(("org1", "r1")) is None
+        assert cache.discard_where(lambda key: key[0] == "org1") == 1
+        assert cache.items() == [(("org2", "r1"), 3)]
+
+        cache.clear()
+        assert len(cache) == 0
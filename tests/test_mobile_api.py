@@ -632,3 +632,123 @@ class TestWebSocketAuth:
             ws.send_json({"token": "invalid-token"})
             data = ws.receive_json()
             assert data.get("error") == "Authentication failed"
+
+
+# =============================================================================
+# 組織別 Brain プール テスト
+# =============================================================================
+
+
+class TestBrainPool:
+    """brain_pool.BrainPool のテスト（BrainIntegrationの使い回し）"""
+
+    def _make_pool(self, **kwargs):
+        from brain_pool import BrainPool
+
+        created = []
+
+        def _factory(org_id, db_pool):
+            integration = MagicMock()
+            integration.org_id = org_id
+            integration.brain.llm_brain.close = AsyncMock()
+            integration.process_message = AsyncMock(return_value=MagicMock(success=False))
+            created.append(integration)
+            return integration
+
+        return BrainPool(factory=_factory, **kwargs), created
+
+    @pytest.mark.asyncio
+    async def test_reuses_instance_per_org(self):
+        pool, created = self._make_pool()
+        db = MagicMock()
+
+        async with pool.lease("org_a", db) as first:
+            pass
+        async with pool.lease("org_a", db) as second:
+            pass
+
+        assert first is second
+        assert len(created) == 1
+        assert pool.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_create_once(self):
+        import asyncio
+        pool, created = self._make_pool()
+        db = MagicMock()
+
+        async def _use():
+            async with pool.lease("org_a", db) as integration:
+                await asyncio.sleep(0)
+                return integration
+
+        results = await asyncio.gather(*[_use() for _ in range(5)])
+
+        assert len(created) == 1
+        assert all(r is created[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_closes_idle_brain(self):
+        pool, created = self._make_pool(max_size=2)
+        db = MagicMock()
+
+        for org_id in ("org_a", "org_b", "org_a", "org_c"):
+            async with pool.lease(org_id, db):
+                pass
+
+        assert pool.stats()["size"] == 2
+        assert [c.org_id for c in created] == ["org_a", "org_b", "org_c"]
+        created[1].brain.llm_brain.close.assert_awaited_once()
+        created[0].brain.llm_brain.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_db_pool_swap_rebuilds(self):
+        pool, created = self._make_pool()
+
+        async with pool.lease("org_a", MagicMock()):
+            pass
+        async with pool.lease("org_a", MagicMock()):
+            pass
+
+        assert len(created) == 2
+        created[0].brain.llm_brain.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_consecutive_failures_retire_instance(self):
+        """process_message は例外を返さず success=False を返すため、それを失敗として数える"""
+        pool, created = self._make_pool(max_consecutive_failures=2)
+        db = MagicMock()
+
+        for _ in range(2):
+            result = await pool.process_message("org_a", db, message="テスト")
+            assert result.success is False
+
+        assert pool.stats()["size"] == 0
+        created[0].brain.llm_brain.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self):
+        pool, created = self._make_pool(max_consecutive_failures=2)
+        db = MagicMock()
+
+        await pool.process_message("org_a", db, message="テスト")
+        created[0].process_message.return_value = MagicMock(success=True)
+        await pool.process_message("org_a", db, message="テスト")
+        created[0].process_message.return_value = MagicMock(success=False)
+        await pool.process_message("org_a", db, message="テスト")
+
+        assert pool.stats()["size"] == 1
+        assert len(created) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_brain_init_is_rebuilt(self):
+        """脳の初期化に失敗したインスタンスは次のリースで作り直す"""
+        pool, created = self._make_pool()
+        db = MagicMock()
+
+        async with pool.lease("org_a", db) as integration:
+            integration.brain = None
+        async with pool.lease("org_a", db):
+            pass
+
+        assert len(created) == 2
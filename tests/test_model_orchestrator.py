@@ -13,7 +13,7 @@ Model Orchestrator ユニットテスト
 
 import pytest
 from decimal import Decimal
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from uuid import uuid4
 import asyncio
@@ -596,7 +596,11 @@ class TestUsageLogger:
         conn = Mock()
         result = Mock()
         # Use a valid UUID format for the mock
-        result.fetchone.return_value = ("550e8400-e29b-41d4-a716-446655440000",)
+        # INSERT ... RETURNING id, created_at
+        result.fetchone.return_value = (
+            "550e8400-e29b-41d4-a716-446655440000",
+            datetime(2026, 10, 16, tzinfo=timezone.utc),
+        )
         conn.execute.return_value = result
         pool.connect.return_value.__enter__ = Mock(return_value=conn)
         pool.connect.return_value.__exit__ = Mock(return_value=False)
@@ -0,0 +1,86 @@
+# tests/test_operation_rate_limiter.py
+"""
+lib/brain/operations/rate_limiter.py のテスト
+
+リングバッファの容量が上限回数で頭打ちになること、
+古いウィンドウ・前日のカウンタが自動で破棄されること、
+共有バックエンド障害時にインメモリへ縮退することを検証する。
+"""
+
+from unittest.mock import MagicMock
+
+from lib.brain.operations.rate_limiter import (
+    SWEEP_INTERVAL_SECONDS,
+    OperationRateLimiter,
+    PostgresRateLimitBackend,
+    RateWindow,
+    create_operation_rate_limiter,
+    evaluate_windows,
+)
+
+
+WINDOWS = [RateWindow(window_seconds=10, limit=3), RateWindow(window_seconds=60, limit=5)]
+
+
+class TestEvaluateWindows:
+
+    def test_reports_first_exceeded_window(self):
+        now = 1000.0
+        burst = evaluate_windows([now - 3, now - 2, now - 1], now, WINDOWS)
+        per_minute = evaluate_windows([now - 50, now - 40, now - 30, now - 20, now - 11], now, WINDOWS)
+
+        assert (burst.allowed, burst.window.window_seconds, burst.count) == (False, 10, 3)
+        assert (per_minute.allowed, per_minute.window.window_seconds, per_minute.count) == (False, 60, 5)
+        assert evaluate_windows([now - 70, now - 65], now, WINDOWS).allowed
+
+
+class TestOperationRateLimiter:
+
+    def test_ring_buffer_is_bounded_by_largest_limit(self):
+        limiter = OperationRateLimiter(WINDOWS)
+        for i in range(100):
+            limiter.hit("acc", now=1000.0 + i * 20)
+
+        assert limiter.local.calls["acc"].maxlen == 5
+        assert len(limiter.local.calls["acc"]) == 5
+
+    def test_blocked_calls_are_not_recorded(self):
+        limiter = OperationRateLimiter(WINDOWS)
+        results = [limiter.hit("acc", now=1000.0).allowed for _ in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert len(limiter.local.calls["acc"]) == 3
+
+    def test_sweep_expires_idle_accounts_and_old_days(self):
+        limiter = OperationRateLimiter(WINDOWS)
+        start = limiter.local._last_sweep
+        limiter.hit("idle", now=start)
+        limiter.consume("idle", "read", quota=50, day="2000-01-01")
+
+        limiter.hit("active", now=start + SWEEP_INTERVAL_SECONDS + 1)
+
+        assert "idle" not in limiter.local.calls
+        assert "active" in limiter.local.calls
+        assert ("idle", "2000-01-01") not in limiter.local.daily_counts
+
+    def test_daily_quota_stops_at_limit(self):
+        limiter = OperationRateLimiter(WINDOWS)
+        decisions = [limiter.consume("acc", "write", quota=2, day="2026-10-16") for _ in range(3)]
+
+        assert [d.allowed for d in decisions] == [True, True, False]
+        assert decisions[-1].count == 2
+
+    def test_shared_backend_failure_falls_back_to_memory(self):
+        pool = MagicMock()
+        pool.connect.side_effect = RuntimeError("db down")
+        shared = PostgresRateLimitBackend(pool, "org-1", capacity=5, max_window_seconds=60)
+        limiter = OperationRateLimiter(WINDOWS, shared_backend=shared)
+
+        assert limiter.is_shared
+        assert limiter.hit("acc", now=1000.0).allowed
+        assert limiter.consume("acc", "read", quota=1, day="2026-10-16").allowed
+        assert len(limiter.local.calls["acc"]) == 1
+
+    def test_factory_without_pool_uses_memory(self):
+        limiter = create_operation_rate_limiter(backend="postgres")
+        assert not limiter.is_shared
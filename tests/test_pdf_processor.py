@@ -8,9 +8,11 @@ lib/capabilities/multimodal/pdf_processor.py のカバレッジ80%以上を目
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
+import asyncio
 import io
 
 from lib.capabilities.multimodal.pdf_processor import (
+    PDFPageCache,
     PDFProcessor,
     create_pdf_processor,
 )
@@ -20,6 +22,7 @@ from lib.capabilities.multimodal.constants import (
     ContentConfidenceLevel,
     MAX_PDF_SIZE_BYTES,
     MAX_PDF_PAGES,
+    PDF_SUMMARY_INPUT_LENGTH,
 )
 from lib.capabilities.multimodal.models import (
     MultimodalInput,
@@ -866,3 +869,95 @@ class TestGenerateSummary:
         # フォールバックで最初の数文が返される
         assert len(summary) > 0
         assert key_points == []
+
+
+# =============================================================================
+# TestPagePipeline - ページ単位パイプラインのテスト
+# =============================================================================
+
+
+class TestPagePipeline:
+    """並行OCR・ページキャッシュ・要約の先行開始のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_ocr_runs_concurrently_within_limit(self, mock_pool):
+        processor = PDFProcessor(pool=mock_pool, organization_id="org", ocr_concurrency=3)
+        running = 0
+        peak = 0
+
+        async def fake_ocr(pdf_data, page_index):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 * (10 - page_index))
+            running -= 1
+            return PDFPageContent(page_number=page_index + 1, text=f"p{page_index}", ocr_used=True)
+
+        with patch.object(processor, "_ocr_page", new=fake_ocr):
+            pages = await processor._extract_text(b"pdf", PDFType.SCANNED, 10)
+
+        assert peak == 3
+        # 完了順に関係なくページ順で返る
+        assert [p.text for p in pages] == [f"p{i}" for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_mixed_keeps_text_page_when_ocr_fails(self, processor):
+        text_pages = [
+            PDFPageContent(page_number=1, text="十分なテキスト" * 10),
+            PDFPageContent(page_number=2, text="短い"),
+        ]
+        with patch.object(processor, "_extract_text_pypdf", return_value=text_pages):
+            with patch.object(processor, "_ocr_page", new=AsyncMock(side_effect=Exception("x"))) as ocr:
+                pages = await processor._extract_text(b"pdf", PDFType.MIXED, 2)
+
+        ocr.assert_awaited_once_with(b"pdf", 1)
+        assert pages[1].text == "短い"
+
+    @pytest.mark.asyncio
+    async def test_page_cache_skips_vision_call(self, mock_pool):
+        processor = PDFProcessor(pool=mock_pool, organization_id="org", page_cache=PDFPageCache())
+        processor._vision_client = MagicMock()
+        processor._vision_client.analyze_with_fallback = AsyncMock(
+            return_value={"content": '{"text": "表紙", "confidence": 0.9}'}
+        )
+
+        with patch.object(processor, "_pdf_page_to_image", return_value=b"same-image"):
+            first = await processor._ocr_page(b"pdf", 0)
+            second = await processor._ocr_page(b"other-pdf", 4)
+
+        assert processor._vision_client.analyze_with_fallback.await_count == 1
+        assert (first.text, first.page_number) == ("表紙", 1)
+        assert (second.text, second.page_number) == ("表紙", 5)
+
+    @pytest.mark.asyncio
+    async def test_summary_starts_from_leading_pages(self, processor, sample_input):
+        page_text = "あ" * (PDF_SUMMARY_INPUT_LENGTH // 2)
+        summary_inputs = []
+        started_before_finish = []
+
+        async def fake_ocr(pdf_data, page_index):
+            # 先頭ページ以外は要約の開始後に完了する
+            if page_index >= 3:
+                for _ in range(1000):
+                    if summary_inputs:
+                        break
+                    await asyncio.sleep(0)
+                started_before_finish.append(bool(summary_inputs))
+            return PDFPageContent(page_number=page_index + 1, text=page_text, ocr_used=True)
+
+        async def fake_summary(full_text, pdf_metadata, instruction=None):
+            summary_inputs.append(full_text)
+            return "要約", []
+
+        with patch.object(processor, "_extract_pdf_metadata", return_value=PDFMetadata(page_count=6)), \
+             patch.object(processor, "_detect_pdf_type", return_value=PDFType.SCANNED), \
+             patch.object(processor, "_ocr_page", new=fake_ocr), \
+             patch.object(processor, "_generate_summary", new=fake_summary), \
+             patch.object(processor, "_save_processing_log", new=AsyncMock()):
+            result = await processor.process(sample_input)
+
+        assert result.success is True
+        assert len(result.pdf_result.pages) == 6
+        assert len(summary_inputs) == 1
+        assert started_before_finish == [True, True, True]
+        assert summary_inputs[0][:PDF_SUMMARY_INPUT_LENGTH] == result.extracted_text[:PDF_SUMMARY_INPUT_LENGTH]
@@ -0,0 +1,133 @@
+"""
+lib/pii_redaction.py のテスト
+
+1パス置換が従来の順次置換と同じマスキング結果になること、
+カテゴリ別件数、パターンごとのフラグの扱い、
+ストリーム処理がチャンクの切り方によらず一括処理と一致することを検証する。
+"""
+
+import re
+import time
+
+import pytest
+
+from lib.brain.memory_sanitizer import MASK_PATTERNS, mask_pii
+from lib.meetings.transcript_sanitizer import MEETING_PII_PATTERNS, TranscriptSanitizer
+from lib.pii_redaction import PIIRedactor, category_of
+
+
+TRANSCRIPT = (
+    "田中: 電話は090-1234-5678、メールは tanaka@example.co.jp です。\n"
+    "佐藤: カードは4111 1111 1111 1111、社員番号はEMP-12345。\n"
+    "鈴木: 住所は東京都渋谷区神南1-2-3、マイナンバーは1234 5678 9012。\n"
+    "高橋: password: hunter2 で、月額500000円、固定電話0312345678。\n"
+)
+
+
+def _sequential(text, patterns):
+    for pattern, replacement in patterns:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class TestPIIRedactor:
+
+    def test_matches_sequential_substitution_with_category_counts(self):
+        result = PIIRedactor(MEETING_PII_PATTERNS).redact(TRANSCRIPT)
+
+        assert result.text == _sequential(TRANSCRIPT, MEETING_PII_PATTERNS)
+        assert result.counts == {
+            "PHONE": 2, "EMAIL": 1, "CARD": 1, "EMPLOYEE_ID": 1,
+            "ADDRESS": 1, "MY_NUMBER": 1, "PASSWORD": 1, "SALARY": 1,
+        }
+        assert result.total == 9
+
+    def test_flags_are_scoped_per_pattern(self):
+        redactor = PIIRedactor([
+            (re.compile(r"secret", re.IGNORECASE), "[A]"),
+            (re.compile(r"key"), "[B]"),
+        ])
+
+        result = redactor.redact("SECRET KEY key")
+
+        assert result.text == "[A] KEY [B]"
+
+    def test_inner_groups_map_to_the_right_category(self):
+        redactor = PIIRedactor([
+            (re.compile(r"(a)(b)"), "[AB]"),
+            (re.compile(r"c(d)?"), "[CD]"),
+        ])
+
+        result = redactor.redact("ab cd c")
+
+        assert result.text == "[AB] [CD] [CD]"
+        assert result.counts == {"AB": 1, "CD": 2}
+
+    def test_placeholder_is_not_counted_twice(self):
+        # 順次置換では [EMPLOYEE_ID] に置換後、パスワードとして再度数えていた
+        result = PIIRedactor(MEETING_PII_PATTERNS).redact("password: AB-12345")
+
+        assert result.text == "[PASSWORD]"
+        assert result.counts == {"PASSWORD": 1}
+
+    def test_category_of(self):
+        assert category_of("[API_KEY]") == "API_KEY"
+
+
+class TestRedactStream:
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 300, 5000])
+    def test_stream_equals_one_shot(self, chunk_size):
+        redactor = PIIRedactor(MEETING_PII_PATTERNS)
+        text = TRANSCRIPT * 20
+        expected = redactor.redact(text)
+
+        counts = {}
+        chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+        streamed = "".join(redactor.redact_stream(chunks, counts))
+
+        assert streamed == expected.text
+        assert counts == expected.counts
+
+    def test_lookbehind_sees_previous_chunk(self):
+        redactor = PIIRedactor(MEETING_PII_PATTERNS, max_match_length=8)
+        text = "9" + "1234 5678 9012" + " end"
+
+        streamed = "".join(redactor.redact_stream(iter(text)))
+
+        assert streamed == redactor.redact(text).text
+        assert "[MY_NUMBER]" not in streamed
+
+    def test_transcript_sanitizer_stream(self):
+        sanitizer = TranscriptSanitizer(chunk_size=50)
+        counts = {}
+
+        streamed = "".join(sanitizer.sanitize_stream(TRANSCRIPT, counts))
+
+        assert (streamed, sum(counts.values())) == sanitizer.sanitize(TRANSCRIPT)
+
+
+class TestSharedEngine:
+
+    def test_mask_pii_uses_memory_patterns(self):
+        text = "連絡先 03-1111-2222 / api_key=abc123"
+
+        masked, was_masked = mask_pii(text)
+
+        assert was_masked
+        assert masked == _sequential(text, MASK_PATTERNS)
+
+    def test_hour_long_transcript_scales_linearly(self):
+        sanitizer = TranscriptSanitizer()
+        small = TRANSCRIPT * 200
+        large = TRANSCRIPT * 2000
+
+        start = time.perf_counter()
+        sanitizer.sanitize(small)
+        small_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        _, count = sanitizer.sanitize(large)
+        large_elapsed = time.perf_counter() - start
+
+        assert count == 9 * 2000
+        assert large_elapsed < max(small_elapsed * 30, 1.0)
@@ -1777,6 +1777,85 @@ class TestCreateProactiveMonitor:
         assert m._brain is None
 
 
+# =============================================================================
+# Bulk trigger evaluation tests (v11.3.0)
+# =============================================================================
+
+
+def _user_row(user_id, account_id):
+    return Mock(
+        id=user_id,
+        organization_id=SAMPLE_ORG_ID,
+        chatwork_account_id=account_id,
+        dm_room_id=f"room-{account_id}",
+        last_active_at=None,
+    )
+
+
+def _bulk_execute(user_rows, queries):
+    """SQL本文で応答を振り分ける execute のモック"""
+    def execute(query, params=None):
+        sql = str(query)
+        queries.append(sql)
+        if "FROM users" in sql:
+            return _make_db_result(fetchall_value=user_rows)
+        if "FROM goals" in sql and "'active'" in sql:
+            return _make_db_result(fetchall_value=[Mock(
+                user_id=user_rows[0].id, id="goal-1", title="売上目標",
+                updated_at=datetime.now(JST) - timedelta(days=10),
+            )])
+        if "FROM chatwork_tasks" in sql and "'open'" in sql:
+            return _make_db_result(fetchall_value=[Mock(
+                account_id=int(user_rows[1].chatwork_account_id),
+                total_count=8, overdue_count=2,
+            )])
+        if "FROM brain_proactive_actions" in sql:
+            return _make_db_result(fetchall_value=[Mock(
+                user_id=user_rows[1].id, trigger_type="task_overload",
+            )])
+        return _make_db_result()
+    return execute
+
+
+class TestBulkTriggerEvaluation:
+    """check_and_act がトリガー種別ごとに組織単位の1クエリで評価すること"""
+
+    @pytest.mark.asyncio
+    async def test_triggers_and_cooldowns_from_set_queries(self, monitor, mock_pool, mock_brain):
+        users = [_user_row(f"user-{i}", str(1000 + i)) for i in range(3)]
+        queries = []
+        mock_pool._conn.execute = Mock(side_effect=_bulk_execute(users, queries))
+
+        results = await monitor.check_and_act()
+
+        by_user = {r.user_id: r for r in results}
+        assert len(results) == 3
+        assert [t.trigger_type for t in by_user["user-0"].triggers_found] == [TriggerType.GOAL_ABANDONED]
+        assert len(by_user["user-0"].actions_taken) == 1
+        assert by_user["user-1"].skipped_triggers == [
+            {"trigger_type": "task_overload", "reason": "cooldown"},
+        ]
+        assert by_user["user-2"].triggers_found == []
+        assert mock_brain.generate_proactive_message.await_count == 1
+        # 個別チェック用の1ユーザー条件のクエリは発行しない
+        assert not any("AND user_id = CAST(:user_id AS uuid)" in q for q in queries)
+
+    @pytest.mark.asyncio
+    async def test_query_count_independent_of_headcount(self, monitor, mock_pool):
+        counts = []
+        for headcount in (3, 30):
+            users = [_user_row(f"user-{i}", str(1000 + i)) for i in range(headcount)]
+            queries = []
+            mock_pool._conn.execute = Mock(side_effect=_bulk_execute(users, queries))
+
+            results = await monitor.check_and_act()
+
+            assert len(results) == headcount
+            counts.append(len(queries))
+
+        assert counts[0] == counts[1]
+
+
 # =============================================================================
 # Constants validation tests
 # =============================================================================
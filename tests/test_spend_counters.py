@@ -0,0 +1,162 @@
+"""
+lib/brain/model_orchestrator/spend_counters.py のテスト
+
+予算判定がTTL内はDBを読まないこと、TTL切れでカウンタ行だけを読み直し、
+突き合わせ間隔ごとに ai_usage_logs から再集計すること、
+自プロセスの利用額が即時に反映されること、カウンタの加算がログのINSERTとは
+別の文で行われ、失敗してもログを失わないことを検証する。
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from lib.brain.model_orchestrator.constants import Tier
+from lib.brain.model_orchestrator.cost_manager import CostAction, CostManager
+from lib.brain.model_orchestrator.spend_counters import (
+    JST,
+    RECONCILE_SPEND_COUNTERS_SQL,
+    SELECT_SPEND_COUNTERS_SQL,
+    SpendCounterCache,
+)
+from lib.brain.model_orchestrator.usage_logger import UsageLogger
+
+
+ORG = "5f0c3a8e-0000-4000-8000-000000000001"
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=JST)
+
+
+class FakeClock:
+    def __init__(self):
+        self.value = 1000.0
+
+    def __call__(self):
+        return self.value
+
+
+def _pool(day="1.5", month="20"):
+    pool = MagicMock()
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = [
+        ("day", Decimal(day)), ("month", Decimal(month)),
+    ]
+    pool.connect.return_value.__enter__.return_value = conn
+    return pool, conn
+
+
+def _queries(conn):
+    return [c.args[0] for c in conn.execute.call_args_list]
+
+
+class TestSpendCounterCache:
+
+    def test_ttl_then_load_then_reconcile(self):
+        clock = FakeClock()
+        cache = SpendCounterCache(ttl_seconds=30, reconcile_interval_seconds=3600, clock=clock)
+        pool, conn = _pool()
+
+        first = cache.get(pool, ORG, now=NOW)
+        cache.get(pool, ORG, now=NOW)
+        assert (first.daily_cost_usd, first.monthly_cost_usd) == (Decimal("1.5"), Decimal("20"))
+        assert _queries(conn) == [RECONCILE_SPEND_COUNTERS_SQL]
+
+        clock.value += 31
+        cache.get(pool, ORG, now=NOW)
+        assert _queries(conn)[-1] is SELECT_SPEND_COUNTERS_SQL
+
+        clock.value += 3600
+        cache.get(pool, ORG, now=NOW)
+        assert _queries(conn)[-1] is RECONCILE_SPEND_COUNTERS_SQL
+        assert conn.execute.call_count == 3
+
+    def test_record_applies_immediately_and_day_rollover_reloads(self):
+        cache = SpendCounterCache(ttl_seconds=30, clock=FakeClock())
+        pool, conn = _pool()
+        cache.get(pool, ORG, now=NOW)
+
+        cache.record(ORG, Decimal("0.25"), now=NOW)
+        snapshot = cache.get(pool, ORG, now=NOW)
+        assert (snapshot.daily_cost_usd, snapshot.monthly_cost_usd) == (Decimal("1.75"), Decimal("20.25"))
+
+        # JSTの日付が変わったらTTL内でも読み直す
+        cache.get(pool, ORG, now=datetime(2026, 10, 17, 0, 1, tzinfo=JST))
+        assert conn.execute.call_count == 2
+
+    def test_database_error_returns_zero(self):
+        cache = SpendCounterCache(clock=FakeClock())
+        pool = MagicMock()
+        pool.connect.side_effect = RuntimeError("db down")
+
+        snapshot = cache.get(pool, ORG, now=NOW)
+
+        assert snapshot.daily_cost_usd == Decimal("0")
+        assert snapshot.monthly_cost_usd == Decimal("0")
+
+
+class TestBudgetCheckUsesCounters:
+
+    def test_check_cost_reads_counters_once(self):
+        cache = SpendCounterCache(ttl_seconds=30, clock=FakeClock())
+        pool, conn = _pool(day="0", month="0")
+        manager = CostManager(pool, ORG, spend_counters=cache)
+        manager._settings_cache = manager._get_default_settings()
+        conn.execute.reset_mock()
+
+        for _ in range(5):
+            result = manager.check_cost(estimated_cost_jpy=Decimal("1"))
+
+        assert result.action == CostAction.AUTO_EXECUTE
+        assert _queries(conn) == [RECONCILE_SPEND_COUNTERS_SQL]
+
+    def test_usage_logger_feeds_shared_counters(self):
+        cache = SpendCounterCache(ttl_seconds=30, clock=FakeClock())
+        pool, conn = _pool(day="0", month="0")
+        manager = CostManager(pool, ORG, spend_counters=cache)
+        usage_logger = UsageLogger(pool, ORG, spend_counters=cache)
+        manager._get_daily_cost_usd()
+
+        usage_logger.log_usage(
+            model_id="openai/gpt-5.2", task_type="chat", tier=Tier.STANDARD,
+            input_tokens=100, output_tokens=50, cost_jpy=Decimal("30"),
+            cost_usd=Decimal("0.2"), latency_ms=200, success=True,
+        )
+
+        assert manager._get_daily_cost_usd() == Decimal("0.2")
+        # ログのINSERTとは別の文でカウンタを加算する
+        queries = [str(q) for q in _queries(conn)]
+        log_sql = next(q for q in queries if "INSERT INTO ai_usage_logs" in q)
+        assert "ai_spend_counters" not in log_sql
+        assert any("INSERT INTO ai_spend_counters" in q for q in queries)
+
+    def test_spend_counter_failure_keeps_log(self):
+        pool, conn = _pool(day="0", month="0")
+        log_id = uuid4()
+
+        def execute(query, params=None):
+            sql = str(query)
+            if "INSERT INTO ai_spend_counters" in sql:
+                raise RuntimeError("relation does not exist")
+            result = MagicMock()
+            result.fetchone.return_value = (log_id, datetime(2026, 10, 16, tzinfo=timezone.utc))
+            return result
+
+        conn.execute.side_effect = execute
+        usage_logger = UsageLogger(pool, ORG, spend_counters=SpendCounterCache(clock=FakeClock()))
+
+        assert usage_logger.log_usage(
+            model_id="openai/gpt-5.2", task_type="chat", tier=Tier.STANDARD,
+            input_tokens=100, output_tokens=50, cost_jpy=Decimal("30"),
+            cost_usd=Decimal("0.2"), latency_ms=200, success=True,
+        ) == log_id
+        conn.rollback.assert_called_once()
+
+    def test_error_logs_do_not_touch_spend_counters(self):
+        pool, conn = _pool(day="0", month="0")
+        UsageLogger(pool, ORG, spend_counters=SpendCounterCache(clock=FakeClock())).log_usage(
+            model_id="openai/gpt-5.2", task_type="chat", tier=Tier.STANDARD,
+            input_tokens=100, output_tokens=50, cost_jpy=Decimal("30"),
+            cost_usd=Decimal("0.2"), latency_ms=200, success=False,
+        )
+
+        assert not any("ai_spend_counters" in str(q) for q in _queries(conn))
@@ -0,0 +1,261 @@
+"""
+tests/test_sync_chatwork_tasks_room_sync.py
+
+v11.3.0: sync-chatwork-tasks のルーム単位差分同期のテスト
+
+- 変更のないタスクは last_synced_at のみ更新
+- 変更・新規タスクはバルクUPSERT（チャンク分割）
+- open → done の遷移
+- ルームのタスク取得の並列数上限
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ============================================================
+# モジュールロード
+# ============================================================
+
+def _load_sync_module():
+    """sync-chatwork-tasks/main.py をロード（Firestoreはモック）"""
+    _MOCK_NAMES = ["google.cloud", "google.cloud.firestore"]
+
+    saved = {name: sys.modules.pop(name) for name in _MOCK_NAMES if name in sys.modules}
+
+    try:
+        for mod_name in _MOCK_NAMES:
+            sys.modules[mod_name] = MagicMock()
+
+        sync_dir = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "sync-chatwork-tasks"
+        )
+        spec = importlib.util.spec_from_file_location(
+            "sync_chatwork_tasks_main", os.path.join(sync_dir, "main.py")
+        )
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        for name in _MOCK_NAMES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+
+_sync_mod = _load_sync_module()
+
+LIMIT_TIME = 1790000000
+
+
+def _api_task(task_id, body="資料を作成してください", limit_time=LIMIT_TIME):
+    return {
+        "task_id": task_id,
+        "account": {"account_id": 100, "name": "山田"},
+        "assigned_by_account": {"account_id": 200},
+        "body": body,
+        "limit_time": limit_time,
+    }
+
+
+def _existing_row(body="資料を作成してください", status="open", limit_time=LIMIT_TIME,
+                  summary="資料作成", completion_notified=False):
+    return {
+        "status": status,
+        "limit_time": limit_time,
+        "assigned_by_name": "佐藤",
+        "body": body,
+        "summary": summary,
+        "completion_notified": completion_notified,
+        "room_name": "営業部",
+        "assigned_to_name": "山田",
+    }
+
+
+def _executed_sql(cursor, keyword):
+    """keyword を含むSQLの execute 呼び出しを返す"""
+    return [c for c in cursor.execute.call_args_list if keyword in c.args[0]]
+
+
+@pytest.fixture
+def quiet_side_effects():
+    """要約判定・通知など同期以外の処理を固定する"""
+    with patch.object(_sync_mod, "lib_validate_summary", return_value=True), \
+         patch.object(_sync_mod, "resolve_task_summary_locally", return_value=None), \
+         patch.object(_sync_mod, "detect_and_report_limit_changes") as limit_changes, \
+         patch.object(_sync_mod, "send_deadline_alert_to_requester") as deadline_alert:
+        yield {"limit_changes": limit_changes, "deadline_alert": deadline_alert}
+
+
+# ============================================================
+# openタスクの差分同期
+# ============================================================
+
+class TestSyncRoomOpenTasks:
+
+    def test_unchanged_task_only_touches_last_synced_at(self, quiet_side_effects):
+        conn, cursor = MagicMock(), MagicMock()
+
+        stats = _sync_mod.sync_room_open_tasks(
+            conn, cursor, 1, "営業部", [_api_task(10)], {10: _existing_row()}, None
+        )
+
+        assert stats == {"inserted": 0, "updated": 0, "unchanged": 1, "summary_queued": 0}
+        assert not _executed_sql(cursor, "INSERT INTO chatwork_tasks")
+        touch = _executed_sql(cursor, "SET last_synced_at = CURRENT_TIMESTAMP")[0]
+        assert touch.args[1][1] == [10]
+        conn.commit.assert_called_once()
+
+    def test_changed_task_is_upserted_and_summary_queued(self, quiet_side_effects):
+        conn, cursor = MagicMock(), MagicMock()
+        cursor.fetchall.return_value = [(10, False)]
+
+        stats = _sync_mod.sync_room_open_tasks(
+            conn, cursor, 1, "営業部",
+            [_api_task(10, body="資料を修正してください", limit_time=LIMIT_TIME + 86400)],
+            {10: _existing_row()}, None,
+        )
+
+        assert stats == {"inserted": 0, "updated": 1, "unchanged": 0, "summary_queued": 1}
+        upsert = _executed_sql(cursor, "INSERT INTO chatwork_tasks")[0]
+        params = upsert.args[1]
+        assert params[0] == 10
+        assert params[4] == "資料を修正してください"
+        assert params[5] == LIMIT_TIME + 86400
+        # LLM要約が確定するまでは旧summaryを維持
+        assert params[10] == "資料作成"
+        assert not _executed_sql(cursor, "UPDATE chatwork_tasks")
+        assert _executed_sql(cursor, "INSERT INTO task_summary_queue")
+        quiet_side_effects["limit_changes"].assert_called_once()
+
+    def test_new_task_is_inserted_and_alerted(self, quiet_side_effects):
+        conn, cursor = MagicMock(), MagicMock()
+        cursor.fetchall.side_effect = [[], [(11, True)]]  # 部署取得 → UPSERT
+
+        stats = _sync_mod.sync_room_open_tasks(
+            conn, cursor, 1, "営業部", [_api_task(11)], {}, None
+        )
+
+        assert stats["inserted"] == 1
+        assert stats["updated"] == 0
+        quiet_side_effects["deadline_alert"].assert_called_once()
+        assert quiet_side_effects["deadline_alert"].call_args.kwargs["task_id"] == 11
+
+    def test_locally_resolved_summary_discards_queued_row(self, quiet_side_effects):
+        conn, cursor = MagicMock(), MagicMock()
+        cursor.fetchall.return_value = [(10, False)]
+
+        with patch.object(_sync_mod, "resolve_task_summary_locally", return_value="定型作業"):
+            stats = _sync_mod.sync_room_open_tasks(
+                conn, cursor, 1, "営業部", [_api_task(10, body="定型作業")],
+                {10: _existing_row()}, None,
+            )
+
+        assert stats["summary_queued"] == 0
+        discard = _executed_sql(cursor, "DELETE FROM task_summary_queue")[0]
+        assert discard.args[1][1] == [10]
+
+
+class TestBulkUpsertTasks:
+
+    def test_rows_are_sent_in_chunks(self):
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = [[(1, True), (2, False)], [(3, True), (4, False)], [(5, True)]]
+        rows = [
+            (task_id, 1, 100, 200, "本文", None, False, "営業部", "山田", "", None, None, "org")
+            for task_id in range(1, 6)
+        ]
+
+        with patch.object(_sync_mod, "SYNC_UPSERT_CHUNK_SIZE", 2):
+            inserted = _sync_mod._bulk_upsert_tasks(cursor, rows)
+
+        assert inserted == {1, 3, 5}
+        assert cursor.execute.call_count == 3
+        first_sql, first_params = cursor.execute.call_args_list[0].args
+        assert first_sql.count("CURRENT_TIMESTAMP, %s") == 2
+        assert len(first_params) == 2 * len(rows[0])
+        assert "WHERE chatwork_tasks.organization_id = EXCLUDED.organization_id" in first_sql
+
+
+# ============================================================
+# doneタスクの同期
+# ============================================================
+
+class TestSyncRoomDoneTasks:
+
+    def test_open_to_done_transition(self):
+        conn, cursor = MagicMock(), MagicMock()
+        existing = {
+            10: _existing_row(),
+            11: _existing_row(completion_notified=True),
+            12: _existing_row(status="done"),
+        }
+
+        with patch.object(_sync_mod, "send_completion_notification") as notify:
+            done = _sync_mod.sync_room_done_tasks(
+                conn, cursor, 1, [_api_task(10), _api_task(11), _api_task(12), _api_task(13)], existing
+            )
+
+        assert done == 2
+        update = _executed_sql(cursor, "SET status = 'done'")[0]
+        assert update.args[1][1] == [10, 11]
+        assert [c.args[1]["task_id"] for c in notify.call_args_list] == [10]
+        notified = _executed_sql(cursor, "SET completion_notified = TRUE")[0]
+        assert notified.args[1][1] == [10]
+        conn.commit.assert_called_once()
+
+    def test_no_transition_skips_db(self):
+        conn, cursor = MagicMock(), MagicMock()
+
+        done = _sync_mod.sync_room_done_tasks(
+            conn, cursor, 1, [_api_task(12)], {12: _existing_row(status="done")}
+        )
+
+        assert done == 0
+        cursor.execute.assert_not_called()
+        conn.commit.assert_not_called()
+
+
+# ============================================================
+# ルームの並列取得
+# ============================================================
+
+class TestFetchRoomsTasksConcurrently:
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_get_room_tasks(room_id, status="open"):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return [{"task_id": room_id * 10, "status": status}]
+
+        rooms = [{"room_id": room_id, "name": f"room{room_id}"} for room_id in range(1, 9)]
+        with patch.object(_sync_mod, "get_room_tasks", side_effect=fake_get_room_tasks):
+            results = _sync_mod.fetch_rooms_tasks_concurrently(rooms, include_done=True, max_workers=3)
+
+        assert 1 < state["peak"] <= 3
+        assert set(results) == set(range(1, 9))
+        open_tasks, done_tasks = results[4]
+        assert open_tasks == [{"task_id": 40, "status": "open"}]
+        assert done_tasks == [{"task_id": 40, "status": "done"}]
+
+    def test_done_tasks_are_not_fetched_by_default(self):
+        with patch.object(_sync_mod, "get_room_tasks", return_value=[]) as get_room_tasks:
+            results = _sync_mod.fetch_rooms_tasks_concurrently([{"room_id": 1, "name": "a"}])
+
+        assert results == {1: ([], [])}
+        get_room_tasks.assert_called_once_with(1, "open")
+
+    def test_empty_rooms(self):
+        assert _sync_mod.fetch_rooms_tasks_concurrently([]) == {}
@@ -0,0 +1,216 @@
+"""
+tests/test_sync_chatwork_tasks_summary_queue.py
+
+v11.3.0: sync-chatwork-tasks のタスク要約キューのテスト
+
+- エンキュー（本文が変わったら試行回数をリセット）
+- ワーカー（LLM呼び出し中はDB接続を保持しない）
+- 本文が変わった（古いハッシュの）項目・試行回数上限の項目の削除
+- 要約の書き込みは本文ハッシュが一致する行だけ
+"""
+
+import importlib.util
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ============================================================
+# モジュールロード
+# ============================================================
+
+def _load_sync_module():
+    """sync-chatwork-tasks/main.py をロード（Firestoreはモック）"""
+    _MOCK_NAMES = ["google.cloud", "google.cloud.firestore"]
+
+    saved = {name: sys.modules.pop(name) for name in _MOCK_NAMES if name in sys.modules}
+
+    try:
+        for mod_name in _MOCK_NAMES:
+            sys.modules[mod_name] = MagicMock()
+
+        sync_dir = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "sync-chatwork-tasks"
+        )
+        spec = importlib.util.spec_from_file_location(
+            "sync_chatwork_tasks_main", os.path.join(sync_dir, "main.py")
+        )
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        for name in _MOCK_NAMES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+
+_sync_mod = _load_sync_module()
+
+
+def _executed_sql(cursor, keyword):
+    """keyword を含むSQLの execute 呼び出しを返す"""
+    return [c for c in cursor.execute.call_args_list if keyword in c.args[0]]
+
+
+class _FakeDB:
+    """接続ごとに cursor を作り、LLM呼び出し時点で開いている接続を記録できるようにする"""
+
+    def __init__(self, claim_rows=(), rowcount=0):
+        self.claim_rows = list(claim_rows)
+        self.rowcount = rowcount
+        self.connections = []
+        self.open = 0
+
+    def connect(self):
+        conn = MagicMock()
+        cursor = MagicMock()
+        cursor.rowcount = self.rowcount
+        cursor.fetchall.side_effect = self._fetchall(cursor)
+        conn.cursor.return_value = cursor
+        conn.close.side_effect = self._close
+        self.open += 1
+        self.connections.append((conn, cursor))
+        return conn
+
+    def _close(self):
+        self.open -= 1
+
+    def _fetchall(self, cursor):
+        def fetchall():
+            sql = cursor.execute.call_args.args[0]
+            if "FROM task_summary_queue q" in sql:
+                return self.claim_rows
+            return []
+        return fetchall
+
+
+# ============================================================
+# エンキュー
+# ============================================================
+
+class TestEnqueueTaskSummaries:
+
+    def test_upserts_body_hash_and_resets_attempts_on_change(self):
+        cursor = MagicMock()
+
+        count = _sync_mod.enqueue_task_summaries(cursor, [(1, "本文A"), (2, None)])
+
+        assert count == 2
+        sql, params = cursor.execute.call_args.args
+        assert "ON CONFLICT (organization_id, task_id) DO UPDATE" in sql
+        assert "ELSE 0" in sql
+        assert params[1] == [1, 2]
+        assert params[2] == [_sync_mod.task_body_hash("本文A"), _sync_mod.task_body_hash("")]
+
+    def test_empty_is_noop(self):
+        cursor = MagicMock()
+
+        assert _sync_mod.enqueue_task_summaries(cursor, []) == 0
+        cursor.execute.assert_not_called()
+
+    def test_discard_removes_queued_rows(self):
+        cursor = MagicMock()
+
+        _sync_mod.discard_task_summaries(cursor, [5, 6])
+
+        sql, params = cursor.execute.call_args.args
+        assert "DELETE FROM task_summary_queue" in sql
+        assert params[1] == [5, 6]
+
+
+# ============================================================
+# 書き込み
+# ============================================================
+
+class TestBulkUpdateSummaries:
+
+    def test_update_is_guarded_by_body_hash(self):
+        cursor = MagicMock()
+
+        _sync_mod._bulk_update_summaries(cursor, [1], ["要約"], ["hash1"])
+
+        sql, params = cursor.execute.call_args.args
+        assert "sha256(convert_to(COALESCE(t.body, ''), 'UTF8'))" in sql
+        assert "= v.body_hash" in sql
+        assert params[:3] == ([1], ["要約"], ["hash1"])
+
+
+# ============================================================
+# ワーカー
+# ============================================================
+
+class TestProcessTaskSummaryQueue:
+
+    def test_drain_releases_connection_during_llm_call(self):
+        body = "資料を作成してください"
+        db = _FakeDB(claim_rows=[(10, _sync_mod.task_body_hash(body), body, True)])
+        open_during_llm = []
+
+        def summarize(bodies, known_summaries=None):
+            open_during_llm.append(db.open)
+            return ["資料作成"]
+
+        with patch.object(_sync_mod, "summarize_task_bodies", side_effect=summarize):
+            result = _sync_mod.process_task_summary_queue(limit=10, connect=db.connect)
+
+        assert open_during_llm == [0]
+        assert result["total"] == 1
+        assert result["success"] == 1
+        assert db.open == 0
+
+        claim_conn, claim_cursor = db.connections[0]
+        claim_conn.commit.assert_called_once()
+        assert _executed_sql(claim_cursor, "attempts = attempts + 1")
+
+        write_conn, write_cursor = db.connections[1]
+        write_conn.commit.assert_called_once()
+        update = _executed_sql(write_cursor, "UPDATE chatwork_tasks t")[0]
+        assert update.args[1][:3] == ([10], ["資料作成"], [_sync_mod.task_body_hash(body)])
+        delete = _executed_sql(write_cursor, "USING unnest")[0]
+        assert "q.body_hash = d.body_hash" in delete.args[0]
+
+    def test_stale_and_orphan_rows_are_dropped_without_llm(self):
+        db = _FakeDB(claim_rows=[
+            (1, _sync_mod.task_body_hash("古い本文"), "新しい本文", True),
+            (2, _sync_mod.task_body_hash("削除済み"), None, False),
+        ])
+
+        with patch.object(_sync_mod, "summarize_task_bodies") as summarize:
+            result = _sync_mod.process_task_summary_queue(limit=10, connect=db.connect)
+
+        summarize.assert_not_called()
+        assert result["total"] == 0
+        assert result["stale"] == 2
+        assert len(db.connections) == 1
+
+        _, cursor = db.connections[0]
+        delete = _executed_sql(cursor, "USING unnest")[0]
+        assert delete.args[1][0] == [1, 2]
+        assert not _executed_sql(cursor, "attempts = attempts + 1")
+
+    def test_exhausted_rows_are_deleted(self):
+        db = _FakeDB(claim_rows=[], rowcount=3)
+
+        result = _sync_mod.process_task_summary_queue(limit=10, connect=db.connect)
+
+        _, cursor = db.connections[0]
+        delete = _executed_sql(cursor, "attempts >= %s")[0]
+        assert delete.args[1][1] == _sync_mod.SUMMARY_QUEUE_MAX_ATTEMPTS
+        assert result["exhausted"] == 3
+        select = _executed_sql(cursor, "FROM task_summary_queue q")[0]
+        assert "q.attempts < %s" in select.args[0]
+
+    def test_llm_failure_keeps_queue_rows(self):
+        body = "見積もりを送ってください"
+        db = _FakeDB(claim_rows=[(7, _sync_mod.task_body_hash(body), body, True)])
+
+        with patch.object(_sync_mod, "summarize_task_bodies", side_effect=RuntimeError("LLM down")):
+            result = _sync_mod.process_task_summary_queue(limit=10, connect=db.connect)
+
+        assert result["failed"] == 1
+        assert result["success"] == 0
+        # 試行回数の加算だけコミットされ、書き込み用の接続は開かない
+        assert len(db.connections) == 1
+        assert db.open == 0
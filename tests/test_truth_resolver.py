@@ -164,6 +164,29 @@ class TestTruthSourcePriority:
         assert len(result.data) == 2
         mock_chatwork_client.get_contacts.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_room_members_bypass_api_cache(self, resolver, mock_chatwork_client):
+        """ルームメンバーは権限判定に使うためキャッシュを読まない"""
+        result = await resolver.resolve("room_members", {"room_id": 100})
+
+        assert result.source == TruthSource.REALTIME_API
+        mock_chatwork_client.get_room_members.assert_called_once_with(100, use_cache=False)
+
+    @pytest.mark.asyncio
+    async def test_room_members_without_cache_option(self, resolver, mock_chatwork_client):
+        """use_cache を受け取らないクライアントにはそのまま渡す"""
+        calls = []
+
+        async def get_room_members(room_id):
+            calls.append(room_id)
+            return [{"account_id": "1", "name": "田中"}]
+
+        mock_chatwork_client.get_room_members = get_room_members
+        result = await resolver.resolve("room_members", {"room_id": 100})
+
+        assert calls == [100]
+        assert len(result.data) == 1
+
     @pytest.mark.asyncio
     async def test_db_first_for_user_profile(self, resolver, mock_db_accessor):
         """
@@ -0,0 +1,145 @@
+# tests/test_usage_rollups.py
+"""
+lib/usage_rollups.py のテスト
+
+日次ロールアップの合計から平均応答時間・エラー率を正しく復元できること、
+JST日付のバケット境界で読み出すこと、利用ログのINSERT後に
+ロールアップが別の文で（失敗してもログを失わずに）更新されることを検証する。
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from lib.brain.model_orchestrator.constants import Tier
+from lib.brain.model_orchestrator.usage_logger import UsageLogger
+from lib.usage_rollups import (
+    JST,
+    fetch_daily_usage,
+    fetch_usage_breakdown,
+    fetch_usage_totals,
+    jst_day_start,
+)
+
+
+class _FakeAsyncConn:
+    """await conn.execute() の引数を記録し、固定の行を返す"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def execute(self, query, params):
+        self.calls.append((str(query), params))
+        result = MagicMock()
+        result.fetchone.return_value = self.rows[0] if self.rows else None
+        result.fetchall.return_value = self.rows
+        return result
+
+
+class TestUsageRollupReaders:
+
+    @pytest.mark.asyncio
+    async def test_totals_derive_rates_from_sums(self):
+        conn = _FakeAsyncConn([(40, 2, Decimal("120.5"), Decimal("0.8"), 36000, 30)])
+
+        totals = await fetch_usage_totals(conn, "org-1", date(2026, 10, 16))
+
+        sql, params = conn.calls[0]
+        assert "ai_usage_rollups" in sql and "ai_usage_logs" not in sql
+        assert params["start"] == datetime(2026, 10, 16, tzinfo=JST)
+        assert params["granularity"] == "day"
+        assert totals.error_rate == 0.05
+        assert totals.avg_response_time_ms == 1200.0
+        assert totals.cost_jpy == 120.5
+
+    @pytest.mark.asyncio
+    async def test_daily_usage_reports_jst_dates(self):
+        # JST 10/16 0:00 は UTC 10/15 15:00
+        bucket = jst_day_start(date(2026, 10, 16)).astimezone(timezone.utc)
+        conn = _FakeAsyncConn([(bucket, Decimal("3.25"), 7)])
+
+        daily = await fetch_daily_usage(conn, "org-1", date(2026, 10, 1))
+
+        assert daily[0].day == date(2026, 10, 16)
+        assert (daily[0].cost_jpy, daily[0].request_count) == (3.25, 7)
+
+    @pytest.mark.asyncio
+    async def test_breakdown_rejects_unknown_dimension(self):
+        conn = _FakeAsyncConn([("brain", Decimal("9"), 3)])
+
+        assert await fetch_usage_breakdown(conn, "org-1", date(2026, 10, 1), "tier") == [("brain", 9.0, 3)]
+        with pytest.raises(ValueError):
+            await fetch_usage_breakdown(conn, "org-1", date(2026, 10, 1), "user_id; DROP TABLE x")
+
+
+class TestUsageLoggerRollup:
+
+    @staticmethod
+    def _pool_with_conn():
+        pool = MagicMock()
+        conn = MagicMock()
+        pool.connect.return_value.__enter__ = MagicMock(return_value=conn)
+        pool.connect.return_value.__exit__ = MagicMock(return_value=None)
+        conn.execute.return_value.fetchone.return_value = (
+            uuid4(), datetime(2026, 10, 16, 3, 0, tzinfo=timezone.utc),
+        )
+        return pool, conn
+
+    @staticmethod
+    def _rollup_call(conn):
+        return next(
+            c[0] for c in conn.execute.call_args_list
+            if "INSERT INTO ai_usage_rollups" in str(c[0][0])
+        )
+
+    def _log(self, pool, **kwargs):
+        params = dict(
+            model_id="openai/gpt-4o",
+            task_type="chat",
+            tier=Tier.STANDARD,
+            input_tokens=10,
+            output_tokens=5,
+            cost_jpy=Decimal("0.5"),
+            latency_ms=300,
+            success=False,
+        )
+        params.update(kwargs)
+        return UsageLogger(pool, "org-1").log_usage(**params)
+
+    def test_log_usage_upserts_rollups_after_log_insert(self):
+        pool, conn = self._pool_with_conn()
+
+        self._log(pool)
+
+        log_sql = str(conn.execute.call_args_list[0][0][0])
+        rollup_sql, rollup_params = self._rollup_call(conn)
+        assert "INSERT INTO ai_usage_logs" in log_sql
+        assert "ai_usage_rollups" not in log_sql
+        assert "ON CONFLICT (organization_id, granularity, bucket_start, model_id, tier)" in str(rollup_sql)
+        # 型の決まらないパラメータ（:x IS NULL など）をSQLに渡さない
+        assert "IS NULL" not in str(rollup_sql)
+        assert rollup_params["error_count"] == 1
+        assert (rollup_params["response_time_ms_sum"], rollup_params["response_time_count"]) == (300, 1)
+
+    def test_rollup_counts_missing_latency_as_zero(self):
+        pool, conn = self._pool_with_conn()
+
+        self._log(pool, latency_ms=None, success=True)
+
+        rollup_params = self._rollup_call(conn)[1]
+        assert rollup_params["error_count"] == 0
+        assert (rollup_params["response_time_ms_sum"], rollup_params["response_time_count"]) == (0, 0)
+
+    def test_rollup_failure_keeps_log(self):
+        pool, conn = self._pool_with_conn()
+        log_result = MagicMock()
+        log_id = uuid4()
+        log_result.fetchone.return_value = (log_id, datetime(2026, 10, 16, tzinfo=timezone.utc))
+        conn.execute.side_effect = [log_result, RuntimeError("relation does not exist")]
+
+        assert self._log(pool) == log_id
+        conn.rollback.assert_called_once()
@@ -0,0 +1,137 @@
+"""
+chatwork-webhook/infra/event_loop.py のテスト
+
+リクエストをまたいで同じイベントループが使われること、
+シャットダウンフックが実行されることを検証する。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'chatwork-webhook'))
+
+from infra.event_loop import (
+    BRAIN_PROCESS_TIMEOUT_SECONDS,
+    GUNICORN_THREADS,
+    BackgroundEventLoop,
+)
+
+
+@pytest.fixture
+def bg_loop():
+    loop = BackgroundEventLoop(name="test-loop")
+    yield loop
+    loop.shutdown(timeout=2)
+
+
+class TestBackgroundEventLoop:
+
+    def test_run_returns_result(self, bg_loop):
+        async def _add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert bg_loop.run(_add(1, 2)) == 3
+
+    def test_same_loop_across_calls(self, bg_loop):
+        """複数リクエストで同じループが使われる（ループ依存リソースが生き残る）"""
+        async def _current_loop():
+            return asyncio.get_running_loop()
+
+        first = bg_loop.run(_current_loop())
+        second = bg_loop.run(_current_loop())
+        assert first is second
+        assert not first.is_closed()
+
+    def test_concurrent_callers_from_threads(self, bg_loop):
+        """Flaskの複数スレッドから同時に投入できる"""
+        results = []
+
+        async def _work(i):
+            await asyncio.sleep(0.01)
+            return i
+
+        def _caller(i):
+            results.append(bg_loop.run(_work(i)))
+
+        threads = [threading.Thread(target=_caller, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(results) == list(range(8))
+
+    def test_exception_propagates(self, bg_loop):
+        async def _fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            bg_loop.run(_fail())
+
+    def test_timeout_cancels_coroutine(self, bg_loop):
+        cancelled = threading.Event()
+
+        async def _slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            bg_loop.run(_slow(), timeout=0.05)
+        assert cancelled.wait(timeout=1)
+
+    def test_default_executor_covers_all_gunicorn_threads(self, bg_loop):
+        """全スレッドが同時に to_thread しても executor で待たされない"""
+        barrier = threading.Barrier(GUNICORN_THREADS, timeout=2)
+
+        async def _blocking_db_call():
+            return await asyncio.to_thread(barrier.wait)
+
+        results = []
+
+        def _caller():
+            results.append(bg_loop.run(_blocking_db_call(), timeout=5))
+
+        threads = [threading.Thread(target=_caller) for _ in range(GUNICORN_THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(results) == list(range(GUNICORN_THREADS))
+
+    def test_process_timeout_is_below_gunicorn_timeout(self):
+        assert BRAIN_PROCESS_TIMEOUT_SECONDS < 540
+
+    def test_shutdown_runs_hooks_and_stops_loop(self):
+        bg_loop = BackgroundEventLoop(name="test-shutdown")
+        closed = []
+
+        async def _hook():
+            closed.append(True)
+
+        loop = bg_loop.start()
+        bg_loop.add_shutdown_hook(_hook)
+        bg_loop.shutdown(timeout=2)
+
+        assert closed == [True]
+        assert loop.is_closed()
+        assert not bg_loop.is_running
+
+    def test_restart_after_shutdown(self):
+        bg_loop = BackgroundEventLoop(name="test-restart")
+        bg_loop.start()
+        bg_loop.shutdown(timeout=2)
+
+        async def _ok():
+            return "ok"
+
+        assert bg_loop.run(_ok()) == "ok"
+        bg_loop.shutdown(timeout=2)
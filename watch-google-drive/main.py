@@ -73,8 +73,9 @@ from lib.document_processor import (
     ExtractedDocument,
     Chunk,
 )
-from lib.embedding import EmbeddingClient
+from lib.embedding import EmbeddingClient, DatabaseEmbeddingStore
 from lib.pinecone_client import PineconeClient
+from lib.vector_store import get_vector_store
 from lib.db import get_db_pool
 from lib.secrets import get_secret
 from lib.chatwork import ChatworkClient
@@ -1022,8 +1023,12 @@ def watch_google_drive():
             chunk_size=CHUNK_SIZE,
             chunk_overlap=CHUNK_OVERLAP
         )
-        embedding_client = EmbeddingClient()
-        pinecone_client = PineconeClient()
+        # v11.3.0: 変更のないチャンクはembedding_cacheから再利用（API呼び出し削減）
+        embedding_client = EmbeddingClient(
+            persistent_store=DatabaseEmbeddingStore(db_pool, organization_id),
+        )
+        # v11.3.0: VECTOR_STORE_BACKEND=local ならローカルインデックス（Pinecone不要）
+        pinecone_client = get_vector_store()
 
         # FolderMapper 初期化
         # USE_DYNAMIC_DEPARTMENT_MAPPING=true の場合、DBから部署マスタを取得
@@ -1191,6 +1196,9 @@ def watch_google_drive():
         # 同期を実行
         new_page_token = loop.run_until_complete(run_sync())
 
+        # v11.3.0: ローカルベクターストアの変更をディスクへ保存（Pineconeは何もしない）
+        loop.run_until_complete(pinecone_client.flush())
+
         # 同期状態を更新
         db_ops.update_sync_state(
             organization_id,